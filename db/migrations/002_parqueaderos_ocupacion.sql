@@ -0,0 +1,313 @@
+-- =====================================================
+-- MIGRACIÓN: RESUMEN DE OCUPACIÓN POR PARQUEADERO
+-- Tabla desnormalizada parqueaderos_ocupacion mantenida por triggers
+-- Reemplaza las subconsultas correlacionadas de obtener_todos,
+-- obtener_estadisticas_generales, obtener_ocupacion_por_sotano y
+-- vista_parqueaderos_completo por búsquedas por clave primaria
+-- =====================================================
+
+USE parking_management;
+
+-- =====================================================
+-- PASO 1: Tabla de resumen (una fila por parqueadero)
+-- Los agregados consideran solo asignaciones activas
+-- =====================================================
+CREATE TABLE IF NOT EXISTS parqueaderos_ocupacion (
+    parqueadero_id INT PRIMARY KEY,
+    total_asignaciones INT NOT NULL DEFAULT 0,
+    total_carros INT NOT NULL DEFAULT 0,
+    permite_compartir_min BOOLEAN NULL COMMENT 'NULL si no hay ocupantes',
+    pico_placa_solidario_max BOOLEAN NOT NULL DEFAULT FALSE,
+    discapacidad_max BOOLEAN NOT NULL DEFAULT FALSE,
+    exclusivo_max BOOLEAN NOT NULL DEFAULT FALSE,
+    hibrido_max BOOLEAN NOT NULL DEFAULT FALSE,
+    actualizado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (parqueadero_id) REFERENCES parqueaderos(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+DELIMITER $$
+
+-- =====================================================
+-- PASO 2: Procedimientos de mantenimiento
+-- =====================================================
+
+-- Recalcula la fila de un parqueadero (2-4 asignaciones: costo constante)
+DROP PROCEDURE IF EXISTS sp_recalcular_ocupacion$$
+CREATE PROCEDURE sp_recalcular_ocupacion(IN p_parqueadero_id INT)
+BEGIN
+    INSERT INTO parqueaderos_ocupacion (
+        parqueadero_id, total_asignaciones, total_carros, permite_compartir_min,
+        pico_placa_solidario_max, discapacidad_max, exclusivo_max, hibrido_max
+    )
+    SELECT
+        p_parqueadero_id,
+        COUNT(a.id),
+        COALESCE(SUM(v.tipo_vehiculo = 'Carro'), 0),
+        MIN(f.permite_compartir),
+        COALESCE(MAX(f.pico_placa_solidario), FALSE),
+        COALESCE(MAX(f.discapacidad), FALSE),
+        COALESCE(MAX(f.tiene_parqueadero_exclusivo), FALSE),
+        COALESCE(MAX(f.tiene_carro_hibrido OR v.tipo_circulacion = 'HÍBRIDO'), FALSE)
+    FROM asignaciones a
+    JOIN vehiculos v ON a.vehiculo_id = v.id
+    JOIN funcionarios f ON v.funcionario_id = f.id
+    WHERE a.parqueadero_id = p_parqueadero_id
+    AND a.activo = TRUE
+    ON DUPLICATE KEY UPDATE
+        total_asignaciones = VALUES(total_asignaciones),
+        total_carros = VALUES(total_carros),
+        permite_compartir_min = VALUES(permite_compartir_min),
+        pico_placa_solidario_max = VALUES(pico_placa_solidario_max),
+        discapacidad_max = VALUES(discapacidad_max),
+        exclusivo_max = VALUES(exclusivo_max),
+        hibrido_max = VALUES(hibrido_max);
+END$$
+
+-- Recalcula los parqueaderos donde un funcionario tiene vehículos asignados
+DROP PROCEDURE IF EXISTS sp_recalcular_ocupacion_funcionario$$
+CREATE PROCEDURE sp_recalcular_ocupacion_funcionario(IN p_funcionario_id INT)
+BEGIN
+    DECLARE v_parqueadero_id INT;
+    DECLARE v_fin BOOLEAN DEFAULT FALSE;
+    DECLARE cur_parqueaderos CURSOR FOR
+        SELECT DISTINCT a.parqueadero_id
+        FROM asignaciones a
+        JOIN vehiculos v ON a.vehiculo_id = v.id
+        WHERE v.funcionario_id = p_funcionario_id
+        AND a.activo = TRUE;
+    DECLARE CONTINUE HANDLER FOR NOT FOUND SET v_fin = TRUE;
+
+    OPEN cur_parqueaderos;
+    recorrer: LOOP
+        FETCH cur_parqueaderos INTO v_parqueadero_id;
+        IF v_fin THEN
+            LEAVE recorrer;
+        END IF;
+        CALL sp_recalcular_ocupacion(v_parqueadero_id);
+    END LOOP;
+    CLOSE cur_parqueaderos;
+END$$
+
+-- Reconstruye la tabla completa (comando de reparación / carga inicial)
+DROP PROCEDURE IF EXISTS sp_reconstruir_ocupacion$$
+CREATE PROCEDURE sp_reconstruir_ocupacion()
+BEGIN
+    DELETE FROM parqueaderos_ocupacion;
+
+    INSERT INTO parqueaderos_ocupacion (
+        parqueadero_id, total_asignaciones, total_carros, permite_compartir_min,
+        pico_placa_solidario_max, discapacidad_max, exclusivo_max, hibrido_max
+    )
+    SELECT
+        p.id,
+        COUNT(a.id),
+        COALESCE(SUM(v.tipo_vehiculo = 'Carro'), 0),
+        MIN(f.permite_compartir),
+        COALESCE(MAX(f.pico_placa_solidario), FALSE),
+        COALESCE(MAX(f.discapacidad), FALSE),
+        COALESCE(MAX(f.tiene_parqueadero_exclusivo), FALSE),
+        COALESCE(MAX(f.tiene_carro_hibrido OR v.tipo_circulacion = 'HÍBRIDO'), FALSE)
+    FROM parqueaderos p
+    LEFT JOIN asignaciones a ON a.parqueadero_id = p.id AND a.activo = TRUE
+    LEFT JOIN vehiculos v ON a.vehiculo_id = v.id
+    LEFT JOIN funcionarios f ON v.funcionario_id = f.id
+    GROUP BY p.id;
+END$$
+
+-- =====================================================
+-- PASO 3: Triggers
+-- after_insert_asignacion / after_update_asignacion conservan su lógica
+-- de estado y además recalculan el resumen del parqueadero afectado
+-- =====================================================
+
+DROP TRIGGER IF EXISTS after_insert_asignacion$$
+CREATE TRIGGER after_insert_asignacion
+AFTER INSERT ON asignaciones
+FOR EACH ROW
+BEGIN
+    DECLARE count_asignaciones INT;
+
+    -- Si hay estado_manual, usarlo en lugar del automático
+    IF NEW.estado_manual IS NOT NULL THEN
+        UPDATE parqueaderos
+        SET estado = NEW.estado_manual
+        WHERE id = NEW.parqueadero_id;
+    ELSE
+        -- Contar asignaciones activas para este parqueadero
+        SELECT COUNT(*) INTO count_asignaciones
+        FROM asignaciones a
+        JOIN vehiculos v ON a.vehiculo_id = v.id
+        WHERE a.parqueadero_id = NEW.parqueadero_id
+        AND a.activo = TRUE
+        AND v.tipo_vehiculo = 'Carro';
+
+        -- Actualizar estado basado en cantidad
+        IF count_asignaciones = 0 THEN
+            UPDATE parqueaderos
+            SET estado = 'Disponible'
+            WHERE id = NEW.parqueadero_id;
+        ELSEIF count_asignaciones = 1 THEN
+            UPDATE parqueaderos
+            SET estado = 'Parcialmente_Asignado'
+            WHERE id = NEW.parqueadero_id;
+        ELSEIF count_asignaciones >= 2 THEN
+            UPDATE parqueaderos
+            SET estado = 'Completo'
+            WHERE id = NEW.parqueadero_id;
+        END IF;
+    END IF;
+
+    CALL sp_recalcular_ocupacion(NEW.parqueadero_id);
+END$$
+
+DROP TRIGGER IF EXISTS after_update_asignacion$$
+CREATE TRIGGER after_update_asignacion
+AFTER UPDATE ON asignaciones
+FOR EACH ROW
+BEGIN
+    DECLARE count_asignaciones INT;
+
+    -- Si hay estado_manual definido, usarlo
+    IF NEW.estado_manual IS NOT NULL THEN
+        UPDATE parqueaderos
+        SET estado = NEW.estado_manual
+        WHERE id = NEW.parqueadero_id;
+    ELSEIF OLD.activo = TRUE AND NEW.activo = FALSE THEN
+        -- Contar asignaciones activas restantes
+        SELECT COUNT(*) INTO count_asignaciones
+        FROM asignaciones a
+        JOIN vehiculos v ON a.vehiculo_id = v.id
+        WHERE a.parqueadero_id = NEW.parqueadero_id
+        AND a.activo = TRUE
+        AND v.tipo_vehiculo = 'Carro';
+
+        -- Actualizar estado solo si no hay estado_manual en otras asignaciones activas
+        IF NOT EXISTS (
+            SELECT 1 FROM asignaciones
+            WHERE parqueadero_id = NEW.parqueadero_id
+            AND activo = TRUE
+            AND estado_manual IS NOT NULL
+        ) THEN
+            IF count_asignaciones = 0 THEN
+                UPDATE parqueaderos
+                SET estado = 'Disponible'
+                WHERE id = NEW.parqueadero_id;
+            ELSEIF count_asignaciones = 1 THEN
+                UPDATE parqueaderos
+                SET estado = 'Parcialmente_Asignado'
+                WHERE id = NEW.parqueadero_id;
+            END IF;
+        END IF;
+    END IF;
+
+    IF OLD.activo <> NEW.activo OR OLD.parqueadero_id <> NEW.parqueadero_id OR OLD.vehiculo_id <> NEW.vehiculo_id THEN
+        CALL sp_recalcular_ocupacion(NEW.parqueadero_id);
+        IF OLD.parqueadero_id <> NEW.parqueadero_id THEN
+            CALL sp_recalcular_ocupacion(OLD.parqueadero_id);
+        END IF;
+    END IF;
+END$$
+
+-- Nota: los borrados por ON DELETE CASCADE no disparan triggers en MySQL; la
+-- aplicación elimina las asignaciones explícitamente antes que los vehículos
+DROP TRIGGER IF EXISTS after_delete_asignacion$$
+CREATE TRIGGER after_delete_asignacion
+AFTER DELETE ON asignaciones
+FOR EACH ROW
+BEGIN
+    IF OLD.activo = TRUE THEN
+        CALL sp_recalcular_ocupacion(OLD.parqueadero_id);
+    END IF;
+END$$
+
+-- Parqueaderos nuevos nacen con su fila de resumen vacía
+DROP TRIGGER IF EXISTS after_insert_parqueadero$$
+CREATE TRIGGER after_insert_parqueadero
+AFTER INSERT ON parqueaderos
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO parqueaderos_ocupacion (parqueadero_id) VALUES (NEW.id);
+END$$
+
+-- Cambios en las excepciones del funcionario alteran los máximos del resumen
+DROP TRIGGER IF EXISTS after_update_funcionario$$
+CREATE TRIGGER after_update_funcionario
+AFTER UPDATE ON funcionarios
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.permite_compartir <=> NEW.permite_compartir)
+        OR NOT (OLD.pico_placa_solidario <=> NEW.pico_placa_solidario)
+        OR NOT (OLD.discapacidad <=> NEW.discapacidad)
+        OR NOT (OLD.tiene_parqueadero_exclusivo <=> NEW.tiene_parqueadero_exclusivo)
+        OR NOT (OLD.tiene_carro_hibrido <=> NEW.tiene_carro_hibrido) THEN
+        CALL sp_recalcular_ocupacion_funcionario(NEW.id);
+    END IF;
+END$$
+
+-- Cambios de tipo, circulación o dueño de un vehículo asignado
+DROP TRIGGER IF EXISTS after_update_vehiculo$$
+CREATE TRIGGER after_update_vehiculo
+AFTER UPDATE ON vehiculos
+FOR EACH ROW
+BEGIN
+    DECLARE v_parqueadero_id INT DEFAULT NULL;
+
+    IF NOT (OLD.tipo_vehiculo <=> NEW.tipo_vehiculo)
+        OR NOT (OLD.tipo_circulacion <=> NEW.tipo_circulacion)
+        OR NOT (OLD.funcionario_id <=> NEW.funcionario_id) THEN
+        SELECT parqueadero_id INTO v_parqueadero_id
+        FROM asignaciones
+        WHERE vehiculo_id = NEW.id AND activo = TRUE
+        LIMIT 1;
+
+        IF v_parqueadero_id IS NOT NULL THEN
+            CALL sp_recalcular_ocupacion(v_parqueadero_id);
+        END IF;
+    END IF;
+END$$
+
+DELIMITER ;
+
+-- =====================================================
+-- PASO 4: Vista de parqueaderos sobre el resumen
+-- =====================================================
+CREATE OR REPLACE VIEW vista_parqueaderos_completo AS
+SELECT
+    p.numero_parqueadero,
+    p.estado,
+    GROUP_CONCAT(
+        CONCAT(
+            f.nombre, ' ', f.apellidos,
+            ' (', v.placa, '-', v.tipo_circulacion,
+            IF(f.permite_compartir = FALSE, '-EXCLUSIVO', ''),
+            IF(f.pico_placa_solidario = TRUE, '-SOLID', ''),
+            IF(f.discapacidad = TRUE, '-DISC', ''),
+            ')'
+        )
+        SEPARATOR ' | '
+    ) AS asignados,
+    COALESCE(MAX(o.total_asignaciones), 0) AS total_asignados
+FROM parqueaderos p
+LEFT JOIN parqueaderos_ocupacion o ON o.parqueadero_id = p.id
+LEFT JOIN asignaciones a ON p.id = a.parqueadero_id AND a.activo = TRUE
+LEFT JOIN vehiculos v ON a.vehiculo_id = v.id
+LEFT JOIN funcionarios f ON v.funcionario_id = f.id
+WHERE p.activo = TRUE
+GROUP BY p.id, p.numero_parqueadero, p.estado
+ORDER BY p.numero_parqueadero;
+
+-- =====================================================
+-- PASO 5: Carga inicial
+-- =====================================================
+CALL sp_reconstruir_ocupacion();
+
+-- =====================================================
+-- PASO 6: Verificar (debe devolver 0 filas)
+-- También disponible como: python scripts/verificar_ocupacion.py
+-- =====================================================
+SELECT p.id, p.numero_parqueadero, o.total_asignaciones, COUNT(a.id) AS real_asignaciones
+FROM parqueaderos p
+LEFT JOIN parqueaderos_ocupacion o ON o.parqueadero_id = p.id
+LEFT JOIN asignaciones a ON a.parqueadero_id = p.id AND a.activo = TRUE
+GROUP BY p.id, p.numero_parqueadero, o.total_asignaciones
+HAVING NOT (o.total_asignaciones <=> COUNT(a.id));
@@ -0,0 +1,19 @@
+-- =====================================================
+-- MIGRACIÓN: ÍNDICE PARA EL HISTORIAL POR PARQUEADERO
+-- El historial del modal de detalle se pagina por
+-- (fecha_asignacion, id) descendente dentro de un parqueadero;
+-- este índice resuelve cada página sin ordenar en memoria
+-- =====================================================
+
+USE parking_management;
+
+CREATE INDEX IF NOT EXISTS idx_parqueadero_fecha
+    ON asignaciones (parqueadero_id, fecha_asignacion, id);
+
+-- Verificación: debe usar idx_parqueadero_fecha sin "Using filesort"
+EXPLAIN
+SELECT a.id, a.fecha_asignacion
+FROM asignaciones a
+WHERE a.parqueadero_id = 1
+ORDER BY a.fecha_asignacion DESC, a.id DESC
+LIMIT 50;
@@ -0,0 +1,40 @@
+-- =====================================================
+-- MIGRACIÓN: ÍNDICES COMPUESTOS PARA LISTADOS Y REPORTES
+-- Las consultas de models/ y ui/reportes_tab.py unen, filtran
+-- y ordenan por estas columnas; sin índice cada listado lee
+-- la tabla completa y ordena en memoria (Using filesort).
+-- Verificar con: python scripts/asesor_indices.py
+-- =====================================================
+
+USE parking_management;
+
+-- Vehículos activos de un funcionario (conteos, detalle, eliminación en cascada)
+CREATE INDEX IF NOT EXISTS idx_funcionario_activo
+    ON vehiculos (funcionario_id, activo);
+
+-- Asignaciones activas: cubre el JOIN a parqueaderos sin leer la fila
+CREATE INDEX IF NOT EXISTS idx_activo_vehiculo
+    ON asignaciones (activo, vehiculo_id, parqueadero_id);
+
+-- Listados de funcionarios activos ordenados por apellidos, nombre
+CREATE INDEX IF NOT EXISTS idx_activo_apellidos_nombre
+    ON funcionarios (activo, apellidos, nombre);
+
+-- Filtro por rango de fechas de los reportes
+CREATE INDEX IF NOT EXISTS idx_fecha_registro
+    ON funcionarios (fecha_registro);
+
+ANALYZE TABLE funcionarios, vehiculos, asignaciones;
+
+-- Verificación: funcionarios debe usar idx_activo_apellidos_nombre sin "Using filesort"
+EXPLAIN
+SELECT f.id, f.apellidos, f.nombre
+FROM funcionarios f
+WHERE f.activo = TRUE
+ORDER BY f.apellidos, f.nombre;
+
+-- Verificación: vehiculos debe usar idx_funcionario_activo (type = ref)
+EXPLAIN
+SELECT v.id, v.placa
+FROM vehiculos v
+WHERE v.funcionario_id = 1 AND v.activo = TRUE;
@@ -0,0 +1,90 @@
+-- =====================================================
+-- MIGRACIÓN: ROLLUPS DE ACCESOS Y OCUPACIÓN
+-- Tablas agregadas por hora y por día, mantenidas de forma
+-- incremental por utils/rollups_historial.AgregadorRollups.
+-- Los reportes históricos y las gráficas leen de aquí en vez
+-- de recorrer historial_accesos y asignaciones.
+-- Por sótano: unir con parqueaderos (200 filas).
+-- =====================================================
+
+USE parking_management;
+
+-- =====================================================
+-- PASO 1: Marcas de agua (último id procesado por fuente)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS rollup_marcas (
+    nombre VARCHAR(50) PRIMARY KEY,
+    ultimo_id BIGINT NOT NULL DEFAULT 0,
+    actualizado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- =====================================================
+-- PASO 2: Eventos de acceso (historial_accesos)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS rollup_accesos_hora (
+    hora DATETIME NOT NULL,
+    parqueadero_id INT NOT NULL,
+    tipo_vehiculo ENUM('Carro', 'Moto', 'Bicicleta') NOT NULL,
+    entradas INT NOT NULL DEFAULT 0,
+    salidas INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (hora, parqueadero_id, tipo_vehiculo),
+    INDEX idx_parqueadero_hora (parqueadero_id, hora)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+CREATE TABLE IF NOT EXISTS rollup_accesos_dia (
+    fecha DATE NOT NULL,
+    parqueadero_id INT NOT NULL,
+    tipo_vehiculo ENUM('Carro', 'Moto', 'Bicicleta') NOT NULL,
+    entradas INT NOT NULL DEFAULT 0,
+    salidas INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (fecha, parqueadero_id, tipo_vehiculo),
+    INDEX idx_parqueadero_fecha (parqueadero_id, fecha)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- =====================================================
+-- PASO 3: Asignaciones nuevas por día (asignaciones.id > marca)
+-- =====================================================
+CREATE TABLE IF NOT EXISTS rollup_asignaciones_dia (
+    fecha DATE NOT NULL,
+    parqueadero_id INT NOT NULL,
+    tipo_vehiculo ENUM('Carro', 'Moto', 'Bicicleta') NOT NULL,
+    asignaciones INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (fecha, parqueadero_id, tipo_vehiculo)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- =====================================================
+-- PASO 4: Ocupación (una muestra por parqueadero activo y hora)
+-- Las asignaciones liberadas se eliminan, así que la ocupación
+-- pasada no se puede reconstruir desde asignaciones: se muestrea
+-- =====================================================
+CREATE TABLE IF NOT EXISTS rollup_ocupacion_hora (
+    hora DATETIME NOT NULL,
+    parqueadero_id INT NOT NULL,
+    ocupado BOOLEAN NOT NULL DEFAULT FALSE,
+    carros INT NOT NULL DEFAULT 0,
+    motos INT NOT NULL DEFAULT 0,
+    bicicletas INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (hora, parqueadero_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Promedio del día = *_suma / horas
+CREATE TABLE IF NOT EXISTS rollup_ocupacion_dia (
+    fecha DATE NOT NULL,
+    parqueadero_id INT NOT NULL,
+    horas INT NOT NULL DEFAULT 0,
+    horas_ocupado INT NOT NULL DEFAULT 0,
+    carros_suma INT NOT NULL DEFAULT 0,
+    motos_suma INT NOT NULL DEFAULT 0,
+    bicicletas_suma INT NOT NULL DEFAULT 0,
+    vehiculos_max INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (fecha, parqueadero_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- =====================================================
+-- PASO 5: Marcas iniciales (los eventos existentes se agregan
+-- en la primera pasada del agregador, por lotes)
+-- =====================================================
+INSERT IGNORE INTO rollup_marcas (nombre, ultimo_id) VALUES ('accesos', 0), ('asignaciones', 0);
+
+-- Verificación
+SELECT nombre, ultimo_id FROM rollup_marcas;
@@ -0,0 +1,57 @@
+-- =====================================================
+-- MIGRACIÓN: ARCHIVO Y PARTICIONAMIENTO DEL HISTORIAL
+-- historial_accesos se particiona por mes (fecha_hora) y los
+-- eventos y asignaciones inactivas antiguas se mueven a tablas
+-- de archivo con scripts/archivar_historial.py, en lotes
+-- pequeños. Las tablas activas conservan un tamaño acotado.
+-- =====================================================
+
+USE parking_management;
+
+-- =====================================================
+-- PASO 1: Tablas de archivo (mismas columnas, sin claves foráneas)
+-- Se crean antes de particionar: LIKE copiaría las particiones
+-- =====================================================
+CREATE TABLE IF NOT EXISTS historial_accesos_archivo LIKE historial_accesos;
+ALTER TABLE historial_accesos_archivo ROW_FORMAT=COMPRESSED;
+
+CREATE TABLE IF NOT EXISTS asignaciones_archivo LIKE asignaciones;
+-- Un vehículo acumula varias asignaciones finalizadas en el archivo
+ALTER TABLE asignaciones_archivo DROP INDEX IF EXISTS unique_vehiculo_activo;
+ALTER TABLE asignaciones_archivo ROW_FORMAT=COMPRESSED;
+CREATE INDEX IF NOT EXISTS idx_parqueadero_fecha
+    ON asignaciones_archivo (parqueadero_id, fecha_asignacion, id);
+CREATE INDEX IF NOT EXISTS idx_vehiculo
+    ON asignaciones_archivo (vehiculo_id);
+
+-- =====================================================
+-- PASO 2: Particionar historial_accesos por mes
+-- MySQL no admite claves foráneas en tablas particionadas y
+-- exige que la clave primaria incluya la columna de partición.
+-- La integridad la garantizan la ingesta (valida la placa) y
+-- EliminacionCascada (borra el historial del funcionario).
+-- =====================================================
+ALTER TABLE historial_accesos
+    DROP FOREIGN KEY IF EXISTS historial_accesos_ibfk_1,
+    DROP FOREIGN KEY IF EXISTS historial_accesos_ibfk_2;
+
+ALTER TABLE historial_accesos
+    MODIFY fecha_hora TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    DROP PRIMARY KEY,
+    ADD PRIMARY KEY (id, fecha_hora);
+
+-- Los meses siguientes los agrega ArchivadorHistorial.mantener_particiones()
+ALTER TABLE historial_accesos
+PARTITION BY RANGE (UNIX_TIMESTAMP(fecha_hora)) (
+    PARTITION p_anteriores VALUES LESS THAN (UNIX_TIMESTAMP('2026-10-01 00:00:00')),
+    PARTITION p202610 VALUES LESS THAN (UNIX_TIMESTAMP('2026-11-01 00:00:00')),
+    PARTITION p202611 VALUES LESS THAN (UNIX_TIMESTAMP('2026-12-01 00:00:00')),
+    PARTITION p202612 VALUES LESS THAN (UNIX_TIMESTAMP('2027-01-01 00:00:00')),
+    PARTITION pmax VALUES LESS THAN MAXVALUE
+);
+
+-- Verificación
+SELECT PARTITION_NAME, TABLE_ROWS
+FROM information_schema.PARTITIONS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'historial_accesos'
+ORDER BY PARTITION_ORDINAL_POSITION;
@@ -0,0 +1,51 @@
+-- =====================================================
+-- MIGRACIÓN: OCUPACIÓN EN UN MOMENTO DADO
+-- Cada asignación es un intervalo [fecha_asignacion,
+-- fecha_fin_asignacion); los índices por inicio y por fin
+-- resuelven "quién estaba en el espacio N el día X" y las
+-- fotos de ocupación de ParqueaderoModel sin recorrer la tabla.
+-- Además, liberar una asignación la finaliza en vez de borrarla,
+-- para que el historial conserve el intervalo.
+-- =====================================================
+
+USE parking_management;
+
+-- =====================================================
+-- PASO 1: Un vehículo puede acumular varias asignaciones finalizadas
+-- unique_vehiculo_activo (vehiculo_id, activo) admitía una sola.
+-- La unicidad se mantiene solo para la asignación activa:
+-- vehiculo_activo es NULL en las finalizadas y UNIQUE ignora NULL.
+-- =====================================================
+-- Índice para la clave foránea de vehiculo_id antes de quitar la única
+CREATE INDEX IF NOT EXISTS idx_vehiculo_fecha
+    ON asignaciones (vehiculo_id, fecha_asignacion);
+
+ALTER TABLE asignaciones
+    ADD COLUMN IF NOT EXISTS vehiculo_activo INT
+        GENERATED ALWAYS AS (IF(activo, vehiculo_id, NULL)) VIRTUAL,
+    ADD UNIQUE INDEX IF NOT EXISTS unique_vehiculo_activo_unico (vehiculo_activo),
+    DROP INDEX IF EXISTS unique_vehiculo_activo;
+
+-- =====================================================
+-- PASO 2: Índices de intervalo (cubren inicio, fin y espacio)
+-- Fotos recientes: fecha_fin_asignacion IS NULL OR > X
+-- Fotos antiguas: fecha_asignacion <= X
+-- =====================================================
+CREATE INDEX IF NOT EXISTS idx_inicio_fin
+    ON asignaciones (fecha_asignacion, fecha_fin_asignacion, parqueadero_id);
+CREATE INDEX IF NOT EXISTS idx_fin_inicio
+    ON asignaciones (fecha_fin_asignacion, fecha_asignacion, parqueadero_id);
+
+CREATE INDEX IF NOT EXISTS idx_inicio_fin
+    ON asignaciones_archivo (fecha_asignacion, fecha_fin_asignacion, parqueadero_id);
+CREATE INDEX IF NOT EXISTS idx_fin_inicio
+    ON asignaciones_archivo (fecha_fin_asignacion, fecha_asignacion, parqueadero_id);
+
+ANALYZE TABLE asignaciones, asignaciones_archivo;
+
+-- Verificación: debe usar idx_fin_inicio o idx_inicio_fin (type = range)
+EXPLAIN
+SELECT a.parqueadero_id, a.vehiculo_id
+FROM asignaciones a
+WHERE a.fecha_asignacion <= NOW() - INTERVAL 7 DAY
+  AND (a.fecha_fin_asignacion IS NULL OR a.fecha_fin_asignacion > NOW() - INTERVAL 7 DAY);
@@ -30,7 +30,9 @@ CREATE TABLE funcionarios (
     activo BOOLEAN DEFAULT TRUE,
     INDEX idx_cedula (cedula),
     INDEX idx_nombre_completo (nombre, apellidos),
-    INDEX idx_cargo (cargo)
+    INDEX idx_cargo (cargo),
+    INDEX idx_activo_apellidos_nombre (activo, apellidos, nombre),
+    INDEX idx_fecha_registro (fecha_registro)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 -- =====================================================
@@ -48,7 +50,8 @@ CREATE TABLE vehiculos (
     activo BOOLEAN DEFAULT TRUE,
     FOREIGN KEY (funcionario_id) REFERENCES funcionarios(id) ON DELETE CASCADE,
     INDEX idx_placa (placa),
-    INDEX idx_tipo_circulacion (tipo_circulacion)
+    INDEX idx_tipo_circulacion (tipo_circulacion),
+    INDEX idx_funcionario_activo (funcionario_id, activo)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 -- =====================================================
@@ -80,7 +83,8 @@ CREATE TABLE asignaciones (
     FOREIGN KEY (parqueadero_id) REFERENCES parqueaderos(id),
     FOREIGN KEY (vehiculo_id) REFERENCES vehiculos(id) ON DELETE CASCADE,
     UNIQUE KEY unique_vehiculo_activo (vehiculo_id, activo),
-    INDEX idx_parqueadero_activo (parqueadero_id, activo)
+    INDEX idx_parqueadero_activo (parqueadero_id, activo),
+    INDEX idx_activo_vehiculo (activo, vehiculo_id, parqueadero_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 -- =====================================================
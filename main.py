@@ -153,6 +153,35 @@ def check_dependencies():
     return True, ""
 
 
+def extract_trace_options(argv: list) -> tuple:
+    """
+    Extrae de argv los flags del trazador de arranque.
+
+    Flags soportados (se quitan de argv para que QApplication no los reciba):
+        --trace-startup RUTA  /  --trace-startup=RUTA
+        --trace-format json|chrome  /  --trace-format=json|chrome
+
+    Args:
+        argv: Lista de argumentos (se modifica en sitio)
+
+    Returns:
+        tuple: (ruta o None, formato o None)
+    """
+    options = {"--trace-startup": None, "--trace-format": None}
+    remaining = [argv[0]] if argv else []
+    args = iter(argv[1:])
+
+    for arg in args:
+        name, sep, value = arg.partition("=")
+        if name in options:
+            options[name] = value if sep else next(args, None)
+        else:
+            remaining.append(arg)
+
+    argv[:] = remaining
+    return options["--trace-startup"], options["--trace-format"]
+
+
 def main():
     """
     Función principal de la aplicación.
@@ -163,11 +192,24 @@ def main():
     log_file = None
 
     try:
+        # Trazador de arranque (tiempos por fase; ver src/core/trazador_arranque.py)
+        from src.core.trazador_arranque import trazador
+
+        trazador.iniciar()
+        trace_path, trace_format = extract_trace_options(sys.argv)
+        if trace_path or trace_format:
+            # Los flags tienen prioridad sobre las variables de entorno
+            try:
+                trazador.configurar(trace_path or trazador.ruta, trace_format)
+            except ValueError as e:
+                print(f"[WARNING] {e}")
+
         # ======================================================
         # 1. VERIFICAR DEPENDENCIAS
         # ======================================================
         print("[INFO] Verificando dependencias...")
-        deps_ok, deps_error = check_dependencies()
+        with trazador.fase("dependencias"):
+            deps_ok, deps_error = check_dependencies()
 
         if not deps_ok:
             log_file = log_error_to_file(deps_error)
@@ -180,12 +222,13 @@ def main():
         print("[INFO] Cargando módulos del sistema...")
 
         try:
-            from PyQt5.QtWidgets import QApplication
-            from PyQt5.QtCore import Qt
+            with trazador.fase("imports"):
+                from PyQt5.QtWidgets import QApplication
+                from PyQt5.QtCore import Qt
 
-            # Importar módulos de la aplicación
-            from src.auth.login_window import FuturisticLoginWindow
-            from scripts.main_modular import MainWindow
+                # Importar módulos de la aplicación
+                from src.auth.login_window import FuturisticLoginWindow
+                from scripts.main_modular import MainWindow
 
         except ImportError as e:
             error_msg = (
@@ -209,7 +252,8 @@ def main():
             QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
 
         # Crear aplicación
-        app = QApplication(sys.argv)
+        with trazador.fase("qapplication"):
+            app = QApplication(sys.argv)
 
         # Configurar para que no cierre al cerrar ventana (permite flujo login -> main)
         app.setQuitOnLastWindowClosed(False)
@@ -254,6 +298,9 @@ def main():
         # Crear instancia (pasamos la app ya creada)
         authenticated_app = AuthenticatedApp()
 
+        if trazador.ruta:
+            print(f"[INFO] Traza de arranque ({trazador.formato}): {trazador.ruta}")
+
         # Iniciar aplicación
         return authenticated_app.start()
 
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🗄️ ARCHIVO DEL HISTORIAL DE ACCESOS Y ASIGNACIONES
+============================================================
+Mueve los eventos de acceso y las asignaciones finalizadas
+antiguas a las tablas de archivo (migración 006) en lotes
+pequeños con pausas, elimina las particiones vacías y crea las
+particiones mensuales de los próximos meses.
+
+Pensado para ejecutarse de noche (cron / Programador de tareas):
+    python scripts/archivar_historial.py
+    python scripts/archivar_historial.py --dias-accesos 90 --lote 500
+    python scripts/archivar_historial.py --solo-particiones
+
+Código de salida 1 si hubo errores de conexión.
+============================================================
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Agregar path del proyecto
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from datetime import datetime, timedelta
+
+from src.config.settings import (
+    ARCHIVE_ACCESS_DAYS,
+    ARCHIVE_ASSIGNMENT_DAYS,
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_PAUSE_MS,
+)
+from src.database.archivo_historial import ArchivadorHistorial
+from src.database.manager import DatabaseManager
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Archiva historial antiguo y mantiene las particiones")
+    parser.add_argument("--dias-accesos", type=int, default=ARCHIVE_ACCESS_DAYS,
+                        help="Antigüedad mínima de los eventos de acceso a archivar")
+    parser.add_argument("--dias-asignaciones", type=int, default=ARCHIVE_ASSIGNMENT_DAYS,
+                        help="Antigüedad mínima (fecha de fin) de las asignaciones a archivar")
+    parser.add_argument("--lote", type=int, default=ARCHIVE_BATCH_SIZE, help="Filas por transacción")
+    parser.add_argument("--pausa-ms", type=int, default=ARCHIVE_PAUSE_MS, help="Pausa entre lotes")
+    parser.add_argument("--meses-adelante", type=int, default=3,
+                        help="Meses futuros con partición creada")
+    parser.add_argument("--solo-particiones", action="store_true",
+                        help="No archiva filas; solo mantiene las particiones")
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    if not db.ensure_connection():
+        print("❌ No se pudo conectar a la base de datos")
+        return 1
+
+    archivador = ArchivadorHistorial(db, tamano_lote=args.lote, pausa_ms=args.pausa_ms)
+
+    if not args.solo_particiones:
+        accesos = archivador.archivar_accesos(args.dias_accesos)
+        asignaciones = archivador.archivar_asignaciones(args.dias_asignaciones)
+        print(f"✅ Archivados: {accesos} eventos de acceso, {asignaciones} asignaciones")
+
+    eliminadas = archivador.eliminar_particiones_vacias(datetime.now() - timedelta(days=args.dias_accesos))
+    creadas = archivador.mantener_particiones(args.meses_adelante)
+    if eliminadas:
+        print(f"🗑️ Particiones eliminadas: {', '.join(eliminadas)}")
+    if creadas:
+        print(f"➕ Particiones creadas: {', '.join(creadas)}")
+
+    for tabla, filas in sorted(archivador.estado().items()):
+        print(f"   {tabla}: ~{filas} filas")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
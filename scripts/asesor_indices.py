@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🔎 ASESOR DE ÍNDICES (EXPLAIN)
+============================================================
+Ejecuta las lecturas de los modelos y de la pestaña de reportes
+contra la base configurada (usar una base local con datos de prueba),
+captura cada consulta SELECT con sus parámetros y revisa su plan
+con EXPLAIN FORMAT=JSON: escaneos completos y "Using filesort".
+
+Uso:
+    python scripts/asesor_indices.py                                      # informe
+    python scripts/asesor_indices.py --linea-base db/explain_linea_base.json
+    python scripts/asesor_indices.py --guardar-linea-base db/explain_linea_base.json
+
+Código de salida 1 si hay hallazgos que no están en la línea base
+(o consultas que no se pudieron explicar).
+============================================================
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Agregar path del proyecto
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# La pestaña de reportes se construye sin mostrarse
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from src.database.asesor_indices import (
+    FILAS_MINIMAS_ESCANEO,
+    CapturaConsultas,
+    analizar,
+    cargar_linea_base,
+    guardar_linea_base,
+)
+from src.database.manager import DatabaseManager
+from src.models.funcionario import FuncionarioModel
+from src.models.parqueadero import ParqueaderoModel
+from src.models.vehiculo import VehiculoModel
+from src.utils.motor_elegibilidad import InstantaneaOcupacion
+
+
+def recorrer_catalogo(db: DatabaseManager):
+    """Ejecuta las lecturas representativas de la aplicación"""
+    funcionarios = FuncionarioModel(db)
+    vehiculos = VehiculoModel(db)
+    parqueaderos = ParqueaderoModel(db)
+
+    # Identificadores reales para que los planes reflejen la selectividad de los datos
+    muestra = db.fetch_one(
+        """
+        SELECT
+            (SELECT MIN(id) FROM funcionarios WHERE activo = TRUE) AS funcionario_id,
+            (SELECT MIN(id) FROM vehiculos WHERE activo = TRUE) AS vehiculo_id,
+            (SELECT MIN(id) FROM parqueaderos WHERE activo = TRUE) AS parqueadero_id
+        """
+    ) or {}
+    funcionario_id = muestra.get("funcionario_id") or 1
+    vehiculo_id = muestra.get("vehiculo_id") or 1
+    parqueadero_id = muestra.get("parqueadero_id") or 1
+
+    funcionarios.obtener_todos()
+    funcionarios.obtener_todos_incluyendo_inactivos()
+    funcionarios.obtener_por_id(funcionario_id)
+    funcionarios.obtener_datos_relacionados(funcionario_id)
+    funcionarios.buscar("a")
+
+    vehiculos.obtener_todos()
+    vehiculos.obtener_sin_asignar()
+    vehiculos.obtener_sin_asignar("PAR")
+    vehiculos.obtener_por_funcionario(funcionario_id)
+    vehiculos.obtener_por_id(vehiculo_id)
+
+    parqueaderos.obtener_todos()
+    parqueaderos.obtener_disponibles()
+    parqueaderos.obtener_estadisticas()
+    parqueaderos.obtener_estadisticas_generales()
+    parqueaderos.obtener_ocupacion_por_sotano()
+    parqueaderos.obtener_ocupacion_por_tipo_vehiculo()
+    parqueaderos.obtener_historial(parqueadero_id)
+    hace_una_semana = datetime.now() - timedelta(days=7)
+    parqueaderos.ocupantes_en(parqueadero_id, hace_una_semana)
+    parqueaderos.ocupacion_en(hace_una_semana)
+    parqueaderos.serie_ocupacion(hace_una_semana, datetime.now())
+    for sotano in parqueaderos.obtener_sotanos_disponibles()[:1]:
+        parqueaderos.obtener_todos(sotano=sotano)
+    # Carga del motor de elegibilidad (candidatos de la pestaña de asignaciones)
+    InstantaneaOcupacion.cargar(db)
+    InstantaneaOcupacion.cargar(db, parqueadero_id)
+
+    from datetime import date
+
+    from PyQt5.QtWidgets import QApplication
+
+    from src.ui.reportes_tab import ReportesTab
+
+    app = QApplication.instance() or QApplication(sys.argv)  # noqa: F841
+    reportes = ReportesTab(db)  # el constructor carga todos los reportes sin filtros
+    reportes.filtros_activos.update(
+        {"tipo_vehiculo": "Carro", "fecha_inicio": date(2000, 1, 1), "fecha_fin": date.today()}
+    )
+    reportes.actualizar_reportes()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Revisa con EXPLAIN los planes de las consultas de la aplicación")
+    parser.add_argument("--linea-base", help="Archivo JSON con los hallazgos aceptados")
+    parser.add_argument("--guardar-linea-base", metavar="RUTA", help="Guarda los hallazgos actuales como aceptados")
+    parser.add_argument(
+        "--min-filas",
+        type=int,
+        default=FILAS_MINIMAS_ESCANEO,
+        help=f"Filas estimadas mínimas para reportar un escaneo completo (por defecto {FILAS_MINIMAS_ESCANEO})",
+    )
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    if not db.connection:
+        print("❌ No se pudo conectar a la base de datos")
+        return 1
+
+    with CapturaConsultas(db) as captura:
+        recorrer_catalogo(db)
+    consultas = captura.consultas()
+    hallazgos, errores = analizar(db, consultas, args.min_filas)
+    print(f"📋 {len(consultas)} consultas analizadas, {len(hallazgos)} hallazgos")
+
+    if args.guardar_linea_base:
+        guardar_linea_base(args.guardar_linea_base, hallazgos)
+        print(f"✅ Línea base guardada en {args.guardar_linea_base}")
+        return 0
+
+    aceptados = cargar_linea_base(args.linea_base) if args.linea_base else set()
+    nuevos = [h for h in hallazgos if h.clave not in aceptados]
+
+    for consulta in errores:
+        print(f"❌ No se pudo explicar ({consulta.origen}): {consulta.huella[:120]}")
+    for h in nuevos:
+        tabla = f" en {h.tabla}" if h.tabla else ""
+        print(f"⚠️ {h.tipo}{tabla} (~{h.filas} filas) — {h.origen}")
+        print(f"   {h.huella[:160]}")
+
+    if nuevos or errores:
+        return 1
+    print("✅ Sin escaneos completos ni filesorts fuera de la línea base")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
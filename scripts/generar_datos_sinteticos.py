@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 GENERADOR DE DATOS SINTÉTICOS PARA PRUEBAS DE RENDIMIENTO
+============================================================
+Llena una base de PRUEBAS con funcionarios, vehículos,
+parqueaderos, asignaciones e historial de accesos generados
+de forma determinista (misma semilla y fecha de corte =>
+mismas filas).
+
+Escalas:
+    pequena   1.000 funcionarios,   200 espacios,  30 días
+    media    10.000 funcionarios, 1.000 espacios, 180 días
+    grande  100.000 funcionarios, 5.000 espacios, 365 días (millones de accesos)
+
+Preparar la base de pruebas (esquema + migraciones con otro nombre):
+    sed 's/parking_management/parking_benchmark/g' db/schema/parking_database_schema.sql | mysql -u root -p
+    for f in db/migrations/*.sql; do sed 's/parking_management/parking_benchmark/g' "$f" | mysql -u root -p; done
+
+Uso:
+    python scripts/generar_datos_sinteticos.py --escala media --vaciar
+    python scripts/generar_datos_sinteticos.py --escala grande --semilla 7 --hasta 2026-10-01 --vaciar
+    python scripts/generar_datos_sinteticos.py --funcionarios 50000 --espacios 2000 --solo-contar
+============================================================
+"""
+
+import argparse
+import sys
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+
+# Agregar path del proyecto
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config.settings import DatabaseConfig
+from src.database.datos_sinteticos import COLUMNAS, ESCALAS, TABLAS_CARGA, CargadorDatos, GeneradorDatos
+from src.database.manager import ConexionIndependiente
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Genera y carga datos sintéticos a escala")
+    parser.add_argument("--escala", choices=sorted(ESCALAS), default="pequena")
+    parser.add_argument("--funcionarios", type=int, help="Reemplaza la cantidad de funcionarios de la escala")
+    parser.add_argument("--espacios", type=int, help="Reemplaza la cantidad de espacios de la escala")
+    parser.add_argument("--dias", type=int, help="Reemplaza los días de historial de la escala")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--hasta", type=datetime.fromisoformat, help="Fecha de corte (por defecto hoy)")
+    parser.add_argument("--base", default="parking_benchmark", help="Base de datos de pruebas")
+    parser.add_argument("--lote", type=int, default=5000, help="Filas por INSERT")
+    parser.add_argument("--vaciar", action="store_true", help="Vacía las tablas de la base de pruebas antes de cargar")
+    parser.add_argument("--solo-contar", action="store_true", help="Genera sin conectarse y muestra los conteos")
+    args = parser.parse_args()
+
+    escala = ESCALAS[args.escala]
+    cambios = {"funcionarios": args.funcionarios, "espacios": args.espacios, "dias_historial": args.dias}
+    escala = replace(escala, **{k: v for k, v in cambios.items() if v is not None})
+    generador = GeneradorDatos(escala, semilla=args.semilla, hasta=args.hasta)
+    print(f"📐 {escala} (semilla {args.semilla}, hasta {generador.hasta:%Y-%m-%d})")
+
+    if args.solo_contar:
+        for tabla in TABLAS_CARGA:
+            print(f"   {tabla}: {sum(1 for _ in generador.filas(tabla))} filas")
+        return 0
+
+    if args.base == DatabaseConfig().database:
+        print(f"❌ '{args.base}' es la base configurada de la aplicación; use una base de pruebas")
+        return 1
+
+    with ConexionIndependiente(replace(DatabaseConfig(), database=args.base)) as db:
+        if not db.ensure_connection():
+            print(f"❌ No se pudo conectar a '{args.base}'")
+            return 1
+
+        cargador = CargadorDatos(db, tamano_lote=args.lote)
+        exito, mensaje = cargador.preparar(generador, vaciar=args.vaciar)
+        if not exito:
+            print(f"❌ {mensaje}")
+            return 1
+
+        def progreso(tabla: str, filas: int):
+            print(f"\r   {tabla}: {filas} filas", end="", flush=True)
+
+        resumen = cargador.cargar(generador, progreso)
+        print()
+        for tabla, datos in resumen.items():
+            velocidad = datos["filas"] / datos["segundos"] if datos["segundos"] else 0
+            estado = f"❌ {datos['error']}" if "error" in datos else "✅"
+            print(f"{estado} {tabla}: {datos['filas']} filas ({len(COLUMNAS[tabla])} columnas) "
+                  f"en {datos['segundos']:.1f}s ({velocidad:,.0f} filas/s)")
+        return 1 if any("error" in d for d in resumen.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
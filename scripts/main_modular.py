@@ -4,22 +4,118 @@
 
 import sys
 from datetime import datetime
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QTabWidget, QMessageBox
+    QApplication, QMainWindow, QTabWidget, QMessageBox, QWidget, QVBoxLayout, QLabel
 )
 from PyQt5.QtGui import QIcon
 
+from src.core.trazador_arranque import trazador
 from src.database.manager import DatabaseManager
-from src.ui.dashboard_tab import DashboardWidget
-from src.ui.funcionarios_tab import FuncionariosTab
-from src.ui.vehiculos_tab import VehiculosTab
-from src.ui.parqueaderos_tab import ParqueaderosTab
-from src.ui.asignaciones_tab import AsignacionesTab
-from src.ui.reportes_tab import ReportesTab
+from src.ui.utils.programador_actualizaciones import ProgramadorActualizaciones
 from src.ui.widgets.styles import AppStyles
+from src.utils.rollups_historial import ProgramadorRollups
 from src.utils.resource_path import get_resource_path
 
 
+# Fábricas de pestañas. Los imports van dentro de cada función para que el
+# módulo solo se cargue al abrir la pestaña (y siguen siendo imports literales,
+# visibles para PyInstaller).
+def _crear_dashboard(db):
+    from src.ui.dashboard_tab import DashboardWidget
+    return DashboardWidget(db)
+
+
+def _crear_funcionarios(db):
+    from src.ui.funcionarios_tab import FuncionariosTab
+    return FuncionariosTab(db)
+
+
+def _crear_vehiculos(db):
+    from src.ui.vehiculos_tab import VehiculosTab
+    return VehiculosTab(db)
+
+
+def _crear_asignaciones(db):
+    from src.ui.asignaciones_tab import AsignacionesTab
+    return AsignacionesTab(db)
+
+
+def _crear_parqueaderos(db):
+    from src.ui.parqueaderos_tab import ParqueaderosTab
+    return ParqueaderosTab(db)
+
+
+def _crear_reportes(db):
+    from src.ui.reportes_tab import ReportesTab
+    return ReportesTab(db)
+
+
+# Pestañas en el orden en que se muestran: (atributo, fábrica, título).
+# Solo el dashboard se construye al iniciar; el resto se construye la primera
+# vez que el usuario abre la pestaña.
+PESTANAS = [
+    ("tab_dashboard", _crear_dashboard, "🏠 Dashboard"),
+    ("tab_funcionarios", _crear_funcionarios, "👥 Funcionarios"),
+    ("tab_vehiculos", _crear_vehiculos, "🚗 Vehículos"),
+    ("tab_asignaciones", _crear_asignaciones, "📋 Asignaciones"),
+    ("tab_parqueaderos", _crear_parqueaderos, "🅿️ Parqueaderos"),
+    ("tab_reportes", _crear_reportes, "📊 Reportes"),
+]
+
+# Señales entre pestañas: pestaña origen -> señal -> [(pestaña destino, método de recarga)]
+# Los destinos que todavía no se han construido se omiten: cargarán datos frescos al abrirse.
+SENALES_ENTRE_PESTANAS = {
+    "tab_funcionarios": {
+        # Cuando se cree un funcionario, actualizar el combo de vehículos y el dashboard
+        "funcionario_creado": [
+            ("tab_vehiculos", "cargar_combo_funcionarios"),
+            ("tab_dashboard", "load_initial_data"),
+        ],
+        # Cuando se ELIMINE un funcionario en cascada, actualizar TODAS las pestañas
+        "funcionario_eliminado": [
+            ("tab_vehiculos", "cargar_vehiculos_async"),
+            ("tab_vehiculos", "cargar_combo_funcionarios"),
+            ("tab_asignaciones", "actualizar_asignaciones"),
+            ("tab_parqueaderos", "cargar_filtros_iniciales"),
+            ("tab_parqueaderos", "cargar_parqueaderos"),
+            ("tab_dashboard", "load_initial_data"),
+        ],
+    },
+    "tab_vehiculos": {
+        # Cuando se cree/elimine un vehículo: asignaciones, parqueaderos, dashboard
+        # y funcionarios (contador de vehículos)
+        "vehiculo_creado": [
+            ("tab_asignaciones", "cargar_vehiculos_sin_asignar"),
+            ("tab_asignaciones", "cargar_asignaciones"),
+            ("tab_parqueaderos", "cargar_filtros_iniciales"),
+            ("tab_parqueaderos", "cargar_parqueaderos"),
+            ("tab_dashboard", "load_initial_data"),
+            ("tab_funcionarios", "cargar_funcionarios"),
+        ],
+    },
+    "tab_asignaciones": {
+        # Cuando se actualicen asignaciones: parqueaderos, dashboard, vehículos,
+        # funcionarios y reportes
+        "asignacion_actualizada": [
+            ("tab_parqueaderos", "cargar_filtros_iniciales"),
+            ("tab_parqueaderos", "cargar_parqueaderos"),
+            ("tab_dashboard", "load_initial_data"),
+            ("tab_vehiculos", "cargar_vehiculos_async"),
+            ("tab_funcionarios", "cargar_funcionarios"),
+            ("tab_reportes", "actualizar_reportes"),
+        ],
+    },
+    "tab_parqueaderos": {
+        # Cuando se actualicen parqueaderos: dashboard y reportes
+        "parqueaderos_actualizados": [
+            ("tab_dashboard", "load_initial_data"),
+            ("tab_reportes", "actualizar_reportes"),
+        ],
+    },
+}
+
+
 class MainWindow(QMainWindow):
     """Ventana principal de la aplicación modular"""
 
@@ -34,6 +130,10 @@ class MainWindow(QMainWindow):
         self.setup_ui()
         self.setStyleSheet(AppStyles.MAIN_STYLE)
 
+        # Rollups del reporte histórico: se actualizan en un hilo con conexión propia
+        self.programador_rollups = ProgramadorRollups(self.db.config)
+        self.programador_rollups.iniciar()
+
     def setup_ui(self):
         """Configura la interfaz de usuario principal"""
         self.setWindowTitle("Sistema de Gestión de Parqueadero - Ssalud Plaza Claro")
@@ -55,84 +155,105 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
-        # Crear las pestañas principales usando los nuevos módulos
-        self.tab_dashboard = DashboardWidget(self.db)
-        self.tab_funcionarios = FuncionariosTab(self.db)
-        self.tab_vehiculos = VehiculosTab(self.db)
-        self.tab_parqueaderos = ParqueaderosTab(self.db)
-        self.tab_asignaciones = AsignacionesTab(self.db)
-        self.tab_reportes = ReportesTab(self.db)
-
-        # Agregar pestañas en el orden solicitado
-        self.tabs.addTab(self.tab_dashboard, "🏠 Dashboard")
-        self.tabs.addTab(self.tab_funcionarios, "👥 Funcionarios")
-        self.tabs.addTab(self.tab_vehiculos, "🚗 Vehículos")
-        self.tabs.addTab(self.tab_asignaciones, "📋 Asignaciones")
-        self.tabs.addTab(self.tab_parqueaderos, "🅿️ Parqueaderos")
-        self.tabs.addTab(self.tab_reportes, "📊 Reportes")
+        # Agregar pestañas en el orden solicitado: marcadores livianos que se
+        # reemplazan por la pestaña real en su primera activación
+        for atributo, _, titulo in PESTANAS:
+            setattr(self, atributo, None)
+            self.tabs.addTab(self._crear_marcador(), titulo)
+
+        # Debe conectarse antes que el programador: la pestaña se construye
+        # antes de procesar sus recargas pendientes
+        self.tabs.currentChanged.connect(self._al_activar_pestana)
 
         # Conectar señales entre pestañas
         self.conectar_senales()
 
+        self.construir_pestana(0)
+
         # Barra de estado
         self.statusBar().showMessage("Sistema modular iniciado correctamente")
 
         # Configurar menú
         self.crear_menu()
 
+    @staticmethod
+    def _crear_marcador() -> QWidget:
+        """Widget provisional mostrado mientras la pestaña no se ha construido"""
+        marcador = QWidget()
+        layout = QVBoxLayout(marcador)
+        etiqueta = QLabel("Cargando...")
+        etiqueta.setAlignment(Qt.AlignCenter)
+        layout.addWidget(etiqueta)
+        return marcador
+
+    def _al_activar_pestana(self, indice: int):
+        if 0 <= indice < len(PESTANAS):
+            self.construir_pestana(indice)
+
+    def construir_pestana(self, indice: int):
+        """
+        Construye la pestaña real si aún es un marcador
+
+        Args:
+            indice: Posición de la pestaña en PESTANAS
+
+        Returns:
+            QWidget: La pestaña construida
+        """
+        atributo, fabrica, titulo = PESTANAS[indice]
+        pestana = getattr(self, atributo)
+        if pestana is not None:
+            return pestana
+
+        self.statusBar().showMessage(f"Cargando {titulo}...")
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            with trazador.fase(f"pestana.{atributo}", categoria="pestana"):
+                pestana = fabrica(self.db)
+        finally:
+            QApplication.restoreOverrideCursor()
+        setattr(self, atributo, pestana)
+
+        # Reemplazar el marcador sin volver a emitir currentChanged
+        actual = self.tabs.currentIndex()
+        self.tabs.blockSignals(True)
+        marcador = self.tabs.widget(indice)
+        self.tabs.removeTab(indice)
+        self.tabs.insertTab(indice, pestana, titulo)
+        self.tabs.setCurrentIndex(actual)
+        self.tabs.blockSignals(False)
+        marcador.deleteLater()
+
+        self._conectar_senales_de(atributo, pestana)
+        self.statusBar().clearMessage()
+        return pestana
+
     def conectar_senales(self):
-        """Conecta las señales entre las diferentes pestañas para sincronización completa"""
-
-        # ============================================
-        # CONEXIONES DESDE FUNCIONARIOS
-        # ============================================
-        # Cuando se cree un funcionario, actualizar:
-        self.tab_funcionarios.funcionario_creado.connect(self.tab_vehiculos.actualizar_combo_funcionarios)  # Combo en vehículos
-        self.tab_funcionarios.funcionario_creado.connect(self.tab_dashboard.actualizar_dashboard)  # Dashboard
-
-        # Cuando se ELIMINE un funcionario en cascada, actualizar TODAS las pestañas:
-        self.tab_funcionarios.funcionario_eliminado.connect(self.tab_vehiculos.actualizar_vehiculos)  # Eliminar vehículos de la tabla
-        self.tab_funcionarios.funcionario_eliminado.connect(self.tab_vehiculos.actualizar_combo_funcionarios)  # Actualizar combo
-        self.tab_funcionarios.funcionario_eliminado.connect(self.tab_asignaciones.actualizar_asignaciones)  # Eliminar asignaciones de la tabla
-        self.tab_funcionarios.funcionario_eliminado.connect(self.tab_parqueaderos.actualizar_parqueaderos)  # Actualizar estados de parqueaderos
-        self.tab_funcionarios.funcionario_eliminado.connect(self.tab_dashboard.actualizar_dashboard)  # Actualizar estadísticas
-
-        # ============================================
-        # CONEXIONES DESDE VEHÍCULOS
-        # ============================================
-        # Cuando se cree/elimine un vehículo, actualizar:
-        self.tab_vehiculos.vehiculo_creado.connect(self.tab_asignaciones.actualizar_vehiculos_sin_asignar)  # Lista sin asignar
-        self.tab_vehiculos.vehiculo_creado.connect(self.tab_asignaciones.cargar_asignaciones)  # Tabla asignaciones actuales
-        self.tab_vehiculos.vehiculo_creado.connect(self.tab_parqueaderos.actualizar_parqueaderos)  # Lista parqueaderos
-        self.tab_vehiculos.vehiculo_creado.connect(self.tab_dashboard.actualizar_dashboard)  # Dashboard
-        self.tab_vehiculos.vehiculo_creado.connect(self.tab_funcionarios.actualizar_funcionarios)  # Tabla funcionarios (contador vehículos)
-
-        # ============================================
-        # CONEXIONES DESDE ASIGNACIONES
-        # ============================================
-        # Cuando se actualicen asignaciones, actualizar:
-        self.tab_asignaciones.asignacion_actualizada.connect(self.tab_parqueaderos.actualizar_parqueaderos)  # Vista parqueaderos
-        self.tab_asignaciones.asignacion_actualizada.connect(self.tab_dashboard.actualizar_dashboard)  # Dashboard
-        self.tab_asignaciones.asignacion_actualizada.connect(self.tab_vehiculos.actualizar_vehiculos)  # Tabla vehículos
-        self.tab_asignaciones.asignacion_actualizada.connect(self.tab_funcionarios.actualizar_funcionarios)  # Tabla funcionarios
-
-        # ============================================
-        # CONEXIONES DESDE PARQUEADEROS
-        # ============================================
-        # Cuando se actualicen parqueaderos, actualizar:
-        self.tab_parqueaderos.parqueaderos_actualizados.connect(self.tab_dashboard.actualizar_dashboard)  # Dashboard
-
-        # ============================================
-        # CONEXIONES HACIA REPORTES
-        # ============================================
-        # Actualizar reportes cuando cambien asignaciones o parqueaderos:
-        self.tab_asignaciones.asignacion_actualizada.connect(self.tab_reportes.actualizar_reportes)  # Actualizar reportes
-        self.tab_parqueaderos.parqueaderos_actualizados.connect(self.tab_reportes.actualizar_reportes)  # Actualizar reportes
-
-        # ============================================
-        # CONEXIONES DESDE DASHBOARD
-        # ============================================
-        # La funcionalidad de búsqueda fue eliminada del dashboard.
+        """Conecta las señales entre las diferentes pestañas para sincronización completa
+
+        Las recargas pasan por ProgramadorActualizaciones: las señales que llegan
+        en ráfaga se agrupan, cada pestaña se recarga una sola vez por ronda y las
+        pestañas ocultas se recargan cuando el usuario las abre. Las señales de
+        cada pestaña se conectan al construirla (ver SENALES_ENTRE_PESTANAS).
+        """
+        self.programador = ProgramadorActualizaciones(self.tabs, self.db)
+
+    def _conectar_senales_de(self, atributo: str, pestana: QWidget):
+        if atributo == "tab_dashboard":
+            # El dashboard ya recarga sus datos en showEvent
+            self.programador.recarga_al_mostrar(pestana)
+
+        for senal, destinos in SENALES_ENTRE_PESTANAS.get(atributo, {}).items():
+            getattr(pestana, senal).connect(lambda destinos=destinos: self._solicitar_recargas(destinos))
+
+    def _solicitar_recargas(self, destinos):
+        metodos = [
+            getattr(getattr(self, atributo), metodo)
+            for atributo, metodo in destinos
+            if getattr(self, atributo) is not None
+        ]
+        if metodos:
+            self.programador.solicitar(*metodos)
 
     def crear_menu(self):
         """Crea el menú de la aplicación"""
@@ -144,12 +265,29 @@ class MainWindow(QMainWindow):
         accion_salir = menu_archivo.addAction("Salir")
         accion_salir.triggered.connect(self.close)
 
+        # Menú Herramientas
+        menu_herramientas = menubar.addMenu("&Herramientas")
+
+        accion_consultas = menu_herramientas.addAction("Estadísticas de consultas...")
+        accion_consultas.triggered.connect(self.mostrar_estadisticas_consultas)
+
         # Menú Ayuda
         menu_ayuda = menubar.addMenu("&Ayuda")
 
         accion_acerca = menu_ayuda.addAction("Acerca de")
         accion_acerca.triggered.connect(self.mostrar_acerca_de)
 
+    def mostrar_estadisticas_consultas(self):
+        """Muestra las estadísticas de consultas SQL (solo administradores)"""
+        usuario = getattr(self, "current_user", None)
+        if usuario and usuario.get("rol") != "Administrador":
+            QMessageBox.warning(self, "Acceso denegado", "Solo los administradores pueden ver esta información.")
+            return
+
+        from src.ui.dialogo_estadisticas_consultas import EstadisticasConsultasDialog
+
+        EstadisticasConsultasDialog(parent=self).exec_()
+
     def mostrar_acerca_de(self):
         """Muestra el diálogo 'Acerca de'"""
         QMessageBox.about(
@@ -172,6 +310,7 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
+            self.programador_rollups.detener()
             self.db.disconnect()
             event.accept()
         else:
@@ -214,8 +353,10 @@ def main():
     app.setStyle('Fusion')
 
     # Crear y mostrar la ventana principal
-    window = MainWindow()
+    with trazador.fase("ventana_principal"):
+        window = MainWindow()
     window.show()
+    QTimer.singleShot(0, trazador.finalizar)
 
     # Ejecutar el loop de eventos
     sys.exit(app.exec_())
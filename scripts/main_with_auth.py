@@ -12,9 +12,11 @@ Python: 3.8+
 =====================================================
 """
 
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication, QMessageBox
 
 from src.auth.login_window import FuturisticLoginWindow
+from src.core.trazador_arranque import trazador
 from scripts.main_modular import MainWindow
 
 
@@ -47,7 +49,8 @@ class AuthenticatedApp:
 
     def show_login(self):
         """Muestra la ventana de login"""
-        self.login_window = FuturisticLoginWindow()
+        with trazador.fase("login.ventana"):
+            self.login_window = FuturisticLoginWindow()
 
         # Conectar señal de login exitoso
         self.login_window.login_successful.connect(self.on_login_success)
@@ -60,6 +63,8 @@ class AuthenticatedApp:
 
         # Mostrar ventana de login
         self.login_window.show()
+        # El tiempo entre esta marca y "login.exitoso" es espera del usuario
+        trazador.marcar("login.mostrado")
 
     def on_login_success(self, user_data):
         """
@@ -69,6 +74,7 @@ class AuthenticatedApp:
             user_data: Diccionario con información del usuario autenticado
         """
         self.current_user = user_data
+        trazador.marcar("login.exitoso")
 
         # Mostrar aplicación principal primero
         self.show_main_application()
@@ -81,7 +87,8 @@ class AuthenticatedApp:
     def show_main_application(self):
         """Muestra la aplicación principal del sistema de parqueadero"""
         try:
-            self.main_window = MainWindow()
+            with trazador.fase("ventana_principal"):
+                self.main_window = MainWindow()
 
             # Configurar información del usuario en la ventana principal
             self.setup_user_info()
@@ -92,6 +99,9 @@ class AuthenticatedApp:
             # Mostrar ventana principal (respeta configuración de showMaximized en MainWindow)
             self.main_window.show()
 
+            # Fin del arranque cuando el loop de eventos procese el primer pintado
+            QTimer.singleShot(0, trazador.finalizar)
+
         except Exception as e:
             QMessageBox.critical(None, "Error",
                                f"Error al abrir la aplicación principal:\n{str(e)}")
@@ -182,6 +192,8 @@ class AuthenticatedApp:
 
             # Solo cerrar la base de datos al final, desde la aplicación principal
             if self.main_window and hasattr(self.main_window, 'db'):
+                if hasattr(self.main_window, 'programador_rollups'):
+                    self.main_window.programador_rollups.detener()
                 self.main_window.db.disconnect()
                 print("Conexión a base de datos cerrada")
 
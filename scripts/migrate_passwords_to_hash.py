@@ -10,9 +10,13 @@ Solo ejecutar en entorno de desarrollo/staging
 ============================================================
 """
 
+import os
 import sys
+import time
 import bcrypt
 import mysql.connector
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from getpass import getpass
 
@@ -20,7 +24,10 @@ from getpass import getpass
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.config.settings import DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME
+from src.config.settings import BCRYPT_ROUNDS, DB_HOST, DB_PORT, DB_USER, DB_PASSWORD, DB_NAME
+
+# Usuarios leídos, hasheados y escritos por transacción
+LOTE_MIGRACION = 256
 
 
 def hash_password(password: str) -> bytes:
@@ -33,7 +40,110 @@ def hash_password(password: str) -> bytes:
     Returns:
         Hash bcrypt (60 bytes)
     """
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=12))
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+
+
+def _hash_usuario(fila: tuple, rounds: int) -> tuple:
+    """
+    Hashea la contraseña de un usuario (se ejecuta en un proceso del pool)
+
+    Args:
+        fila: (id, contraseña en texto plano)
+        rounds: Costo de bcrypt
+
+    Returns:
+        (id, hash bcrypt)
+    """
+    user_id, password = fila
+    return user_id, bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds))
+
+
+def _guardar_lote(cursor, resultados: list):
+    """
+    Escribe un lote de hashes con un único UPDATE ... CASE
+
+    Args:
+        cursor: Cursor de la conexión
+        resultados: Lista de (id, hash)
+    """
+    casos = " ".join(["WHEN %s THEN %s"] * len(resultados))
+    placeholders = ", ".join(["%s"] * len(resultados))
+    params = [valor for fila in resultados for valor in fila] + [user_id for user_id, _ in resultados]
+
+    cursor.execute(
+        f"UPDATE usuarios SET password_hash = CASE id {casos} END WHERE id IN ({placeholders})",
+        params,
+    )
+
+
+def migrar_en_paralelo(conn, solo_pendientes: bool = True, tamano_lote: int = LOTE_MIGRACION, workers: int = None) -> int:
+    """
+    Hashea las contraseñas en paralelo (un proceso por núcleo) y las guarda por lotes
+
+    bcrypt es CPU-bound y libera poco el GIL entre llamadas, por eso se usa un
+    pool de procesos y no de hilos. Cada lote se confirma en su propia
+    transacción: si el proceso se interrumpe, al volver a ejecutarlo con
+    solo_pendientes=True continúa desde los usuarios que aún no tienen hash.
+
+    Args:
+        conn: Conexión MySQL abierta
+        solo_pendientes: Si True, solo migra usuarios con password_hash NULL (reanudable)
+        tamano_lote: Usuarios por lote/transacción
+        workers: Procesos del pool (por defecto, todos los núcleos)
+
+    Returns:
+        Cantidad de usuarios migrados
+    """
+    cursor = conn.cursor(dictionary=True)
+    filtro = "contraseña IS NOT NULL" + (" AND password_hash IS NULL" if solo_pendientes else "")
+
+    cursor.execute(f"SELECT COUNT(*) AS total FROM usuarios WHERE {filtro}")
+    total = cursor.fetchone()['total']
+
+    if not total:
+        print("⚠️  No se encontraron usuarios pendientes de migrar")
+        cursor.close()
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    print(f"👥 Usuarios a migrar: {total}")
+    print(f"⚙️  Procesos: {workers} | Lote: {tamano_lote} | Costo bcrypt: {BCRYPT_ROUNDS}")
+    print()
+
+    migrados = 0
+    ultimo_id = 0
+    inicio = time.time()
+    hashear = partial(_hash_usuario, rounds=BCRYPT_ROUNDS)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            # Paginación por id: memoria acotada y orden estable para reanudar
+            cursor.execute(
+                f"SELECT id, contraseña FROM usuarios WHERE {filtro} AND id > %s ORDER BY id LIMIT %s",
+                (ultimo_id, tamano_lote),
+            )
+            lote = [(fila['id'], fila['contraseña']) for fila in cursor.fetchall()]
+            if not lote:
+                break
+
+            resultados = list(pool.map(hashear, lote, chunksize=max(1, len(lote) // (workers * 4))))
+
+            _guardar_lote(cursor, resultados)
+            conn.commit()
+
+            migrados += len(resultados)
+            ultimo_id = lote[-1][0]
+
+            transcurrido = time.time() - inicio
+            velocidad = migrados / transcurrido if transcurrido else 0
+            restante = (total - migrados) / velocidad if velocidad else 0
+            print(
+                f"   [{migrados}/{total}] {migrados * 100 // total}% "
+                f"- {velocidad:.1f} usuarios/s - restante ~{int(restante)}s"
+            )
+
+    cursor.close()
+    return migrados
 
 
 def migrate_passwords():
@@ -43,10 +153,10 @@ def migrate_passwords():
     PROCESO:
     1. Conectar a BD
     2. Agregar columna password_hash
-    3. Para cada usuario:
-       - Leer contraseña en texto plano
-       - Generar hash bcrypt
-       - Actualizar password_hash
+    3. Por cada lote de usuarios (ver migrar_en_paralelo):
+       - Leer contraseñas en texto plano
+       - Generar hashes bcrypt en un pool de procesos
+       - Actualizar password_hash con un UPDATE por lote
     4. Eliminar columna contraseña antigua
     """
     print("=" * 70)
@@ -84,13 +194,17 @@ def migrate_passwords():
         print()
 
         # Verificar si ya existe password_hash
+        solo_pendientes = True
         cursor.execute("SHOW COLUMNS FROM usuarios LIKE 'password_hash'")
         if cursor.fetchone():
             print("⚠️  La columna 'password_hash' ya existe")
-            sobrescribir = input("¿Desea sobrescribir? (SI/NO): ")
-            if sobrescribir.upper() != "SI":
+            print("   R = Reanudar (solo usuarios sin hash)")
+            print("   S = Sobrescribir todos los hashes")
+            modo = input("Opción (R/S, otra tecla cancela): ").upper()
+            if modo not in ("R", "S"):
                 print("❌ Migración cancelada")
                 return
+            solo_pendientes = modo == "R"
         else:
             # Agregar columna password_hash
             print("📝 Agregando columna 'password_hash'...")
@@ -102,38 +216,8 @@ def migrate_passwords():
             print("✅ Columna agregada")
             print()
 
-        # Obtener todos los usuarios
-        cursor.execute("SELECT id, usuario, contraseña FROM usuarios")
-        usuarios = cursor.fetchall()
-
-        if not usuarios:
-            print("⚠️  No se encontraron usuarios para migrar")
-            return
-
-        print(f"👥 Se encontraron {len(usuarios)} usuarios")
-        print()
-
-        # Migrar cada usuario
-        for i, usuario in enumerate(usuarios, 1):
-            user_id = usuario['id']
-            username = usuario['usuario']
-            plaintext_password = usuario['contraseña']
-
-            print(f"[{i}/{len(usuarios)}] Migrando usuario: {username}")
-
-            # Generar hash bcrypt
-            password_hash = hash_password(plaintext_password)
-
-            # Actualizar en BD
-            cursor.execute("""
-                UPDATE usuarios
-                SET password_hash = %s
-                WHERE id = %s
-            """, (password_hash, user_id))
-
-            print(f"   ✅ Hash generado y guardado")
-
-        conn.commit()
+        # Hash en paralelo + UPDATE por lotes (reanudable)
+        migrar_en_paralelo(conn, solo_pendientes=solo_pendientes)
         print()
         print("=" * 70)
         print("✅ MIGRACIÓN COMPLETADA EXITOSAMENTE")
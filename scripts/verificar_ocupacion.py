@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🅿️ VERIFICACIÓN DEL RESUMEN DE OCUPACIÓN
+============================================================
+Compara parqueaderos_ocupacion (mantenida por triggers) con los
+agregados calculados desde asignaciones activas.
+
+Uso:
+    python scripts/verificar_ocupacion.py                # solo verificar
+    python scripts/verificar_ocupacion.py --reconstruir  # recalcular y verificar
+
+Códigos de salida: 0 consistente, 1 si quedan diferencias, 2 si la
+verificación no se pudo ejecutar (sin conexión, sin la migración 002
+o error en la consulta).
+============================================================
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Agregar path del proyecto
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from mysql.connector import Error
+
+from src.database.manager import DatabaseManager
+from src.models.parqueadero import ParqueaderoModel
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Verifica el resumen de ocupación de parqueaderos")
+    parser.add_argument(
+        "--reconstruir",
+        action="store_true",
+        help="Recalcula parqueaderos_ocupacion completa antes de verificar",
+    )
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    if not db.ensure_connection():
+        print("❌ No se pudo conectar a la base de datos")
+        return 2
+    modelo = ParqueaderoModel(db)
+
+    if args.reconstruir:
+        exito, error = modelo.reconstruir_resumen_ocupacion()
+        if not exito:
+            print(f"❌ Error al reconstruir: {error}")
+            return 2
+        print("✅ Resumen de ocupación reconstruido")
+
+    try:
+        diferencias = modelo.verificar_resumen_ocupacion()
+    except Error as e:
+        print(f"❌ No se pudo verificar: {e.msg}")
+        return 2
+
+    if not diferencias:
+        print("✅ parqueaderos_ocupacion es consistente con las asignaciones activas")
+        return 0
+
+    print(f"⚠️ {len(diferencias)} diferencias encontradas:")
+    for d in diferencias:
+        print(f"   P-{d['numero_parqueadero']:03d} {d['columna']}: resumen={d['resumen']} real={d['real']}")
+    print("   Ejecute con --reconstruir para corregirlas")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,7 @@ from typing import Dict, Optional, Tuple
 
 import bcrypt
 
+from ..config.settings import BCRYPT_ROUNDS
 from ..database.manager import DatabaseManager
 from ..core.logger import logger
 
@@ -67,17 +68,22 @@ class AuthManager:
 
         return False, 0
 
-    def authenticate(self, usuario: str, contraseña: str) -> Tuple[bool, str]:
+    def authenticate(self, usuario: str, contraseña: str, db: DatabaseManager = None) -> Tuple[bool, str]:
         """
         Autentica un usuario con sus credenciales usando bcrypt
 
+        bcrypt es costoso a propósito: desde la interfaz debe llamarse en un
+        worker (ver AutenticacionWorker) pasando una conexión propia en db.
+
         Args:
             usuario: Nombre de usuario
             contraseña: Contraseña del usuario (texto plano)
+            db: Conexión a usar (por defecto la conexión compartida)
 
         Returns:
             Tuple[bool, str]: (éxito, mensaje)
         """
+        db = db or self.db
         try:
             # Verificar si está bloqueado
             is_locked, remaining = self.is_locked_out(usuario)
@@ -95,7 +101,7 @@ class AuthManager:
             WHERE username = %s AND activo = TRUE
             """
 
-            result = self.db.fetch_one(query, (usuario,))
+            result = db.fetch_one(query, (usuario,))
 
             if not result:
                 # Usuario no existe o está inactivo
@@ -121,7 +127,11 @@ class AuthManager:
                     self.failed_attempts[usuario].clear()
 
                 # Actualizar último acceso
-                self._update_last_access(self.current_user["id"])
+                self._update_last_access(self.current_user["id"], db)
+
+                # Re-hash transparente si cambió BCRYPT_ROUNDS
+                if self.needs_rehash(password_hash):
+                    self._rehash_password(self.current_user["id"], contraseña, db)
 
                 logger.info(f"LOGIN_SUCCESS | User: {usuario} | ID: {self.current_user['id']}")
                 return True, "Inicio de sesión exitoso"
@@ -145,21 +155,45 @@ class AuthManager:
         """
         self.failed_attempts[usuario].append(time.time())
 
-    def _update_last_access(self, user_id: int):
+    def _update_last_access(self, user_id: int, db: DatabaseManager = None):
         """
         Actualiza la fecha del último acceso del usuario
 
         Args:
             user_id: ID del usuario
+            db: Conexión a usar (por defecto la conexión compartida)
         """
         try:
             query = "UPDATE usuarios SET ultimo_acceso = %s WHERE id = %s"
-            success, error = self.db.execute_query(query, (datetime.now(), user_id))
+            success, error = (db or self.db).execute_query(query, (datetime.now(), user_id))
             if not success:
                 logger.error(f"Error actualizando último acceso: {error}")
         except Exception as e:
             logger.error(f"Error actualizando último acceso: {e}")
 
+    def _rehash_password(self, user_id: int, contraseña: str, db: DatabaseManager = None):
+        """
+        Reemplaza el hash almacenado por uno con el costo configurado
+
+        Solo se puede hacer tras un login exitoso, que es el único momento en
+        que se conoce la contraseña en texto plano.
+
+        Args:
+            user_id: ID del usuario
+            contraseña: Contraseña ya verificada (texto plano)
+            db: Conexión a usar (por defecto la conexión compartida)
+        """
+        try:
+            nuevo_hash = self.hash_password(contraseña).decode('utf-8')
+            query = "UPDATE usuarios SET password_hash = %s WHERE id = %s"
+            success, error = (db or self.db).execute_query(query, (nuevo_hash, user_id))
+            if success:
+                logger.info(f"PASSWORD_REHASH | User ID: {user_id} | Rounds: {BCRYPT_ROUNDS}")
+            else:
+                logger.error(f"Error actualizando hash de contraseña: {error}")
+        except Exception as e:
+            logger.error(f"Error actualizando hash de contraseña: {e}")
+
     def logout(self):
         """
         Cierra la sesión del usuario actual
@@ -201,7 +235,26 @@ class AuthManager:
             >>> password_hash = AuthManager.hash_password("mi_contraseña_segura")
             >>> # Guardar password_hash en la base de datos
         """
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
+
+    @staticmethod
+    def needs_rehash(password_hash, rounds: int = None) -> bool:
+        """
+        Indica si un hash bcrypt fue generado con un costo distinto al configurado
+
+        Args:
+            password_hash: Hash bcrypt almacenado ($2b$<rounds>$...)
+            rounds: Costo esperado (por defecto BCRYPT_ROUNDS)
+
+        Returns:
+            bool: True si debe regenerarse
+        """
+        if isinstance(password_hash, bytes):
+            password_hash = password_hash.decode('utf-8')
+        try:
+            return int(password_hash.split('$')[2]) != (rounds or BCRYPT_ROUNDS)
+        except (IndexError, ValueError):
+            return False
 
     @staticmethod
     def verify_password(password: str, password_hash: bytes) -> bool:
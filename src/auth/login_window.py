@@ -5,7 +5,7 @@ Ventana de login futurista para el sistema de gestión de parqueadero
 
 import sys
 
-from PyQt5.QtCore import QEasingCurve, QPropertyAnimation, Qt, QTimer, pyqtSignal
+from PyQt5.QtCore import QEasingCurve, QPropertyAnimation, Qt, QThread, QTimer, pyqtSignal
 from PyQt5.QtWidgets import (
     QApplication,
     QFrame,
@@ -19,9 +19,33 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
+from ..core.trazador_arranque import trazador
+from ..database.manager import ConexionIndependiente
 from .auth_manager import AuthManager
 
 
+class AutenticacionWorker(QThread):
+    """Worker thread para verificar credenciales (bcrypt) sin congelar la ventana de login"""
+
+    finished = pyqtSignal(bool, str)  # (exito, mensaje)
+
+    def __init__(self, auth_manager: AuthManager, usuario: str, contraseña: str):
+        super().__init__()
+        self.auth_manager = auth_manager
+        self.usuario = usuario
+        self.contraseña = contraseña
+
+    def run(self):
+        """Ejecuta la autenticación en background con conexión propia"""
+        try:
+            with trazador.fase("login.autenticacion"):
+                with ConexionIndependiente(self.auth_manager.db.config) as db:
+                    success, message = self.auth_manager.authenticate(self.usuario, self.contraseña, db)
+            self.finished.emit(success, message)
+        except Exception as e:
+            self.finished.emit(False, f"Error de conexión: {str(e)}")
+
+
 class FuturisticLoginWindow(QWidget):
     """
     Ventana de login con diseño futurista y profesional
@@ -33,6 +57,7 @@ class FuturisticLoginWindow(QWidget):
         super().__init__()
         self.auth_manager = AuthManager()
         self.password_visible = False
+        self.auth_worker = None
         self.setup_ui()
         self.setup_animations()
 
@@ -244,6 +269,10 @@ class FuturisticLoginWindow(QWidget):
 
     def attempt_login(self):
         """Intenta realizar el login"""
+        # Enter en los campos también llega aquí: una sola validación a la vez
+        if self.auth_worker is not None and self.auth_worker.isRunning():
+            return
+
         usuario = self.user_input.text().strip()
         contraseña = self.password_input.text()
 
@@ -251,19 +280,17 @@ class FuturisticLoginWindow(QWidget):
             self.show_error("Por favor complete todos los campos")
             return
 
-        # Deshabilitar botón durante la autenticación
-        self.login_btn.setEnabled(False)
-        self.login_btn.setText("VALIDANDO...")
+        # Deshabilitar botón y campos durante la autenticación
+        self._set_validando(True)
 
-        # Simular delay de autenticación para mejor UX
-        QTimer.singleShot(1000, lambda: self.process_login(usuario, contraseña))
+        # bcrypt corre en un worker: la ventana sigue respondiendo
+        self.auth_worker = AutenticacionWorker(self.auth_manager, usuario, contraseña)
+        self.auth_worker.finished.connect(self.process_login)
+        self.auth_worker.start()
 
-    def process_login(self, usuario, contraseña):
-        """Procesa el login con el manejador de autenticación"""
+    def process_login(self, success: bool, message: str):
+        """Procesa el resultado de la autenticación (en el hilo de la interfaz)"""
         try:
-            # El nuevo authenticate() retorna (bool, str)
-            success, message = self.auth_manager.authenticate(usuario, contraseña)
-
             if success:
                 self.show_success("¡Bienvenido al sistema!")
                 user_data = self.auth_manager.get_current_user()
@@ -279,9 +306,15 @@ class FuturisticLoginWindow(QWidget):
         except Exception as e:
             self.show_error(f"Error de conexión: {str(e)}")
         finally:
-            # Restaurar botón
-            self.login_btn.setEnabled(True)
-            self.login_btn.setText("INICIAR SESIÓN")
+            # Restaurar botón y campos
+            self._set_validando(False)
+
+    def _set_validando(self, validando: bool):
+        """Bloquea el botón y los campos mientras corre la autenticación"""
+        self.login_btn.setEnabled(not validando)
+        self.login_btn.setText("VALIDANDO..." if validando else "INICIAR SESIÓN")
+        self.user_input.setEnabled(not validando)
+        self.password_input.setEnabled(not validando)
 
     def show_error(self, message):
         """Muestra un mensaje de error"""
@@ -202,6 +202,38 @@ DB_PASSWORD = DB_CONFIG.password
 DB_NAME = DB_CONFIG.database
 DB_URL = DB_CONFIG.get_connection_url()
 
+# Instrumentación de consultas (histograma en memoria por huella de consulta)
+QUERY_STATS_ENABLED = _get_bool("QUERY_STATS_ENABLED", True)
+
+# Consultas más lentas que este umbral (ms) se escriben en logs/slow_queries.log
+SLOW_QUERY_MS = _get_int("SLOW_QUERY_MS", 200)
+
+# Ingesta de eventos de acceso (historial_accesos): capacidad de la cola en
+# memoria, filas por INSERT y espera máxima antes de escribir un lote parcial
+ACCESS_QUEUE_SIZE = _get_int("ACCESS_QUEUE_SIZE", 10000)
+ACCESS_BATCH_SIZE = _get_int("ACCESS_BATCH_SIZE", 500)
+ACCESS_FLUSH_MS = _get_int("ACCESS_FLUSH_MS", 500)
+
+# Rollups de accesos y ocupación: segundos entre pasadas del agregador,
+# filas máximas de historial procesadas por transacción y segundos que la
+# marca de agua espera detrás de un hueco de ids antes de darlo por definitivo
+ROLLUP_INTERVAL_S = _get_int("ROLLUP_INTERVAL_S", 60)
+ROLLUP_BATCH_SIZE = _get_int("ROLLUP_BATCH_SIZE", 50000)
+ROLLUP_GAP_WAIT_S = _get_int("ROLLUP_GAP_WAIT_S", 300)
+
+# Archivo del historial: antigüedad (días) a partir de la cual los eventos de
+# acceso y las asignaciones finalizadas salen de las tablas activas, filas por
+# lote y pausa entre lotes (ms) para no competir con la operación diaria
+ARCHIVE_ACCESS_DAYS = _get_int("ARCHIVE_ACCESS_DAYS", 180)
+ARCHIVE_ASSIGNMENT_DAYS = _get_int("ARCHIVE_ASSIGNMENT_DAYS", 365)
+ARCHIVE_BATCH_SIZE = _get_int("ARCHIVE_BATCH_SIZE", 1000)
+ARCHIVE_PAUSE_MS = _get_int("ARCHIVE_PAUSE_MS", 100)
+
+# Gráficas de tendencia del dashboard: días mostrados y puntos máximos por
+# serie (la base de datos agrupa las muestras horarias para no superarlos)
+DASHBOARD_TREND_DAYS = _get_int("DASHBOARD_TREND_DAYS", 7)
+DASHBOARD_TREND_POINTS = _get_int("DASHBOARD_TREND_POINTS", 168)
+
 
 # ============================================================================
 # SECCIÓN 3: CONFIGURACIÓN DE SEGURIDAD
@@ -220,6 +252,10 @@ SESSION_TIMEOUT = _get_int("SESSION_TIMEOUT", 480)  # 8 horas por defecto
 MAX_LOGIN_ATTEMPTS = _get_int("MAX_LOGIN_ATTEMPTS", 5)
 ACCOUNT_LOCKOUT_TIME = _get_int("ACCOUNT_LOCKOUT_TIME", 30)  # minutos
 
+# Costo de bcrypt (2^rounds iteraciones). Cada +1 duplica el tiempo de login.
+# Al cambiarlo, los hashes existentes se actualizan en el siguiente login exitoso.
+BCRYPT_ROUNDS = _get_int("BCRYPT_ROUNDS", 12)
+
 # Validar que SECRET_KEY no sea la default en producción
 if not DEBUG and "CAMBIAR-EN-PRODUCCION" in SECRET_KEY:
     print("  Generar nueva clave: python -c \"import secrets; print(secrets.token_hex(32))\"")
@@ -252,6 +288,12 @@ DEFAULT_EXPORT_FORMAT = _get_str("DEFAULT_EXPORT_FORMAT", "csv")  # csv | xlsx |
 # Retención de reportes (días)
 REPORTS_RETENTION_DAYS = _get_int("REPORTS_RETENTION_DAYS", 30)
 
+# Caché en memoria de resultados de reportes (entradas y presupuesto en MB)
+REPORT_CACHE_ENTRIES = _get_int("REPORT_CACHE_ENTRIES", 64)
+REPORT_CACHE_MB = _get_int("REPORT_CACHE_MB", 32)
+# Edad máxima de un resultado en caché: las escrituras de otros puestos no cambian la versión local
+REPORT_CACHE_TTL_S = _get_int("REPORT_CACHE_TTL_S", 120)
+
 
 # ============================================================================
 # SECCIÓN 6: ENUMERACIONES Y TIPOS
@@ -526,6 +568,14 @@ def validate_config() -> tuple[bool, list[str]]:
     if _ENV_PATH is None:
         warnings.append("Archivo .env no encontrado - usando valores por defecto")
 
+    # Validar costo de bcrypt (rango aceptado por la librería)
+    if not 4 <= BCRYPT_ROUNDS <= 31:
+        warnings.append(f"BCRYPT_ROUNDS fuera de rango (4-31): {BCRYPT_ROUNDS}")
+
+    # Validar umbral de consultas lentas
+    if SLOW_QUERY_MS < 0:
+        warnings.append(f"SLOW_QUERY_MS no puede ser negativo: {SLOW_QUERY_MS}")
+
     # Validar directorio de logs
     if LOG_DIR and not LOG_DIR.exists():
         warnings.append(f"Directorio de logs no existe: {LOG_DIR}")
@@ -617,12 +667,27 @@ __all__ = [
     'DB_PASSWORD',
     'DB_NAME',
     'DB_URL',
+    'QUERY_STATS_ENABLED',
+    'SLOW_QUERY_MS',
+    'ACCESS_QUEUE_SIZE',
+    'ACCESS_BATCH_SIZE',
+    'ACCESS_FLUSH_MS',
+    'ROLLUP_INTERVAL_S',
+    'ROLLUP_BATCH_SIZE',
+    'ROLLUP_GAP_WAIT_S',
+    'ARCHIVE_ACCESS_DAYS',
+    'ARCHIVE_ASSIGNMENT_DAYS',
+    'ARCHIVE_BATCH_SIZE',
+    'ARCHIVE_PAUSE_MS',
+    'DASHBOARD_TREND_DAYS',
+    'DASHBOARD_TREND_POINTS',
 
     # Configuración de seguridad
     'SECRET_KEY',
     'SESSION_TIMEOUT',
     'MAX_LOGIN_ATTEMPTS',
     'ACCOUNT_LOCKOUT_TIME',
+    'BCRYPT_ROUNDS',
 
     # Configuración de UI
     'UI_THEME',
@@ -633,6 +698,9 @@ __all__ = [
     'REPORTS_DIR',
     'DEFAULT_EXPORT_FORMAT',
     'REPORTS_RETENTION_DAYS',
+    'REPORT_CACHE_ENTRIES',
+    'REPORT_CACHE_MB',
+    'REPORT_CACHE_TTL_S',
 
     # Enumeraciones
     'TipoVehiculo',
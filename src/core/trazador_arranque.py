@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+Trazador de Arranque
+====================
+
+Registra el tiempo de pared y de CPU de cada fase del arranque (verificación
+de dependencias, imports, QApplication, login, construcción de la ventana y
+de cada pestaña, consultas a la base de datos) para detectar regresiones de
+arranque en los equipos de los puestos de control.
+
+Solo registra entre iniciar() (lo llama main.py) y finalizar(): los scripts,
+los hilos de fondo y las pruebas que importan el módulo no acumulan eventos.
+Además, se guardan como máximo MAX_EVENTOS. El volcado a disco solo ocurre
+si se configuró un destino:
+
+    PARKING_STARTUP_TRACE=arranque.json          # resumen JSON
+    PARKING_STARTUP_TRACE=arranque.trace.json \\
+    PARKING_STARTUP_TRACE_FORMAT=chrome          # chrome://tracing / Perfetto
+
+o con los flags de main.py: --trace-startup RUTA [--trace-format json|chrome]
+
+Uso:
+    from src.core.trazador_arranque import trazador
+
+    trazador.iniciar()
+    with trazador.fase("login.ventana"):
+        ventana = FuturisticLoginWindow()
+
+    trazador.finalizar()  # primera pantalla interactiva: vuelca y deja de registrar
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+ENV_RUTA = "PARKING_STARTUP_TRACE"
+ENV_FORMATO = "PARKING_STARTUP_TRACE_FORMAT"
+FORMATOS = ("json", "chrome")
+
+# Máximo de caracteres de SQL guardados por consulta
+LARGO_SQL = 120
+# Máximo de eventos en memoria; los siguientes solo se cuentan
+MAX_EVENTOS = 5000
+
+
+class TrazadorArranque:
+    """Registro en memoria de fases de arranque con tiempo de pared y de CPU"""
+
+    def __init__(self):
+        self._origen = time.perf_counter()
+        self._inicio = datetime.now()
+        self._eventos: List[Dict] = []
+        self.descartados = 0
+        self._pila = threading.local()
+        self._lock = threading.Lock()
+        self.ruta: Optional[Path] = None
+        self.formato = "json"
+        # Solo se registra entre iniciar() y finalizar()
+        self.activo = False
+        try:
+            self.configurar(os.environ.get(ENV_RUTA), os.environ.get(ENV_FORMATO))
+        except ValueError as e:
+            print(f"[WARNING] {e}")
+
+    def configurar(self, ruta: Optional[Union[str, Path]], formato: Optional[str] = None):
+        """
+        Define el destino del volcado
+
+        Args:
+            ruta: Archivo de salida (None para no volcar)
+            formato: "json" (resumen) o "chrome" (Trace Event Format)
+        """
+        self.ruta = Path(ruta) if ruta else None
+        if formato:
+            formato = formato.lower()
+            if formato not in FORMATOS:
+                raise ValueError(f"Formato de traza no soportado: '{formato}' (use {', '.join(FORMATOS)})")
+            self.formato = formato
+
+    def iniciar(self):
+        """Empieza a registrar fases y consultas (punto de entrada de la aplicación)"""
+        self.activo = True
+
+    def _nivel(self) -> int:
+        return getattr(self._pila, "nivel", 0)
+
+    @contextmanager
+    def fase(self, nombre: str, categoria: str = "fase", **datos):
+        """
+        Mide un bloque de código
+
+        Args:
+            nombre: Nombre de la fase (p. ej. "pestana.tab_reportes")
+            categoria: Agrupación (fase, pestana, consulta, ...)
+            **datos: Datos adicionales guardados con el evento
+        """
+        nivel = self._nivel()
+        self._pila.nivel = nivel + 1
+        pared = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self._pila.nivel = nivel
+            self._agregar(
+                nombre,
+                categoria,
+                inicio=pared - self._origen,
+                duracion=time.perf_counter() - pared,
+                cpu=time.thread_time() - cpu,
+                nivel=nivel,
+                datos=datos,
+            )
+
+    def marcar(self, nombre: str, categoria: str = "marca", **datos):
+        """Registra un instante (sin duración)"""
+        self._agregar(
+            nombre, categoria, inicio=time.perf_counter() - self._origen,
+            duracion=0.0, cpu=0.0, nivel=self._nivel(), datos=datos,
+        )
+
+    def consulta(self, sql: str, inicio: float, duracion: float, filas: Optional[int] = None):
+        """
+        Registra una consulta SQL ejecutada durante el arranque
+
+        Args:
+            sql: Texto de la consulta
+            inicio: time.perf_counter() al iniciar la consulta
+            duracion: Segundos de pared
+            filas: Filas devueltas o afectadas
+        """
+        if not self.activo:
+            return
+        self._agregar(
+            " ".join(sql.split())[:LARGO_SQL], "consulta", inicio=inicio - self._origen,
+            duracion=duracion, cpu=0.0, nivel=self._nivel(), datos={"filas": filas},
+        )
+
+    def _agregar(self, nombre, categoria, inicio, duracion, cpu, nivel, datos):
+        if not self.activo:
+            return
+        evento = {
+            "nombre": nombre,
+            "categoria": categoria,
+            "inicio_ms": round(inicio * 1000, 3),
+            "duracion_ms": round(duracion * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+            "nivel": nivel,
+            "hilo": threading.current_thread().name,
+        }
+        if datos:
+            evento["datos"] = datos
+        with self._lock:
+            if len(self._eventos) < MAX_EVENTOS:
+                self._eventos.append(evento)
+            else:
+                self.descartados += 1
+
+    @property
+    def eventos(self) -> List[Dict]:
+        with self._lock:
+            return list(self._eventos)
+
+    def resumen(self) -> Dict:
+        """Resumen JSON: fases en orden de inicio y totales por categoría"""
+        eventos = sorted(self.eventos, key=lambda e: e["inicio_ms"])
+        por_categoria: Dict[str, Dict] = {}
+        for evento in eventos:
+            if evento["nivel"] > 0 and evento["categoria"] != "consulta":
+                continue  # Las fases anidadas ya están incluidas en su fase padre
+            total = por_categoria.setdefault(evento["categoria"], {"cantidad": 0, "duracion_ms": 0.0})
+            total["cantidad"] += 1
+            total["duracion_ms"] = round(total["duracion_ms"] + evento["duracion_ms"], 3)
+
+        fin = max((e["inicio_ms"] + e["duracion_ms"] for e in eventos), default=0.0)
+        return {
+            "inicio": self._inicio.isoformat(timespec="seconds"),
+            "total_ms": round(fin, 3),
+            "descartados": self.descartados,
+            "por_categoria": por_categoria,
+            "eventos": eventos,
+        }
+
+    def traza_chrome(self) -> Dict:
+        """Eventos en Trace Event Format (chrome://tracing, Perfetto)"""
+        pid = os.getpid()
+        hilos: Dict[str, int] = {}
+        eventos = []
+        for evento in self.eventos:
+            tid = hilos.setdefault(evento["hilo"], len(hilos) + 1)
+            args = {"cpu_ms": evento["cpu_ms"], **evento.get("datos", {})}
+            eventos.append({
+                "name": evento["nombre"],
+                "cat": evento["categoria"],
+                "ph": "X" if evento["duracion_ms"] else "i",
+                "ts": round(evento["inicio_ms"] * 1000),
+                "dur": round(evento["duracion_ms"] * 1000),
+                "pid": pid,
+                "tid": tid,
+                "args": args,
+            })
+        for nombre, tid in hilos.items():
+            eventos.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": nombre}})
+        return {"traceEvents": eventos, "displayTimeUnit": "ms"}
+
+    def volcar(self, ruta: Optional[str] = None, formato: Optional[str] = None) -> Optional[Path]:
+        """
+        Escribe la traza en disco
+
+        Args:
+            ruta: Archivo de salida (por defecto el configurado)
+            formato: "json" o "chrome" (por defecto el configurado)
+
+        Returns:
+            Path: Ruta escrita, o None si no hay destino configurado
+        """
+        destino = Path(ruta) if ruta else self.ruta
+        if destino is None:
+            return None
+
+        contenido = self.traza_chrome() if (formato or self.formato) == "chrome" else self.resumen()
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_text(json.dumps(contenido, ensure_ascii=False, indent=2), encoding="utf-8")
+        return destino
+
+    def finalizar(self) -> Optional[Path]:
+        """
+        Marca el fin del arranque (primera pantalla interactiva)
+
+        Deja de registrar y vuelca la traza si hay destino configurado.
+        Solo tiene efecto la primera vez después de iniciar().
+        """
+        if not self.activo:
+            return None
+        self.marcar("arranque.interactivo")
+        self.activo = False
+        try:
+            return self.volcar()
+        except OSError as e:
+            # Un error al escribir la traza nunca debe impedir el arranque
+            print(f"[WARNING] No se pudo guardar la traza de arranque: {e}")
+            return None
+
+
+# Instancia global: el origen de tiempo es el primer import del módulo
+trazador = TrazadorArranque()
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+Archivo del historial de accesos y de asignaciones finalizadas
+
+historial_accesos y asignaciones solo crecen. ArchivadorHistorial mueve las
+filas antiguas a historial_accesos_archivo y asignaciones_archivo
+(migración 006) en lotes pequeños: cada lote copia y borra en la misma
+transacción y entre lotes se hace una pausa, para no retener bloqueos ni
+competir con la operación diaria. Además mantiene las particiones mensuales
+de historial_accesos: crea las de los meses siguientes y elimina las
+antiguas que quedaron vacías (DROP PARTITION no recorre filas).
+
+Las filas que los rollups (migración 005) aún no agregaron no se archivan.
+
+HistorialUnificado consulta las tablas activas y las de archivo como una
+sola fuente.
+
+Uso:
+    archivador = ArchivadorHistorial(db)
+    archivador.archivar_accesos()
+    archivador.archivar_asignaciones()
+    archivador.eliminar_particiones_vacias()
+    archivador.mantener_particiones()
+"""
+
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from mysql.connector import Error
+
+from ..config.settings import (
+    ARCHIVE_ACCESS_DAYS,
+    ARCHIVE_ASSIGNMENT_DAYS,
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_PAUSE_MS,
+)
+from ..core.logger import logger
+from .version_datos import version_archivo
+
+TABLA_PARTICIONADA = "historial_accesos"
+
+# Fuente -> (tabla activa, tabla de archivo, condición de antigüedad con un parámetro de fecha)
+FUENTES_ARCHIVO = {
+    "accesos": ("historial_accesos", "historial_accesos_archivo", "fecha_hora < %s"),
+    "asignaciones": (
+        "asignaciones",
+        "asignaciones_archivo",
+        "activo = FALSE AND fecha_fin_asignacion < %s",
+    ),
+}
+
+
+def tabla_existe(db, tabla: str) -> bool:
+    """Indica si existe una tabla (migraciones opcionales)"""
+    try:
+        return db.fetch_one(f"SHOW TABLES LIKE '{tabla}'") is not None
+    except Exception as e:
+        print(f"Advertencia al verificar tabla '{tabla}': {e}")
+        return False
+
+
+def _primer_dia_mes(fecha: date, meses: int = 0) -> date:
+    indice = fecha.year * 12 + fecha.month - 1 + meses
+    return date(indice // 12, indice % 12 + 1, 1)
+
+
+class ArchivadorHistorial:
+    """Mueve historial antiguo a las tablas de archivo y mantiene las particiones"""
+
+    def __init__(
+        self,
+        db,
+        tamano_lote: int = ARCHIVE_BATCH_SIZE,
+        pausa_ms: int = ARCHIVE_PAUSE_MS,
+        dormir: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Args:
+            db: DatabaseManager o ConexionIndependiente
+            tamano_lote: Filas movidas por transacción
+            pausa_ms: Pausa entre lotes
+            dormir: Función de espera (reemplazable en pruebas)
+        """
+        self.db = db
+        self.tamano_lote = tamano_lote
+        self.pausa_s = pausa_ms / 1000
+        self.dormir = dormir
+        self._columnas = {}
+
+    # ------------------------------------------------------------------
+    # Archivo por lotes
+    # ------------------------------------------------------------------
+
+    def archivar_accesos(self, dias: int = ARCHIVE_ACCESS_DAYS, max_lotes: int = None) -> int:
+        """Archiva los eventos de acceso con más de `dias` de antigüedad"""
+        return self.archivar("accesos", datetime.now() - timedelta(days=dias), max_lotes)
+
+    def archivar_asignaciones(self, dias: int = ARCHIVE_ASSIGNMENT_DAYS, max_lotes: int = None) -> int:
+        """Archiva las asignaciones finalizadas hace más de `dias`"""
+        return self.archivar("asignaciones", datetime.now() - timedelta(days=dias), max_lotes)
+
+    def archivar(self, nombre: str, antes_de: datetime, max_lotes: int = None) -> int:
+        """
+        Mueve a la tabla de archivo las filas de una fuente anteriores a una fecha
+
+        Args:
+            nombre: "accesos" o "asignaciones"
+            antes_de: Fecha de corte
+            max_lotes: Límite de lotes de esta ejecución (None: hasta terminar)
+
+        Returns:
+            int: Filas archivadas
+        """
+        origen, destino, _ = FUENTES_ARCHIVO[nombre]
+        if not tabla_existe(self.db, destino):
+            logger.warning(f"No existe {destino}: aplique db/migrations/006_archivo_historial.sql")
+            return 0
+
+        tope_id = self._marca_rollup(nombre)
+        total = lotes = 0
+        while max_lotes is None or lotes < max_lotes:
+            movidas = self._mover_lote(nombre, antes_de, tope_id)
+            if movidas <= 0:
+                break
+            total += movidas
+            lotes += 1
+            if movidas < self.tamano_lote:
+                break
+            self.dormir(self.pausa_s)
+
+        if total:
+            logger.info(f"{total} filas de {origen} archivadas en {destino}")
+        return total
+
+    def _marca_rollup(self, nombre: str) -> Optional[int]:
+        """Último id agregado por los rollups (None si los rollups no están instalados)"""
+        if not tabla_existe(self.db, "rollup_marcas"):
+            return None
+        fila = self.db.fetch_one("SELECT ultimo_id FROM rollup_marcas WHERE nombre = %s", (nombre,))
+        return fila["ultimo_id"] if fila else 0
+
+    def _columnas_archivo(self, destino: str) -> str:
+        """Columnas copiadas a la tabla de archivo (sin columnas generadas, p. ej. vehiculo_activo)"""
+        if destino not in self._columnas:
+            columnas = self.db.fetch_all(f"SHOW COLUMNS FROM {destino}") or []
+            self._columnas[destino] = ", ".join(
+                c["Field"] for c in columnas if "GENERATED" not in (c.get("Extra") or "").upper()
+            )
+        return self._columnas[destino]
+
+    def _mover_lote(self, nombre: str, antes_de: datetime, tope_id: Optional[int]) -> int:
+        """Copia y borra un lote en una transacción; retorna las filas movidas (-1 si hubo error)"""
+        origen, destino, condicion = FUENTES_ARCHIVO[nombre]
+        if not self.db.ensure_connection():
+            return -1
+
+        params = [antes_de]
+        if tope_id is not None:
+            condicion += " AND id <= %s"
+            params.append(tope_id)
+
+        columnas = self._columnas_archivo(destino)
+        cursor = self.db.cursor
+        try:
+            cursor.execute(
+                f"SELECT id FROM {origen} WHERE {condicion} ORDER BY id LIMIT %s FOR UPDATE",
+                tuple(params) + (self.tamano_lote,),
+            )
+            ids = [fila["id"] for fila in cursor.fetchall()]
+            if not ids:
+                self.db.connection.rollback()
+                return 0
+
+            marcadores = ", ".join(["%s"] * len(ids))
+            cursor.execute(
+                f"INSERT INTO {destino} ({columnas}) SELECT {columnas} FROM {origen} WHERE id IN ({marcadores})",
+                tuple(ids),
+            )
+            # La condición de fecha permite podar particiones en historial_accesos
+            cursor.execute(
+                f"DELETE FROM {origen} WHERE id IN ({marcadores}) AND {condicion}", tuple(ids) + tuple(params)
+            )
+            self.db.connection.commit()
+            version_archivo.incrementar()
+            return len(ids)
+        except Error as e:
+            self.db.connection.rollback()
+            logger.error(f"Error archivando {origen}: {e}")
+            return -1
+
+    # ------------------------------------------------------------------
+    # Particiones de historial_accesos
+    # ------------------------------------------------------------------
+
+    def particiones(self) -> List[Dict]:
+        """
+        Particiones de historial_accesos en orden
+
+        Returns:
+            Lista de {nombre, limite (datetime o None para MAXVALUE), filas (estimadas)}
+        """
+        query = """
+            SELECT PARTITION_NAME AS nombre,
+                   IF(PARTITION_DESCRIPTION = 'MAXVALUE', NULL, FROM_UNIXTIME(PARTITION_DESCRIPTION)) AS limite,
+                   TABLE_ROWS AS filas
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+        """
+        return self.db.fetch_all(query, (TABLA_PARTICIONADA,)) or []
+
+    def mantener_particiones(self, meses_adelante: int = 3, hoy: date = None) -> List[str]:
+        """
+        Crea las particiones mensuales que falten hasta `meses_adelante` meses en el futuro
+
+        Se dividen desde pmax, que normalmente está vacía, así que no se mueven filas.
+
+        Returns:
+            Nombres de las particiones creadas
+        """
+        particiones = self.particiones()
+        limites = [p["limite"] for p in particiones if p["limite"] is not None]
+        if not particiones or particiones[-1]["limite"] is not None or not limites:
+            # Tabla sin particionar (migración 006 no aplicada) o sin partición MAXVALUE
+            return []
+
+        ultimo_max = particiones[-1]["nombre"]
+        inicio = max(limites).date()
+        objetivo = _primer_dia_mes(hoy or date.today(), meses_adelante + 1)
+        creadas = []
+        while inicio < objetivo:
+            fin = _primer_dia_mes(inicio, 1)
+            nombre = f"p{inicio:%Y%m}"
+            exito, error = self.db.execute_query(
+                f"""
+                ALTER TABLE {TABLA_PARTICIONADA} REORGANIZE PARTITION {ultimo_max} INTO (
+                    PARTITION {nombre} VALUES LESS THAN (UNIX_TIMESTAMP('{fin:%Y-%m-%d} 00:00:00')),
+                    PARTITION {ultimo_max} VALUES LESS THAN MAXVALUE
+                )
+                """
+            )
+            if not exito:
+                logger.error(f"No se pudo crear la partición {nombre}: {error}")
+                break
+            creadas.append(nombre)
+            inicio = fin
+        return creadas
+
+    def eliminar_particiones_vacias(self, antes_de: datetime = None) -> List[str]:
+        """
+        Elimina las particiones que terminan antes de la fecha de corte y ya no tienen filas
+
+        Returns:
+            Nombres de las particiones eliminadas
+        """
+        corte = antes_de or datetime.now() - timedelta(days=ARCHIVE_ACCESS_DAYS)
+        particiones = self.particiones()
+        eliminadas = []
+        # Se conserva al menos una partición con límite además de MAXVALUE
+        candidatas = [p for p in particiones[:-2] if p["limite"] is not None and p["limite"] <= corte]
+        for particion in candidatas:
+            nombre = particion["nombre"]
+            # TABLE_ROWS es una estimación: se verifica leyendo la partición
+            if self.db.fetch_one(f"SELECT 1 AS hay FROM {TABLA_PARTICIONADA} PARTITION ({nombre}) LIMIT 1"):
+                continue
+            exito, error = self.db.execute_query(f"ALTER TABLE {TABLA_PARTICIONADA} DROP PARTITION {nombre}")
+            if not exito:
+                logger.error(f"No se pudo eliminar la partición {nombre}: {error}")
+                break
+            eliminadas.append(nombre)
+        return eliminadas
+
+    def estado(self) -> Dict[str, int]:
+        """Filas estimadas de las tablas activas y de archivo"""
+        tablas = [t for origen, destino, _ in FUENTES_ARCHIVO.values() for t in (origen, destino)]
+        marcadores = ", ".join(["%s"] * len(tablas))
+        filas = self.db.fetch_all(
+            f"""
+            SELECT TABLE_NAME AS tabla, TABLE_ROWS AS filas
+            FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME IN ({marcadores})
+            """,
+            tuple(tablas),
+        ) or []
+        return {f["tabla"]: f["filas"] or 0 for f in filas}
+
+
+class HistorialUnificado:
+    """Consultas de historial sobre tablas activas y de archivo a la vez"""
+
+    def __init__(self, db):
+        self.db = db
+        self._archivo_accesos = None
+
+    def _usa_archivo(self) -> bool:
+        if self._archivo_accesos is None:
+            self._archivo_accesos = tabla_existe(self.db, "historial_accesos_archivo")
+        return self._archivo_accesos
+
+    def accesos(
+        self,
+        vehiculo_id: int = None,
+        parqueadero_id: int = None,
+        desde: datetime = None,
+        hasta: datetime = None,
+        limite: int = 500,
+    ) -> List[Dict]:
+        """
+        Eventos de acceso (activos y archivados), más recientes primero
+
+        Args:
+            vehiculo_id: Filtrar por vehículo
+            parqueadero_id: Filtrar por parqueadero
+            desde, hasta: Rango de fecha_hora (inclusive)
+            limite: Filas máximas
+
+        Returns:
+            Lista de {id, vehiculo_id, placa, parqueadero_id, numero_parqueadero, tipo_evento,
+            fecha_hora, observaciones, archivado}
+        """
+        condiciones, params = [], []
+        for columna, operador, valor in (
+            ("vehiculo_id", "=", vehiculo_id),
+            ("parqueadero_id", "=", parqueadero_id),
+            ("fecha_hora", ">=", desde),
+            ("fecha_hora", "<=", hasta),
+        ):
+            if valor is not None:
+                condiciones.append(f"h.{columna} {operador} %s")
+                params.append(valor)
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+
+        # Cada rama se ordena y limita por separado para usar sus índices
+        rama = """
+            (SELECT h.id, h.vehiculo_id, h.parqueadero_id, h.tipo_evento, h.fecha_hora, h.observaciones,
+                    {archivado} AS archivado
+             FROM {tabla} h
+             {where}
+             ORDER BY h.fecha_hora DESC, h.id DESC
+             LIMIT %s)
+        """
+        ramas = [rama.format(tabla="historial_accesos", archivado="FALSE", where=where)]
+        params_ramas = params + [limite]
+        if self._usa_archivo():
+            ramas.append(rama.format(tabla="historial_accesos_archivo", archivado="TRUE", where=where))
+            params_ramas += params + [limite]
+
+        query = f"""
+            SELECT h.*, v.placa, p.numero_parqueadero
+            FROM ({" UNION ALL ".join(ramas)}) h
+            LEFT JOIN vehiculos v ON v.id = h.vehiculo_id
+            LEFT JOIN parqueaderos p ON p.id = h.parqueadero_id
+            ORDER BY h.fecha_hora DESC, h.id DESC
+            LIMIT %s
+        """
+        return self.db.fetch_all(query, tuple(params_ramas) + (limite,)) or []
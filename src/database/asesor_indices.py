@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Asesor de índices basado en EXPLAIN
+
+Captura las consultas SELECT que ejecuta la aplicación (con sus parámetros
+reales), ejecuta EXPLAIN FORMAT=JSON sobre cada una y señala los planes con
+lectura completa de tabla (access_type = ALL) u ordenamiento en memoria
+(using_filesort). Pensado para correr contra una base local con datos de
+prueba y usarse como verificación de regresiones: los hallazgos aceptados se
+guardan en una línea base y solo los nuevos hacen fallar la verificación.
+
+Uso:
+    with CapturaConsultas(db) as captura:
+        FuncionarioModel(db).obtener_todos()
+
+    hallazgos, errores = analizar(db, captura.consultas())
+    nuevos = [h for h in hallazgos if h.clave not in cargar_linea_base(ruta)]
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..core.logger import logger
+from .estadisticas_consultas import huella_consulta, ubicacion_llamador
+
+# Filas estimadas por debajo de las cuales un escaneo completo no se reporta
+# (catálogos pequeños donde el índice no aporta)
+FILAS_MINIMAS_ESCANEO = 100
+
+ESCANEO_COMPLETO = "escaneo_completo"
+FILESORT = "filesort"
+
+
+@dataclass
+class ConsultaCapturada:
+    """Primera ejecución observada de una consulta (por huella)"""
+
+    sql: str
+    params: Optional[tuple]
+    origen: str
+
+    @property
+    def huella(self) -> str:
+        return huella_consulta(self.sql)
+
+
+@dataclass
+class Hallazgo:
+    """Operación costosa detectada en el plan de una consulta"""
+
+    tipo: str
+    tabla: str
+    filas: int
+    huella: str
+    origen: str
+
+    @property
+    def clave(self) -> Tuple[str, str, str]:
+        """Identidad estable del hallazgo (no depende del volumen de datos)"""
+        return (self.huella, self.tipo, self.tabla)
+
+    def a_dict(self) -> Dict:
+        return {
+            "tipo": self.tipo,
+            "tabla": self.tabla,
+            "filas": self.filas,
+            "huella": self.huella,
+            "origen": self.origen,
+        }
+
+
+class CapturaConsultas:
+    """
+    Registra las consultas SELECT ejecutadas por fetch_all/fetch_one de un manejador
+
+    Las consultas se siguen ejecutando normalmente; al salir del bloque se
+    restauran los métodos originales.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._consultas: Dict[str, ConsultaCapturada] = {}
+        self._originales = {}
+
+    def __enter__(self):
+        for nombre in ("fetch_all", "fetch_one"):
+            original = getattr(self.db, nombre)
+            self._originales[nombre] = original
+            setattr(self.db, nombre, self._envolver(original))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for nombre, original in self._originales.items():
+            setattr(self.db, nombre, original)
+        self._originales.clear()
+        return False
+
+    def consultas(self) -> List[ConsultaCapturada]:
+        """Consultas capturadas, una por huella, en orden de primera ejecución"""
+        return list(self._consultas.values())
+
+    def _envolver(self, original):
+        def envoltura(query, params=None, *args, **kwargs):
+            self.registrar(query, params)
+            return original(query, params, *args, **kwargs)
+
+        return envoltura
+
+    def registrar(self, query: str, params: Optional[tuple] = None):
+        """Agrega una consulta al catálogo si es un SELECT no visto"""
+        if not query.lstrip().upper().startswith(("SELECT", "WITH")):
+            return
+        huella = huella_consulta(query)
+        if huella not in self._consultas:
+            self._consultas[huella] = ConsultaCapturada(query, tuple(params) if params else None, ubicacion_llamador())
+
+
+def hallazgos_plan(plan: Dict, min_filas: int = FILAS_MINIMAS_ESCANEO) -> List[Tuple[str, str, int]]:
+    """
+    Recorre un plan de EXPLAIN FORMAT=JSON buscando escaneos completos y filesorts
+
+    Args:
+        plan: Plan decodificado (con clave "query_block")
+        min_filas: Filas estimadas mínimas para reportar un escaneo completo
+
+    Returns:
+        Lista de (tipo, tabla, filas estimadas)
+    """
+    hallazgos = []
+
+    def visitar(nodo):
+        if isinstance(nodo, list):
+            for elemento in nodo:
+                visitar(elemento)
+            return
+        if not isinstance(nodo, dict):
+            return
+
+        if nodo.get("using_filesort"):
+            tabla = _primera_tabla(nodo)
+            hallazgos.append((FILESORT, tabla["table_name"] if tabla else "", _filas(tabla) if tabla else 0))
+
+        tabla = nodo.get("table")
+        if isinstance(tabla, dict) and tabla.get("access_type") == "ALL":
+            filas = _filas(tabla)
+            # Tablas derivadas/materializadas (<derived2>) no tienen índices que agregar
+            if filas >= min_filas and not tabla.get("table_name", "").startswith("<"):
+                hallazgos.append((ESCANEO_COMPLETO, tabla.get("table_name", ""), filas))
+
+        for valor in nodo.values():
+            visitar(valor)
+
+    visitar(plan)
+    return hallazgos
+
+
+def _primera_tabla(nodo) -> Optional[Dict]:
+    """Primera tabla (en orden de ejecución) bajo un nodo del plan"""
+    if isinstance(nodo, list):
+        for elemento in nodo:
+            tabla = _primera_tabla(elemento)
+            if tabla:
+                return tabla
+    elif isinstance(nodo, dict):
+        if isinstance(nodo.get("table"), dict):
+            return nodo["table"]
+        for valor in nodo.values():
+            tabla = _primera_tabla(valor)
+            if tabla:
+                return tabla
+    return None
+
+
+def _filas(tabla: Dict) -> int:
+    # MySQL 5.7+/8.0 usa rows_examined_per_scan; MariaDB usa rows
+    return int(tabla.get("rows_examined_per_scan", tabla.get("rows", 0)) or 0)
+
+
+def explicar(db, query: str, params: Optional[tuple] = None) -> Optional[Dict]:
+    """
+    Ejecuta EXPLAIN FORMAT=JSON sobre una consulta
+
+    Returns:
+        Plan decodificado o None si el servidor no pudo explicarla
+    """
+    fila = db.fetch_one(f"EXPLAIN FORMAT=JSON {query}", params)
+    if not fila:
+        return None
+    try:
+        return json.loads(next(iter(fila.values())))
+    except (StopIteration, TypeError, ValueError) as e:
+        logger.error(f"Plan EXPLAIN no válido: {e}")
+        return None
+
+
+def analizar(
+    db, consultas: Iterable[ConsultaCapturada], min_filas: int = FILAS_MINIMAS_ESCANEO
+) -> Tuple[List[Hallazgo], List[ConsultaCapturada]]:
+    """
+    Explica cada consulta del catálogo y reúne los hallazgos
+
+    Args:
+        db: Manejador de base de datos (conectado a la base con datos de prueba)
+        consultas: Catálogo de consultas capturadas
+        min_filas: Filas estimadas mínimas para reportar un escaneo completo
+
+    Returns:
+        (hallazgos, consultas que no se pudieron explicar)
+    """
+    hallazgos, errores = [], []
+    for consulta in consultas:
+        plan = explicar(db, consulta.sql, consulta.params)
+        if plan is None:
+            errores.append(consulta)
+            continue
+        vistos = set()
+        for tipo, tabla, filas in hallazgos_plan(plan, min_filas):
+            if (tipo, tabla) in vistos:
+                continue
+            vistos.add((tipo, tabla))
+            hallazgos.append(Hallazgo(tipo, tabla, filas, consulta.huella, consulta.origen))
+    return hallazgos, errores
+
+
+def cargar_linea_base(ruta: str) -> Set[Tuple[str, str, str]]:
+    """Claves de los hallazgos aceptados (vacío si el archivo no existe)"""
+    if not os.path.exists(ruta):
+        return set()
+    with open(ruta, encoding="utf-8") as archivo:
+        return {(h["huella"], h["tipo"], h["tabla"]) for h in json.load(archivo)}
+
+
+def guardar_linea_base(ruta: str, hallazgos: Iterable[Hallazgo]):
+    """Guarda los hallazgos actuales como aceptados"""
+    directorio = os.path.dirname(ruta)
+    if directorio:
+        os.makedirs(directorio, exist_ok=True)
+    registros = sorted((h.a_dict() for h in hallazgos), key=lambda h: (h["huella"], h["tipo"], h["tabla"]))
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(registros, archivo, ensure_ascii=False, indent=2)
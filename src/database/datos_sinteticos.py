@@ -0,0 +1,581 @@
+# -*- coding: utf-8 -*-
+"""
+Datos sintéticos a escala real para pruebas de rendimiento
+
+GeneradorDatos produce, a partir de una semilla, las filas de funcionarios,
+vehículos, parqueaderos, asignaciones (con su historial de intervalos) e
+historial de accesos con distribuciones realistas:
+
+- Placas de carro ABC123 (PAR/IMPAR por el último dígito), de moto ABC12D,
+  bicicletas sin placa; combinaciones de vehículos según las reglas de
+  ValidadorVehiculos (regulares hasta 2 carros, exclusivos hasta 4)
+- Excepciones (pico y placa solidario, discapacidad, exclusivo, híbrido)
+  con frecuencias bajas
+- Espacios repartidos por sótanos; carros con dos cupos (PAR e IMPAR)
+- Asignaciones activas ubicadas por PlanificadorAsignacion (mismas reglas
+  que la asignación automática) e historial de asignaciones consecutivas por
+  cupo antes de ellas; un vehículo nunca tiene dos intervalos superpuestos
+- Entradas y salidas en días hábiles respetando pico y placa
+
+La misma semilla y la misma fecha de corte producen exactamente las mismas
+filas. Cada tabla usa su propio generador aleatorio, así que cambiar la
+escala de una no altera las demás más allá de las referencias.
+
+CargadorDatos inserta las filas en lotes multi-fila (execute_many) sobre una
+base de pruebas con el esquema y las migraciones aplicados.
+
+Uso:
+    generador = GeneradorDatos(ESCALAS["media"], semilla=42)
+    cargador = CargadorDatos(db)
+    exito, mensaje = cargador.preparar(generador, vaciar=True)
+    resumen = cargador.cargar(generador)
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..core.logger import logger
+from ..utils.asignacion_automatica import PlanificadorAsignacion
+from ..utils.motor_elegibilidad import InstantaneaOcupacion, PerfilVehiculo
+
+# Columnas insertadas por tabla (mismo orden que las tuplas del generador)
+COLUMNAS = {
+    "funcionarios": (
+        "id", "cedula", "nombre", "apellidos", "direccion_grupo", "cargo", "celular",
+        "no_tarjeta_proximidad", "permite_compartir", "pico_placa_solidario", "discapacidad",
+        "tiene_parqueadero_exclusivo", "tiene_carro_hibrido", "fecha_registro",
+    ),
+    "vehiculos": ("id", "funcionario_id", "tipo_vehiculo", "placa", "ultimo_digito", "tipo_circulacion"),
+    "parqueaderos": ("id", "numero_parqueadero", "tipo_espacio", "sotano"),
+    "asignaciones": ("id", "parqueadero_id", "vehiculo_id", "fecha_asignacion", "fecha_fin_asignacion", "activo"),
+    "historial_accesos": ("vehiculo_id", "parqueadero_id", "tipo_evento", "fecha_hora"),
+}
+
+# Tablas que se vacían antes de cargar (hijas primero)
+TABLAS_CARGA = ("funcionarios", "vehiculos", "parqueaderos", "asignaciones", "historial_accesos")
+TABLAS_DERIVADAS = (
+    "historial_accesos_archivo",
+    "asignaciones_archivo",
+    "rollup_accesos_hora",
+    "rollup_accesos_dia",
+    "rollup_asignaciones_dia",
+    "rollup_ocupacion_hora",
+    "rollup_ocupacion_dia",
+    "parqueaderos_ocupacion",
+)
+
+NOMBRES = (
+    "Ana", "Andrés", "Camila", "Carlos", "Carolina", "Daniel", "Diana", "Felipe", "Gloria", "Jorge",
+    "José", "Juan", "Julián", "Laura", "Luis", "María", "Marta", "Natalia", "Nicolás", "Paola",
+    "Pedro", "Sandra", "Santiago", "Sebastián", "Sofía", "Valentina", "Vanessa", "William",
+)
+APELLIDOS = (
+    "Álvarez", "Castro", "Díaz", "Fernández", "García", "Gómez", "González", "Gutiérrez", "Hernández",
+    "Herrera", "Jiménez", "López", "Martínez", "Moreno", "Muñoz", "Ortiz", "Pérez", "Ramírez", "Restrepo",
+    "Rodríguez", "Rojas", "Romero", "Sánchez", "Suárez", "Torres", "Vargas",
+)
+DIRECCIONES = (
+    "Dirección Administrativa", "Dirección Financiera", "Dirección Jurídica", "Dirección de Talento Humano",
+    "Dirección de Tecnología", "Dirección de Planeación", "Oficina de Control Interno", "Secretaría General",
+)
+CARGOS = (("Profesional", 40), ("Técnico", 25), ("Asesor", 15), ("Auxiliar", 12), ("Coordinador", 6), ("Director", 2))
+
+# Probabilidad de cada bandera de excepción
+PROB_COMPARTIR = 0.7
+PROB_SOLIDARIO = 0.05
+PROB_DISCAPACIDAD = 0.02
+PROB_EXCLUSIVO = 0.01
+PROB_HIBRIDO = 0.03
+
+# Vehículos por funcionario regular (0 a 3) y tipo de cada uno
+VEHICULOS_POR_FUNCIONARIO = (0.12, 0.6, 0.22, 0.06)
+TIPOS_VEHICULO = (("Carro", 70), ("Moto", 22), ("Bicicleta", 8))
+TIPOS_ESPACIO = (("Carro", 75), ("Moto", 18), ("Bicicleta", 7))
+
+# Duración de cada asignación histórica (días) y pausa entre asignaciones del mismo cupo
+DURACION_ASIGNACION = (30, 240)
+PAUSA_ENTRE_ASIGNACIONES = (0, 5)
+# Vehículos sorteados por intervalo histórico antes de dejar el cupo vacío
+INTENTOS_VEHICULO_LIBRE = 5
+PROB_ASISTENCIA_SABADO = 0.08
+
+
+@dataclass(frozen=True)
+class EscalaDatos:
+    """Tamaño y comportamiento del conjunto generado"""
+
+    funcionarios: int
+    espacios: int
+    sotanos: int = 3
+    dias_historial: int = 365
+    ocupacion: float = 0.85  # Fracción de cupos con asignación activa
+    asistencia: float = 0.8  # Probabilidad de que un vehículo asignado ingrese un día hábil
+
+
+ESCALAS = {
+    "pequena": EscalaDatos(funcionarios=1_000, espacios=200, sotanos=3, dias_historial=30),
+    "media": EscalaDatos(funcionarios=10_000, espacios=1_000, sotanos=4, dias_historial=180),
+    "grande": EscalaDatos(funcionarios=100_000, espacios=5_000, sotanos=6, dias_historial=365),
+}
+
+
+def circulacion_de_placa(tipo_vehiculo: str, placa: Optional[str]) -> Tuple[str, str]:
+    """(ultimo_digito, tipo_circulacion) con la misma regla que el trigger before_insert_vehiculo"""
+    ultimo = placa[-1] if placa else ""
+    if tipo_vehiculo != "Carro" or not ultimo.isdigit():
+        return ultimo, "N/A"
+    return ultimo, "IMPAR" if ultimo in "12345" else "PAR"
+
+
+def _al_segundo(momento: datetime) -> datetime:
+    return momento.replace(microsecond=0)
+
+
+def restringido_por_pico_placa(tipo_circulacion: str, dia: date) -> bool:
+    """Los carros IMPAR no circulan los días impares y los PAR los días pares"""
+    if tipo_circulacion == "IMPAR":
+        return dia.day % 2 == 1
+    if tipo_circulacion == "PAR":
+        return dia.day % 2 == 0
+    return False
+
+
+class GeneradorDatos:
+    """Genera filas deterministas para cada tabla"""
+
+    def __init__(
+        self,
+        escala: EscalaDatos,
+        semilla: int = 42,
+        hasta: datetime = None,
+        historico_por_vehiculo: Optional[int] = None,
+    ):
+        """
+        Args:
+            escala: Tamaño del conjunto
+            semilla: Semilla de los generadores aleatorios
+            hasta: Fecha de corte del historial (por defecto, hoy a medianoche)
+            historico_por_vehiculo: Asignaciones finalizadas máximas por vehículo
+                (None: sin límite; 1 en bases sin la migración 007)
+        """
+        self.escala = escala
+        self.semilla = semilla
+        self.hasta = hasta or datetime.combine(date.today(), datetime.min.time())
+        self.desde = self.hasta - timedelta(days=escala.dias_historial)
+        self.historico_por_vehiculo = historico_por_vehiculo
+        self._funcionarios = None
+        self._vehiculos = None
+        self._parqueaderos = None
+        self._asignaciones = None
+
+    def _aleatorio(self, tabla: str) -> random.Random:
+        return random.Random(f"{self.semilla}:{tabla}")
+
+    # ------------------------------------------------------------------
+    # Tablas
+    # ------------------------------------------------------------------
+
+    def funcionarios(self) -> List[Tuple]:
+        """Filas de funcionarios (ver COLUMNAS["funcionarios"])"""
+        if self._funcionarios is None:
+            rng = self._aleatorio("funcionarios")
+            cargos, pesos = zip(*CARGOS)
+            filas = []
+            for i in range(1, self.escala.funcionarios + 1):
+                cargo = rng.choices(cargos, pesos)[0]
+                exclusivo = cargo == "Director" or rng.random() < PROB_EXCLUSIVO
+                filas.append((
+                    i,
+                    str(10_000_000 + i * 7919 % 90_000_000),
+                    rng.choice(NOMBRES),
+                    f"{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}",
+                    rng.choice(DIRECCIONES),
+                    cargo,
+                    f"3{rng.randrange(10**9):09d}",
+                    f"T{i:07d}",
+                    rng.random() < PROB_COMPARTIR,
+                    rng.random() < PROB_SOLIDARIO,
+                    rng.random() < PROB_DISCAPACIDAD,
+                    exclusivo,
+                    rng.random() < PROB_HIBRIDO,
+                    self.hasta - timedelta(days=rng.randrange(5 * 365), minutes=rng.randrange(1440)),
+                ))
+            self._funcionarios = filas
+        return self._funcionarios
+
+    def vehiculos(self) -> List[Tuple]:
+        """Filas de vehículos con placas únicas (ver COLUMNAS["vehiculos"])"""
+        if self._vehiculos is None:
+            rng = self._aleatorio("vehiculos")
+            tipos, pesos = zip(*TIPOS_VEHICULO)
+            placas = set()
+            filas = []
+            for funcionario in self.funcionarios():
+                funcionario_id, exclusivo = funcionario[0], funcionario[11]
+                if exclusivo:
+                    combinacion = ["Carro"] * rng.randint(1, 4) + (["Moto"] if rng.random() < 0.3 else [])
+                else:
+                    cantidad = rng.choices(range(len(VEHICULOS_POR_FUNCIONARIO)), VEHICULOS_POR_FUNCIONARIO)[0]
+                    combinacion = []
+                    for _ in range(cantidad):
+                        tipo = rng.choices(tipos, pesos)[0]
+                        limite = 2 if tipo == "Carro" else 1
+                        if combinacion.count(tipo) < limite:
+                            combinacion.append(tipo)
+
+                for tipo in combinacion:
+                    placa = self._placa(rng, tipo, placas)
+                    ultimo, circulacion = circulacion_de_placa(tipo, placa)
+                    filas.append((len(filas) + 1, funcionario_id, tipo, placa, ultimo or None, circulacion))
+            self._vehiculos = filas
+        return self._vehiculos
+
+    @staticmethod
+    def _placa(rng: random.Random, tipo: str, usadas: set) -> Optional[str]:
+        if tipo == "Bicicleta":
+            return None
+        letras = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+        while True:
+            prefijo = "".join(rng.choice(letras) for _ in range(3))
+            if tipo == "Carro":
+                placa = f"{prefijo}{rng.randrange(1000):03d}"
+            else:
+                placa = f"{prefijo}{rng.randrange(100):02d}{rng.choice(letras)}"
+            if placa not in usadas:
+                usadas.add(placa)
+                return placa
+
+    def parqueaderos(self) -> List[Tuple]:
+        """Espacios repartidos en bloques por sótano (ver COLUMNAS["parqueaderos"])"""
+        if self._parqueaderos is None:
+            rng = self._aleatorio("parqueaderos")
+            tipos, pesos = zip(*TIPOS_ESPACIO)
+            por_sotano = -(-self.escala.espacios // self.escala.sotanos)
+            self._parqueaderos = [
+                (numero, numero, rng.choices(tipos, pesos)[0], f"Sótano-{(numero - 1) // por_sotano + 1}")
+                for numero in range(1, self.escala.espacios + 1)
+            ]
+        return self._parqueaderos
+
+    def asignaciones(self) -> List[Tuple]:
+        """
+        Intervalos de asignación, ordenados por fecha (ver COLUMNAS["asignaciones"])
+
+        Las asignaciones activas salen de _asignaciones_activas. Antes de ellas,
+        cada cupo (dos por espacio de carro: PAR e IMPAR; uno por espacio de moto
+        o bicicleta) tiene asignaciones consecutivas desde el inicio de la ventana.
+        Un vehículo tiene a lo sumo una asignación activa y nunca dos intervalos
+        superpuestos.
+        """
+        if self._asignaciones is None:
+            rng = self._aleatorio("asignaciones")
+            intervalos = []
+            # vehiculo_id -> intervalos [inicio, fin) ya asignados
+            ocupado: Dict[int, List[Tuple[datetime, datetime]]] = {}
+            primera_activa: Dict[int, datetime] = {}
+            for parqueadero_id, vehiculo_id in self._asignaciones_activas(rng):
+                inicio = self.hasta - timedelta(days=rng.uniform(0, DURACION_ASIGNACION[1]))
+                inicio = _al_segundo(max(inicio, self.desde))
+                intervalos.append((parqueadero_id, vehiculo_id, inicio, None))
+                ocupado[vehiculo_id] = [(inicio, datetime.max)]
+                primera_activa[parqueadero_id] = min(inicio, primera_activa.get(parqueadero_id, inicio))
+
+            pools: Dict[Tuple[str, str], List[int]] = {}
+            for vehiculo_id, _, tipo, _, _, circulacion in self.vehiculos():
+                pools.setdefault((tipo, circulacion), []).append(vehiculo_id)
+            historicas: Dict[int, int] = {}
+
+            for parqueadero_id, _, tipo_espacio, _ in self.parqueaderos():
+                cupos = [("Carro", "PAR"), ("Carro", "IMPAR")] if tipo_espacio == "Carro" else [(tipo_espacio, "N/A")]
+                for cupo in cupos:
+                    # El historial del espacio termina antes de su primera asignación activa
+                    if parqueadero_id in primera_activa:
+                        fin = primera_activa[parqueadero_id] - timedelta(days=rng.uniform(*PAUSA_ENTRE_ASIGNACIONES))
+                    else:
+                        fin = self.hasta - timedelta(days=rng.uniform(0, DURACION_ASIGNACION[0]))
+                    intervalos.extend(
+                        self._intervalos_cupo(rng, parqueadero_id, pools.get(cupo, []), fin, ocupado, historicas)
+                    )
+
+            intervalos.sort(key=lambda a: (a[2], a[0], a[1]))
+            self._asignaciones = [
+                (i, parqueadero_id, vehiculo_id, inicio, fin, fin is None)
+                for i, (parqueadero_id, vehiculo_id, inicio, fin) in enumerate(intervalos, start=1)
+            ]
+        return self._asignaciones
+
+    def _asignaciones_activas(self, rng) -> List[Tuple[int, int]]:
+        """
+        Pares (parqueadero_id, vehiculo_id) activos, ubicados con PlanificadorAsignacion
+
+        Se planifica una muestra de vehículos del tamaño de la ocupación de la
+        escala, así las asignaciones activas cumplen las reglas del motor de
+        elegibilidad (parejas PAR/IMPAR, excepciones solas, directivos en sus
+        propios espacios). Los carros regulares de funcionarios que no permiten
+        compartir van al final, cada uno en un espacio libre.
+        """
+        funcionarios = {f[0]: f for f in self.funcionarios()}
+        ocupacion = InstantaneaOcupacion.desde_filas(
+            {"id": p[0], "numero_parqueadero": p[1], "tipo_espacio": p[2], "sotano": p[3]}
+            for p in self.parqueaderos()
+        )
+        cupos = sum(2 if p[2] == "Carro" else 1 for p in self.parqueaderos())
+        vehiculos = self.vehiculos()
+        muestra = rng.sample(vehiculos, min(round(cupos * self.escala.ocupacion), len(vehiculos)))
+
+        compartidos, solos = [], []
+        for vehiculo_id, funcionario_id, tipo, _, _, circulacion in muestra:
+            funcionario = funcionarios[funcionario_id]
+            fila = {
+                "id": vehiculo_id,
+                "funcionario_id": funcionario_id,
+                "tipo_vehiculo": tipo,
+                "tipo_circulacion": circulacion,
+                "pico_placa_solidario": funcionario[9],
+                "discapacidad": funcionario[10],
+                "tiene_parqueadero_exclusivo": funcionario[11],
+                "tiene_carro_hibrido": funcionario[12],
+            }
+            if funcionario[8] or not PerfilVehiculo.desde_fila(fila).comparte:
+                compartidos.append(fila)
+            else:
+                solos.append(fila)
+
+        pares = PlanificadorAsignacion(ocupacion).planificar(compartidos).pares()
+        for fila in solos:
+            espacio = next(
+                (e for e in (ocupacion.primero(("libre", "Carro", s)) for s in ocupacion.sotanos) if e is not None),
+                None,
+            )
+            if espacio is None:
+                break
+            ocupacion.registrar_asignacion(PerfilVehiculo.desde_fila(fila), espacio.id)
+            pares.append((espacio.id, fila["id"]))
+        return pares
+
+    def _intervalos_cupo(self, rng, parqueadero_id, candidatos, fin, ocupado, historicas) -> List[Tuple]:
+        """Intervalos finalizados (parqueadero_id, vehiculo_id, inicio, fin) de un cupo, hacia atrás desde `fin`"""
+        intervalos = []
+        while fin > self.desde and candidatos:
+            inicio = fin - timedelta(days=rng.uniform(*DURACION_ASIGNACION))
+            intervalo = (_al_segundo(max(inicio, self.desde)), _al_segundo(fin))
+            vehiculo_id = self._vehiculo_libre(rng, candidatos, intervalo, ocupado, historicas)
+            if vehiculo_id is not None:
+                historicas[vehiculo_id] = historicas.get(vehiculo_id, 0) + 1
+                ocupado.setdefault(vehiculo_id, []).append(intervalo)
+                intervalos.append((parqueadero_id, vehiculo_id) + intervalo)
+            fin = inicio - timedelta(days=rng.uniform(*PAUSA_ENTRE_ASIGNACIONES))
+        return intervalos
+
+    def _vehiculo_libre(self, rng, candidatos, intervalo, ocupado, historicas) -> Optional[int]:
+        """Vehículo sorteado sin otro intervalo superpuesto, o None (el cupo queda vacío en ese intervalo)"""
+        inicio, fin = intervalo
+        for _ in range(INTENTOS_VEHICULO_LIBRE):
+            vehiculo_id = rng.choice(candidatos)
+            if self.historico_por_vehiculo is not None and historicas.get(vehiculo_id, 0) >= self.historico_por_vehiculo:
+                continue
+            if all(fin <= i or f <= inicio for i, f in ocupado.get(vehiculo_id, ())):
+                return vehiculo_id
+        return None
+
+    def historial_accesos(self) -> Iterator[Tuple]:
+        """
+        Entradas y salidas día por día, en orden cronológico (ver COLUMNAS["historial_accesos"])
+
+        Se generan al vuelo: en la escala grande son millones de filas.
+        """
+        rng = self._aleatorio("historial_accesos")
+        vehiculos = {v[0]: v for v in self.vehiculos()}
+        exentos = {f[0] for f in self.funcionarios() if f[10] or f[11] or f[12]}
+        pendientes = iter(self.asignaciones())
+        siguiente = next(pendientes, None)
+        vigentes = []
+
+        dia = self.desde.date()
+        while dia < self.hasta.date():
+            apertura = datetime.combine(dia, datetime.min.time()) + timedelta(hours=6)
+            cierre = apertura + timedelta(hours=14)
+            while siguiente is not None and siguiente[3] <= apertura:
+                vigentes.append(siguiente)
+                siguiente = next(pendientes, None)
+            vigentes = [a for a in vigentes if a[4] is None or a[4] > apertura]
+
+            habil = dia.weekday() < 5 or (dia.weekday() == 5 and rng.random() < PROB_ASISTENCIA_SABADO)
+            eventos = []
+            for _, parqueadero_id, vehiculo_id, _, fin, _ in vigentes if habil else ():
+                if fin is not None and fin < cierre:
+                    continue
+                _, funcionario_id, _, _, _, circulacion = vehiculos[vehiculo_id]
+                if funcionario_id not in exentos and restringido_por_pico_placa(circulacion, dia):
+                    continue
+                if rng.random() >= self.escala.asistencia:
+                    continue
+                entrada = apertura + timedelta(minutes=min(max(rng.gauss(90, 40), 0), 210))
+                salida = apertura + timedelta(minutes=min(max(rng.gauss(690, 60), 570), 840))
+                eventos.append((vehiculo_id, parqueadero_id, "Entrada", _al_segundo(entrada)))
+                eventos.append((vehiculo_id, parqueadero_id, "Salida", _al_segundo(salida)))
+
+            eventos.sort(key=lambda e: e[3])
+            yield from eventos
+            dia += timedelta(days=1)
+
+    def filas(self, tabla: str) -> Iterable[Tuple]:
+        """Filas de una tabla por nombre"""
+        return getattr(self, tabla)()
+
+
+class CargadorDatos:
+    """Carga un GeneradorDatos en una base de pruebas con INSERT multi-fila"""
+
+    def __init__(self, db, tamano_lote: int = 5000):
+        """
+        Args:
+            db: DatabaseManager o ConexionIndependiente de la base de pruebas
+            tamano_lote: Filas por INSERT
+        """
+        self.db = db
+        self.tamano_lote = tamano_lote
+
+    def _tabla_existe(self, tabla: str) -> bool:
+        return self.db.fetch_one(f"SHOW TABLES LIKE '{tabla}'") is not None
+
+    def preparar(self, generador: GeneradorDatos, vaciar: bool = False) -> Tuple[bool, str]:
+        """
+        Deja la base lista para la carga
+
+        - Sin `vaciar`, se niega a cargar sobre una base con funcionarios
+        - Con `vaciar`, trunca las tablas cargadas y las derivadas (resumen, rollups, archivo)
+        - Agrega la columna sotano si falta y quita el CHECK de 1..200 espacios si hacen falta más
+        - Sin la migración 007 limita a una asignación finalizada por vehículo
+
+        Returns:
+            Tupla (éxito, mensaje)
+        """
+        fila = self.db.fetch_one("SELECT COUNT(*) AS total FROM funcionarios")
+        if fila is None:
+            return False, "No se pudo consultar la base de datos (¿esquema aplicado?)"
+        if fila["total"] and not vaciar:
+            return False, f"La base ya tiene {fila['total']} funcionarios; use vaciar=True en una base de pruebas"
+
+        if vaciar:
+            tablas = [t for t in TABLAS_DERIVADAS + tuple(reversed(TABLAS_CARGA)) if self._tabla_existe(t)]
+            self.db.execute_query("SET FOREIGN_KEY_CHECKS = 0")
+            for tabla in tablas:
+                exito, error = self.db.execute_query(f"TRUNCATE TABLE {tabla}")
+                if not exito:
+                    self.db.execute_query("SET FOREIGN_KEY_CHECKS = 1")
+                    return False, f"Error vaciando {tabla}: {error}"
+            self.db.execute_query("SET FOREIGN_KEY_CHECKS = 1")
+            if self._tabla_existe("rollup_marcas"):
+                self.db.execute_query("UPDATE rollup_marcas SET ultimo_id = 0")
+
+        if self.db.fetch_one("SHOW COLUMNS FROM parqueaderos LIKE 'sotano'") is None:
+            exito, error = self.db.execute_query(
+                "ALTER TABLE parqueaderos ADD COLUMN sotano VARCHAR(20) DEFAULT 'Sótano-1'"
+            )
+            if not exito:
+                return False, f"Error agregando la columna sotano: {error}"
+
+        if generador.escala.espacios > 200:
+            restricciones = self.db.fetch_all(
+                """
+                SELECT CONSTRAINT_NAME AS nombre
+                FROM information_schema.TABLE_CONSTRAINTS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'parqueaderos' AND CONSTRAINT_TYPE = 'CHECK'
+                """
+            ) or []
+            for restriccion in restricciones:
+                self.db.execute_query(f"ALTER TABLE parqueaderos DROP CONSTRAINT `{restriccion['nombre']}`")
+
+        if self.db.fetch_one("SHOW COLUMNS FROM asignaciones LIKE 'vehiculo_activo'") is None:
+            # unique_vehiculo_activo (vehiculo_id, activo) admite una sola asignación finalizada
+            generador.historico_por_vehiculo = 1
+        return True, "Base preparada"
+
+    def cargar(
+        self, generador: GeneradorDatos, progreso: Callable[[str, int], None] = None
+    ) -> Dict[str, Dict]:
+        """
+        Inserta todas las tablas en lotes
+
+        Args:
+            generador: Origen de las filas
+            progreso: Llamada opcional (tabla, filas cargadas) tras cada lote
+
+        Returns:
+            {tabla: {"filas": int, "segundos": float}} (se detiene en la primera tabla con error,
+            que incluye además "error")
+        """
+        resumen = {}
+        # Las referencias vienen del propio generador: se omiten las verificaciones por fila
+        self.db.execute_query("SET unique_checks = 0, foreign_key_checks = 0")
+        try:
+            for tabla in TABLAS_CARGA:
+                resumen[tabla] = self._cargar_tabla(tabla, generador.filas(tabla), progreso)
+                if "error" in resumen[tabla]:
+                    break
+        finally:
+            self.db.execute_query("SET unique_checks = 1, foreign_key_checks = 1")
+
+        # after_insert_asignacion solo cuenta carros; la app marca motos y bicicletas con estado_manual
+        self.db.execute_query(
+            """
+            UPDATE parqueaderos p
+            SET estado = 'Completo'
+            WHERE p.tipo_espacio IN ('Moto', 'Bicicleta')
+              AND EXISTS (SELECT 1 FROM asignaciones a WHERE a.parqueadero_id = p.id AND a.activo = TRUE)
+            """
+        )
+        if self._tabla_existe("parqueaderos_ocupacion"):
+            self.db.execute_query("CALL sp_reconstruir_ocupacion()")
+        self._analizar()
+        return resumen
+
+    def _analizar(self) -> bool:
+        """
+        Actualiza las estadísticas del optimizador de las tablas cargadas
+
+        ANALYZE TABLE devuelve una fila por tabla: se lee con fetch_all (execute_query
+        no consume el resultado y el commit fallaría con "Unread result found").
+
+        Returns:
+            bool: True si todas las tablas quedaron analizadas
+        """
+        filas = self.db.fetch_all(f"ANALYZE TABLE {', '.join(TABLAS_CARGA)}")
+        if not filas:
+            logger.error("No se pudieron actualizar las estadísticas de las tablas cargadas")
+            return False
+        errores = [f"{f['Table']}: {f['Msg_text']}" for f in filas if f.get("Msg_type") == "error"]
+        if errores:
+            logger.error(f"ANALYZE TABLE con errores: {'; '.join(errores)}")
+            return False
+        return True
+
+    def _cargar_tabla(self, tabla: str, filas: Iterable[Tuple], progreso) -> Dict:
+        columnas = COLUMNAS[tabla]
+        query = f"""
+            INSERT INTO {tabla} ({", ".join(columnas)})
+            VALUES ({", ".join(["%s"] * len(columnas))})
+        """
+        inicio = time.perf_counter()
+        total = 0
+        iterador = iter(filas)
+        while True:
+            lote = list(islice(iterador, self.tamano_lote))
+            if not lote:
+                break
+            exito, error = self.db.execute_many(query, lote)
+            if not exito:
+                logger.error(f"Error cargando {tabla} (después de {total} filas): {error}")
+                return {"filas": total, "segundos": time.perf_counter() - inicio, "error": error}
+            total += len(lote)
+            if progreso:
+                progreso(tabla, total)
+
+        segundos = time.perf_counter() - inicio
+        logger.info(f"{tabla}: {total} filas en {segundos:.1f}s")
+        return {"filas": total, "segundos": segundos}
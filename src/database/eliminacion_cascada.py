@@ -6,7 +6,9 @@ Garantiza que al eliminar un funcionario se borren TODOS sus datos asociados
 
 from typing import Dict, List, Tuple
 
+from .archivo_historial import tabla_existe
 from .manager import DatabaseManager
+from .version_datos import version_datos
 
 
 class GestorEliminacionCascada:
@@ -170,6 +172,20 @@ class GestorEliminacionCascada:
                 self.db.connection.rollback()
                 return False, f"Error eliminando asignaciones: {error}", detalles_eliminacion
 
+            # PASO 2b: Eliminar historial archivado (migración 006, sin claves foráneas)
+            for tabla_archivo in ("historial_accesos_archivo", "asignaciones_archivo"):
+                if not tabla_existe(self.db, tabla_archivo):
+                    continue
+                query_archivo = f"""
+                    DELETE x FROM {tabla_archivo} x
+                    JOIN vehiculos v ON x.vehiculo_id = v.id
+                    WHERE v.funcionario_id = %s
+                """
+                exito, error = self.db.execute_query(query_archivo, (funcionario_id,))
+                if not exito:
+                    self.db.connection.rollback()
+                    return False, f"Error eliminando historial archivado: {error}", detalles_eliminacion
+
             # PASO 3: Eliminar TODOS los vehículos (activos e inactivos)
             query_vehiculos = """
                 DELETE FROM vehiculos
@@ -204,6 +220,7 @@ class GestorEliminacionCascada:
 
             # Confirmar transacción
             self.db.connection.commit()
+            version_datos.incrementar()
 
             # Verificar eliminación
             verificacion = self.verificar_eliminacion_completa(funcionario_id)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentación de consultas SQL
+
+DatabaseManager registra aquí cada consulta ejecutada: duración, filas,
+ubicación del llamador y una huella normalizada (literales y parámetros
+reemplazados por '?') que agrupa las consultas equivalentes. Las consultas
+que superan SLOW_QUERY_MS se escriben además en logs/slow_queries.log.
+
+Uso:
+    from src.database.estadisticas_consultas import estadisticas
+
+    for fila in estadisticas.resumen(orden="total_ms", limite=20):
+        print(fila["huella"], fila["llamadas"], fila["total_ms"])
+    estadisticas.exportar_csv("consultas.csv")
+"""
+
+import csv
+import json
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from ..config.settings import QUERY_STATS_ENABLED, SLOW_QUERY_MS
+
+# Límites superiores (ms) de los buckets del histograma; el último es abierto
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, float("inf"))
+
+# Largo máximo de la huella guardada
+LARGO_HUELLA = 300
+
+# Archivos que no cuentan como "llamador" (la propia capa de base de datos)
+_ARCHIVOS_INTERNOS = (
+    os.path.join("database", "manager.py"),
+    os.path.join("database", "estadisticas_consultas.py"),
+    os.path.join("database", "asesor_indices.py"),
+)
+
+_RE_CADENA = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_RE_NUMERO = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_RE_PARAMETRO = re.compile(r"%s|%\(\w+\)s")
+_RE_LISTA_IN = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_RE_ESPACIOS = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def huella_consulta(sql: str) -> str:
+    """
+    Normaliza una consulta para agrupar las equivalentes
+
+    Reemplaza literales y parámetros por '?', colapsa listas IN (?, ?, ...)
+    a IN (?+) y normaliza espacios.
+
+    Args:
+        sql: Texto de la consulta
+
+    Returns:
+        str: Huella de la consulta
+    """
+    huella = _RE_CADENA.sub("?", sql)
+    huella = _RE_PARAMETRO.sub("?", huella)
+    huella = _RE_NUMERO.sub("?", huella)
+    huella = _RE_ESPACIOS.sub(" ", huella).strip()
+    huella = _RE_LISTA_IN.sub("IN (?+)", huella)
+    return huella[:LARGO_HUELLA]
+
+
+def ubicacion_llamador() -> str:
+    """Primer frame fuera de la capa de base de datos, como 'ruta.py:linea funcion'"""
+    frame = sys._getframe(1)
+    while frame is not None:
+        archivo = frame.f_code.co_filename
+        if not archivo.endswith(_ARCHIVOS_INTERNOS) and "contextlib" not in archivo:
+            partes = archivo.replace("\\", "/").split("/")
+            # Ruta relativa al proyecto (desde src/ o scripts/) si es posible
+            for raiz in ("src", "scripts", "tests"):
+                if raiz in partes:
+                    partes = partes[partes.index(raiz):]
+                    break
+            else:
+                partes = partes[-1:]
+            return f"{'/'.join(partes)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "desconocido"
+
+
+@dataclass
+class EstadisticaConsulta:
+    """Acumulado de una huella de consulta"""
+
+    huella: str
+    llamadas: int = 0
+    total_ms: float = 0.0
+    min_ms: float = float("inf")
+    max_ms: float = 0.0
+    filas: int = 0
+    lentas: int = 0
+    histograma: List[int] = field(default_factory=lambda: [0] * len(BUCKETS_MS))
+    origenes: Counter = field(default_factory=Counter)
+
+    @property
+    def promedio_ms(self) -> float:
+        return self.total_ms / self.llamadas if self.llamadas else 0.0
+
+    def percentil(self, p: float) -> float:
+        """Percentil aproximado: límite superior del bucket que lo contiene"""
+        objetivo = self.llamadas * p
+        acumulado = 0
+        for limite, cantidad in zip(BUCKETS_MS, self.histograma):
+            acumulado += cantidad
+            if acumulado >= objetivo and cantidad:
+                return min(limite, self.max_ms)
+        return self.max_ms
+
+    def a_dict(self) -> Dict:
+        origen, _ = self.origenes.most_common(1)[0] if self.origenes else ("", 0)
+        return {
+            "huella": self.huella,
+            "llamadas": self.llamadas,
+            "total_ms": round(self.total_ms, 3),
+            "promedio_ms": round(self.promedio_ms, 3),
+            "p95_ms": round(self.percentil(0.95), 3),
+            "min_ms": round(self.min_ms, 3) if self.llamadas else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "filas": self.filas,
+            "lentas": self.lentas,
+            "origen_principal": origen,
+            "origenes": len(self.origenes),
+            "histograma": dict(zip([str(b) for b in BUCKETS_MS], self.histograma)),
+        }
+
+
+class EstadisticasConsultas:
+    """Histograma en memoria de consultas agrupadas por huella (seguro entre hilos)"""
+
+    def __init__(self, umbral_lento_ms: int = SLOW_QUERY_MS, habilitado: bool = QUERY_STATS_ENABLED):
+        """
+        Args:
+            umbral_lento_ms: Consultas más lentas van al log de consultas lentas
+            habilitado: Si False, registrar() no hace nada
+        """
+        self.umbral_lento_ms = umbral_lento_ms
+        self.habilitado = habilitado
+        self._datos: Dict[str, EstadisticaConsulta] = {}
+        self._lock = threading.Lock()
+        self._log_lentas = None
+
+    def registrar(self, sql: str, duracion: float, filas: Optional[int] = None, origen: Optional[str] = None):
+        """
+        Registra una ejecución
+
+        Args:
+            sql: Texto de la consulta
+            duracion: Segundos de pared
+            filas: Filas devueltas o afectadas
+            origen: Ubicación del llamador (se calcula si no se indica)
+        """
+        if not self.habilitado:
+            return
+
+        ms = duracion * 1000
+        huella = huella_consulta(sql)
+        origen = origen or ubicacion_llamador()
+        bucket = next(i for i, limite in enumerate(BUCKETS_MS) if ms <= limite)
+        lenta = ms >= self.umbral_lento_ms
+
+        with self._lock:
+            dato = self._datos.get(huella)
+            if dato is None:
+                dato = self._datos[huella] = EstadisticaConsulta(huella)
+            dato.llamadas += 1
+            dato.total_ms += ms
+            dato.min_ms = min(dato.min_ms, ms)
+            dato.max_ms = max(dato.max_ms, ms)
+            dato.filas += max(filas or 0, 0)  # rowcount puede ser -1
+            dato.histograma[bucket] += 1
+            dato.origenes[origen] += 1
+            if lenta:
+                dato.lentas += 1
+
+        if lenta:
+            self._registrar_lenta(huella, ms, filas, origen)
+
+    def _registrar_lenta(self, huella: str, ms: float, filas: Optional[int], origen: str):
+        if self._log_lentas is None:
+            # El archivo solo se crea cuando aparece la primera consulta lenta
+            from ..core.logger import setup_logger
+
+            self._log_lentas = setup_logger("slow_queries", log_level="INFO", enable_console=False)
+            self._log_lentas.propagate = False
+        self._log_lentas.warning(f"{ms:.1f}ms filas={filas} origen={origen} | {huella}")
+
+    def resumen(self, orden: str = "total_ms", limite: Optional[int] = None) -> List[Dict]:
+        """
+        Estadísticas por huella
+
+        Args:
+            orden: Campo de ordenamiento descendente (total_ms, llamadas, max_ms, ...)
+            limite: Máximo de filas
+
+        Returns:
+            List[Dict]: Una entrada por huella
+        """
+        with self._lock:
+            filas = [dato.a_dict() for dato in self._datos.values()]
+        filas.sort(key=lambda fila: fila[orden], reverse=True)
+        return filas[:limite] if limite else filas
+
+    def totales(self) -> Dict:
+        """Totales globales (llamadas, tiempo, consultas lentas, huellas distintas)"""
+        with self._lock:
+            datos = list(self._datos.values())
+        return {
+            "huellas": len(datos),
+            "llamadas": sum(d.llamadas for d in datos),
+            "total_ms": round(sum(d.total_ms for d in datos), 3),
+            "lentas": sum(d.lentas for d in datos),
+        }
+
+    def reiniciar(self):
+        """Descarta lo acumulado"""
+        with self._lock:
+            self._datos.clear()
+
+    def exportar_csv(self, ruta: str):
+        """Exporta el resumen a CSV (sin el histograma detallado)"""
+        columnas = [
+            "huella", "llamadas", "total_ms", "promedio_ms", "p95_ms", "min_ms",
+            "max_ms", "filas", "lentas", "origen_principal", "origenes",
+        ]
+        with open(ruta, "w", newline="", encoding="utf-8-sig") as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=columnas, extrasaction="ignore")
+            escritor.writeheader()
+            escritor.writerows(self.resumen())
+
+    def exportar_json(self, ruta: str):
+        """Exporta totales y resumen completo (con histograma) a JSON"""
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({"totales": self.totales(), "consultas": self.resumen()}, archivo, ensure_ascii=False, indent=2)
+
+
+# Instancia global compartida por DatabaseManager y ConexionIndependiente
+estadisticas = EstadisticasConsultas()
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Manejador de base de datos MySQL optimizado"""
 
+import time
+from collections import OrderedDict
 from typing import Dict, List, Optional
 
 import mysql.connector
@@ -8,6 +10,13 @@ from mysql.connector import Error
 
 from ..config.settings import DatabaseConfig
 from ..core.logger import logger
+from ..core.trazador_arranque import trazador
+from .estadisticas_consultas import estadisticas
+from .version_datos import version_datos
+
+# Sentencias preparadas en caché por conexión (el servidor limita el total
+# con max_prepared_stmt_count, compartido entre todas las conexiones)
+MAX_SENTENCIAS_PREPARADAS = 64
 
 
 class DatabaseManager:
@@ -25,20 +34,24 @@ class DatabaseManager:
             self.config = DatabaseConfig()
             self.connection = None
             self.cursor = None
+            self._sentencias = OrderedDict()
             self.initialized = True
             self.connect()
 
     def connect(self) -> bool:
         try:
             logger.info(f"Intentando conectar a la base de datos: {self.config.database}")
-            self.connection = mysql.connector.connect(
-                host=self.config.host,
-                user=self.config.user,
-                password=self.config.password,
-                database=self.config.database,
-                port=self.config.port,
-            )
+            with trazador.fase("db.conexion", categoria="db"):
+                self.connection = mysql.connector.connect(
+                    host=self.config.host,
+                    user=self.config.user,
+                    password=self.config.password,
+                    database=self.config.database,
+                    port=self.config.port,
+                )
             self.cursor = self.connection.cursor(dictionary=True)
+            # Las sentencias preparadas pertenecen a la conexión anterior
+            self._sentencias = OrderedDict()
             logger.info(f"Conexión establecida correctamente a: {self.config.database}")
             print(f"Conectado a la base de datos: {self.config.database}")
             return True
@@ -50,6 +63,7 @@ class DatabaseManager:
     def disconnect(self):
         """Cierra la conexión con la base de datos"""
         if self.connection and self.connection.is_connected():
+            self._cerrar_sentencias()
             self.cursor.close()
             self.connection.close()
             logger.info("Desconectado de la base de datos")
@@ -75,6 +89,7 @@ class DatabaseManager:
         try:
             # Cerrar conexión actual si existe
             if self.connection and self.connection.is_connected():
+                self._cerrar_sentencias()
                 self.cursor.close()
                 self.connection.close()
                 logger.debug("Conexión cerrada para forzar refresh")
@@ -85,6 +100,62 @@ class DatabaseManager:
             logger.error(f"Error en force_reconnect: {e}")
             return False
 
+    def _cerrar_sentencias(self):
+        """Libera en el servidor las sentencias preparadas de esta conexión"""
+        for cursor in self._sentencias.values():
+            try:
+                cursor.close()
+            except Error:
+                pass
+        self._sentencias.clear()
+
+    def _cursor_preparado(self, query: str):
+        """
+        Cursor con la sentencia preparada para este texto SQL (LRU por conexión)
+
+        mysql-connector solo reutiliza la sentencia si el cursor vuelve a
+        ejecutar exactamente el mismo SQL, por eso hay un cursor por consulta.
+        """
+        cursor = self._sentencias.pop(query, None)
+        if cursor is None:
+            cursor = self.connection.cursor(prepared=True)
+            if len(self._sentencias) >= MAX_SENTENCIAS_PREPARADAS:
+                _, antiguo = self._sentencias.popitem(last=False)
+                antiguo.close()
+        self._sentencias[query] = cursor
+        return cursor
+
+    def _fetch_preparada(self, query: str, params) -> List[Dict]:
+        """
+        Ejecuta una consulta SELECT como sentencia preparada del servidor
+
+        El protocolo binario retorna tuplas: se convierten a diccionarios con
+        los nombres de columna, igual que el cursor dictionary=True.
+        """
+        cursor = self._cursor_preparado(query)
+        try:
+            cursor.execute(query, tuple(params or ()))
+            columnas = cursor.column_names
+            return [
+                dict(zip(columnas, (v.decode("utf-8") if isinstance(v, (bytes, bytearray)) else v for v in fila)))
+                for fila in cursor.fetchall()
+            ]
+        except Error:
+            # Sentencia inválida o conexión perdida: no reutilizar este cursor
+            self._sentencias.pop(query, None)
+            try:
+                cursor.close()
+            except Error:
+                pass
+            raise
+
+    @staticmethod
+    def _registrar_consulta(query: str, inicio: float, filas: Optional[int]):
+        """Registra la duración de una consulta (estadísticas y traza de arranque)"""
+        duracion = time.perf_counter() - inicio
+        estadisticas.registrar(query, duracion, filas)
+        trazador.consulta(query, inicio, duracion, filas)
+
     def execute_query(self, query: str, params: tuple = None) -> tuple:
         """
         Ejecuta una consulta que modifica datos (INSERT, UPDATE, DELETE)
@@ -99,8 +170,11 @@ class DatabaseManager:
             if not self.ensure_connection():
                 return (False, "No se pudo establecer conexión a la base de datos")
 
+            inicio = time.perf_counter()
             self.cursor.execute(query, params or ())
             self.connection.commit()
+            version_datos.incrementar()
+            self._registrar_consulta(query, inicio, self.cursor.rowcount)
             logger.debug(f"Query ejecutado exitosamente: {query[:50]}...")
             return (True, "")
         except Error as e:
@@ -111,12 +185,44 @@ class DatabaseManager:
             print(f"Error ejecutando query: {error_msg}")
             return (False, error_msg)
 
-    def fetch_all(self, query: str, params: tuple = None) -> List[Dict]:
+    def execute_many(self, query: str, params_list: List[tuple]) -> tuple:
+        """
+        Ejecuta una consulta de modificación para varias filas en una sola transacción.
+        mysql-connector reescribe los INSERT como un único INSERT multi-fila.
+        Args:
+            query: Consulta SQL a ejecutar
+            params_list: Lista de tuplas de parámetros (una por fila)
+        Returns:
+            tuple: (bool: éxito, str: mensaje de error si existe)
+        """
+        if not params_list:
+            return (True, "")
+
+        try:
+            if not self.ensure_connection():
+                return (False, "No se pudo establecer conexión a la base de datos")
+
+            inicio = time.perf_counter()
+            self.cursor.executemany(query, params_list)
+            self.connection.commit()
+            version_datos.incrementar()
+            self._registrar_consulta(query, inicio, self.cursor.rowcount)
+            logger.debug(f"Query masivo ejecutado ({len(params_list)} filas): {query.strip()[:50]}...")
+            return (True, "")
+        except Error as e:
+            if self.connection:
+                self.connection.rollback()
+            error_msg = str(e)
+            logger.error(f"Error ejecutando query masivo: {error_msg}")
+            return (False, error_msg)
+
+    def fetch_all(self, query: str, params: tuple = None, preparada: bool = False) -> List[Dict]:
         """
         Ejecuta una consulta SELECT y retorna todos los resultados
         Args:
             query: Consulta SQL
             params: Parámetros para la consulta
+            preparada: Ejecutar como sentencia preparada en caché (consultas frecuentes)
         Returns:
             Lista de diccionarios con los resultados
         """
@@ -126,18 +232,25 @@ class DatabaseManager:
                 print("No se pudo establecer conexión a la base de datos")
                 return []
 
-            self.cursor.execute(query, params or ())
-            return self.cursor.fetchall()
+            inicio = time.perf_counter()
+            if preparada:
+                filas = self._fetch_preparada(query, params)
+            else:
+                self.cursor.execute(query, params or ())
+                filas = self.cursor.fetchall()
+            self._registrar_consulta(query, inicio, len(filas))
+            return filas
         except Error as e:
             print(f"Error en consulta: {e}")
             return []
 
-    def fetch_one(self, query: str, params: tuple = None) -> Optional[Dict]:
+    def fetch_one(self, query: str, params: tuple = None, preparada: bool = False) -> Optional[Dict]:
         """
         Ejecuta una consulta SELECT y retorna el primer resultado
         Args:
             query: Consulta SQL
             params: Parámetros para la consulta
+            preparada: Ejecutar como sentencia preparada en caché (consultas frecuentes)
         Returns:
             Diccionario con el resultado o None
         """
@@ -147,8 +260,15 @@ class DatabaseManager:
                 print("No se pudo establecer conexión a la base de datos")
                 return None
 
-            self.cursor.execute(query, params or ())
-            return self.cursor.fetchone()
+            inicio = time.perf_counter()
+            if preparada:
+                filas = self._fetch_preparada(query, params)
+                fila = filas[0] if filas else None
+            else:
+                self.cursor.execute(query, params or ())
+                fila = self.cursor.fetchone()
+            self._registrar_consulta(query, inicio, 1 if fila else 0)
+            return fila
         except Error as e:
             print(f"Error en consulta: {e}")
             return None
@@ -163,11 +283,44 @@ class DatabaseManager:
             Resultados del procedimiento
         """
         try:
+            inicio = time.perf_counter()
             self.cursor.callproc(proc_name, params or ())
             results = []
             for result in self.cursor.stored_results():
                 results.extend(result.fetchall())
+            self._registrar_consulta(f"CALL {proc_name}", inicio, len(results))
             return results
         except Error as e:
             print(f"Error llamando procedimiento {proc_name}: {e}")
             return []
+
+
+class ConexionIndependiente(DatabaseManager):
+    """
+    Conexión propia (NO Singleton) con la misma API que DatabaseManager.
+
+    Pensada para workers en segundo plano: cada hilo debe usar su propia
+    conexión MySQL, ya que mysql-connector no es seguro entre hilos.
+
+    Uso:
+        with ConexionIndependiente(db_manager.config) as db:
+            db.fetch_all("SELECT ...")
+    """
+
+    def __new__(cls, *args, **kwargs):
+        return object.__new__(cls)
+
+    def __init__(self, config: DatabaseConfig = None):
+        self.config = config or DatabaseConfig()
+        self.connection = None
+        self.cursor = None
+        self._sentencias = OrderedDict()
+        self.initialized = True
+        self.connect()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disconnect()
+        return False
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Versión global de los datos
+
+Cada transacción confirmada (commit) incrementa la versión. Las cachés de
+resultados incluyen la versión en su clave: cualquier escritura hace que las
+entradas anteriores dejen de coincidir, sin tener que saber qué tablas tocó
+la operación (los triggers modifican tablas que el código no nombra).
+
+Los trabajos de fondo que solo agregan o mueven historial tienen su propio
+contador, para no invalidar cada minuto los reportes de datos operativos:
+
+    version_rollups  tablas rollup_* (ver utils.rollups_historial)
+    version_archivo  tablas *_archivo (ver database.archivo_historial)
+
+La versión es local al proceso: las escrituras de otros puestos no la
+cambian (las cachés acotan además la edad de sus entradas).
+
+DatabaseManager.execute_query/execute_many la incrementan solos; las
+transacciones que llaman a connection.commit() directamente deben llamar a
+version_datos.incrementar() después del commit.
+
+Uso:
+    from src.database.version_datos import version_datos
+
+    clave = (reporte, filtros, version_datos.actual())
+"""
+
+import threading
+
+
+class VersionDatos:
+    """Contador monotónico de escrituras confirmadas (seguro entre hilos)"""
+
+    def __init__(self):
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def actual(self) -> int:
+        """Versión vigente de los datos"""
+        return self._version
+
+    def incrementar(self) -> int:
+        """Registra una escritura confirmada y retorna la nueva versión"""
+        with self._lock:
+            self._version += 1
+            return self._version
+
+
+# Instancia global compartida por DatabaseManager, ConexionIndependiente y los workers
+version_datos = VersionDatos()
+version_rollups = VersionDatos()
+version_archivo = VersionDatos()
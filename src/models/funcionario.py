@@ -42,7 +42,7 @@ class FuncionarioModel:
             query += " AND id != %s"
             params.append(funcionario_id)
 
-        existing = self.db.fetch_one(query, params)
+        existing = self.db.fetch_one(query, params, preparada=True)
         if existing:
             return (
                 False,
@@ -153,6 +153,69 @@ class FuncionarioModel:
             else:
                 return False, f"🚫 Error al registrar el funcionario: {error}"
 
+    def obtener_cedulas_registradas(self, cedulas: List[str], tamano_lote: int = 1000) -> Dict[str, Dict]:
+        """Consulta en bloque qué cédulas ya existen (activas o inactivas)
+
+        Reemplaza la validación fila por fila de validar_cedula_unica() en las
+        importaciones masivas: una consulta IN (...) por cada lote de cédulas.
+
+        Args:
+            cedulas (List[str]): Cédulas a consultar
+            tamano_lote (int): Máximo de cédulas por consulta
+
+        Returns:
+            Dict[str, Dict]: {cedula: {"id", "nombre", "apellidos", "activo", "tiene_parqueadero_exclusivo"}}
+        """
+        registradas = {}
+        cedulas_unicas = list(dict.fromkeys(c for c in cedulas if c))
+
+        for inicio in range(0, len(cedulas_unicas), tamano_lote):
+            lote = cedulas_unicas[inicio:inicio + tamano_lote]
+            placeholders = ", ".join(["%s"] * len(lote))
+            query = f"""
+                SELECT id, cedula, nombre, apellidos, activo, tiene_parqueadero_exclusivo
+                FROM funcionarios
+                WHERE cedula IN ({placeholders})
+            """
+            for fila in self.db.fetch_all(query, tuple(lote)) or []:
+                registradas[fila["cedula"]] = fila
+
+        return registradas
+
+    def crear_masivo(self, registros: List[Dict]) -> Tuple[bool, str]:
+        """Inserta un lote de funcionarios ya validados en una sola transacción
+
+        Args:
+            registros (List[Dict]): Funcionarios con las claves de crear()
+
+        Returns:
+            Tuple[bool, str]: (éxito, mensaje de error si existe)
+        """
+        query = """
+            INSERT INTO funcionarios
+            (cedula, nombre, apellidos, direccion_grupo, cargo, celular, no_tarjeta_proximidad,
+             permite_compartir, pico_placa_solidario, discapacidad, tiene_parqueadero_exclusivo, tiene_carro_hibrido)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        params_list = [
+            (
+                r["cedula"],
+                r["nombre"],
+                r["apellidos"],
+                r.get("direccion_grupo", ""),
+                r.get("cargo", ""),
+                r.get("celular", ""),
+                r.get("tarjeta", ""),
+                bool(r.get("permite_compartir", True)),
+                bool(r.get("pico_placa_solidario", False)),
+                bool(r.get("discapacidad", False)),
+                bool(r.get("tiene_parqueadero_exclusivo", False)),
+                bool(r.get("tiene_carro_hibrido", False)),
+            )
+            for r in registros
+        ]
+        return self.db.execute_many(query, params_list)
+
     def obtener_todos(self) -> List[Dict]:
         """Obtiene todos los funcionarios activos"""
         query = """
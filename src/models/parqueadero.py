@@ -3,13 +3,73 @@
 Modelo para operaciones con parqueaderos
 """
 
+from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 
 from mysql.connector import Error
 
 from ..database.manager import DatabaseManager
+from ..database.version_datos import version_datos
+from ..utils.motor_elegibilidad import InstantaneaOcupacion, PerfilVehiculo
 from ..utils.validaciones_asignaciones import ValidadorAsignacion
 from ..utils.formatters import format_numero_parqueadero
+from ..utils.intervalos_ocupacion import IndiceIntervalos, momentos
+
+# Asignaciones vigentes en un momento: [fecha_asignacion, fecha_fin_asignacion)
+# Se resuelve por rango sobre idx_inicio_fin / idx_fin_inicio (migración 007)
+CONDICION_VIGENTE_EN = (
+    "fecha_asignacion <= %s AND (fecha_fin_asignacion IS NULL OR fecha_fin_asignacion > %s)"
+)
+
+# Agregados de ocupación leídos de parqueaderos_ocupacion (migración 002)
+COLUMNAS_OCUPACION_RESUMEN = """
+                    COALESCE(MAX(o.total_asignaciones), 0) AS total_asignaciones,
+                    MAX(o.permite_compartir_min) AS permite_compartir_ocupante,
+                    MAX(o.pico_placa_solidario_max) AS pico_placa_solidario_ocupante,
+                    MAX(o.discapacidad_max) AS discapacidad_ocupante"""
+
+# Mismos agregados calculados por parqueadero (bases sin la migración 002)
+COLUMNAS_OCUPACION_SUBCONSULTAS = """
+                    (
+                        SELECT COUNT(*)
+                        FROM asignaciones a2
+                        WHERE a2.parqueadero_id = p.id AND a2.activo = TRUE
+                    ) AS total_asignaciones,
+                    (
+                        SELECT MIN(f2.permite_compartir)
+                        FROM asignaciones a2
+                        JOIN vehiculos v2 ON a2.vehiculo_id = v2.id
+                        JOIN funcionarios f2 ON v2.funcionario_id = f2.id
+                        WHERE a2.parqueadero_id = p.id AND a2.activo = TRUE
+                    ) AS permite_compartir_ocupante,
+                    (
+                        SELECT MAX(f2.pico_placa_solidario)
+                        FROM asignaciones a2
+                        JOIN vehiculos v2 ON a2.vehiculo_id = v2.id
+                        JOIN funcionarios f2 ON v2.funcionario_id = f2.id
+                        WHERE a2.parqueadero_id = p.id AND a2.activo = TRUE
+                    ) AS pico_placa_solidario_ocupante,
+                    (
+                        SELECT MAX(f2.discapacidad)
+                        FROM asignaciones a2
+                        JOIN vehiculos v2 ON a2.vehiculo_id = v2.id
+                        JOIN funcionarios f2 ON v2.funcionario_id = f2.id
+                        WHERE a2.parqueadero_id = p.id AND a2.activo = TRUE
+                    ) AS discapacidad_ocupante"""
+
+# Filas por página del historial de asignaciones de un parqueadero
+HISTORIAL_POR_PAGINA = 50
+
+# Columnas de parqueaderos_ocupacion comparadas por verificar_resumen_ocupacion
+COLUMNAS_RESUMEN = (
+    "total_asignaciones",
+    "total_carros",
+    "permite_compartir_min",
+    "pico_placa_solidario_max",
+    "discapacidad_max",
+    "exclusivo_max",
+    "hibrido_max",
+)
 
 
 class ParqueaderoModel:
@@ -17,6 +77,62 @@ class ParqueaderoModel:
 
     def __init__(self, db: DatabaseManager):
         self.db = db
+        self._resumen_ocupacion = None
+        self._archivo_asignaciones = None
+        self._conserva_historial = None
+
+    def _usa_resumen_ocupacion(self) -> bool:
+        """Indica si existe la tabla parqueaderos_ocupacion (se consulta una vez por modelo)"""
+        if self._resumen_ocupacion is None:
+            try:
+                self._resumen_ocupacion = (
+                    self.db.fetch_one("SHOW TABLES LIKE 'parqueaderos_ocupacion'") is not None
+                )
+            except Exception as e:
+                print(f"Advertencia al verificar tabla 'parqueaderos_ocupacion': {e}")
+                self._resumen_ocupacion = False
+        return self._resumen_ocupacion
+
+    def _usa_archivo_asignaciones(self) -> bool:
+        """Indica si existe la tabla asignaciones_archivo (se consulta una vez por modelo)"""
+        if self._archivo_asignaciones is None:
+            try:
+                self._archivo_asignaciones = (
+                    self.db.fetch_one("SHOW TABLES LIKE 'asignaciones_archivo'") is not None
+                )
+            except Exception as e:
+                print(f"Advertencia al verificar tabla 'asignaciones_archivo': {e}")
+                self._archivo_asignaciones = False
+        return self._archivo_asignaciones
+
+    def _usa_historial_intervalos(self) -> bool:
+        """Indica si liberar debe finalizar la asignación en vez de borrarla (migración 007)"""
+        if self._conserva_historial is None:
+            try:
+                self._conserva_historial = (
+                    self.db.fetch_one("SHOW COLUMNS FROM asignaciones LIKE 'vehiculo_activo'") is not None
+                )
+            except Exception as e:
+                print(f"Advertencia al verificar columna 'vehiculo_activo': {e}")
+                self._conserva_historial = False
+        return self._conserva_historial
+
+    def _intervalos_sql(self, condicion: str) -> Tuple[str, int]:
+        """
+        SELECT de las asignaciones (activas y archivadas) que cumplen una condición
+
+        Returns:
+            Tupla (sql, número de ramas: los parámetros de la condición se repiten por rama)
+        """
+        tablas = ["asignaciones"]
+        if self._usa_archivo_asignaciones():
+            tablas.append("asignaciones_archivo")
+        ramas = [
+            f"""SELECT id, parqueadero_id, vehiculo_id, fecha_asignacion, fecha_fin_asignacion
+                FROM {tabla} WHERE {condicion}"""
+            for tabla in tablas
+        ]
+        return " UNION ALL ".join(ramas), len(ramas)
 
     def _obtener_vehiculos_detalle(self, parqueadero_id: int) -> List[Dict]:
         """
@@ -49,6 +165,176 @@ class ParqueaderoModel:
         results = self.db.fetch_all(query, (parqueadero_id,))
         return results if results else []
 
+    def obtener_historial(
+        self, parqueadero_id: int, limite: int = HISTORIAL_POR_PAGINA, despues_de: Tuple = None
+    ) -> List[Dict]:
+        """
+        Obtiene una página del historial de asignaciones de un parqueadero (más recientes primero)
+
+        Pagina por clave (fecha_asignacion, id) sobre idx_parqueadero_fecha: cada página
+        lee solo sus filas, sin importar cuántos años de historial tenga el espacio.
+        Incluye las asignaciones movidas a asignaciones_archivo.
+
+        Args:
+            parqueadero_id: ID del parqueadero
+            limite: Cantidad máxima de filas de la página
+            despues_de: (fecha_asignacion, id) de la última fila de la página anterior
+
+        Returns:
+            Lista de asignaciones con datos del vehículo y del funcionario
+        """
+        filtro_pagina = ""
+        params = (parqueadero_id,)
+        if despues_de:
+            fecha, asignacion_id = despues_de
+            filtro_pagina = "AND (a.fecha_asignacion < %s OR (a.fecha_asignacion = %s AND a.id < %s))"
+            params += (fecha, fecha, asignacion_id)
+
+        query = f"""
+            SELECT
+                a.id,
+                a.fecha_asignacion,
+                a.fecha_fin_asignacion,
+                CONCAT(f.nombre, ' ', f.apellidos) as funcionario,
+                f.cedula,
+                v.tipo_vehiculo,
+                v.placa,
+                v.tipo_circulacion,
+                CASE
+                    WHEN a.activo = TRUE THEN 'Activo'
+                    ELSE 'Finalizado'
+                END as estado,
+                a.observaciones
+            FROM {{tabla}} a
+            JOIN vehiculos v ON a.vehiculo_id = v.id
+            JOIN funcionarios f ON v.funcionario_id = f.id
+            WHERE a.parqueadero_id = %s
+            {filtro_pagina}
+            ORDER BY a.fecha_asignacion DESC, a.id DESC
+            LIMIT %s
+        """
+        if not self._usa_archivo_asignaciones():
+            results = self.db.fetch_all(query.format(tabla="asignaciones"), params + (limite,))
+            return results if results else []
+
+        # Asignaciones archivadas (migración 006): cada rama pagina con su propio índice
+        # y la unión se reordena; ambas comparten la secuencia de ids
+        query = f"""
+            SELECT * FROM (
+                ({query.format(tabla="asignaciones")})
+                UNION ALL
+                ({query.format(tabla="asignaciones_archivo")})
+            ) historial
+            ORDER BY fecha_asignacion DESC, id DESC
+            LIMIT %s
+        """
+        results = self.db.fetch_all(query, params + (limite,) + params + (limite,) + (limite,))
+        return results if results else []
+
+    def ocupantes_en(self, parqueadero_id: int, momento: datetime) -> List[Dict]:
+        """
+        Vehículos que ocupaban un parqueadero en un momento dado
+
+        Args:
+            parqueadero_id: ID del parqueadero
+            momento: Fecha y hora a consultar
+
+        Returns:
+            Lista de asignaciones vigentes en ese momento con datos del vehículo y del funcionario
+        """
+        intervalos, ramas = self._intervalos_sql(f"parqueadero_id = %s AND {CONDICION_VIGENTE_EN}")
+        query = f"""
+            SELECT
+                a.id,
+                a.fecha_asignacion,
+                a.fecha_fin_asignacion,
+                CONCAT(f.nombre, ' ', f.apellidos) as funcionario,
+                f.cedula,
+                v.tipo_vehiculo,
+                v.placa,
+                v.tipo_circulacion
+            FROM ({intervalos}) a
+            JOIN vehiculos v ON a.vehiculo_id = v.id
+            JOIN funcionarios f ON v.funcionario_id = f.id
+            ORDER BY a.fecha_asignacion, a.id
+        """
+        results = self.db.fetch_all(query, (parqueadero_id, momento, momento) * ramas)
+        return results if results else []
+
+    def ocupacion_en(self, momento: datetime) -> List[Dict]:
+        """
+        Foto de la ocupación en un momento dado: parqueaderos con vehículos asignados
+
+        Args:
+            momento: Fecha y hora a consultar
+
+        Returns:
+            Lista de {parqueadero_id, numero_parqueadero, tipo_espacio, vehiculos, carros, motos,
+            bicicletas}, un registro por parqueadero ocupado
+        """
+        intervalos, ramas = self._intervalos_sql(CONDICION_VIGENTE_EN)
+        query = f"""
+            SELECT
+                p.id AS parqueadero_id,
+                p.numero_parqueadero,
+                p.tipo_espacio,
+                COUNT(*) AS vehiculos,
+                SUM(v.tipo_vehiculo = 'Carro') AS carros,
+                SUM(v.tipo_vehiculo = 'Moto') AS motos,
+                SUM(v.tipo_vehiculo = 'Bicicleta') AS bicicletas
+            FROM ({intervalos}) a
+            JOIN vehiculos v ON a.vehiculo_id = v.id
+            JOIN parqueaderos p ON a.parqueadero_id = p.id
+            GROUP BY p.id, p.numero_parqueadero, p.tipo_espacio
+            ORDER BY p.numero_parqueadero
+        """
+        results = self.db.fetch_all(query, (momento, momento) * ramas)
+        return results if results else []
+
+    def serie_ocupacion(
+        self,
+        desde: datetime,
+        hasta: datetime,
+        paso: timedelta = timedelta(hours=1),
+        parqueadero_id: int = None,
+    ) -> List[Dict]:
+        """
+        Serie temporal de ocupación reconstruida desde los intervalos de asignación
+
+        Lee una sola vez las asignaciones que se cruzan con [desde, hasta] y muestrea
+        en memoria con IndiceIntervalos, en vez de una consulta por punto.
+
+        Args:
+            desde: Inicio de la serie
+            hasta: Fin de la serie (inclusive)
+            paso: Separación entre puntos
+            parqueadero_id: Limitar a un parqueadero (None: todos)
+
+        Returns:
+            Lista de {momento, vehiculos, espacios_ocupados, carros, motos, bicicletas}
+        """
+        if hasta < desde or paso <= timedelta(0):
+            return []
+
+        condicion = CONDICION_VIGENTE_EN
+        params = (hasta, desde)
+        if parqueadero_id is not None:
+            condicion = f"parqueadero_id = %s AND {condicion}"
+            params = (parqueadero_id,) + params
+
+        intervalos, ramas = self._intervalos_sql(condicion)
+        query = f"""
+            SELECT a.parqueadero_id, a.fecha_asignacion, a.fecha_fin_asignacion, v.tipo_vehiculo
+            FROM ({intervalos}) a
+            JOIN vehiculos v ON a.vehiculo_id = v.id
+        """
+        filas = self.db.fetch_all(query, params * ramas) or []
+        indice = IndiceIntervalos(
+            (f["fecha_asignacion"], f["fecha_fin_asignacion"], f["parqueadero_id"], f["tipo_vehiculo"])
+            for f in filas
+        )
+        return indice.serie(momentos(desde, hasta, paso))
+
     def obtener_todos(self, sotano: str = None, tipo_vehiculo: str = None, estado: str = None) -> List[Dict]:
         """Obtiene información de todos los parqueaderos con filtros opcionales
         Solo muestra carros asignados, ya que motos y bicicletas no ocupan espacios de parqueadero
@@ -81,39 +367,23 @@ class ParqueaderoModel:
                         CONCAT(f.nombre, ' ', f.apellidos, ' (', v.placa, '-', v.tipo_circulacion, ')')
                         SEPARATOR ' | '
                     ) AS asignados,
-                    (
-                        SELECT COUNT(*)
-                        FROM asignaciones a2
-                        WHERE a2.parqueadero_id = p.id AND a2.activo = TRUE
-                    ) AS total_asignaciones,
-                    (
-                        SELECT MIN(f2.permite_compartir)
-                        FROM asignaciones a2
-                        JOIN vehiculos v2 ON a2.vehiculo_id = v2.id
-                        JOIN funcionarios f2 ON v2.funcionario_id = f2.id
-                        WHERE a2.parqueadero_id = p.id AND a2.activo = TRUE
-                    ) AS permite_compartir_ocupante,
-                    (
-                        SELECT MAX(f2.pico_placa_solidario)
-                        FROM asignaciones a2
-                        JOIN vehiculos v2 ON a2.vehiculo_id = v2.id
-                        JOIN funcionarios f2 ON v2.funcionario_id = f2.id
-                        WHERE a2.parqueadero_id = p.id AND a2.activo = TRUE
-                    ) AS pico_placa_solidario_ocupante,
-                    (
-                        SELECT MAX(f2.discapacidad)
-                        FROM asignaciones a2
-                        JOIN vehiculos v2 ON a2.vehiculo_id = v2.id
-                        JOIN funcionarios f2 ON v2.funcionario_id = f2.id
-                        WHERE a2.parqueadero_id = p.id AND a2.activo = TRUE
-                    ) AS discapacidad_ocupante
+                    {columnas_ocupacion}
                 FROM parqueaderos p
+                {join_ocupacion}
                 LEFT JOIN asignaciones a ON p.id = a.parqueadero_id AND a.activo = TRUE
                 LEFT JOIN vehiculos v ON a.vehiculo_id = v.id
                     AND (v.tipo_vehiculo = 'Carro' OR p.tipo_espacio IN ('Moto', 'Bicicleta'))
                 LEFT JOIN funcionarios f ON v.funcionario_id = f.id
                 WHERE p.activo = TRUE
             """
+            if self._usa_resumen_ocupacion():
+                # Agregados mantenidos por triggers: búsqueda por clave primaria
+                query = query.format(
+                    columnas_ocupacion=COLUMNAS_OCUPACION_RESUMEN,
+                    join_ocupacion="LEFT JOIN parqueaderos_ocupacion o ON o.parqueadero_id = p.id",
+                )
+            else:
+                query = query.format(columnas_ocupacion=COLUMNAS_OCUPACION_SUBCONSULTAS, join_ocupacion="")
         else:
             # Estructura original sin sótanos (compatibilidad hacia atrás)
             query = """
@@ -365,7 +635,9 @@ class ParqueaderoModel:
             """
             return self.db.fetch_all(query)
 
-    def asignar_vehiculo(self, vehiculo_id: int, parqueadero_id: int, observaciones: str = "") -> Tuple[bool, str]:
+    def asignar_vehiculo(
+        self, vehiculo_id: int, parqueadero_id: int, observaciones: str = "", instantanea: InstantaneaOcupacion = None
+    ) -> Tuple[bool, str]:
         """
         Asigna un vehículo a un parqueadero con validaciones previas de reglas de negocio
 
@@ -373,6 +645,7 @@ class ParqueaderoModel:
             vehiculo_id: ID del vehículo a asignar
             parqueadero_id: ID del parqueadero
             observaciones: Observaciones adicionales sobre la asignación
+            instantanea: Ocupación ya cargada (se actualiza si la asignación tiene éxito)
 
         Returns:
             Tupla (éxito, mensaje)
@@ -387,7 +660,7 @@ class ParqueaderoModel:
                     v.funcionario_id,
                     f.nombre, f.apellidos, f.cargo,
                     f.permite_compartir, f.pico_placa_solidario, f.discapacidad,
-                    f.tiene_parqueadero_exclusivo
+                    f.tiene_parqueadero_exclusivo, f.tiene_carro_hibrido
                 FROM vehiculos v
                 JOIN funcionarios f ON v.funcionario_id = f.id
                 WHERE v.id = %s AND v.activo = TRUE
@@ -397,118 +670,17 @@ class ParqueaderoModel:
             if not vehiculo_data:
                 return (False, "🚫 Vehículo no encontrado o inactivo")
 
-            # 2. Verificar si el parqueadero existe
-            query_parqueadero = """
-                SELECT id, numero_parqueadero, estado, tipo_espacio
-                FROM parqueaderos
-                WHERE id = %s AND activo = TRUE
-            """
-            parqueadero_data = self.db.fetch_one(query_parqueadero, (parqueadero_id,))
+            # 2. Validar reglas de negocio contra la ocupación (motor de elegibilidad)
+            # Sin instantánea se carga solo este parqueadero en lugar de varios COUNT(*)
+            ocupacion = instantanea or InstantaneaOcupacion.cargar(self.db, parqueadero_id=parqueadero_id)
+            perfil = PerfilVehiculo.desde_fila(vehiculo_data)
+            parqueadero_data = ocupacion.espacio(parqueadero_id)
 
-            if not parqueadero_data:
-                return (False, "🚫 Parqueadero no encontrado o inactivo")
-
-            # 3. Contar asignaciones activas en el parqueadero
-            query_count = """
-                SELECT COUNT(*) as total
-                FROM asignaciones
-                WHERE parqueadero_id = %s AND activo = TRUE
-            """
-            count_result = self.db.fetch_one(query_count, (parqueadero_id,))
-            asignaciones_existentes = count_result.get("total", 0) if count_result else 0
-
-            # 4. VALIDACIÓN: Pico y placa (solo si NO tiene pico_placa_solidario)
-            mismo_tipo_count = 0
-            if vehiculo_data["tipo_vehiculo"] == "Carro" and vehiculo_data["tipo_circulacion"] != "N/A":
-                query_mismo_tipo = """
-                    SELECT COUNT(*) as total
-                    FROM asignaciones a
-                    JOIN vehiculos v ON a.vehiculo_id = v.id
-                    WHERE a.parqueadero_id = %s
-                    AND a.activo = TRUE
-                    AND v.tipo_circulacion = %s
-                """
-                mismo_tipo_result = self.db.fetch_one(
-                    query_mismo_tipo, (parqueadero_id, vehiculo_data["tipo_circulacion"])
-                )
-                mismo_tipo_count = mismo_tipo_result.get("total", 0) if mismo_tipo_result else 0
-
-            es_valido, mensaje = ValidadorAsignacion.validar_pico_placa(
-                vehiculo_data["tipo_vehiculo"],
-                vehiculo_data["tipo_circulacion"],
-                vehiculo_data.get("pico_placa_solidario", False),
-                mismo_tipo_count,
-                vehiculo_data.get("tiene_parqueadero_exclusivo", False),
-                vehiculo_data.get("cargo", ""),
-            )
+            es_valido, mensaje = ocupacion.validar(perfil, parqueadero_id)
             if not es_valido:
                 return (False, mensaje)
 
-            # 5. VALIDACIÓN CRÍTICA: Vehículos con excepción de pico y placa NO pueden compartir parqueadero
-            # Excepciones: Pico y Placa Solidario, Discapacidad, Híbrido, Directivo Exclusivo
-            pico_placa_solidario = vehiculo_data.get("pico_placa_solidario", False)
-            discapacidad = vehiculo_data.get("discapacidad", False)
-            es_hibrido = vehiculo_data.get("tipo_circulacion", "") == "HÍBRIDO"
-            es_directivo_exclusivo = vehiculo_data.get("tiene_parqueadero_exclusivo", False)
-
-            tiene_excepcion = (
-                pico_placa_solidario or
-                discapacidad or
-                es_hibrido or
-                es_directivo_exclusivo
-            )
-
-            if tiene_excepcion and asignaciones_existentes > 0:
-                # Verificar si NO es directivo con sus propios vehículos
-                if es_directivo_exclusivo:
-                    # Permitir solo si TODOS los vehículos en el parqueadero son del MISMO funcionario
-                    query_check_mismo_funcionario = """
-                        SELECT COUNT(DISTINCT v.funcionario_id) as total_funcionarios
-                        FROM asignaciones a
-                        JOIN vehiculos v ON a.vehiculo_id = v.id
-                        WHERE a.parqueadero_id = %s AND a.activo = TRUE
-                    """
-                    check_result = self.db.fetch_one(query_check_mismo_funcionario, (parqueadero_id,))
-                    total_funcionarios = check_result.get("total_funcionarios", 0) if check_result else 0
-
-                    if total_funcionarios > 0:
-                        # Verificar que sea el MISMO funcionario
-                        query_check_owner = """
-                            SELECT v.funcionario_id
-                            FROM asignaciones a
-                            JOIN vehiculos v ON a.vehiculo_id = v.id
-                            WHERE a.parqueadero_id = %s AND a.activo = TRUE
-                            LIMIT 1
-                        """
-                        owner_result = self.db.fetch_one(query_check_owner, (parqueadero_id,))
-                        funcionario_en_parqueadero = owner_result.get("funcionario_id") if owner_result else None
-
-                        if funcionario_en_parqueadero != vehiculo_data["funcionario_id"]:
-                            return (
-                                False,
-                                f"🚫 Este parqueadero ya está asignado a otro directivo.\n\n"
-                                f"Los directivos exclusivos solo pueden compartir parqueaderos con sus propios vehículos."
-                            )
-                else:
-                    # Para otras excepciones (Híbrido, Discapacidad, Pico y Placa Solidario)
-                    # NO pueden usar parqueaderos parcialmente asignados
-                    excepciones_str = []
-                    if pico_placa_solidario:
-                        excepciones_str.append("Pico y Placa Solidario")
-                    if discapacidad:
-                        excepciones_str.append("Funcionario con Discapacidad")
-                    if es_hibrido:
-                        excepciones_str.append("Vehículo Híbrido")
-
-                    return (
-                        False,
-                        f"🚫 Este vehículo tiene excepción de pico y placa ({', '.join(excepciones_str)}).\n\n"
-                        f"⚠️ Los vehículos con excepciones SOLO pueden asignarse a parqueaderos 100% DISPONIBLES.\n"
-                        f"No pueden compartir con otros vehículos.\n\n"
-                        f"Por favor, seleccione un parqueadero que esté completamente desocupado."
-                    )
-
-            # 6. Mensajes informativos para casos especiales
+            # 3. Mensajes informativos para casos especiales
             msg_info = ValidadorAsignacion.obtener_mensajes_informativos(vehiculo_data)
 
             # ==================== LLAMAR AL PROCEDIMIENTO ALMACENADO ====================
@@ -525,6 +697,8 @@ class ParqueaderoModel:
                 self.db.cursor.execute(update_query, (observaciones.strip(), vehiculo_id))
 
             self.db.connection.commit()
+            version_datos.incrementar()
+            ocupacion.registrar_asignacion(perfil, parqueadero_id)
 
             # Obtener el mensaje de resultado
             msg_base = "Asignación realizada correctamente"
@@ -537,7 +711,7 @@ class ParqueaderoModel:
                 f"✅ {msg_base}\n\n"
                 f"🚗 Vehículo: {vehiculo_data['placa']}\n"
                 f"👤 Funcionario: {vehiculo_data['nombre']} {vehiculo_data['apellidos']}\n"
-                f"📍 Parqueadero: {format_numero_parqueadero(parqueadero_data['numero_parqueadero'])}"
+                f"📍 Parqueadero: {format_numero_parqueadero(parqueadero_data.numero_parqueadero)}"
             )
 
             if msg_info:
@@ -547,12 +721,144 @@ class ParqueaderoModel:
 
         except Error as e:
             self.db.connection.rollback()
-            # Limpiar el mensaje de error (remover código MySQL)
-            error_msg = str(e)
-            # Remover el código de error tipo "1644 (45000): " del inicio
-            if ": " in error_msg:
-                error_msg = error_msg.split(": ", 1)[1]
-            return (False, error_msg)
+            return (False, self._mensaje_error(e))
+
+    def obtener_por_numeros(self, numeros: List[int]) -> Dict[int, Dict]:
+        """
+        Consulta en bloque parqueaderos activos por número
+
+        Args:
+            numeros: Números de parqueadero
+
+        Returns:
+            Diccionario {numero_parqueadero: {"id", "numero_parqueadero", "tipo_espacio", "estado"}}
+        """
+        numeros_unicos = list(dict.fromkeys(numeros))
+        if not numeros_unicos:
+            return {}
+
+        placeholders = ", ".join(["%s"] * len(numeros_unicos))
+        query = f"""
+            SELECT id, numero_parqueadero, tipo_espacio, estado
+            FROM parqueaderos
+            WHERE numero_parqueadero IN ({placeholders}) AND activo = TRUE
+        """
+        return {p["numero_parqueadero"]: p for p in self.db.fetch_all(query, tuple(numeros_unicos)) or []}
+
+    def crear_asignaciones_masivo(self, asignaciones: List[Tuple[int, int]]) -> Tuple[bool, str]:
+        """
+        Inserta varias asignaciones en una sola transacción (importación masiva)
+
+        El trigger after_insert_asignacion actualiza el estado de cada parqueadero.
+
+        Args:
+            asignaciones: Lista de tuplas (parqueadero_id, vehiculo_id)
+
+        Returns:
+            Tupla (éxito, mensaje de error si existe)
+        """
+        query = """
+            INSERT INTO asignaciones (parqueadero_id, vehiculo_id, activo)
+            VALUES (%s, %s, TRUE)
+        """
+        return self.db.execute_many(query, list(asignaciones))
+
+    def asignar_masivo(self, asignaciones: List[Tuple[int, int]]) -> Tuple[bool, str, Dict[int, str]]:
+        """
+        Guarda un plan de asignación automática en una sola transacción
+
+        El plan se calculó sobre una instantánea que puede estar desactualizada
+        (otro operador asignó mientras tanto). Por eso se bloquean los
+        parqueaderos del plan (SELECT ... FOR UPDATE), se vuelve a cargar su
+        ocupación, se valida cada par con el motor de elegibilidad y cada par
+        válido se guarda con sp_asignar_vehiculo (misma validación y mismo
+        estado_manual que la asignación individual). Los pares rechazados se
+        reportan; los demás se confirman juntos.
+
+        Args:
+            asignaciones: Lista de tuplas (parqueadero_id, vehiculo_id)
+
+        Returns:
+            Tupla (éxito, mensaje de error, {vehiculo_id: motivo} de los pares rechazados).
+            Si éxito es False no se guardó ninguna asignación.
+        """
+        asignaciones = list(asignaciones)
+        if not asignaciones:
+            return (True, "", {})
+        if not self.db.ensure_connection():
+            return (False, "No se pudo establecer conexión a la base de datos", {})
+
+        rechazados = {}
+        cursor = self.db.cursor
+        try:
+            # Cerrar cualquier transacción previa para leer la ocupación vigente
+            self.db.connection.commit()
+
+            parqueadero_ids = sorted({parqueadero_id for parqueadero_id, _ in asignaciones})
+            placeholders = ", ".join(["%s"] * len(parqueadero_ids))
+            cursor.execute(
+                f"SELECT id FROM parqueaderos WHERE id IN ({placeholders}) ORDER BY id FOR UPDATE",
+                tuple(parqueadero_ids),
+            )
+            cursor.fetchall()
+            ocupacion = InstantaneaOcupacion.cargar(self.db, parqueadero_ids=parqueadero_ids)
+
+            vehiculo_ids = [vehiculo_id for _, vehiculo_id in asignaciones]
+            placeholders = ", ".join(["%s"] * len(vehiculo_ids))
+            cursor.execute(
+                f"""
+                SELECT
+                    v.id, v.tipo_vehiculo, v.tipo_circulacion, v.funcionario_id,
+                    f.permite_compartir, f.pico_placa_solidario, f.discapacidad,
+                    f.tiene_parqueadero_exclusivo, f.tiene_carro_hibrido,
+                    a.parqueadero_id AS asignado_en
+                FROM vehiculos v
+                JOIN funcionarios f ON v.funcionario_id = f.id
+                LEFT JOIN asignaciones a ON a.vehiculo_id = v.id AND a.activo = TRUE
+                WHERE v.id IN ({placeholders}) AND v.activo = TRUE
+                """,
+                tuple(vehiculo_ids),
+            )
+            vehiculos = {fila["id"]: fila for fila in cursor.fetchall()}
+
+            for parqueadero_id, vehiculo_id in asignaciones:
+                vehiculo_data = vehiculos.get(vehiculo_id)
+                if not vehiculo_data:
+                    rechazados[vehiculo_id] = "🚫 Vehículo no encontrado o inactivo"
+                    continue
+                if vehiculo_data["asignado_en"] is not None:
+                    rechazados[vehiculo_id] = "🚫 El vehículo ya tiene un parqueadero asignado"
+                    continue
+
+                perfil = PerfilVehiculo.desde_fila(vehiculo_data)
+                es_valido, mensaje = ocupacion.validar(perfil, parqueadero_id)
+                if not es_valido:
+                    rechazados[vehiculo_id] = mensaje
+                    continue
+
+                try:
+                    cursor.callproc("sp_asignar_vehiculo", (vehiculo_id, parqueadero_id))
+                except Error as e:
+                    if e.sqlstate != "45000":
+                        raise
+                    # Regla de negocio rechazada por el procedimiento (SIGNAL): solo este par
+                    rechazados[vehiculo_id] = self._mensaje_error(e)
+                    continue
+                ocupacion.registrar_asignacion(perfil, parqueadero_id)
+
+            self.db.connection.commit()
+            version_datos.incrementar()
+            return (True, "", rechazados)
+
+        except Error as e:
+            self.db.connection.rollback()
+            return (False, self._mensaje_error(e), {})
+
+    @staticmethod
+    def _mensaje_error(error: Error) -> str:
+        """Mensaje de MySQL sin el código inicial (p. ej. "1644 (45000): ")"""
+        mensaje = str(error)
+        return mensaje.split(": ", 1)[1] if ": " in mensaje else mensaje
 
     def liberar_asignacion(self, vehiculo_id: int) -> bool:
         """Libera la asignación de un vehículo y actualiza el estado del parqueadero"""
@@ -570,11 +876,19 @@ class ParqueaderoModel:
 
             parqueadero_id = resultado["parqueadero_id"]
 
-            # Eliminar la asignación físicamente
-            query_liberar = """
-                DELETE FROM asignaciones
-                WHERE vehiculo_id = %s AND activo = TRUE
-            """
+            if self._usa_historial_intervalos():
+                # Finalizar la asignación: el intervalo queda en el historial (migración 007)
+                query_liberar = """
+                    UPDATE asignaciones
+                    SET activo = FALSE, fecha_fin_asignacion = NOW()
+                    WHERE vehiculo_id = %s AND activo = TRUE
+                """
+            else:
+                # Eliminar la asignación físicamente
+                query_liberar = """
+                    DELETE FROM asignaciones
+                    WHERE vehiculo_id = %s AND activo = TRUE
+                """
             exito, _ = self.db.execute_query(query_liberar, (vehiculo_id,))
 
             if not exito:
@@ -714,31 +1028,54 @@ class ParqueaderoModel:
 
     def obtener_estadisticas_generales(self) -> Dict:
         """Obtiene estadísticas generales de ocupación para espacios de carros únicamente."""
-        query = """
-            SELECT
-                (SELECT COUNT(*) FROM parqueaderos WHERE activo = TRUE AND tipo_espacio = 'Carro') AS total_espacios,
-                (SELECT COUNT(DISTINCT a.parqueadero_id)
-                 FROM asignaciones a
-                 JOIN parqueaderos p ON a.parqueadero_id = p.id
-                 WHERE a.activo = TRUE AND p.tipo_espacio = 'Carro') AS ocupados,
-                (SELECT COUNT(*) FROM asignaciones WHERE activo = TRUE) AS vehiculos_estacionados
-        """
+        if self._usa_resumen_ocupacion():
+            query = """
+                SELECT
+                    CAST(COALESCE(SUM(p.activo = TRUE AND p.tipo_espacio = 'Carro'), 0) AS SIGNED) AS total_espacios,
+                    CAST(COALESCE(SUM(p.tipo_espacio = 'Carro' AND o.total_asignaciones > 0), 0) AS SIGNED) AS ocupados,
+                    CAST(COALESCE(SUM(o.total_asignaciones), 0) AS SIGNED) AS vehiculos_estacionados
+                FROM parqueaderos p
+                LEFT JOIN parqueaderos_ocupacion o ON o.parqueadero_id = p.id
+            """
+        else:
+            query = """
+                SELECT
+                    (SELECT COUNT(*) FROM parqueaderos WHERE activo = TRUE AND tipo_espacio = 'Carro') AS total_espacios,
+                    (SELECT COUNT(DISTINCT a.parqueadero_id)
+                     FROM asignaciones a
+                     JOIN parqueaderos p ON a.parqueadero_id = p.id
+                     WHERE a.activo = TRUE AND p.tipo_espacio = 'Carro') AS ocupados,
+                    (SELECT COUNT(*) FROM asignaciones WHERE activo = TRUE) AS vehiculos_estacionados
+            """
         result = self.db.fetch_one(query)
         return result if result else {"total_espacios": 0, "ocupados": 0, "vehiculos_estacionados": 0}
 
     def obtener_ocupacion_por_sotano(self) -> Dict:
         """Obtiene la ocupación detallada por cada sótano contando solo parqueaderos de carros."""
-        query = """
-            SELECT
-                COALESCE(TRIM(p.sotano), 'Sótano-1') as sotano,
-                COUNT(DISTINCT p.id) AS total,
-                COUNT(DISTINCT CASE WHEN a.parqueadero_id IS NOT NULL THEN a.parqueadero_id END) AS ocupados
-            FROM parqueaderos p
-            LEFT JOIN asignaciones a ON p.id = a.parqueadero_id AND a.activo = TRUE
-            WHERE p.activo = TRUE AND p.tipo_espacio = 'Carro'
-            GROUP BY COALESCE(TRIM(p.sotano), 'Sótano-1')
-            ORDER BY COALESCE(TRIM(p.sotano), 'Sótano-1');
-        """
+        if self._usa_resumen_ocupacion():
+            query = """
+                SELECT
+                    COALESCE(TRIM(p.sotano), 'Sótano-1') as sotano,
+                    COUNT(*) AS total,
+                    CAST(COALESCE(SUM(o.total_asignaciones > 0), 0) AS SIGNED) AS ocupados
+                FROM parqueaderos p
+                LEFT JOIN parqueaderos_ocupacion o ON o.parqueadero_id = p.id
+                WHERE p.activo = TRUE AND p.tipo_espacio = 'Carro'
+                GROUP BY COALESCE(TRIM(p.sotano), 'Sótano-1')
+                ORDER BY COALESCE(TRIM(p.sotano), 'Sótano-1');
+            """
+        else:
+            query = """
+                SELECT
+                    COALESCE(TRIM(p.sotano), 'Sótano-1') as sotano,
+                    COUNT(DISTINCT p.id) AS total,
+                    COUNT(DISTINCT CASE WHEN a.parqueadero_id IS NOT NULL THEN a.parqueadero_id END) AS ocupados
+                FROM parqueaderos p
+                LEFT JOIN asignaciones a ON p.id = a.parqueadero_id AND a.activo = TRUE
+                WHERE p.activo = TRUE AND p.tipo_espacio = 'Carro'
+                GROUP BY COALESCE(TRIM(p.sotano), 'Sótano-1')
+                ORDER BY COALESCE(TRIM(p.sotano), 'Sótano-1');
+            """
         results = self.db.fetch_all(query)
         sotanos_data = {}
         if results:
@@ -746,6 +1083,81 @@ class ParqueaderoModel:
                 sotanos_data[row["sotano"]] = {"total": row["total"], "ocupados": row["ocupados"]}
         return sotanos_data
 
+    def reconstruir_resumen_ocupacion(self) -> Tuple[bool, str]:
+        """
+        Recalcula parqueaderos_ocupacion completa desde las asignaciones activas
+
+        Returns:
+            Tupla (éxito, mensaje de error si existe)
+        """
+        if not self._usa_resumen_ocupacion():
+            return (False, "La tabla parqueaderos_ocupacion no existe (aplique db/migrations/002)")
+        return self.db.execute_query("CALL sp_reconstruir_ocupacion()")
+
+    def verificar_resumen_ocupacion(self) -> List[Dict]:
+        """
+        Compara parqueaderos_ocupacion con los agregados calculados en vivo
+
+        A diferencia de las lecturas de la interfaz, un error no se convierte en
+        una lista vacía: "sin diferencias" solo significa que la comparación corrió.
+
+        Returns:
+            Lista de parqueaderos con diferencias: {"parqueadero_id", "numero_parqueadero",
+            "columna", "resumen", "real"} (vacía si el resumen es consistente)
+
+        Raises:
+            Error: Sin conexión, sin la tabla parqueaderos_ocupacion o si la consulta falla
+        """
+        if not self.db.ensure_connection():
+            raise Error(msg="No se pudo establecer conexión a la base de datos")
+        if not self._usa_resumen_ocupacion():
+            raise Error(msg="La tabla parqueaderos_ocupacion no existe (aplique db/migrations/002)")
+
+        columnas_resumen = ", ".join(f"o.{c} AS resumen_{c}" for c in COLUMNAS_RESUMEN)
+        columnas_real = ", ".join(f"r.{c} AS real_{c}" for c in COLUMNAS_RESUMEN)
+        diferencias_sql = " OR ".join(f"NOT (o.{c} <=> r.{c})" for c in COLUMNAS_RESUMEN)
+        query = f"""
+            SELECT p.id AS parqueadero_id, p.numero_parqueadero, {columnas_resumen}, {columnas_real}
+            FROM parqueaderos p
+            LEFT JOIN parqueaderos_ocupacion o ON o.parqueadero_id = p.id
+            JOIN (
+                SELECT
+                    p2.id AS parqueadero_id,
+                    COUNT(a.id) AS total_asignaciones,
+                    COALESCE(SUM(v.tipo_vehiculo = 'Carro'), 0) AS total_carros,
+                    MIN(f.permite_compartir) AS permite_compartir_min,
+                    COALESCE(MAX(f.pico_placa_solidario), FALSE) AS pico_placa_solidario_max,
+                    COALESCE(MAX(f.discapacidad), FALSE) AS discapacidad_max,
+                    COALESCE(MAX(f.tiene_parqueadero_exclusivo), FALSE) AS exclusivo_max,
+                    COALESCE(MAX(f.tiene_carro_hibrido OR v.tipo_circulacion = 'HÍBRIDO'), FALSE) AS hibrido_max
+                FROM parqueaderos p2
+                LEFT JOIN asignaciones a ON a.parqueadero_id = p2.id AND a.activo = TRUE
+                LEFT JOIN vehiculos v ON a.vehiculo_id = v.id
+                LEFT JOIN funcionarios f ON v.funcionario_id = f.id
+                GROUP BY p2.id
+            ) r ON r.parqueadero_id = p.id
+            WHERE {diferencias_sql}
+            ORDER BY p.numero_parqueadero
+        """
+        self.db.cursor.execute(query)
+        diferencias = []
+        for fila in self.db.cursor.fetchall():
+            for columna in COLUMNAS_RESUMEN:
+                resumen, real = fila[f"resumen_{columna}"], fila[f"real_{columna}"]
+                if resumen is None or real is None or int(resumen) != int(real):
+                    if resumen is None and real is None:
+                        continue
+                    diferencias.append(
+                        {
+                            "parqueadero_id": fila["parqueadero_id"],
+                            "numero_parqueadero": fila["numero_parqueadero"],
+                            "columna": columna,
+                            "resumen": resumen,
+                            "real": real,
+                        }
+                    )
+        return diferencias
+
     def obtener_ocupacion_por_tipo_vehiculo(self) -> Dict:
         """Obtiene la ocupación por tipo de vehículo de forma robusta."""
 
@@ -3,9 +3,10 @@
 Modelo para operaciones CRUD de vehículos
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from ..database.manager import DatabaseManager
+from ..database.version_datos import version_datos
 from ..utils.validaciones import ValidadorCampos
 from ..utils.validaciones_vehiculos import ValidadorVehiculos
 
@@ -39,7 +40,7 @@ class VehiculoModel:
             query += " AND id != %s"
             params.append(vehiculo_id)
 
-        existing = self.db.fetch_one(query, params)
+        existing = self.db.fetch_one(query, params, preparada=True)
         if existing:
             return (
                 False,
@@ -119,21 +120,137 @@ class VehiculoModel:
         """
         return self.db.fetch_all(query, (funcionario_id,))
 
+    def obtener_por_funcionarios(self, funcionario_ids: List[int], tamano_lote: int = 1000) -> Dict[int, List[Dict]]:
+        """Obtiene en bloque los vehículos activos de varios funcionarios
+
+        Equivale a llamar obtener_por_funcionario() para cada ID, con una
+        consulta IN (...) por cada lote.
+
+        Args:
+            funcionario_ids (List[int]): IDs de funcionarios
+            tamano_lote (int): Máximo de IDs por consulta
+
+        Returns:
+            Dict[int, List[Dict]]: {funcionario_id: [vehículos]} (lista vacía si no tiene)
+        """
+        ids_unicos = list(dict.fromkeys(funcionario_ids))
+        vehiculos = {funcionario_id: [] for funcionario_id in ids_unicos}
+
+        for inicio in range(0, len(ids_unicos), tamano_lote):
+            lote = ids_unicos[inicio:inicio + tamano_lote]
+            placeholders = ", ".join(["%s"] * len(lote))
+            query = f"""
+                SELECT v.*, p.numero_parqueadero
+                FROM vehiculos v
+                LEFT JOIN asignaciones a ON v.id = a.vehiculo_id AND a.activo = TRUE
+                LEFT JOIN parqueaderos p ON a.parqueadero_id = p.id
+                WHERE v.funcionario_id IN ({placeholders}) AND v.activo = TRUE
+                ORDER BY v.id
+            """
+            for vehiculo in self.db.fetch_all(query, tuple(lote)) or []:
+                vehiculos[vehiculo["funcionario_id"]].append(vehiculo)
+
+        return vehiculos
+
+    def obtener_placas_registradas(self, placas: List[str], tamano_lote: int = 1000) -> Dict[str, Dict]:
+        """Consulta en bloque qué placas ya están registradas en vehículos activos
+
+        Args:
+            placas (List[str]): Placas a consultar
+            tamano_lote (int): Máximo de placas por consulta
+
+        Returns:
+            Dict[str, Dict]: {PLACA: {"id", "tipo_vehiculo"}} con la placa en mayúsculas
+        """
+        registradas = {}
+        placas_unicas = list(dict.fromkeys(p.strip().upper() for p in placas if p and p.strip()))
+
+        for inicio in range(0, len(placas_unicas), tamano_lote):
+            lote = placas_unicas[inicio:inicio + tamano_lote]
+            placeholders = ", ".join(["%s"] * len(lote))
+            query = f"""
+                SELECT id, placa, tipo_vehiculo
+                FROM vehiculos
+                WHERE placa IN ({placeholders}) AND activo = TRUE
+            """
+            # Sin UPPER() en la columna para usar idx_placa: la colación ya ignora mayúsculas
+            for fila in self.db.fetch_all(query, tuple(lote)) or []:
+                fila["placa"] = fila["placa"].upper()
+                registradas[fila["placa"]] = fila
+
+        return registradas
+
+    def crear_masivo(self, registros: List[Dict]) -> Tuple[bool, str]:
+        """Inserta un lote de vehículos ya validados en una sola transacción
+
+        Args:
+            registros (List[Dict]): Vehículos con las claves funcionario_id, tipo_vehiculo y placa
+
+        Returns:
+            Tuple[bool, str]: (éxito, mensaje de error si existe)
+        """
+        query = """
+            INSERT INTO vehiculos (funcionario_id, tipo_vehiculo, placa)
+            VALUES (%s, %s, %s)
+        """
+        params_list = [
+            (r["funcionario_id"], r["tipo_vehiculo"], r["placa"].upper() if r.get("placa") else None)
+            for r in registros
+        ]
+        return self.db.execute_many(query, params_list)
+
+    def obtener_ids_por_funcionarios(
+        self, funcionario_ids: List[int], tamano_lote: int = 1000
+    ) -> Dict[Tuple[int, str, Optional[str]], int]:
+        """Resuelve en bloque los IDs de los vehículos activos de varios funcionarios
+
+        Pensado para recuperar los IDs tras crear_masivo(): las bicicletas no
+        tienen placa, por lo que la clave incluye funcionario y tipo.
+
+        Args:
+            funcionario_ids (List[int]): IDs de funcionarios
+            tamano_lote (int): Máximo de IDs por consulta
+
+        Returns:
+            Dict[Tuple[int, str, Optional[str]], int]:
+                {(funcionario_id, tipo_vehiculo, PLACA o None): id más reciente}
+        """
+        ids = {}
+        ids_unicos = list(dict.fromkeys(funcionario_ids))
+
+        for inicio in range(0, len(ids_unicos), tamano_lote):
+            lote = ids_unicos[inicio:inicio + tamano_lote]
+            placeholders = ", ".join(["%s"] * len(lote))
+            query = f"""
+                SELECT id, funcionario_id, tipo_vehiculo, UPPER(placa) AS placa
+                FROM vehiculos
+                WHERE funcionario_id IN ({placeholders}) AND activo = TRUE
+                ORDER BY id
+            """
+            for fila in self.db.fetch_all(query, tuple(lote)) or []:
+                ids[(fila["funcionario_id"], fila["tipo_vehiculo"], fila["placa"] or None)] = fila["id"]
+
+        return ids
+
     def obtener_sin_asignar(self, tipo_circulacion: str = None) -> List[Dict]:
-        """Obtiene vehículos sin parqueadero asignado"""
+        """Obtiene vehículos sin parqueadero asignado, con las excepciones del funcionario"""
         query = """
-            SELECT v.*, f.nombre, f.apellidos, f.cedula
+            SELECT v.*, f.nombre, f.apellidos, f.cedula, f.cargo,
+                   f.pico_placa_solidario, f.discapacidad,
+                   f.tiene_parqueadero_exclusivo, f.tiene_carro_hibrido
             FROM vehiculos v
             JOIN funcionarios f ON v.funcionario_id = f.id
             LEFT JOIN asignaciones a ON v.id = a.vehiculo_id AND a.activo = TRUE
             WHERE v.activo = TRUE AND a.id IS NULL AND v.tipo_vehiculo = 'Carro'
         """
+        params = None
 
         if tipo_circulacion:
-            query += f" AND v.tipo_circulacion = '{tipo_circulacion}'"
+            query += " AND v.tipo_circulacion = %s"
+            params = (tipo_circulacion,)
 
         query += " ORDER BY f.apellidos, f.nombre"
-        return self.db.fetch_all(query)
+        return self.db.fetch_all(query, params)
 
     def obtener_todos(self) -> List[Dict]:
         """Obtiene todos los vehículos con información de funcionario y parqueadero"""
@@ -324,6 +441,7 @@ class VehiculoModel:
 
             # Confirmar transacción
             self.db.connection.commit()
+            version_datos.incrementar()
 
             return (
                 True,
@@ -380,6 +498,7 @@ class VehiculoModel:
 
             # Confirmar transacción
             self.db.connection.commit()
+            version_datos.incrementar()
 
             return True, f"Vehículo {vehiculo['placa']} eliminado permanentemente"
 
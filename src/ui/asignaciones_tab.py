@@ -28,6 +28,7 @@ from ..database.manager import DatabaseManager
 from ..models.parqueadero import ParqueaderoModel
 from ..models.vehiculo import VehiculoModel
 from ..utils.formatters import format_numero_parqueadero
+from ..utils.motor_elegibilidad import InstantaneaOcupacion, PerfilVehiculo
 
 # Nuevas utilidades de refactorización
 from .utils import UIDialogs
@@ -712,6 +713,8 @@ class AsignacionesTab(QWidget):
         self.db = db_manager
         self.vehiculo_model = VehiculoModel(self.db)
         self.parqueadero_model = ParqueaderoModel(self.db)
+        # Ocupación en memoria para los combos; se descarta al recargar asignaciones
+        self._ocupacion = None
         self.setup_ui()
         self.cargar_sotanos()
         self.cargar_asignaciones()
@@ -1095,11 +1098,33 @@ class AsignacionesTab(QWidget):
         )
         self.btn_asignar.clicked.connect(self.realizar_asignacion)
 
-        # Contenedor para centrar verticalmente el botón con las observaciones
+        # Asignación masiva de todos los vehículos sin asignar
+        self.btn_asignacion_automatica = QPushButton("⚡ Asignación Automática")
+        self.btn_asignacion_automatica.setFixedSize(180, 30)
+        self.btn_asignacion_automatica.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #34495e;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 11px;
+            }
+            QPushButton:hover {
+                background-color: #2c3e50;
+            }
+        """
+        )
+        self.btn_asignacion_automatica.clicked.connect(self.abrir_asignacion_automatica)
+
+        # Contenedor para centrar verticalmente los botones con las observaciones
         btn_container = QWidget()
         btn_container_layout = QVBoxLayout(btn_container)
-        btn_container_layout.setContentsMargins(0, 11, 0, 11)
+        btn_container_layout.setContentsMargins(0, 0, 0, 0)
+        btn_container_layout.setSpacing(4)
         btn_container_layout.addWidget(self.btn_asignar)
+        btn_container_layout.addWidget(self.btn_asignacion_automatica)
 
         assign_layout.addWidget(btn_container, 1, 5)
 
@@ -1471,177 +1496,23 @@ class AsignacionesTab(QWidget):
             self.combo_parqueadero_disponible.addItem("-- Seleccione parqueadero --", None)
 
             if vehiculo_data and sotano_seleccionado:
-                tipo_vehiculo = vehiculo_data.get("tipo_vehiculo", "Carro")
-                funcionario_id = vehiculo_data.get("funcionario_id")
-
-                # Para CARROS: buscar disponibles y parcialmente asignados con complemento
-                if tipo_vehiculo == "Carro":
-                    # VERIFICAR EXCEPCIONES DE PICO Y PLACA
-                    # Vehículos con excepciones SOLO pueden usar parqueaderos 100% DISPONIBLES
-                    pico_placa_solidario = vehiculo_data.get("pico_placa_solidario", False)
-                    discapacidad = vehiculo_data.get("discapacidad", False)
-                    es_hibrido = vehiculo_data.get("tipo_circulacion", "") == "HÍBRIDO"
-
-                    # Verificar si el funcionario tiene parqueadero exclusivo directivo
-                    query_check_exclusivo = """
-                        SELECT tiene_parqueadero_exclusivo, cargo
-                        FROM funcionarios
-                        WHERE id = %s AND activo = TRUE
-                    """
-                    func_data = self.db.fetch_one(query_check_exclusivo, (funcionario_id,))
-                    tiene_exclusivo = func_data and func_data.get("tiene_parqueadero_exclusivo", False)
-                    # Si tiene parqueadero exclusivo, es directivo exclusivo (sin restricción de cargo)
-                    es_directivo_exclusivo = tiene_exclusivo
-
-                    # REGLA CRÍTICA: Vehículos con CUALQUIER excepción NO comparten parqueadero
-                    tiene_excepcion_pico_placa = (
-                        pico_placa_solidario or
-                        discapacidad or
-                        es_hibrido or
-                        es_directivo_exclusivo
-                    )
-
-                    # Obtener parqueaderos disponibles para carros
-                    # NOTA: "Disponible" puede incluir parqueaderos con 1 carro (parcialmente asignado para carros)
-                    parqueaderos_disponibles = self.parqueadero_model.obtener_todos(
-                        sotano=sotano_seleccionado, tipo_vehiculo="Carro", estado="Disponible"
-                    )
-
-                    todos_parqueaderos = {p["id"]: p for p in parqueaderos_disponibles}
-
-                    # APLICAR RESTRICCIONES SEGÚN EXCEPCIONES
-                    if tiene_excepcion_pico_placa and es_directivo_exclusivo:
-                        # CASO ESPECIAL: Directivo con parqueadero exclusivo
-                        # Buscar parqueaderos que ya tienen vehículos de este directivo
-                        query_parqueaderos_directivo = """
-                            SELECT DISTINCT p.id, p.numero_parqueadero, p.estado,
-                                   COALESCE(p.sotano, 'Sótano-1') as sotano,
-                                   COUNT(a.id) as vehiculos_asignados
-                            FROM parqueaderos p
-                            JOIN asignaciones a ON p.id = a.parqueadero_id AND a.activo = TRUE
-                            JOIN vehiculos v ON a.vehiculo_id = v.id
-                            WHERE v.funcionario_id = %s
-                            AND COALESCE(p.sotano, 'Sótano-1') = %s
-                            GROUP BY p.id, p.numero_parqueadero, p.estado, p.sotano
-                            HAVING COUNT(a.id) < 4
-                        """
-                        parqueaderos_directivo = self.db.fetch_all(
-                            query_parqueaderos_directivo, (funcionario_id, sotano_seleccionado)
-                        )
-
-                        # Agregar parqueaderos del directivo que aún tienen espacio
-                        for park in parqueaderos_directivo:
-                            park["estado_display"] = f"Parcial ({park['vehiculos_asignados']}/4)"
-                            todos_parqueaderos[park["id"]] = park
-
-                    elif tiene_excepcion_pico_placa:
-                        # VEHÍCULOS CON EXCEPCIÓN (Híbrido, Discapacidad, Pico y Placa Solidario)
-                        # REGLA: SOLO parqueaderos SIN CARROS (pueden tener motos/bicicletas)
-                        if pico_placa_solidario:
-                            pass  # Excepción detectada
-                        if discapacidad:
-                            pass  # Excepción detectada
-                        if es_hibrido:
-                            pass  # Excepción detectada
-
-                        # FILTRAR parqueaderos que tengan CARROS
-                        parqueaderos_sin_carros = []
-                        for p in parqueaderos_disponibles:
-                            query_count_carros = """
-                                SELECT COUNT(*) as total_carros
-                                FROM asignaciones a
-                                JOIN vehiculos v ON a.vehiculo_id = v.id
-                                WHERE a.parqueadero_id = %s
-                                AND a.activo = TRUE
-                                AND v.tipo_vehiculo = 'Carro'
-                            """
-                            count_result = self.db.fetch_one(query_count_carros, (p["id"],))
-                            total_carros = count_result.get("total_carros", 0) if count_result else 0
-
-                            # Solo agregar si NO tiene NINGÚN CARRO asignado
-                            if total_carros == 0:
-                                parqueaderos_sin_carros.append(p)
-                            else:
-                                pass  # Parqueadero con carros, no agregar
-
-                        # Reemplazar todos_parqueaderos con los que no tienen carros
-                        todos_parqueaderos = {p["id"]: p for p in parqueaderos_sin_carros}
-                        # NO agregar parqueaderos parcialmente asignados con carros
-
-                    else:
-                        # Funcionarios regulares SIN excepción: pueden usar parcialmente asignados con complemento PAR/IMPAR
-                        parqueaderos_complemento = self.parqueadero_model.obtener_disponibles(
-                            vehiculo_data["tipo_circulacion"]
-                        )
-
-                        # Filtrar por sótano y VALIDAR que solo tengan 1 carro asignado
-                        parqueaderos_complemento_sotano = []
-                        for p in parqueaderos_complemento:
-                            if p.get("sotano", "Sótano-1") == sotano_seleccionado:
-                                # VALIDACIÓN 1: Contar cuántos carros hay asignados
-                                query_count_carros = """
-                                    SELECT COUNT(*) as total_carros
-                                    FROM asignaciones a
-                                    JOIN vehiculos v ON a.vehiculo_id = v.id
-                                    WHERE a.parqueadero_id = %s
-                                    AND a.activo = TRUE
-                                    AND v.tipo_vehiculo = 'Carro'
-                                """
-                                count_result = self.db.fetch_one(query_count_carros, (p["id"],))
-                                total_carros = count_result.get("total_carros", 0) if count_result else 0
-
-                                # Solo continuar si tiene EXACTAMENTE 1 carro (no 2 o más)
-                                if total_carros == 1:
-                                    # VALIDACIÓN 2 (CRÍTICA): Verificar que el carro asignado NO tenga excepción
-                                    # Si el parqueadero tiene un vehículo con excepción, NO debe mostrarse a nadie más
-                                    query_check_excepcion = """
-                                        SELECT v.tipo_circulacion,
-                                               f.pico_placa_solidario,
-                                               f.discapacidad,
-                                               f.tiene_parqueadero_exclusivo
-                                        FROM asignaciones a
-                                        JOIN vehiculos v ON a.vehiculo_id = v.id
-                                        JOIN funcionarios f ON v.funcionario_id = f.id
-                                        WHERE a.parqueadero_id = %s
-                                        AND a.activo = TRUE
-                                        AND v.tipo_vehiculo = 'Carro'
-                                        LIMIT 1
-                                    """
-                                    vehiculo_en_parqueadero = self.db.fetch_one(query_check_excepcion, (p["id"],))
-
-                                    if vehiculo_en_parqueadero:
-                                        tiene_excepcion_en_parqueadero = (
-                                            vehiculo_en_parqueadero.get("pico_placa_solidario", False) or
-                                            vehiculo_en_parqueadero.get("discapacidad", False) or
-                                            vehiculo_en_parqueadero.get("tipo_circulacion") == "HÍBRIDO" or
-                                            vehiculo_en_parqueadero.get("tiene_parqueadero_exclusivo", False)
-                                        )
-
-                                        # Si el vehículo en el parqueadero tiene excepción, NO agregar este parqueadero
-                                        if not tiene_excepcion_en_parqueadero:
-                                            parqueaderos_complemento_sotano.append(p)
-                                        else:
-                                            pass  # Parqueadero con vehiculo con excepcion, no agregar
-
-                        todos_parqueaderos.update({p["id"]: p for p in parqueaderos_complemento_sotano})
-
-                # Para MOTOS y BICICLETAS: solo buscar completamente disponibles
-                else:
-                    # Motos y bicicletas solo ocupan parqueaderos disponibles (estado='Disponible')
-                    parqueaderos_disponibles = self.parqueadero_model.obtener_todos(
-                        sotano=sotano_seleccionado, tipo_vehiculo=tipo_vehiculo, estado="Disponible"
-                    )
-                    todos_parqueaderos = {p["id"]: p for p in parqueaderos_disponibles}
-
-                # Llenar el combo con los parqueaderos encontrados
-                for park in sorted(todos_parqueaderos.values(), key=lambda x: x["numero_parqueadero"]):
-                    estado_str = park.get("estado_display", park["estado"]).replace("_", " ")
-                    texto = f"{format_numero_parqueadero(park['numero_parqueadero'])} ({estado_str})"
-                    self.combo_parqueadero_disponible.addItem(texto, park["id"])
+                # Elegibilidad resuelta en memoria (excepciones, complemento PAR/IMPAR
+                # y cupos del directivo exclusivo), sin consultas por parqueadero
+                perfil = PerfilVehiculo.desde_fila(vehiculo_data)
+                for espacio in self.ocupacion().candidatos(perfil, sotano_seleccionado):
+                    estado_str = espacio.estado_display.replace("_", " ")
+                    texto = f"{format_numero_parqueadero(espacio.numero_parqueadero)} ({estado_str})"
+                    self.combo_parqueadero_disponible.addItem(texto, espacio.id)
 
         except Exception as e:
             print(f"Error al cargar parqueaderos por sótano: {e}")
 
+    def ocupacion(self) -> InstantaneaOcupacion:
+        """Instantánea de ocupación, cargada la primera vez que se necesita"""
+        if self._ocupacion is None:
+            self._ocupacion = InstantaneaOcupacion.cargar(self.db)
+        return self._ocupacion
+
     def mostrar_info_vehiculo_seleccionado(self):
         """Carga parqueaderos cuando se selecciona un vehículo (mantiene compatibilidad)"""
         # Cargar parqueaderos si ya hay un sótano seleccionado
@@ -1699,7 +1570,9 @@ class AsignacionesTab(QWidget):
         discapacidad = vehiculo_data.get("discapacidad", False)
 
         # Realizar asignación usando el modelo (validaciones adicionales en modelo)
-        exito, mensaje = self.parqueadero_model.asignar_vehiculo(vehiculo_data["id"], parqueadero_id, observaciones)
+        exito, mensaje = self.parqueadero_model.asignar_vehiculo(
+            vehiculo_data["id"], parqueadero_id, observaciones, instantanea=self._ocupacion
+        )
 
         if exito:
             # Agregar indicadores al mensaje si aplica
@@ -1724,11 +1597,23 @@ class AsignacionesTab(QWidget):
         else:
             UIDialogs.show_error(self, "Error en Asignacion", mensaje)
 
+    def abrir_asignacion_automatica(self):
+        """Abre el diálogo de asignación automática y recarga si se confirmó"""
+        from .dialogo_asignacion_automatica import AsignacionAutomaticaDialog
+
+        dialog = AsignacionAutomaticaDialog(self.db, self)
+        if dialog.exec_() == QDialog.Accepted:
+            self.cargar_vehiculos_sin_asignar()
+            self.cargar_asignaciones()
+            self.cargar_parqueaderos_por_sotano()
+            self.asignacion_actualizada.emit()
+
     def cargar_asignaciones(self):
         """Carga las asignaciones actuales en la tabla"""
         try:
             # Forzar reconexión para ver commits frescos de otros threads
             self.db.force_reconnect()
+            self._ocupacion = None
 
             # Verificar si existe la columna sotano
             check_query = "SHOW COLUMNS FROM parqueaderos LIKE 'sotano'"
@@ -17,6 +17,8 @@ from PyQt5.QtWidgets import (
 
 from ..database.manager import DatabaseManager
 from ..models.parqueadero import ParqueaderoModel
+from ..utils.rollups_historial import ConsultasRollups, SerieTendencia
+from .widgets.grafica_tendencia import GraficaTendencia
 
 
 class DashboardWidget(QWidget):
@@ -30,6 +32,13 @@ class DashboardWidget(QWidget):
         self.db = db_manager
         self.parqueadero_model = ParqueaderoModel(self.db)
 
+        # Tendencias desde los rollups de ocupación (migración 005), en caché entre refrescos
+        consultas_rollups = ConsultasRollups(self.db)
+        self._rollups_disponibles = None
+        self.consultas_rollups = consultas_rollups
+        self.tendencia_sotanos = SerieTendencia(consultas_rollups, por="sotano")
+        self.tendencia_tipos = SerieTendencia(consultas_rollups, por="tipo")
+
         self.setup_ui()
 
         # Timer para actualizar las estadísticas cada 30 segundos
@@ -108,6 +117,24 @@ class DashboardWidget(QWidget):
 
         main_layout.addLayout(columns_layout)
 
+        # Tendencias de ocupación (últimos días)
+        tendencias_frame, tendencias_content = self._crear_seccion_frame("Tendencia de Ocupación")
+        tendencias_layout = QVBoxLayout(tendencias_content)
+        tendencias_layout.setContentsMargins(0, 0, 0, 0)
+        graficas_layout = QHBoxLayout()
+        graficas_layout.setSpacing(8)
+        self.grafica_sotanos = GraficaTendencia("Por sótano", "% ocupado", y_max=100)
+        self.grafica_tipos = GraficaTendencia("Por tipo de vehículo", "vehículos")
+        graficas_layout.addWidget(self.grafica_sotanos)
+        graficas_layout.addWidget(self.grafica_tipos)
+        tendencias_layout.addLayout(graficas_layout)
+        self.lbl_tendencias = QLabel("")
+        self.lbl_tendencias.setStyleSheet("font-size: 11px; color: #6B7280;")
+        self.lbl_tendencias.setAlignment(Qt.AlignCenter)
+        self.lbl_tendencias.hide()
+        tendencias_layout.addWidget(self.lbl_tendencias)
+        main_layout.addWidget(tendencias_frame, 1)
+
     def _crear_kpi_card(self, title, value, icon, color):
         """Crea una tarjeta de indicador clave (KPI) con un diseño mejorado."""
         card = QFrame()
@@ -307,6 +334,29 @@ class DashboardWidget(QWidget):
         except Exception as e:
             print(f"Error al actualizar estadísticas: {e}")
 
+        self.update_tendencias()
+
+    def update_tendencias(self):
+        """Actualiza las gráficas de tendencia: solo consulta y repinta los puntos nuevos."""
+        # Verificar una vez si la migración 005 está aplicada (es estructura, no datos)
+        if self._rollups_disponibles is None:
+            self._rollups_disponibles = self.consultas_rollups.disponible()
+            if not self._rollups_disponibles:
+                self.lbl_tendencias.setText(
+                    "Las tendencias requieren la migración db/migrations/005_rollups_historial.sql"
+                )
+                self.lbl_tendencias.show()
+                self.grafica_sotanos.hide()
+                self.grafica_tipos.hide()
+        if not self._rollups_disponibles:
+            return
+
+        try:
+            self.grafica_sotanos.mostrar(self.tendencia_sotanos.actualizar())
+            self.grafica_tipos.mostrar(self.tendencia_tipos.actualizar())
+        except Exception as e:
+            print(f"Error al actualizar tendencias: {e}")
+
     def update_sotanos_details(self):
         """Actualiza los detalles de ocupación por sótano."""
         try:
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Diálogo de asignación automática de parqueaderos a vehículos sin asignar
+"""
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QListWidget,
+    QListWidgetItem,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from ..models.parqueadero import ParqueaderoModel
+from ..models.vehiculo import VehiculoModel
+from ..utils.asignacion_automatica import PlanAsignacion, PlanificadorAsignacion
+from ..utils.formatters import format_numero_parqueadero
+from ..utils.motor_elegibilidad import InstantaneaOcupacion
+
+COLUMNAS = ["Placa", "Funcionario", "Circulación", "Sótano", "Parqueadero", "Observación"]
+# Pares rechazados listados al confirmar
+MAX_DETALLES_RECHAZO = 10
+
+
+class AsignacionAutomaticaDialog(QDialog):
+    """Calcula un plan de asignación, lo muestra y lo confirma en una sola transacción"""
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db = db_manager
+        self.vehiculo_model = VehiculoModel(self.db)
+        self.parqueadero_model = ParqueaderoModel(self.db)
+        self.plan = None
+        self.setWindowTitle("Asignación automática")
+        self.resize(950, 600)
+        self.setup_ui()
+        self.cargar_sotanos()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        superior = QHBoxLayout()
+        columna_sotanos = QVBoxLayout()
+        columna_sotanos.addWidget(QLabel("Sótanos a usar (arrastre para ordenar por preferencia):"))
+        self.lista_sotanos = QListWidget()
+        self.lista_sotanos.setDragDropMode(QAbstractItemView.InternalMove)
+        self.lista_sotanos.setMaximumHeight(110)
+        columna_sotanos.addWidget(self.lista_sotanos)
+        superior.addLayout(columna_sotanos)
+
+        self.lbl_resumen = QLabel("Presione 'Calcular plan' para ver la propuesta")
+        self.lbl_resumen.setWordWrap(True)
+        superior.addWidget(self.lbl_resumen, 1)
+        layout.addLayout(superior)
+
+        self.tabla = QTableWidget(0, len(COLUMNAS))
+        self.tabla.setHorizontalHeaderLabels(COLUMNAS)
+        self.tabla.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tabla.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tabla.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.tabla.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(self.tabla)
+
+        botones = QHBoxLayout()
+        btn_calcular = QPushButton("Calcular plan")
+        btn_calcular.clicked.connect(self.calcular_plan)
+        self.btn_confirmar = QPushButton("Confirmar asignaciones")
+        self.btn_confirmar.setEnabled(False)
+        self.btn_confirmar.clicked.connect(self.confirmar)
+        btn_cancelar = QPushButton("Cancelar")
+        btn_cancelar.clicked.connect(self.reject)
+        botones.addWidget(btn_calcular)
+        botones.addStretch()
+        botones.addWidget(self.btn_confirmar)
+        botones.addWidget(btn_cancelar)
+        layout.addLayout(botones)
+
+    def cargar_sotanos(self):
+        """Llena la lista de sótanos, todos marcados"""
+        for sotano in self.parqueadero_model.obtener_sotanos_disponibles():
+            item = QListWidgetItem(sotano)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            self.lista_sotanos.addItem(item)
+
+    def sotanos_seleccionados(self) -> list:
+        """Sótanos marcados, en el orden de la lista"""
+        return [
+            self.lista_sotanos.item(i).text()
+            for i in range(self.lista_sotanos.count())
+            if self.lista_sotanos.item(i).checkState() == Qt.Checked
+        ]
+
+    def calcular_plan(self):
+        """Carga vehículos y ocupación actuales y calcula la propuesta"""
+        sotanos = self.sotanos_seleccionados()
+        if not sotanos:
+            QMessageBox.warning(self, "Asignación automática", "Seleccione al menos un sótano")
+            return
+
+        # Reconectar para planificar sobre los datos más recientes
+        self.db.force_reconnect()
+        vehiculos = self.vehiculo_model.obtener_sin_asignar() or []
+        ocupacion = InstantaneaOcupacion.cargar(self.db)
+        self.plan = PlanificadorAsignacion(ocupacion, sotanos).planificar(vehiculos)
+        self.mostrar_plan(self.plan)
+
+    def mostrar_plan(self, plan: PlanAsignacion):
+        """Muestra el plan en la tabla (asignados primero)"""
+        filas = [(fila, espacio, "") for fila, espacio in plan.asignaciones]
+        filas += [(fila, None, motivo) for fila, motivo in plan.sin_asignar]
+
+        self.tabla.setRowCount(len(filas))
+        for i, (fila, espacio, motivo) in enumerate(filas):
+            valores = [
+                fila.get("placa", ""),
+                f"{fila.get('nombre', '')} {fila.get('apellidos', '')}".strip(),
+                fila.get("tipo_circulacion", ""),
+                espacio.sotano if espacio else "",
+                format_numero_parqueadero(espacio.numero_parqueadero) if espacio else "",
+                motivo,
+            ]
+            for j, valor in enumerate(valores):
+                self.tabla.setItem(i, j, QTableWidgetItem(str(valor or "")))
+
+        self.lbl_resumen.setText(
+            f"✅ {len(plan.asignaciones)} vehículos a asignar usando {plan.espacios_libres_usados} "
+            f"parqueaderos libres\n⚠️ {len(plan.sin_asignar)} vehículos sin espacio elegible"
+        )
+        self.btn_confirmar.setEnabled(bool(plan.asignaciones))
+
+    def confirmar(self):
+        """Guarda el plan en una sola transacción, revalidando cada par contra la ocupación vigente"""
+        if not self.plan or not self.plan.asignaciones:
+            return
+
+        respuesta = QMessageBox.question(
+            self,
+            "Confirmar asignación automática",
+            f"¿Asignar {len(self.plan.asignaciones)} vehículos?",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if respuesta != QMessageBox.Yes:
+            return
+
+        exito, error, rechazados = self.parqueadero_model.asignar_masivo(self.plan.pares())
+        if not exito:
+            # La transacción se revierte completa: no queda ninguna asignación parcial
+            QMessageBox.critical(self, "Error", f"No se guardó ninguna asignación:\n{error}")
+            self.btn_confirmar.setEnabled(False)
+            return
+
+        asignados = len(self.plan.asignaciones) - len(rechazados)
+        if not rechazados:
+            QMessageBox.information(self, "Asignación automática", f"Se asignaron {asignados} vehículos")
+            self.accept()
+            return
+
+        # La ocupación cambió desde que se calculó el plan: informar los pares omitidos
+        placas = {fila["id"]: fila.get("placa", "") for fila, _ in self.plan.asignaciones}
+        detalle = "\n".join(
+            f"• {placas.get(vehiculo_id, vehiculo_id)}: {motivo.splitlines()[0]}"
+            for vehiculo_id, motivo in list(rechazados.items())[:MAX_DETALLES_RECHAZO]
+        )
+        if len(rechazados) > MAX_DETALLES_RECHAZO:
+            detalle += f"\n... y {len(rechazados) - MAX_DETALLES_RECHAZO} más"
+        QMessageBox.warning(
+            self,
+            "Asignación automática",
+            f"Se asignaron {asignados} vehículos.\n\n"
+            f"{len(rechazados)} no se asignaron porque la ocupación cambió desde que se calculó el plan:\n"
+            f"{detalle}\n\nVuelva a calcular el plan para ubicarlos.",
+        )
+        self.accept()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Diálogo de administración con las estadísticas de consultas SQL
+"""
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QMessageBox,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+
+from ..database.estadisticas_consultas import EstadisticasConsultas, estadisticas
+
+# (clave del resumen, encabezado)
+COLUMNAS = [
+    ("huella", "Consulta"),
+    ("llamadas", "Llamadas"),
+    ("total_ms", "Total (ms)"),
+    ("promedio_ms", "Prom. (ms)"),
+    ("p95_ms", "p95 (ms)"),
+    ("max_ms", "Máx. (ms)"),
+    ("filas", "Filas"),
+    ("lentas", "Lentas"),
+    ("origen_principal", "Origen principal"),
+]
+
+ORDENES = [
+    ("total_ms", "Tiempo total"),
+    ("llamadas", "Llamadas"),
+    ("max_ms", "Máximo"),
+    ("lentas", "Lentas"),
+]
+
+
+class EstadisticasConsultasDialog(QDialog):
+    """Muestra qué consultas (y qué pantallas) concentran la carga sobre MySQL"""
+
+    def __init__(self, fuente: EstadisticasConsultas = estadisticas, parent=None):
+        super().__init__(parent)
+        self.fuente = fuente
+        self.setWindowTitle("Estadísticas de consultas")
+        self.resize(1100, 600)
+        self.setup_ui()
+        self.cargar()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        barra = QHBoxLayout()
+        self.lbl_totales = QLabel()
+        barra.addWidget(self.lbl_totales)
+        barra.addStretch()
+        barra.addWidget(QLabel("Ordenar por:"))
+        self.combo_orden = QComboBox()
+        for clave, texto in ORDENES:
+            self.combo_orden.addItem(texto, clave)
+        self.combo_orden.currentIndexChanged.connect(self.cargar)
+        barra.addWidget(self.combo_orden)
+        layout.addLayout(barra)
+
+        self.tabla = QTableWidget(0, len(COLUMNAS))
+        self.tabla.setHorizontalHeaderLabels([titulo for _, titulo in COLUMNAS])
+        self.tabla.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tabla.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tabla.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        for columna in range(1, len(COLUMNAS)):
+            self.tabla.horizontalHeader().setSectionResizeMode(columna, QHeaderView.ResizeToContents)
+        layout.addWidget(self.tabla)
+
+        botones = QHBoxLayout()
+        btn_actualizar = QPushButton("Actualizar")
+        btn_actualizar.clicked.connect(self.cargar)
+        btn_reiniciar = QPushButton("Reiniciar")
+        btn_reiniciar.clicked.connect(self.reiniciar)
+        btn_exportar = QPushButton("Exportar...")
+        btn_exportar.clicked.connect(self.exportar)
+        btn_cerrar = QPushButton("Cerrar")
+        btn_cerrar.clicked.connect(self.accept)
+        for boton in (btn_actualizar, btn_reiniciar, btn_exportar):
+            botones.addWidget(boton)
+        botones.addStretch()
+        botones.addWidget(btn_cerrar)
+        layout.addLayout(botones)
+
+    def cargar(self):
+        """Recarga la tabla desde las estadísticas en memoria"""
+        totales = self.fuente.totales()
+        self.lbl_totales.setText(
+            f"{totales['llamadas']} consultas · {totales['huellas']} distintas · "
+            f"{totales['total_ms'] / 1000:.2f} s en total · {totales['lentas']} lentas "
+            f"(≥ {self.fuente.umbral_lento_ms} ms)"
+        )
+
+        filas = self.fuente.resumen(orden=self.combo_orden.currentData())
+        self.tabla.setRowCount(len(filas))
+        for i, fila in enumerate(filas):
+            for j, (clave, _) in enumerate(COLUMNAS):
+                item = QTableWidgetItem()
+                valor = fila[clave]
+                if isinstance(valor, (int, float)):
+                    # Orden numérico al hacer clic en el encabezado
+                    item.setData(Qt.DisplayRole, valor)
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                else:
+                    item.setText(str(valor))
+                    item.setToolTip(str(valor))
+                self.tabla.setItem(i, j, item)
+
+    def reiniciar(self):
+        """Descarta las estadísticas acumuladas"""
+        respuesta = QMessageBox.question(
+            self, "Reiniciar estadísticas", "¿Descartar las estadísticas acumuladas?", QMessageBox.Yes | QMessageBox.No
+        )
+        if respuesta == QMessageBox.Yes:
+            self.fuente.reiniciar()
+            self.cargar()
+
+    def exportar(self):
+        """Exporta las estadísticas a CSV o JSON"""
+        ruta, filtro = QFileDialog.getSaveFileName(
+            self, "Exportar estadísticas", "estadisticas_consultas.csv", "CSV (*.csv);;JSON (*.json)"
+        )
+        if not ruta:
+            return
+
+        try:
+            if ruta.lower().endswith(".json") or filtro.startswith("JSON"):
+                self.fuente.exportar_json(ruta)
+            else:
+                self.fuente.exportar_csv(ruta)
+            QMessageBox.information(self, "Éxito", f"Estadísticas exportadas a:\n{ruta}")
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo exportar: {e}")
@@ -3,7 +3,7 @@
 Módulo de la pestaña Funcionarios del sistema de gestión de parqueadero
 """
 
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from PyQt5.QtGui import QBrush, QColor, QFont
 from PyQt5.QtWidgets import (
     QComboBox,
@@ -17,6 +17,7 @@ from PyQt5.QtWidgets import (
     QLabel,
     QLineEdit,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QTableWidget,
     QTableWidgetItem,
@@ -25,8 +26,9 @@ from PyQt5.QtWidgets import (
 )
 
 from ..config.settings import CARGOS_DISPONIBLES, DIRECCIONES_DISPONIBLES
-from ..database.manager import DatabaseManager
+from ..database.manager import ConexionIndependiente, DatabaseManager
 from ..models.funcionario import FuncionarioModel
+from ..utils.dependencias import faltantes, mensaje_instalacion
 from ..utils.formatters import format_numero_parqueadero
 
 # Nuevas utilidades de refactorización
@@ -34,6 +36,72 @@ from .utils import InputValidators
 from .utils.button_factory import ButtonFactory
 
 
+class ImportarFuncionariosWorker(QThread):
+    """
+    Worker thread para importar funcionarios desde Excel sin bloquear la UI.
+
+    Lee el Excel/CSV por lotes en ambos modos:
+        - confirmar=False: solo validación (dry run), sin conservar los registros
+        - confirmar=True: vuelve a leer el archivo e inserta cada lote válido
+    """
+
+    progreso = pyqtSignal(int, int, str)  # (procesados, total, etapa)
+    finished = pyqtSignal(object, str)  # (ResultadoImportacion o None, mensaje_error)
+
+    def __init__(self, db_config, archivo: str, confirmar: bool = False):
+        super().__init__()
+        self.db_config = db_config
+        self.archivo = archivo
+        self.confirmar = confirmar
+
+    def run(self):
+        """Ejecuta la fase correspondiente con una conexión propia"""
+        try:
+            from ..utils.importacion_funcionarios import COLUMNAS_OPCIONALES, COLUMNAS_REQUERIDAS, ImportadorFuncionarios
+
+            with ConexionIndependiente(self.db_config) as db:
+                if not db.connection:
+                    self.finished.emit(None, "No se pudo establecer conexión a la base de datos")
+                    return
+
+                importador = ImportadorFuncionarios(db)
+
+                from ..utils.lector_importacion import LectorImportacion
+
+                self.progreso.emit(0, 0, "Leyendo archivo...")
+                try:
+                    lector = LectorImportacion(self.archivo)
+                except Exception as e:
+                    self.finished.emit(
+                        None,
+                        f"No se pudo leer el archivo.\n\nError: {str(e)}\n\n"
+                        "Asegúrese de que el archivo no esté abierto en otra aplicación."
+                    )
+                    return
+
+                with lector:
+                    columnas_faltantes = importador.columnas_faltantes(lector.columnas)
+                    if columnas_faltantes:
+                        self.finished.emit(
+                            None,
+                            f"El archivo no tiene las columnas requeridas.\n\n"
+                            f"Columnas faltantes: {', '.join(columnas_faltantes)}\n\n"
+                            f"Columnas requeridas:\n{', '.join(COLUMNAS_REQUERIDAS)}\n\n"
+                            f"Columnas opcionales:\n{', '.join(COLUMNAS_OPCIONALES)}"
+                        )
+                        return
+
+                    # Validación (e inserción, si se confirmó) lote a lote mientras se lee el archivo
+                    resultado = importador.importar_lotes(
+                        lector, dry_run=not self.confirmar, progreso=self.progreso.emit
+                    )
+
+                self.finished.emit(resultado, "")
+
+        except Exception as e:
+            self.finished.emit(None, f"Ocurrió un error durante la importación:\n\n{str(e)}")
+
+
 class FuncionariosTab(QWidget):
     """Pestaña de gestión de funcionarios"""
 
@@ -52,6 +120,11 @@ class FuncionariosTab(QWidget):
         self.total_funcionarios = 0
         self.funcionarios_completos = []  # Lista completa de funcionarios
 
+        # Importación masiva en segundo plano
+        self.importar_worker = None
+        self.progress_importacion = None
+        self.archivo_importacion = None
+
         self.setup_ui()
         self.cargar_funcionarios()
 
@@ -1737,214 +1810,142 @@ class FuncionariosTab(QWidget):
         self.lbl_resultados.setText("")
 
     def importar_desde_excel(self):
-        """Importa funcionarios masivamente desde un archivo Excel (.xlsx o .xls)"""
-        try:
-            # Verificar si pandas y openpyxl están instalados
-            try:
-                import pandas as pd
-            except ImportError:
-                QMessageBox.critical(
-                    self,
-                    "Error de Dependencias",
-                    "La librería 'pandas' no está instalada.\n\n"
-                    "Para usar esta función, ejecute:\n"
-                    "pip install pandas openpyxl xlrd"
-                )
-                return
+        """
+        Importa funcionarios masivamente desde un archivo Excel (.xlsx o .xls)
 
-            # Abrir diálogo para seleccionar archivo
-            archivo, _ = QFileDialog.getOpenFileName(
-                self,
-                "Seleccionar archivo Excel de funcionarios",
-                "",
-                "Archivos Excel (*.xlsx *.xls);;Todos los archivos (*.*)"
-            )
+        Flujo en dos fases, ambas en segundo plano y leyendo el archivo por lotes:
+            1. Lectura y validación (dry run) -> resumen para confirmar
+            2. Nueva lectura con inserción masiva de los registros válidos
+        """
+        # Verificar si pandas y openpyxl están instalados (sin importarlos todavía)
+        pendientes = faltantes("pandas", "openpyxl")
+        if pendientes:
+            QMessageBox.critical(self, "Error de Dependencias", mensaje_instalacion(*pendientes))
+            return
 
-            if not archivo:
-                return  # Usuario canceló
+        # Abrir diálogo para seleccionar archivo
+        archivo, _ = QFileDialog.getOpenFileName(
+            self,
+            "Seleccionar archivo Excel de funcionarios",
+            "",
+            "Archivos Excel (*.xlsx *.xlsm *.xls);;Archivos CSV (*.csv);;Todos los archivos (*.*)"
+        )
 
-            # Leer el archivo Excel
-            try:
-                df = pd.read_excel(archivo)
-            except Exception as e:
-                QMessageBox.critical(
-                    self,
-                    "Error al Leer Archivo",
-                    f"No se pudo leer el archivo Excel.\n\nError: {str(e)}\n\n"
-                    "Asegúrese de que el archivo no esté abierto en otra aplicación."
-                )
-                return
+        if not archivo:
+            return  # Usuario canceló
 
-            # Validar columnas requeridas
-            columnas_requeridas = ["Cedula", "Nombre", "Apellidos", "Direccion", "Cargo", "Celular"]
-            columnas_opcionales = ["Tarjeta_Prox", "Tipo_Excepcion"]
+        self.archivo_importacion = archivo
+        self._iniciar_worker_importacion(
+            ImportarFuncionariosWorker(self.db.config, archivo),
+            "Validando archivo de funcionarios...",
+            self._on_validacion_importacion,
+        )
 
-            columnas_faltantes = [col for col in columnas_requeridas if col not in df.columns]
-            if columnas_faltantes:
-                QMessageBox.critical(
-                    self,
-                    "Error en Estructura del Archivo",
-                    f"El archivo Excel no tiene las columnas requeridas.\n\n"
-                    f"Columnas faltantes: {', '.join(columnas_faltantes)}\n\n"
-                    f"Columnas requeridas:\n{', '.join(columnas_requeridas)}\n\n"
-                    f"Columnas opcionales:\n{', '.join(columnas_opcionales)}"
-                )
-                return
+    def _iniciar_worker_importacion(self, worker, titulo: str, on_finished):
+        """Muestra el diálogo de progreso y arranca un worker de importación"""
+        self.progress_importacion = QProgressDialog(titulo, None, 0, 0, self)
+        self.progress_importacion.setWindowTitle("Importación de Funcionarios")
+        self.progress_importacion.setWindowModality(Qt.WindowModal)
+        self.progress_importacion.setMinimumDuration(0)
+        self.progress_importacion.show()
+
+        self.importar_worker = worker
+        self.importar_worker.progreso.connect(self._on_progreso_importacion)
+        self.importar_worker.finished.connect(on_finished)
+        self.importar_worker.start()
+
+    def _on_progreso_importacion(self, procesados: int, total: int, etapa: str):
+        """Actualiza el diálogo de progreso de la importación"""
+        if not self.progress_importacion:
+            return
+        self.progress_importacion.setLabelText(f"{etapa}\n{procesados} de {total} registros" if total else etapa)
+        self.progress_importacion.setMaximum(total)
+        self.progress_importacion.setValue(procesados)
 
-            # Reemplazar valores NaN por vacío
-            df = df.fillna("")
+    def _cerrar_progreso_importacion(self):
+        if self.progress_importacion:
+            self.progress_importacion.close()
+            self.progress_importacion = None
 
-            # Validar que hay datos
-            if len(df) == 0:
-                QMessageBox.warning(self, "Archivo Vacío", "El archivo Excel no contiene datos para importar.")
-                return
+    def _on_validacion_importacion(self, resultado, error: str):
+        """Fase 1 terminada: muestra el resumen del dry run y pide confirmación"""
+        self._cerrar_progreso_importacion()
 
-            # Confirmar importación
-            reply = QMessageBox.question(
-                self,
-                "Confirmar Importación",
-                f"Se encontraron {len(df)} registros en el archivo.\n\n"
-                "¿Desea proceder con la importación?\n\n"
-                "Los registros duplicados (misma cédula) serán omitidos.",
-                QMessageBox.Yes | QMessageBox.No
-            )
+        if resultado is None:
+            QMessageBox.critical(self, "Error en Importación", error)
+            return
 
-            if reply == QMessageBox.No:
-                return
+        if resultado.total == 0:
+            QMessageBox.warning(self, "Archivo Vacío", "El archivo Excel no contiene datos para importar.")
+            return
 
-            # Procesar cada fila
-            importados = 0
-            omitidos = 0
-            errores = []
+        if resultado.validos == 0:
+            QMessageBox.warning(self, "Sin Registros Válidos", resultado.generar_reporte())
+            self._ofrecer_exportar_errores(resultado)
+            return
 
-            for index, row in df.iterrows():
-                try:
-                    # Extraer datos básicos
-                    cedula = str(row["Cedula"]).strip()
-                    nombre = str(row["Nombre"]).strip()
-                    apellidos = str(row["Apellidos"]).strip()
-                    direccion = str(row["Direccion"]).strip()
-                    cargo = str(row["Cargo"]).strip()
-                    celular = str(row["Celular"]).strip()
-                    tarjeta = str(row.get("Tarjeta_Prox", "")).strip()
-                    tipo_excepcion = str(row.get("Tipo_Excepcion", "ninguna")).strip().lower()
-
-                    # Validaciones básicas
-                    if not cedula or not nombre or not apellidos:
-                        omitidos += 1
-                        errores.append(f"Fila {index + 2}: Cédula, Nombre o Apellidos vacíos")
-                        continue
-
-                    # Validar formato de cédula (7-10 dígitos)
-                    if not cedula.isdigit() or len(cedula) < 7 or len(cedula) > 10:
-                        omitidos += 1
-                        errores.append(f"Fila {index + 2}: Cédula inválida '{cedula}' (debe ser 7-10 dígitos)")
-                        continue
-
-                    # Validar formato de celular (10 dígitos)
-                    if celular and (not celular.isdigit() or len(celular) != 10):
-                        omitidos += 1
-                        errores.append(f"Fila {index + 2}: Celular inválido '{celular}' (debe ser 10 dígitos)")
-                        continue
-
-                    # Validar que Cargo sea válido
-                    if cargo not in CARGOS_DISPONIBLES:
-                        omitidos += 1
-                        errores.append(f"Fila {index + 2}: Cargo inválido '{cargo}' (no existe en el sistema)")
-                        continue
-
-                    # Validar que Dirección sea válida
-                    if direccion not in DIRECCIONES_DISPONIBLES:
-                        omitidos += 1
-                        errores.append(f"Fila {index + 2}: Dirección inválida '{direccion}' (no existe en el sistema)")
-                        continue
-
-                    # Procesar tipo de excepción y establecer banderas
-                    if tipo_excepcion == "carro_hibrido":
-                        permite_compartir = False
-                        pico_placa_solidario = False
-                        discapacidad = False
-                        tiene_parqueadero_exclusivo = False
-                        tiene_carro_hibrido = True
-                    elif tipo_excepcion == "exclusivo_directivo":
-                        permite_compartir = False
-                        pico_placa_solidario = False
-                        discapacidad = False
-                        tiene_parqueadero_exclusivo = True
-                        tiene_carro_hibrido = False
-                    elif tipo_excepcion == "pico_placa_solidario":
-                        permite_compartir = True
-                        pico_placa_solidario = True
-                        discapacidad = False
-                        tiene_parqueadero_exclusivo = False
-                        tiene_carro_hibrido = False
-                    elif tipo_excepcion == "discapacidad":
-                        permite_compartir = True
-                        pico_placa_solidario = False
-                        discapacidad = True
-                        tiene_parqueadero_exclusivo = False
-                        tiene_carro_hibrido = False
-                    else:  # "ninguna" o cualquier otro valor
-                        permite_compartir = True
-                        pico_placa_solidario = False
-                        discapacidad = False
-                        tiene_parqueadero_exclusivo = False
-                        tiene_carro_hibrido = False
-
-                    # Intentar crear funcionario
-                    exito, error_msg = self.funcionario_model.crear(
-                        cedula=cedula,
-                        nombre=nombre,
-                        apellidos=apellidos,
-                        direccion_grupo=direccion,
-                        cargo=cargo,
-                        celular=celular,
-                        tarjeta=tarjeta,
-                        permite_compartir=permite_compartir,
-                        pico_placa_solidario=pico_placa_solidario,
-                        discapacidad=discapacidad,
-                        tiene_parqueadero_exclusivo=tiene_parqueadero_exclusivo,
-                        tiene_carro_hibrido=tiene_carro_hibrido
-                    )
+        dialogo = QMessageBox(self)
+        dialogo.setIcon(QMessageBox.Question)
+        dialogo.setWindowTitle("Confirmar Importación")
+        dialogo.setText(resultado.generar_reporte() + f"\n\n¿Desea importar los {resultado.validos} registros válidos?")
+        btn_importar = dialogo.addButton(f"Importar {resultado.validos}", QMessageBox.AcceptRole)
+        btn_reporte = dialogo.addButton("Solo validar", QMessageBox.ActionRole)
+        dialogo.addButton("Cancelar", QMessageBox.RejectRole)
+        dialogo.exec_()
+
+        if dialogo.clickedButton() == btn_importar:
+            self._iniciar_worker_importacion(
+                ImportarFuncionariosWorker(self.db.config, self.archivo_importacion, confirmar=True),
+                "Insertando funcionarios...",
+                self._on_importacion_completada,
+            )
+        elif dialogo.clickedButton() == btn_reporte:
+            self._ofrecer_exportar_errores(resultado)
 
-                    if exito:
-                        importados += 1
-                    else:
-                        if "Duplicate entry" in error_msg:
-                            omitidos += 1
-                            errores.append(f"Fila {index + 2}: Cédula duplicada '{cedula}'")
-                        else:
-                            omitidos += 1
-                            errores.append(f"Fila {index + 2}: {error_msg}")
+    def _on_importacion_completada(self, resultado, error: str):
+        """Fase 2 terminada: muestra el reporte consolidado y refresca la tabla"""
+        self._cerrar_progreso_importacion()
 
-                except Exception as e:
-                    omitidos += 1
-                    errores.append(f"Fila {index + 2}: Error inesperado - {str(e)}")
+        if resultado is None:
+            QMessageBox.critical(self, "Error en Importación", error)
+            return
 
-            # Mostrar resultados
-            mensaje_resultado = "✅ Importación Completada\n\n"
-            mensaje_resultado += f"Registros importados exitosamente: {importados}\n"
-            mensaje_resultado += f"Registros omitidos/con errores: {omitidos}\n"
+        QMessageBox.information(self, "Importación Completada", resultado.generar_reporte())
+        self._ofrecer_exportar_errores(resultado)
 
-            if errores:
-                mensaje_resultado += "\n⚠️ Detalles de errores (primeros 10):\n"
-                mensaje_resultado += "\n".join(errores[:10])
-                if len(errores) > 10:
-                    mensaje_resultado += f"\n\n... y {len(errores) - 10} errores más."
+        # Recargar tabla si se importó al menos un funcionario
+        if resultado.importados > 0:
+            # El worker hizo commit en su propia conexión
+            self.db.force_reconnect()
+            self.cargar_funcionarios()
+            self.funcionario_creado.emit()
 
-            QMessageBox.information(self, "Importación Completada", mensaje_resultado)
+    def _ofrecer_exportar_errores(self, resultado):
+        """Permite guardar el reporte completo de errores en CSV"""
+        if not resultado.errores:
+            return
 
-            # Recargar tabla si se importó al menos un funcionario
-            if importados > 0:
-                self.cargar_funcionarios()
-                self.funcionario_creado.emit()
+        reply = QMessageBox.question(
+            self,
+            "Reporte de Errores",
+            f"Se encontraron {resultado.omitidos} registros con errores.\n\n"
+            "¿Desea guardar el reporte completo en un archivo CSV?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
 
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error en Importación",
-                f"Ocurrió un error durante la importación:\n\n{str(e)}"
-            )
+        ruta, _ = QFileDialog.getSaveFileName(
+            self, "Guardar reporte de errores", "errores_importacion_funcionarios.csv", "Archivos CSV (*.csv)"
+        )
+        if not ruta:
+            return
+
+        try:
+            resultado.exportar_errores_csv(ruta)
+            QMessageBox.information(self, "Reporte Guardado", f"Reporte guardado en:\n{ruta}")
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar el reporte:\n\n{str(e)}")
 
 
 class VerFuncionarioModal(QDialog):
@@ -3,6 +3,8 @@
 Modal para mostrar información detallada de un parqueadero
 """
 
+from typing import Dict, List, Optional
+
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QBrush, QColor, QFont
 from PyQt5.QtWidgets import (
@@ -23,44 +25,140 @@ from PyQt5.QtWidgets import (
 )
 
 from ..database.manager import DatabaseManager
-from ..models.parqueadero import ParqueaderoModel
+from ..models.parqueadero import HISTORIAL_POR_PAGINA, ParqueaderoModel
 from ..utils.formatters import format_numero_parqueadero
 
 
+def consultar_vehiculos_asignados(db, parqueadero_id: int) -> List[Dict]:
+    """Vehículos con asignación activa en el parqueadero, con datos del funcionario"""
+    query = """
+        SELECT
+            f.nombre, f.apellidos, f.cedula, f.cargo, f.direccion_grupo, f.celular,
+            v.tipo_vehiculo, v.placa, v.tipo_circulacion, v.ultimo_digito,
+            a.fecha_asignacion, a.observaciones
+        FROM asignaciones a
+        JOIN vehiculos v ON a.vehiculo_id = v.id
+        JOIN funcionarios f ON v.funcionario_id = f.id
+        WHERE a.parqueadero_id = %s AND a.activo = TRUE
+        ORDER BY v.tipo_vehiculo, a.fecha_asignacion
+    """
+    return db.fetch_all(query, (parqueadero_id,)) or []
+
+
+def cargar_datos_detalle(db, parqueadero_id: int) -> Optional[Dict]:
+    """
+    Consulta todo lo que muestra el modal al abrirse (sin el historial)
+
+    Recibe la conexión como parámetro para poder ejecutarse en un worker de
+    precarga con ConexionIndependiente.
+
+    Args:
+        db: DatabaseManager o ConexionIndependiente
+        parqueadero_id: ID del parqueadero
+
+    Returns:
+        {"numero_parqueadero", "info", "vehiculos"} o None si el parqueadero no existe
+    """
+    # Verificar si existe la columna sotano
+    try:
+        column_exists = db.fetch_one("SHOW COLUMNS FROM parqueaderos LIKE 'sotano'") is not None
+    except Exception as e:
+        print(f"Advertencia al verificar columna 'sotano': {e}")
+        column_exists = False
+
+    if column_exists:
+        columna_sotano = "COALESCE(p.sotano, 'Sótano-1')"
+        columna_motos = "COUNT(CASE WHEN v.tipo_vehiculo = 'Moto' THEN 1 END)"
+        columna_bicicletas = "COUNT(CASE WHEN v.tipo_vehiculo = 'Bicicleta' THEN 1 END)"
+    else:
+        # Estructura original sin sótanos (compatibilidad hacia atrás)
+        columna_sotano, columna_motos, columna_bicicletas = "'Sótano-1'", "0", "0"
+
+    # Información actual adaptable, incluyendo datos de excepciones de funcionarios
+    # (solo se unen las asignaciones activas, no todo el historial del espacio)
+    query_actual = f"""
+        SELECT
+            p.numero_parqueadero,
+            p.estado,
+            p.tipo_espacio,
+            {columna_sotano} as sotano,
+            COUNT(CASE WHEN v.tipo_vehiculo = 'Carro' THEN 1 END) as carros_asignados,
+            {columna_motos} as motos_asignadas,
+            {columna_bicicletas} as bicicletas_asignadas,
+            MIN(f.permite_compartir) as permite_compartir,
+            MAX(f.pico_placa_solidario) as pico_placa_solidario,
+            MAX(f.discapacidad) as discapacidad,
+            MAX(f.tiene_parqueadero_exclusivo) as tiene_parqueadero_exclusivo,
+            MAX(f.tiene_carro_hibrido) as tiene_carro_hibrido
+        FROM parqueaderos p
+        LEFT JOIN asignaciones a ON p.id = a.parqueadero_id AND a.activo = TRUE
+        LEFT JOIN vehiculos v ON a.vehiculo_id = v.id
+        LEFT JOIN funcionarios f ON v.funcionario_id = f.id
+        WHERE p.id = %s
+        GROUP BY p.id
+    """
+    info = db.fetch_one(query_actual, (parqueadero_id,))
+    if not info:
+        return None
+
+    return {
+        "numero_parqueadero": info["numero_parqueadero"],
+        "info": info,
+        "vehiculos": consultar_vehiculos_asignados(db, parqueadero_id),
+    }
+
+
 class DetalleParqueaderoModal(QDialog):
     """Modal para mostrar información detallada de un parqueadero"""
 
-    def __init__(self, parqueadero_id: int, numero_parqueadero=None, db_manager: DatabaseManager = None, parent=None):
+    def __init__(
+        self,
+        parqueadero_id: int,
+        numero_parqueadero=None,
+        db_manager: DatabaseManager = None,
+        parent=None,
+        datos: Dict = None,
+    ):
         super().__init__(parent)
 
         # Validaciones de inicialización
         if not parqueadero_id or not db_manager:
             raise ValueError("Parámetros de inicialización inválidos")
 
-        self.parqueadero_id = parqueadero_id
         self.db = db_manager
         self.parqueadero_model = ParqueaderoModel(self.db)
         self.info_parqueadero = None
+        self.numero_parqueadero = "N/A"
 
-        # SIEMPRE obtener numero_parqueadero de la BD (ignorar parámetro)
-        # Esto evita problemas con formato inconsistente
-        try:
-            query = "SELECT numero_parqueadero FROM parqueaderos WHERE id = %s"
-            result = self.db.fetch_one(query, (self.parqueadero_id,))
-            if result:
-                self.numero_parqueadero = result['numero_parqueadero']
-            else:
-                self.numero_parqueadero = "N/A"
+        # Estado del historial paginado (se carga al abrir su tab)
+        self._historial_cargado = False
+        self._historial_completo = False
+        self._historial_cursor = None
 
+        try:
+            # La interfaz se construye una sola vez; vincular() la llena para cada parqueadero
             self.setup_ui()
-            self.cargar_informacion()
+            self.vincular(parqueadero_id, datos)
         except Exception as e:
             print(f"Error en inicialización del modal: {e}")
             raise
 
+    def vincular(self, parqueadero_id: int, datos: Dict = None):
+        """
+        Muestra otro parqueadero reutilizando la interfaz ya construida
+
+        Args:
+            parqueadero_id: ID del parqueadero
+            datos: Resultado de cargar_datos_detalle si ya se precargó (None = consultar)
+        """
+        self.parqueadero_id = parqueadero_id
+        self.tabla_historial.setRowCount(0)
+        self.lbl_total_registros.setText("Total de registros: 0")
+        self.tabs.setCurrentWidget(self.tab_ocupacion)
+        self.cargar_informacion(datos)
+
     def setup_ui(self):
         """Configura la interfaz del modal"""
-        self.setWindowTitle(f"📊 Detalle Parqueadero {format_numero_parqueadero(self.numero_parqueadero)}")
         self.setModal(True)
 
         # Aplicar estilo base para asegurar texto negro en todo el modal
@@ -95,17 +193,18 @@ class DetalleParqueaderoModal(QDialog):
         layout.addWidget(header_group)
 
         # Tabs con información detallada
-        tabs = QTabWidget()
+        self.tabs = QTabWidget()
 
         # Tab 1: Ocupación Actual
         self.tab_ocupacion = self.crear_tab_ocupacion()
-        tabs.addTab(self.tab_ocupacion, "🚗 Ocupación Actual")
+        self.tabs.addTab(self.tab_ocupacion, "🚗 Ocupación Actual")
 
-        # Tab 2: Historial
+        # Tab 2: Historial (carga diferida al seleccionarlo)
         self.tab_historial = self.crear_tab_historial()
-        tabs.addTab(self.tab_historial, "📅 Historial")
+        self.tabs.addTab(self.tab_historial, "📅 Historial")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
-        layout.addWidget(tabs)
+        layout.addWidget(self.tabs)
 
         # Botones mejorados
         btn_layout = QHBoxLayout()
@@ -114,7 +213,7 @@ class DetalleParqueaderoModal(QDialog):
 
         # Botón de actualizar todo
         btn_actualizar_todo = QPushButton("🔄 Actualizar Todo")
-        btn_actualizar_todo.clicked.connect(self.cargar_informacion)
+        btn_actualizar_todo.clicked.connect(lambda: self.cargar_informacion())
         btn_actualizar_todo.setStyleSheet(
             "padding: 10px 20px; background-color: #34B5A9; color: white; "
             "border: none; border-radius: 6px; font-weight: bold; font-size: 14px;"
@@ -161,13 +260,13 @@ class DetalleParqueaderoModal(QDialog):
         lbl_numero_label.setStyleSheet("font-size: 16px; font-weight: bold;")
         layout.addWidget(lbl_numero_label, 0, 0)
 
-        lbl_numero = QLabel(f"{format_numero_parqueadero(self.numero_parqueadero)}")
-        lbl_numero.setStyleSheet(
+        self.lbl_numero = QLabel(f"{format_numero_parqueadero(self.numero_parqueadero)}")
+        self.lbl_numero.setStyleSheet(
             "font-size: 22px; font-weight: bold; color: #267A70; "
             "padding: 6px 12px; background-color: #E3F2FD; "
             "border-radius: 6px; border: 2px solid #267A70;"
         )
-        layout.addWidget(lbl_numero, 0, 1)
+        layout.addWidget(self.lbl_numero, 0, 1)
 
         # Estado con mejor visualización
         lbl_estado_label = QLabel("Estado Actual:")
@@ -289,6 +388,9 @@ class DetalleParqueaderoModal(QDialog):
         header.setSectionResizeMode(5, QHeaderView.ResizeToContents)  # Placa
         header.setSectionResizeMode(6, QHeaderView.ResizeToContents)  # Estado
 
+        # Scroll infinito: al acercarse al final se pide la siguiente página
+        self.tabla_historial.verticalScrollBar().valueChanged.connect(self.on_historial_scroll)
+
         self.tabla_historial.setAlternatingRowColors(True)
         self.tabla_historial.setSelectionBehavior(QTableWidget.SelectRows)
         self.tabla_historial.setGridStyle(Qt.SolidLine)
@@ -331,7 +433,7 @@ class DetalleParqueaderoModal(QDialog):
         footer_layout.addWidget(self.lbl_total_registros)
         footer_layout.addStretch()
 
-        lbl_nota = QLabel("Nota: Se muestran los últimos 100 registros")
+        lbl_nota = QLabel("Nota: Desplácese hasta el final para cargar registros anteriores")
         lbl_nota.setStyleSheet("color: #999; font-size: 11px; font-style: italic;")
         footer_layout.addWidget(lbl_nota)
         layout.addLayout(footer_layout)
@@ -339,72 +441,32 @@ class DetalleParqueaderoModal(QDialog):
         widget.setLayout(layout)
         return widget
 
-    def cargar_informacion(self):
-        """Carga la información del parqueadero"""
+    def cargar_informacion(self, datos: Dict = None):
+        """
+        Carga la información del parqueadero
+
+        Args:
+            datos: Resultado de cargar_datos_detalle si ya se precargó (None = consultar)
+        """
         try:
-            # Verificar si existe la columna sotano
-            try:
-                check_query = "SHOW COLUMNS FROM parqueaderos LIKE 'sotano'"
-                column_exists = self.db.fetch_one(check_query) is not None
-            except Exception as e:
-                print(f"Advertencia al verificar columna 'sotano': {e}")
-                column_exists = False
-
-            # Obtener información actual adaptable, incluyendo datos de excepciones de funcionarios
-            if column_exists:
-                query_actual = """
-                    SELECT
-                        p.estado,
-                        p.tipo_espacio,
-                        COALESCE(p.sotano, 'Sótano-1') as sotano,
-                        COUNT(CASE WHEN a.activo = TRUE AND v.tipo_vehiculo = 'Carro' THEN 1 END) as carros_asignados,
-                        COUNT(CASE WHEN a.activo = TRUE AND v.tipo_vehiculo = 'Moto' THEN 1 END) as motos_asignadas,
-                        COUNT(CASE WHEN a.activo = TRUE AND v.tipo_vehiculo = 'Bicicleta' THEN 1 END) as bicicletas_asignadas,
-                        MIN(CASE WHEN a.activo = TRUE THEN f.permite_compartir END) as permite_compartir,
-                        MAX(CASE WHEN a.activo = TRUE THEN f.pico_placa_solidario END) as pico_placa_solidario,
-                        MAX(CASE WHEN a.activo = TRUE THEN f.discapacidad END) as discapacidad,
-                        MAX(CASE WHEN a.activo = TRUE THEN f.tiene_parqueadero_exclusivo END) as tiene_parqueadero_exclusivo,
-                        MAX(CASE WHEN a.activo = TRUE THEN f.tiene_carro_hibrido END) as tiene_carro_hibrido
-                    FROM parqueaderos p
-                    LEFT JOIN asignaciones a ON p.id = a.parqueadero_id
-                    LEFT JOIN vehiculos v ON a.vehiculo_id = v.id
-                    LEFT JOIN funcionarios f ON v.funcionario_id = f.id
-                    WHERE p.id = %s
-                    GROUP BY p.id
-                """
-            else:
-                query_actual = """
-                    SELECT
-                        p.estado,
-                        p.tipo_espacio,
-                        'Sótano-1' as sotano,
-                        COUNT(CASE WHEN a.activo = TRUE AND v.tipo_vehiculo = 'Carro' THEN 1 END) as carros_asignados,
-                        0 as motos_asignadas,
-                        0 as bicicletas_asignadas,
-                        MIN(CASE WHEN a.activo = TRUE THEN f.permite_compartir END) as permite_compartir,
-                        MAX(CASE WHEN a.activo = TRUE THEN f.pico_placa_solidario END) as pico_placa_solidario,
-                        MAX(CASE WHEN a.activo = TRUE THEN f.discapacidad END) as discapacidad,
-                        MAX(CASE WHEN a.activo = TRUE THEN f.tiene_parqueadero_exclusivo END) as tiene_parqueadero_exclusivo,
-                        MAX(CASE WHEN a.activo = TRUE THEN f.tiene_carro_hibrido END) as tiene_carro_hibrido
-                    FROM parqueaderos p
-                    LEFT JOIN asignaciones a ON p.id = a.parqueadero_id
-                    LEFT JOIN vehiculos v ON a.vehiculo_id = v.id
-                    LEFT JOIN funcionarios f ON v.funcionario_id = f.id
-                    WHERE p.id = %s
-                    GROUP BY p.id
-                """
-            info_general = self.db.fetch_one(query_actual, (self.parqueadero_id,))
-
-            if info_general:
-                self.actualizar_header(info_general)
-            else:
+            if not datos:
+                datos = cargar_datos_detalle(self.db, self.parqueadero_id)
+            if not datos:
                 raise Exception(f"No se encontró información para el parqueadero ID: {self.parqueadero_id}")
 
-            # Cargar vehículos asignados
-            self.cargar_vehiculos_asignados()
+            # SIEMPRE tomar numero_parqueadero de la BD (evita formatos inconsistentes)
+            self.numero_parqueadero = datos["numero_parqueadero"]
+            numero_formateado = format_numero_parqueadero(self.numero_parqueadero)
+            self.setWindowTitle(f"📊 Detalle Parqueadero {numero_formateado}")
+            self.lbl_numero.setText(numero_formateado)
 
-            # Cargar historial
-            self.cargar_historial()
+            self.actualizar_header(datos["info"])
+            self.mostrar_vehiculos_asignados(datos["vehiculos"])
+
+            # El historial se recarga al volver a abrir su tab
+            self._historial_cargado = False
+            if self.tabs.currentWidget() is self.tab_historial:
+                self.cargar_historial()
 
         except Exception as e:
             print(f"Error al cargar información del parqueadero: {e}")
@@ -572,29 +634,20 @@ class DetalleParqueaderoModal(QDialog):
     def cargar_vehiculos_asignados(self):
         """Carga los vehículos actualmente asignados"""
         try:
-            query = """
-                SELECT
-                    f.nombre, f.apellidos, f.cedula, f.cargo, f.direccion_grupo, f.celular,
-                    v.tipo_vehiculo, v.placa, v.tipo_circulacion, v.ultimo_digito,
-                    a.fecha_asignacion, a.observaciones
-                FROM asignaciones a
-                JOIN vehiculos v ON a.vehiculo_id = v.id
-                JOIN funcionarios f ON v.funcionario_id = f.id
-                WHERE a.parqueadero_id = %s AND a.activo = TRUE
-                ORDER BY v.tipo_vehiculo, a.fecha_asignacion
-            """
-            vehiculos = self.db.fetch_all(query, (self.parqueadero_id,))
+            vehiculos = consultar_vehiculos_asignados(self.db, self.parqueadero_id)
         except Exception as e:
             print(f"Error al cargar vehículos asignados: {e}")
             vehiculos = []
+        self.mostrar_vehiculos_asignados(vehiculos)
 
-        # Limpiar layout de forma segura
-        for i in reversed(range(self.layout_vehiculos.count())):
-            item = self.layout_vehiculos.itemAt(i)
-            if item is not None:
-                widget = item.widget()
-                if widget is not None:
-                    widget.setParent(None)
+    def mostrar_vehiculos_asignados(self, vehiculos: List[Dict]):
+        """Muestra las tarjetas de los vehículos asignados"""
+        # Limpiar layout de forma segura (incluye el stretch: el modal se reutiliza)
+        while self.layout_vehiculos.count():
+            item = self.layout_vehiculos.takeAt(0)
+            widget = item.widget()
+            if widget is not None:
+                widget.setParent(None)
 
         if not vehiculos:
             lbl_sin_vehiculos = QLabel("💚 Parqueadero disponible - No hay vehículos asignados")
@@ -741,139 +794,147 @@ class DetalleParqueaderoModal(QDialog):
         frame.setLayout(main_layout)
         return frame
 
-    def cargar_historial(self):
-        """Carga el historial de asignaciones"""
-        query = """
-            SELECT
-                a.fecha_asignacion,
-                a.fecha_fin_asignacion,
-                CONCAT(f.nombre, ' ', f.apellidos) as funcionario,
-                f.cedula,
-                v.tipo_vehiculo,
-                v.placa,
-                v.tipo_circulacion,
-                CASE
-                    WHEN a.activo = TRUE THEN 'Activo'
-                    ELSE 'Finalizado'
-                END as estado,
-                a.observaciones
-            FROM asignaciones a
-            JOIN vehiculos v ON a.vehiculo_id = v.id
-            JOIN funcionarios f ON v.funcionario_id = f.id
-            WHERE a.parqueadero_id = %s
-            ORDER BY a.fecha_asignacion DESC
-            LIMIT 100
-        """
-        historial = self.db.fetch_all(query, (self.parqueadero_id,))
+    def on_tab_changed(self, indice):
+        """Carga el historial la primera vez que se abre su tab"""
+        if self.tabs.widget(indice) is self.tab_historial and not self._historial_cargado:
+            self.cargar_historial()
 
-        self.tabla_historial.setRowCount(len(historial))
+    def on_historial_scroll(self, valor):
+        """Pide la siguiente página al llegar cerca del final de la tabla"""
+        barra = self.tabla_historial.verticalScrollBar()
+        if self._historial_cargado and not self._historial_completo and valor >= barra.maximum() - 5:
+            self.cargar_mas_historial()
 
-        for row, registro in enumerate(historial):
-            # Fecha inicio
-            fecha_inicio = (
-                registro["fecha_asignacion"].strftime("%d/%m/%Y\n%H:%M") if registro["fecha_asignacion"] else "N/A"
-            )
-            item_inicio = QTableWidgetItem(fecha_inicio)
-            item_inicio.setTextAlignment(Qt.AlignCenter)
-            item_inicio.setForeground(QBrush(QColor(0, 0, 0)))
-            self.tabla_historial.setItem(row, 0, item_inicio)
-
-            # Fecha fin
-            fecha_fin = (
-                registro["fecha_fin_asignacion"].strftime("%d/%m/%Y\n%H:%M")
-                if registro["fecha_fin_asignacion"]
-                else "Activo"
-            )
-            item_fin = QTableWidgetItem(fecha_fin)
-            item_fin.setTextAlignment(Qt.AlignCenter)
-            if fecha_fin == "Activo":
-                item_fin.setBackground(QColor("#E8F5E9"))
-                item_fin.setForeground(QBrush(QColor(46, 125, 50)))
-            else:
-                item_fin.setForeground(QBrush(QColor(0, 0, 0)))
-            self.tabla_historial.setItem(row, 1, item_fin)
-
-            # Duración
-            if registro["fecha_asignacion"]:
-                fecha_fin_calc = registro["fecha_fin_asignacion"] if registro["fecha_fin_asignacion"] else None
-                if fecha_fin_calc:
-                    duracion = fecha_fin_calc - registro["fecha_asignacion"]
-                    dias = duracion.days
-                    horas = duracion.seconds // 3600
-                    if dias > 0:
-                        duracion_texto = f"{dias}d {horas}h"
-                    else:
-                        duracion_texto = f"{horas}h"
-                else:
-                    # Calcular duración hasta ahora
-                    from datetime import datetime
+    def cargar_historial(self):
+        """Carga la primera página del historial de asignaciones"""
+        self.tabla_historial.setRowCount(0)
+        self._historial_cursor = None
+        self._historial_completo = False
+        self._historial_cargado = True
+        self.cargar_mas_historial()
+
+    def cargar_mas_historial(self):
+        """Agrega la siguiente página del historial al final de la tabla"""
+        historial = self.parqueadero_model.obtener_historial(
+            self.parqueadero_id, HISTORIAL_POR_PAGINA, self._historial_cursor
+        )
+        self._historial_completo = len(historial) < HISTORIAL_POR_PAGINA
+        if historial:
+            ultimo = historial[-1]
+            self._historial_cursor = (ultimo["fecha_asignacion"], ultimo["id"])
+
+        inicio = self.tabla_historial.rowCount()
+        self.tabla_historial.setRowCount(inicio + len(historial))
+        for row, registro in enumerate(historial, start=inicio):
+            self.agregar_fila_historial(row, registro)
+            # Altura compacta
+            self.tabla_historial.setRowHeight(row, 35)
 
-                    duracion = datetime.now() - registro["fecha_asignacion"]
-                    dias = duracion.days
-                    duracion_texto = f"{dias}d" if dias > 0 else "< 1d"
-            else:
-                duracion_texto = "N/A"
-
-            item_duracion = QTableWidgetItem(duracion_texto)
-            item_duracion.setTextAlignment(Qt.AlignCenter)
-            item_duracion.setForeground(QBrush(QColor(0, 0, 0)))
-            self.tabla_historial.setItem(row, 2, item_duracion)
-
-            # Funcionario con cédula
-            funcionario_texto = f"{registro['funcionario']}\n(C.C. {registro['cedula']})"
-            item_funcionario = QTableWidgetItem(funcionario_texto)
-            item_funcionario.setForeground(QBrush(QColor(0, 0, 0)))
-            self.tabla_historial.setItem(row, 3, item_funcionario)
-
-            # Vehículo con ícono
-            iconos_vehiculo = {"Carro": "🚗", "Moto": "🏍️", "Bicicleta": "🚲"}
-            icono_veh = iconos_vehiculo.get(registro["tipo_vehiculo"], "")
-            item_vehiculo = QTableWidgetItem(f"{icono_veh} {registro['tipo_vehiculo']}")
-            item_vehiculo.setTextAlignment(Qt.AlignCenter)
-            item_vehiculo.setForeground(QBrush(QColor(0, 0, 0)))
-            # Color por tipo de vehículo
-            if registro["tipo_vehiculo"] == "Carro":
-                item_vehiculo.setBackground(QColor("#E3F2FD"))
-            elif registro["tipo_vehiculo"] == "Moto":
-                item_vehiculo.setBackground(QColor("#F3E5F5"))
-            elif registro["tipo_vehiculo"] == "Bicicleta":
-                item_vehiculo.setBackground(QColor("#E8F5E9"))
-            self.tabla_historial.setItem(row, 4, item_vehiculo)
-
-            # Placa con tipo de circulación
-            tipo_circ = registro["tipo_circulacion"] or "N/A"
-            placa_texto = f"{registro['placa']}\n({tipo_circ})"
-            item_placa = QTableWidgetItem(placa_texto)
-            item_placa.setTextAlignment(Qt.AlignCenter)
-            item_placa.setForeground(QBrush(QColor(0, 0, 0)))
-            # Color por tipo de circulación
-            if tipo_circ == "IMPAR":
-                item_placa.setBackground(QColor("#FFEBEE"))
-            elif tipo_circ == "PAR":
-                item_placa.setBackground(QColor("#E8EAF6"))
-            elif tipo_circ == "N/A":
-                item_placa.setBackground(QColor("#F5F5F5"))
-            self.tabla_historial.setItem(row, 5, item_placa)
-
-            # Estado con color mejorado
-            item_estado = QTableWidgetItem(registro["estado"])
-            item_estado.setTextAlignment(Qt.AlignCenter)
-            if registro["estado"] == "Activo":
-                item_estado.setBackground(QColor("#E8F5E9"))
-                item_estado.setForeground(QBrush(QColor(46, 125, 50)))
-                item_estado.setFont(QFont("Arial", 10, QFont.Bold))
+        # Actualizar contador
+        total = self.tabla_historial.rowCount()
+        sufijo = "" if self._historial_completo else " (desplácese para ver más)"
+        self.lbl_total_registros.setText(f"Registros cargados: {total}{sufijo}")
+
+    def agregar_fila_historial(self, row, registro):
+        """Llena una fila de la tabla de historial"""
+        # Fecha inicio
+        fecha_inicio = (
+            registro["fecha_asignacion"].strftime("%d/%m/%Y\n%H:%M") if registro["fecha_asignacion"] else "N/A"
+        )
+        item_inicio = QTableWidgetItem(fecha_inicio)
+        item_inicio.setTextAlignment(Qt.AlignCenter)
+        item_inicio.setForeground(QBrush(QColor(0, 0, 0)))
+        self.tabla_historial.setItem(row, 0, item_inicio)
+
+        # Fecha fin
+        fecha_fin = (
+            registro["fecha_fin_asignacion"].strftime("%d/%m/%Y\n%H:%M")
+            if registro["fecha_fin_asignacion"]
+            else "Activo"
+        )
+        item_fin = QTableWidgetItem(fecha_fin)
+        item_fin.setTextAlignment(Qt.AlignCenter)
+        if fecha_fin == "Activo":
+            item_fin.setBackground(QColor("#E8F5E9"))
+            item_fin.setForeground(QBrush(QColor(46, 125, 50)))
+        else:
+            item_fin.setForeground(QBrush(QColor(0, 0, 0)))
+        self.tabla_historial.setItem(row, 1, item_fin)
+
+        # Duración
+        if registro["fecha_asignacion"]:
+            fecha_fin_calc = registro["fecha_fin_asignacion"] if registro["fecha_fin_asignacion"] else None
+            if fecha_fin_calc:
+                duracion = fecha_fin_calc - registro["fecha_asignacion"]
+                dias = duracion.days
+                horas = duracion.seconds // 3600
+                if dias > 0:
+                    duracion_texto = f"{dias}d {horas}h"
+                else:
+                    duracion_texto = f"{horas}h"
             else:
-                item_estado.setBackground(QColor("#FFEBEE"))
-                item_estado.setForeground(QBrush(QColor(198, 40, 40)))
-            self.tabla_historial.setItem(row, 6, item_estado)
+                # Calcular duración hasta ahora
+                from datetime import datetime
 
-            # Tooltip con observaciones si existen
-            if registro["observaciones"]:
-                item_funcionario.setToolTip(f"Observaciones: {registro['observaciones']}")
+                duracion = datetime.now() - registro["fecha_asignacion"]
+                dias = duracion.days
+                duracion_texto = f"{dias}d" if dias > 0 else "< 1d"
+        else:
+            duracion_texto = "N/A"
 
-        # Actualizar contador
-        self.lbl_total_registros.setText(f"Total de registros: {len(historial)}")
+        item_duracion = QTableWidgetItem(duracion_texto)
+        item_duracion.setTextAlignment(Qt.AlignCenter)
+        item_duracion.setForeground(QBrush(QColor(0, 0, 0)))
+        self.tabla_historial.setItem(row, 2, item_duracion)
 
-        # Ajustar altura de filas para ser más compacto
-        for row in range(len(historial)):
-            self.tabla_historial.setRowHeight(row, 35)
+        # Funcionario con cédula
+        funcionario_texto = f"{registro['funcionario']}\n(C.C. {registro['cedula']})"
+        item_funcionario = QTableWidgetItem(funcionario_texto)
+        item_funcionario.setForeground(QBrush(QColor(0, 0, 0)))
+        self.tabla_historial.setItem(row, 3, item_funcionario)
+
+        # Vehículo con ícono
+        iconos_vehiculo = {"Carro": "🚗", "Moto": "🏍️", "Bicicleta": "🚲"}
+        icono_veh = iconos_vehiculo.get(registro["tipo_vehiculo"], "")
+        item_vehiculo = QTableWidgetItem(f"{icono_veh} {registro['tipo_vehiculo']}")
+        item_vehiculo.setTextAlignment(Qt.AlignCenter)
+        item_vehiculo.setForeground(QBrush(QColor(0, 0, 0)))
+        # Color por tipo de vehículo
+        if registro["tipo_vehiculo"] == "Carro":
+            item_vehiculo.setBackground(QColor("#E3F2FD"))
+        elif registro["tipo_vehiculo"] == "Moto":
+            item_vehiculo.setBackground(QColor("#F3E5F5"))
+        elif registro["tipo_vehiculo"] == "Bicicleta":
+            item_vehiculo.setBackground(QColor("#E8F5E9"))
+        self.tabla_historial.setItem(row, 4, item_vehiculo)
+
+        # Placa con tipo de circulación
+        tipo_circ = registro["tipo_circulacion"] or "N/A"
+        placa_texto = f"{registro['placa']}\n({tipo_circ})"
+        item_placa = QTableWidgetItem(placa_texto)
+        item_placa.setTextAlignment(Qt.AlignCenter)
+        item_placa.setForeground(QBrush(QColor(0, 0, 0)))
+        # Color por tipo de circulación
+        if tipo_circ == "IMPAR":
+            item_placa.setBackground(QColor("#FFEBEE"))
+        elif tipo_circ == "PAR":
+            item_placa.setBackground(QColor("#E8EAF6"))
+        elif tipo_circ == "N/A":
+            item_placa.setBackground(QColor("#F5F5F5"))
+        self.tabla_historial.setItem(row, 5, item_placa)
+
+        # Estado con color mejorado
+        item_estado = QTableWidgetItem(registro["estado"])
+        item_estado.setTextAlignment(Qt.AlignCenter)
+        if registro["estado"] == "Activo":
+            item_estado.setBackground(QColor("#E8F5E9"))
+            item_estado.setForeground(QBrush(QColor(46, 125, 50)))
+            item_estado.setFont(QFont("Arial", 10, QFont.Bold))
+        else:
+            item_estado.setBackground(QColor("#FFEBEE"))
+            item_estado.setForeground(QBrush(QColor(198, 40, 40)))
+        self.tabla_historial.setItem(row, 6, item_estado)
+
+        # Tooltip con observaciones si existen
+        if registro["observaciones"]:
+            item_funcionario.setToolTip(f"Observaciones: {registro['observaciones']}")
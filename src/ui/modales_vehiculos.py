@@ -328,6 +328,23 @@ class EliminarVehiculoModal(QDialog):
             t3 = time.time()
             self.mostrar_datos_vehiculo()
 
+    def vincular(self, vehiculo_id: int, vehiculo_data: dict = None):
+        """
+        Reutiliza el modal para otro vehículo sin reconstruir la interfaz
+
+        Args:
+            vehiculo_id: ID del vehículo
+            vehiculo_data: Datos del vehículo si ya se tienen (None = consultar)
+        """
+        self.vehiculo_id = vehiculo_id
+        self.vehiculo_actual = vehiculo_data
+        if hasattr(self, "mensaje_exito"):
+            del self.mensaje_exito
+
+        if self.vehiculo_actual is None:
+            self.cargar_datos_vehiculo()
+        else:
+            self.mostrar_datos_vehiculo()
 
     def setup_ui(self):
         """Configura la interfaz del modal"""
@@ -502,15 +519,30 @@ class VerVehiculoModal(QDialog):
     """Modal para visualizar los detalles de un vehículo"""
 
     def __init__(
-        self, vehiculo_id: int, vehiculo_model: VehiculoModel, funcionario_model: FuncionarioModel, parent=None
+        self,
+        vehiculo_id: int,
+        vehiculo_model: VehiculoModel,
+        funcionario_model: FuncionarioModel,
+        parent=None,
+        vehiculo_data: dict = None,
     ):
         super().__init__(parent)
-        self.vehiculo_id = vehiculo_id
         self.vehiculo_model = vehiculo_model
         self.funcionario_model = funcionario_model
-        self.vehiculo_actual = None
 
         self.setup_ui()
+        self.vincular(vehiculo_id, vehiculo_data)
+
+    def vincular(self, vehiculo_id: int, vehiculo_data: dict = None):
+        """
+        Reutiliza el modal para otro vehículo sin reconstruir la interfaz
+
+        Args:
+            vehiculo_id: ID del vehículo
+            vehiculo_data: Resultado de obtener_por_id si ya se precargó (None = consultar)
+        """
+        self.vehiculo_id = vehiculo_id
+        self.vehiculo_actual = vehiculo_data
         self.cargar_datos_vehiculo()
 
     def setup_ui(self):
@@ -608,8 +640,9 @@ class VerVehiculoModal(QDialog):
         self.setLayout(layout)
 
     def cargar_datos_vehiculo(self):
-        """Carga los datos del vehículo"""
-        self.vehiculo_actual = self.vehiculo_model.obtener_por_id(self.vehiculo_id)
+        """Carga los datos del vehículo (consulta solo si no fueron precargados)"""
+        if self.vehiculo_actual is None:
+            self.vehiculo_actual = self.vehiculo_model.obtener_por_id(self.vehiculo_id)
 
         if not self.vehiculo_actual:
             QMessageBox.critical(self, "Error", "No se pudo cargar la información del vehículo")
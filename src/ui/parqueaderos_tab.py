@@ -19,7 +19,8 @@ from PyQt5.QtWidgets import (
 from ..database.manager import DatabaseManager
 from ..models.parqueadero import ParqueaderoModel
 from .widgets.parking_widget import ParkingSpaceWidget
-from .modal_detalle_parqueadero import DetalleParqueaderoModal
+from .modal_detalle_parqueadero import DetalleParqueaderoModal, cargar_datos_detalle
+from .utils.pool_modales import PoolModales, PrecargaDatos
 
 
 class ParqueaderosTab(QWidget):
@@ -32,6 +33,9 @@ class ParqueaderosTab(QWidget):
         super().__init__()
         self.db = db_manager
         self.parqueadero_model = ParqueaderoModel(self.db)
+        # Un solo modal de detalle re-enlazado en cada clic y su precarga al pasar el mouse
+        self.pool_modales = PoolModales()
+        self.precarga_detalle = PrecargaDatos(self.db.config, cargar_datos_detalle, parent=self)
         self.setup_ui()
         self.cargar_filtros_iniciales()
         self.cargar_parqueaderos()
@@ -135,6 +139,9 @@ class ParqueaderosTab(QWidget):
         tipo_vehiculo = self.combo_filtro_tipo.currentData()
         # Si es None, significa "Todos", no aplicar filtro de tipo
 
+        # Las ocupaciones pudieron cambiar: descartar detalles precargados
+        self.precarga_detalle.invalidar()
+
         # Cargar parqueaderos del tipo seleccionado (o todos si es None)
         parqueaderos = self.parqueadero_model.obtener_todos(tipo_vehiculo=tipo_vehiculo)
 
@@ -174,8 +181,9 @@ class ParqueaderosTab(QWidget):
                 sotano=park.get("sotano", ""),
             )
 
-            # Conectar señal de clic
+            # Conectar señal de clic y precarga del detalle
             widget.clicked.connect(self.mostrar_detalle_parqueadero)
+            widget.hovered.connect(self.precarga_detalle.precargar)
 
             self.parking_grid.addWidget(widget, row, col)
             self.parqueaderos_data[park["id"]] = park
@@ -232,15 +240,21 @@ class ParqueaderosTab(QWidget):
             if not parqueadero_id or not numero_parqueadero:
                 raise ValueError("ID de parqueadero o número no válido")
 
-            # Verificar que el parqueadero existe
-            query_validacion = "SELECT id FROM parqueaderos WHERE id = %s"
-            resultado = self.db.fetch_one(query_validacion, (parqueadero_id,))
-
-            if not resultado:
+            # Datos precargados al pasar el mouse (None = el modal los consulta)
+            datos = self.precarga_detalle.tomar(parqueadero_id) or cargar_datos_detalle(self.db, parqueadero_id)
+            if not datos:
                 raise ValueError(f"El parqueadero con ID {parqueadero_id} no existe")
 
-            modal = DetalleParqueaderoModal(
-                parqueadero_id=parqueadero_id, numero_parqueadero=numero_parqueadero, db_manager=self.db, parent=self
+            modal = self.pool_modales.obtener(
+                DetalleParqueaderoModal,
+                crear=lambda: DetalleParqueaderoModal(
+                    parqueadero_id=parqueadero_id,
+                    numero_parqueadero=numero_parqueadero,
+                    db_manager=self.db,
+                    parent=self,
+                    datos=datos,
+                ),
+                vincular=lambda m: m.vincular(parqueadero_id, datos),
             )
             modal.exec_()
         except Exception as e:
@@ -363,6 +377,7 @@ class ParqueaderosTab(QWidget):
 
     def cargar_parqueaderos_con_filtros(self, sotano=None, tipo_vehiculo=None, estado=None):
         """Carga parqueaderos con filtros específicos"""
+        self.precarga_detalle.invalidar()
         try:
             parqueaderos = self.parqueadero_model.obtener_todos(
                 sotano=sotano, tipo_vehiculo=tipo_vehiculo, estado=estado
@@ -404,8 +419,9 @@ class ParqueaderosTab(QWidget):
                     sotano=park.get("sotano", ""),
                 )
 
-                # Conectar señal de clic
+                # Conectar señal de clic y precarga del detalle
                 widget.clicked.connect(self.mostrar_detalle_parqueadero)
+                widget.hovered.connect(self.precarga_detalle.precargar)
 
                 self.parking_grid.addWidget(widget, row, col)
                 self.parqueaderos_data[park["id"]] = park
@@ -4,7 +4,7 @@ Módulo de la pestaña Reportes del sistema de gestión de parqueadero
 """
 
 import csv
-from datetime import datetime
+from datetime import date, datetime, timedelta
 
 from PyQt5.QtCore import QDate, Qt, pyqtSignal
 from PyQt5.QtWidgets import (
@@ -26,32 +26,12 @@ from PyQt5.QtWidgets import (
 
 from ..config.settings import CARGOS_DISPONIBLES, DIRECCIONES_DISPONIBLES
 from ..database.manager import DatabaseManager
+from ..database.version_datos import version_rollups
+from ..utils.cache_reportes import CacheReportes
+from ..utils.rollups_historial import ConsultasRollups
 
-# Imports opcionales para exportación
-try:
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-    from reportlab.lib.units import inch
-    from reportlab.platypus import (
-        Paragraph,
-        SimpleDocTemplate,
-        Spacer,
-        Table,
-        TableStyle,
-    )
-
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-
-try:
-    from openpyxl import Workbook
-    from openpyxl.styles import Alignment, Font, PatternFill
-
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
+# reportlab y openpyxl se cargan al exportar (ver utils.dependencias)
+from ..utils.dependencias import disponible, mensaje_instalacion
 
 
 class ReportesTab(QWidget):
@@ -64,6 +44,16 @@ class ReportesTab(QWidget):
         super().__init__()
         self.db = db_manager
 
+        # Resultados por (reporte, filtros, versión de datos): cambiar de filtros
+        # o recibir señales sin cambios en los datos no vuelve a consultar
+        self.cache_reportes = CacheReportes()
+        # Resultado que muestra cada tabla (evita repintar la misma lista)
+        self._datos_mostrados = {}
+        self._columna_sotano = None
+        # Reporte histórico: se lee de las tablas de rollup (migración 005)
+        self.consultas_rollups = ConsultasRollups(db_manager)
+        self._rollups_disponibles = None
+
         # Inicializar filtros sin fechas por defecto
         self.filtros_activos = {
             "tipo_vehiculo": None,
@@ -342,6 +332,7 @@ class ReportesTab(QWidget):
         self.tab_parqueaderos = self._crear_tab_parqueaderos()
         self.tab_asignaciones = self._crear_tab_asignaciones()
         self.tab_excepciones = self._crear_tab_excepciones()
+        self.tab_historico = self._crear_tab_historico()
 
         self.tab_widget.addTab(self.tab_general, "📋 Reporte General")
         self.tab_widget.addTab(self.tab_funcionarios, "👥 Funcionarios")
@@ -349,6 +340,7 @@ class ReportesTab(QWidget):
         self.tab_widget.addTab(self.tab_parqueaderos, "🅿️ Parqueaderos")
         self.tab_widget.addTab(self.tab_asignaciones, "📍 Asignaciones")
         self.tab_widget.addTab(self.tab_excepciones, "🔄 Excepciones")
+        self.tab_widget.addTab(self.tab_historico, "📈 Histórico")
 
     def _crear_tab_reporte_general(self):
         """Crea la pestaña de Reporte General"""
@@ -764,6 +756,62 @@ class ReportesTab(QWidget):
 
         return widget
 
+    def _crear_tab_historico(self):
+        """Crea la pestaña de Histórico mensual (ocupación y accesos)"""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+        layout.setContentsMargins(10, 10, 10, 10)
+
+        # Descripción
+        self.lbl_historico = QLabel(
+            "Ocupación promedio, accesos y asignaciones nuevas por mes (últimos 12 meses o rango de fechas del filtro)"
+        )
+        self.lbl_historico.setStyleSheet("color: #7f8c8d; font-style: italic; padding: 5px;")
+        layout.addWidget(self.lbl_historico)
+
+        # Tabla
+        self.tabla_historico = QTableWidget()
+        self.tabla_historico.setColumnCount(10)
+        self.tabla_historico.setHorizontalHeaderLabels(
+            [
+                "Mes",
+                "Espacios",
+                "Ocupación %",
+                "Vehículos Promedio",
+                "Carros",
+                "Motos",
+                "Bicicletas",
+                "Entradas",
+                "Salidas",
+                "Asignaciones Nuevas",
+            ]
+        )
+        self.tabla_historico.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tabla_historico.setAlternatingRowColors(True)
+        self.tabla_historico.setStyleSheet(
+            """
+            QTableWidget {
+                gridline-color: #bdc3c7;
+                background-color: white;
+                alternate-background-color: #ecf0f1;
+            }
+            QHeaderView::section {
+                background-color: #00B54E;
+                color: white;
+                font-weight: bold;
+                padding: 8px;
+                border: 1px solid #009642;
+            }
+        """
+        )
+        layout.addWidget(self.tabla_historico)
+
+        # Botones de acción
+        btn_layout = self._crear_botones_exportacion(self.tabla_historico, "reporte_historico")
+        layout.addLayout(btn_layout)
+
+        return widget
+
     def _crear_botones_exportacion(self, tabla, nombre_base):
         """Crea los botones de exportación para una tabla"""
         btn_layout = QHBoxLayout()
@@ -955,6 +1003,11 @@ class ReportesTab(QWidget):
         except Exception as e:
             errores.append(f"Excepciones: {str(e)}")
 
+        try:
+            self.actualizar_historico()
+        except Exception as e:
+            errores.append(f"Histórico: {str(e)}")
+
         # Emitir señal de reporte generado
         self.reporte_generado.emit()
 
@@ -1039,7 +1092,7 @@ class ReportesTab(QWidget):
 
         query += " ORDER BY f.apellidos, f.nombre"
 
-        datos = self.db.fetch_all(query, tuple(params) if params else None)
+        datos = self._consultar("general", query, params)
         self._llenar_tabla(self.tabla_general, datos)
 
     def actualizar_funcionarios(self):
@@ -1119,7 +1172,7 @@ class ReportesTab(QWidget):
 
         query += " ORDER BY f.apellidos, f.nombre"
 
-        datos = self.db.fetch_all(query, tuple(params) if params else None)
+        datos = self._consultar("funcionarios", query, params)
         self._llenar_tabla(self.tabla_funcionarios, datos)
 
     def actualizar_vehiculos(self):
@@ -1166,18 +1219,20 @@ class ReportesTab(QWidget):
 
         query += " ORDER BY v.placa"
 
-        datos = self.db.fetch_all(query, tuple(params) if params else None)
+        datos = self._consultar("vehiculos", query, params)
         self._llenar_tabla(self.tabla_vehiculos, datos)
 
     def actualizar_parqueaderos(self):
         """Actualiza el reporte de parqueaderos"""
-        # Verificar si existe la columna 'sotano'
-        try:
-            check_query = "SHOW COLUMNS FROM parqueaderos LIKE 'sotano'"
-            column_exists = self.db.fetch_one(check_query) is not None
-        except Exception as e:
-            print(f"Advertencia al verificar columna 'sotano': {e}")
-            column_exists = False
+        # Verificar si existe la columna 'sotano' (una vez: es estructura, no datos)
+        if self._columna_sotano is None:
+            try:
+                check_query = "SHOW COLUMNS FROM parqueaderos LIKE 'sotano'"
+                self._columna_sotano = self.db.fetch_one(check_query) is not None
+            except Exception as e:
+                print(f"Advertencia al verificar columna 'sotano': {e}")
+                self._columna_sotano = False
+        column_exists = self._columna_sotano
 
         if column_exists:
             query = """
@@ -1284,7 +1339,8 @@ class ReportesTab(QWidget):
                 ORDER BY p.numero_parqueadero
             """
 
-        datos = self.db.fetch_all(query)
+        # El reporte de parqueaderos no depende de los filtros
+        datos = self._consultar("parqueaderos", query, filtros={})
         self._llenar_tabla(self.tabla_parqueaderos, datos)
 
     def actualizar_asignaciones(self):
@@ -1333,7 +1389,7 @@ class ReportesTab(QWidget):
 
         query += " ORDER BY a.fecha_asignacion DESC"
 
-        datos = self.db.fetch_all(query, tuple(params) if params else None)
+        datos = self._consultar("asignaciones", query, params)
         self._llenar_tabla(self.tabla_asignaciones, datos)
 
     def actualizar_excepciones(self):
@@ -1411,20 +1467,62 @@ class ReportesTab(QWidget):
 
         query += " ORDER BY f.apellidos, f.nombre"
 
-        datos = self.db.fetch_all(query, tuple(params) if params else None)
+        datos = self._consultar("excepciones", query, params)
         self._llenar_tabla(self.tabla_excepciones, datos)
 
+    def actualizar_historico(self):
+        """Actualiza el reporte histórico mensual desde las tablas de rollup"""
+        # Verificar una vez si la migración 005 está aplicada (es estructura, no datos)
+        if self._rollups_disponibles is None:
+            self._rollups_disponibles = self.consultas_rollups.disponible()
+            if not self._rollups_disponibles:
+                self.lbl_historico.setText(
+                    "El reporte histórico requiere la migración db/migrations/005_rollups_historial.sql"
+                )
+        if not self._rollups_disponibles:
+            return
+
+        hasta = self.filtros_activos.get("fecha_fin") or date.today()
+        desde = self.filtros_activos.get("fecha_inicio") or (hasta - timedelta(days=365)).replace(day=1)
+
+        datos = self.cache_reportes.obtener(
+            "historico",
+            {"fecha_inicio": desde, "fecha_fin": hasta},
+            lambda: self.consultas_rollups.ocupacion_mensual(desde, hasta),
+            version=version_rollups,
+        )
+        self._llenar_tabla(self.tabla_historico, datos)
+
+    def _consultar(self, reporte: str, query: str, params: list = None, filtros: dict = None) -> list:
+        """
+        Ejecuta la consulta de un reporte o la sirve desde la caché
+
+        Args:
+            reporte: Nombre del reporte (parte de la clave de caché)
+            query: Consulta SQL construida para los filtros
+            params: Parámetros de la consulta
+            filtros: Filtros que determinan la consulta (por defecto filtros_activos)
+        """
+        return self.cache_reportes.obtener(
+            reporte,
+            self.filtros_activos if filtros is None else filtros,
+            lambda: self.db.fetch_all(query, tuple(params) if params else None),
+        )
+
     def _llenar_tabla(self, tabla, datos):
         """Llena una tabla con los datos proporcionados"""
+        # Misma lista servida por la caché: la tabla ya la muestra
+        if datos and self._datos_mostrados.get(tabla) is datos:
+            return
+        self._datos_mostrados[tabla] = datos
+
         tabla.setRowCount(0)
 
         if not datos:
             return
 
-        for row_data in datos:
-            row_position = tabla.rowCount()
-            tabla.insertRow(row_position)
-
+        tabla.setRowCount(len(datos))
+        for row_position, row_data in enumerate(datos):
             for col_index, (key, value) in enumerate(row_data.items()):
                 item = QTableWidgetItem(str(value) if value is not None else "")
                 item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # Solo lectura
@@ -1464,13 +1562,11 @@ class ReportesTab(QWidget):
 
     def exportar_excel(self, tabla, nombre_base):
         """Exporta los datos a Excel usando openpyxl"""
-        if not OPENPYXL_AVAILABLE:
+        if not disponible("openpyxl"):
             QMessageBox.warning(
                 self,
                 "Librería no disponible",
-                "La exportación a Excel requiere instalar la librería 'openpyxl'.\n\n"
-                "Instalar con: pip install openpyxl\n\n"
-                "Por ahora, use la exportación a CSV.",
+                mensaje_instalacion("openpyxl") + "\n\nPor ahora, use la exportación a CSV.",
             )
             return
 
@@ -1483,6 +1579,9 @@ class ReportesTab(QWidget):
             if not filename:
                 return
 
+            from openpyxl import Workbook
+            from openpyxl.styles import Alignment, Font, PatternFill
+
             # Crear workbook y hoja activa
             wb = Workbook()
             ws = wb.active
@@ -1524,13 +1623,11 @@ class ReportesTab(QWidget):
 
     def exportar_pdf(self, tabla, nombre_base):
         """Exporta los datos a PDF usando reportlab"""
-        if not REPORTLAB_AVAILABLE:
+        if not disponible("reportlab"):
             QMessageBox.warning(
                 self,
                 "Librería no disponible",
-                "La exportación a PDF requiere instalar la librería 'reportlab'.\n\n"
-                "Instalar con: pip install reportlab\n\n"
-                "Por ahora, use la exportación a CSV.",
+                mensaje_instalacion("reportlab") + "\n\nPor ahora, use la exportación a CSV.",
             )
             return
 
@@ -1543,6 +1640,12 @@ class ReportesTab(QWidget):
             if not filename:
                 return
 
+            from reportlab.lib import colors
+            from reportlab.lib.pagesizes import A4, landscape
+            from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+            from reportlab.lib.units import inch
+            from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
             # Crear documento PDF
             doc = SimpleDocTemplate(
                 filename, pagesize=landscape(A4), rightMargin=30, leftMargin=30, topMargin=30, bottomMargin=30
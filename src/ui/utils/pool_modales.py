@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Reutilización de modales y precarga de sus datos en segundo plano
+
+Construir un modal de detalle cuesta mucho más que llenarlo: cientos de
+widgets, estilos y layouts. PoolModales conserva una instancia por tipo de
+modal y la vuelve a enlazar con los datos del nuevo registro en cada
+apertura. PrecargaDatos trae esos datos con una conexión propia mientras el
+usuario pasa el mouse o selecciona, para que el clic solo tenga que pintar.
+
+Uso:
+    pool = PoolModales()
+    precarga = PrecargaDatos(db.config, cargar_datos_detalle, parent=self)
+    widget.hovered.connect(precarga.precargar)
+
+    modal = pool.obtener(
+        "detalle",
+        crear=lambda: DetalleModal(registro_id, db, datos=precarga.tomar(registro_id)),
+        vincular=lambda m: m.vincular(registro_id, datos=precarga.tomar(registro_id)),
+    )
+    modal.exec_()
+"""
+
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from src.core.logger import logger
+from src.database.manager import ConexionIndependiente
+
+# Segundos durante los que un dato precargado se considera vigente
+VIGENCIA_PRECARGA_S = 10.0
+# Datos precargados conservados a la vez (los más recientes)
+MAX_PRECARGAS = 20
+
+
+class PoolModales:
+    """Conserva una instancia por clave y la re-enlaza en vez de reconstruirla"""
+
+    def __init__(self):
+        self._modales: Dict[Hashable, Any] = {}
+
+    def obtener(self, clave: Hashable, crear: Callable[[], Any], vincular: Callable[[Any], None]):
+        """
+        Devuelve el modal de la clave listo para mostrarse
+
+        Args:
+            clave: Identificador del tipo de modal
+            crear: Construye una instancia nueva (primera vez o si la guardada está en uso)
+            vincular: Carga los datos del nuevo registro en una instancia reutilizada
+
+        Returns:
+            Instancia del modal
+        """
+        modal = self._modales.get(clave)
+        if modal is not None and self._disponible(modal):
+            vincular(modal)
+            return modal
+
+        modal = crear()
+        if clave not in self._modales or not self._vivo(self._modales[clave]):
+            self._modales[clave] = modal
+        return modal
+
+    def descartar(self, clave: Hashable = None):
+        """Olvida la instancia de una clave (o todas), p. ej. tras cambiar el esquema de datos"""
+        if clave is None:
+            self._modales.clear()
+        else:
+            self._modales.pop(clave, None)
+
+    @classmethod
+    def _disponible(cls, modal) -> bool:
+        # Un modal visible está en uso (apertura anidada): no se reutiliza
+        return cls._vivo(modal) and not modal.isVisible()
+
+    @staticmethod
+    def _vivo(modal) -> bool:
+        # El objeto C++ pudo destruirse junto con su padre
+        try:
+            modal.isVisible()
+            return True
+        except RuntimeError:
+            return False
+
+
+class PrecargaWorker(QThread):
+    """Worker que ejecuta una función de carga con conexión propia"""
+
+    finished = pyqtSignal(object, object)  # (clave, datos o None)
+
+    def __init__(self, db_config, cargar: Callable, clave: Hashable):
+        super().__init__()
+        self.db_config = db_config
+        self.cargar = cargar
+        self.clave = clave
+
+    def run(self):
+        datos = None
+        try:
+            with ConexionIndependiente(self.db_config) as db:
+                if db.connection:
+                    datos = self.cargar(db, self.clave)
+        except Exception as e:
+            logger.error(f"Error en precarga de {self.clave!r}: {e}")
+        self.finished.emit(self.clave, datos)
+
+
+class PrecargaDatos(QObject):
+    """
+    Precarga datos de modales en segundo plano, un worker a la vez
+
+    Si llegan solicitudes mientras hay un worker en curso solo se conserva la
+    última: al pasar el mouse por la grilla interesa el espacio donde se
+    detiene, no los que cruzó.
+    """
+
+    def __init__(
+        self,
+        db_config,
+        cargar: Callable[[Any, Hashable], Any],
+        vigencia_s: float = VIGENCIA_PRECARGA_S,
+        max_entradas: int = MAX_PRECARGAS,
+        parent=None,
+    ):
+        """
+        Args:
+            db_config: Configuración para abrir ConexionIndependiente en el worker
+            cargar: Función (db, clave) -> datos; se ejecuta fuera del hilo de la UI
+            vigencia_s: Segundos durante los que un dato precargado se puede usar
+            max_entradas: Datos precargados conservados a la vez
+            parent: QObject padre
+        """
+        super().__init__(parent)
+        self.db_config = db_config
+        self.cargar = cargar
+        self.vigencia_s = vigencia_s
+        self.max_entradas = max_entradas
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        self._worker: Optional[PrecargaWorker] = None
+        self._siguiente: Optional[Hashable] = None
+        # Se incrementa al invalidar: descarta resultados de workers ya lanzados
+        self._generacion = 0
+
+    def precargar(self, clave: Hashable):
+        """Solicita la precarga de una clave (sin efecto si ya está vigente o en curso)"""
+        if self._vigente(clave) is not None:
+            return
+        if self._worker is not None:
+            if self._worker.clave != clave:
+                self._siguiente = clave
+            return
+        self._iniciar(clave)
+
+    def tomar(self, clave: Hashable) -> Optional[Any]:
+        """
+        Datos precargados y vigentes de una clave, o None
+
+        Los datos se consumen: una segunda apertura vuelve a consultar.
+        """
+        datos = self._vigente(clave)
+        self._cache.pop(clave, None)
+        return datos
+
+    def invalidar(self):
+        """Descarta todo lo precargado (tras una asignación, edición, etc.)"""
+        self._cache.clear()
+        self._siguiente = None
+        self._generacion += 1
+
+    def _vigente(self, clave: Hashable) -> Optional[Any]:
+        entrada = self._cache.get(clave)
+        if entrada is None:
+            return None
+        momento, datos = entrada
+        if time.monotonic() - momento > self.vigencia_s:
+            del self._cache[clave]
+            return None
+        return datos
+
+    def _guardar(self, clave: Hashable, datos: Any):
+        """
+        Guarda un resultado y libera lo que ya no se va a usar
+
+        Las claves que se cruzaron con el mouse y nunca se abrieron no pasan por
+        tomar: se descartan al vencer o cuando superan max_entradas (primero las
+        más antiguas).
+        """
+        ahora = time.monotonic()
+        for vencida in [c for c, (momento, _) in self._cache.items() if ahora - momento > self.vigencia_s]:
+            del self._cache[vencida]
+        self._cache.pop(clave, None)
+        self._cache[clave] = (ahora, datos)
+        while len(self._cache) > self.max_entradas:
+            del self._cache[next(iter(self._cache))]
+
+    def _iniciar(self, clave: Hashable):
+        self._worker = PrecargaWorker(self.db_config, self.cargar, clave)
+        self._worker.generacion = self._generacion
+        self._worker.finished.connect(self._al_terminar)
+        self._worker.start()
+
+    def _al_terminar(self, clave, datos):
+        worker, self._worker = self._worker, None
+        vigente = worker is None or worker.generacion == self._generacion
+        if worker is not None:
+            # finished se emite al final de run(): la espera es inmediata
+            worker.wait()
+            worker.deleteLater()
+        if datos is not None and vigente:
+            self._guardar(clave, datos)
+
+        siguiente, self._siguiente = self._siguiente, None
+        if siguiente is not None and siguiente != clave:
+            self.precargar(siguiente)
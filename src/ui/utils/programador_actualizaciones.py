@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Programador de actualizaciones entre pestañas
+
+Una sola operación (p. ej. una asignación) emite varias señales y cada una
+disparaba de inmediato varias recargas, casi todas con force_reconnect().
+ProgramadorActualizaciones agrupa las solicitudes que llegan dentro de una
+ventana corta, elimina destinos repetidos y solo recarga las pestañas
+visibles; las ocultas quedan pendientes hasta que el usuario las abre.
+
+Uso:
+    programador = ProgramadorActualizaciones(tabs, db)
+    senal.connect(lambda: programador.solicitar(tab_a.cargar_datos, tab_b.cargar_datos))
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, List
+
+from PyQt5.QtCore import QObject, QTimer
+
+from src.core.logger import logger
+
+# Ventana de agrupación en milisegundos
+VENTANA_AGRUPACION_MS = 150
+
+
+class ProgramadorActualizaciones(QObject):
+    """Agrupa y deduplica recargas de pestañas disparadas por señales"""
+
+    def __init__(self, tabs, db=None, ventana_ms: int = VENTANA_AGRUPACION_MS, parent=None):
+        """
+        Args:
+            tabs: QTabWidget que contiene las pestañas a recargar
+            db: DatabaseManager compartido; se reconecta una sola vez por ronda
+            ventana_ms: Tiempo de espera para agrupar solicitudes
+            parent: QObject padre
+        """
+        super().__init__(parent or tabs)
+        self.tabs = tabs
+        self.db = db
+
+        # pestaña -> métodos pendientes (en orden de llegada, sin repetir)
+        self._pendientes: Dict[object, "OrderedDict[Callable, None]"] = OrderedDict()
+        # Pestañas que ya recargan todo en su showEvent
+        self._recarga_al_mostrar = set()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(ventana_ms)
+        self._timer.timeout.connect(self.procesar)
+
+        self.tabs.currentChanged.connect(self._al_cambiar_pestana)
+
+    def recarga_al_mostrar(self, pestana):
+        """
+        Marca una pestaña que recarga sus datos al mostrarse (showEvent)
+
+        Las solicitudes para esa pestaña mientras está oculta se descartan.
+        """
+        self._recarga_al_mostrar.add(pestana)
+
+    def solicitar(self, *metodos: Callable):
+        """
+        Encola métodos de recarga (métodos enlazados de cada pestaña)
+
+        Args:
+            *metodos: Métodos a ejecutar; se agrupan por la pestaña dueña
+        """
+        for metodo in metodos:
+            pestana = getattr(metodo, "__self__", None)
+            self._pendientes.setdefault(pestana, OrderedDict())[metodo] = None
+
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def pendientes(self, pestana) -> List[Callable]:
+        """Métodos pendientes de una pestaña"""
+        return list(self._pendientes.get(pestana, ()))
+
+    def _es_visible(self, pestana) -> bool:
+        if self.tabs.indexOf(pestana) < 0:
+            # No es una pestaña (o es un objeto sin widget): siempre se ejecuta
+            return True
+        return self.tabs.currentWidget() is pestana
+
+    def procesar(self):
+        """Ejecuta las recargas pendientes de las pestañas visibles"""
+        visibles = []
+        for pestana in list(self._pendientes):
+            if self._es_visible(pestana):
+                visibles.append((pestana, self._pendientes.pop(pestana)))
+            elif pestana in self._recarga_al_mostrar:
+                del self._pendientes[pestana]
+
+        self._ejecutar(visibles)
+
+    def _al_cambiar_pestana(self, indice: int):
+        pestana = self.tabs.widget(indice)
+        if pestana in self._pendientes:
+            self._ejecutar([(pestana, self._pendientes.pop(pestana))])
+
+    def _ejecutar(self, lotes):
+        if not lotes:
+            return
+
+        # Todas las pestañas comparten la conexión: basta un refresco por ronda
+        if self.db is not None:
+            self.db.force_reconnect()
+
+        for pestana, metodos in lotes:
+            for metodo in metodos:
+                try:
+                    metodo()
+                except Exception as e:
+                    logger.error(f"Error al actualizar {type(pestana).__name__}.{metodo.__name__}: {e}")
@@ -14,6 +14,7 @@ from PyQt5.QtWidgets import (
     QLabel,
     QLineEdit,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
     QTableWidget,
     QTableWidgetItem,
@@ -22,15 +23,23 @@ from PyQt5.QtWidgets import (
     QApplication,
 )
 
-from ..database.manager import DatabaseManager
+from ..database.manager import ConexionIndependiente, DatabaseManager
+from ..database.version_datos import version_datos
 from ..models.funcionario import FuncionarioModel
 from ..models.vehiculo import VehiculoModel
-from .modales_vehiculos import EditarVehiculoModal, EliminarVehiculoModal
+from .modales_vehiculos import EditarVehiculoModal, EliminarVehiculoModal, VerVehiculoModal
+from ..utils.dependencias import faltantes, mensaje_instalacion
 from ..utils.formatters import format_numero_parqueadero
 
 # Nuevas utilidades de refactorización
 from .styles import UIStyles
 from .utils import UIDialogs, TableUtils, ButtonFactory
+from .utils.pool_modales import PoolModales, PrecargaDatos
+
+
+def precargar_vehiculo(db, vehiculo_id: int):
+    """Datos del modal de vehículo (se ejecuta en el worker de precarga)"""
+    return VehiculoModel(db).obtener_por_id(vehiculo_id)
 
 
 # ============================================================================
@@ -79,6 +88,7 @@ class GuardarVehiculoWorker(QThread):
                     try:
                         self.cursor.execute(query, params or ())
                         self.connection.commit()
+                        version_datos.incrementar()
                         return (True, None)
                     except Exception as e:
                         self.connection.rollback()
@@ -263,6 +273,59 @@ class CargarComboFuncionariosWorker(QThread):
                 connection.close()
 
 
+class ImportarVehiculosWorker(QThread):
+    """Worker thread para importar vehículos desde Excel/CSV por lotes sin bloquear UI"""
+
+    progreso = pyqtSignal(int, int, str)  # (procesados, total, etapa)
+    finished = pyqtSignal(object, str)  # (ResultadoImportacion o None, mensaje_error)
+
+    def __init__(self, db_config, archivo: str):
+        super().__init__()
+        self.db_config = db_config
+        self.archivo = archivo
+
+    def run(self):
+        """Lee el archivo en streaming e importa cada lote con conexión propia"""
+        try:
+            from ..utils.importacion_vehiculos import COLUMNAS_OPCIONALES, COLUMNAS_REQUERIDAS, ImportadorVehiculos
+            from ..utils.lector_importacion import LectorImportacion
+
+            self.progreso.emit(0, 0, "Leyendo archivo...")
+            try:
+                lector = LectorImportacion(self.archivo)
+            except Exception as e:
+                self.finished.emit(
+                    None,
+                    f"No se pudo leer el archivo.\n\nError: {str(e)}\n\n"
+                    "Asegúrese de que el archivo no esté abierto en otra aplicación."
+                )
+                return
+
+            with lector, ConexionIndependiente(self.db_config) as db:
+                if not db.connection:
+                    self.finished.emit(None, "No se pudo establecer conexión a la base de datos")
+                    return
+
+                importador = ImportadorVehiculos(db)
+                columnas_faltantes = importador.columnas_faltantes(lector.columnas)
+                if columnas_faltantes:
+                    self.finished.emit(
+                        None,
+                        f"El archivo no tiene las columnas requeridas.\n\n"
+                        f"Columnas faltantes: {', '.join(columnas_faltantes)}\n\n"
+                        f"Columnas requeridas:\n{', '.join(COLUMNAS_REQUERIDAS)}\n\n"
+                        f"Columnas opcionales:\n{', '.join(COLUMNAS_OPCIONALES)}"
+                    )
+                    return
+
+                resultado = importador.importar_lotes(lector, progreso=self.progreso.emit)
+
+            self.finished.emit(resultado, "")
+
+        except Exception as e:
+            self.finished.emit(None, f"Ocurrió un error inesperado durante la importación:\n\n{str(e)}")
+
+
 class VehiculosTab(QWidget):
     """Pestaña de gestión de vehículos"""
 
@@ -292,6 +355,13 @@ class VehiculosTab(QWidget):
         self.guardar_worker = None
         self.cargar_vehiculos_worker = None
         self.cargar_combo_worker = None
+        self.importar_worker = None
+        self.progress_importacion = None
+
+        # Modales reutilizables; su detalle se precarga al pasar el mouse o seleccionar una fila
+        self.pool_modales = PoolModales()
+        self.precarga_vehiculos = PrecargaDatos(db_manager.config, precargar_vehiculo, parent=self)
+        self._ids_pagina = []
 
         self.setup_ui()
         self.cargar_vehiculos()
@@ -471,6 +541,13 @@ class VehiculosTab(QWidget):
         # Deshabilitar scroll vertical completamente para forzar visualización exacta de 6 filas
         from PyQt5.QtCore import Qt as QtCore
         self.tabla_vehiculos.setVerticalScrollBarPolicy(QtCore.ScrollBarAlwaysOff)
+
+        # Precarga del detalle de la fila bajo el mouse o seleccionada
+        self.tabla_vehiculos.setMouseTracking(True)
+        self.tabla_vehiculos.cellEntered.connect(lambda fila, _columna: self.precargar_fila(fila))
+        self.tabla_vehiculos.itemSelectionChanged.connect(
+            lambda: self.precargar_fila(self.tabla_vehiculos.currentRow())
+        )
         self.tabla_vehiculos.setHorizontalScrollBarPolicy(QtCore.ScrollBarAsNeeded)
 
         # Aplicar estilo centralizado
@@ -735,6 +812,7 @@ class VehiculosTab(QWidget):
 
         # Guardar lista completa para filtrado
         self.vehiculos_completos = vehiculos
+        self.precarga_vehiculos.invalidar()
 
         # Mostrar todos los vehículos
         self.mostrar_vehiculos(vehiculos)
@@ -755,6 +833,7 @@ class VehiculosTab(QWidget):
         """Callback cuando terminan de cargar los vehículos"""
         # Guardar lista completa para filtrado
         self.vehiculos_completos = vehiculos
+        self.precarga_vehiculos.invalidar()
 
         # Mostrar todos los vehículos
         self.mostrar_vehiculos(vehiculos)
@@ -783,6 +862,7 @@ class VehiculosTab(QWidget):
 
         # Obtener vehículos de la página actual
         vehiculos_pagina = vehiculos[inicio:fin]
+        self._ids_pagina = [vehiculo["id"] for vehiculo in vehiculos_pagina]
 
         # Actualizar tabla
         self.tabla_vehiculos.setRowCount(len(vehiculos_pagina))
@@ -964,6 +1044,11 @@ class VehiculosTab(QWidget):
         """Actualiza la tabla de vehículos (Optimizado - Asíncrono)"""
         self.cargar_vehiculos_async()
 
+    def precargar_fila(self, fila: int):
+        """Precarga en segundo plano el detalle del vehículo de una fila visible"""
+        if 0 <= fila < len(self._ids_pagina):
+            self.precarga_vehiculos.precargar(self._ids_pagina[fila])
+
     def abrir_modal_editar(self, vehiculo_id: int):
         """Abre el modal para editar un vehículo
 
@@ -990,14 +1075,35 @@ class VehiculosTab(QWidget):
             vehiculo_id (int): ID del vehículo a visualizar
         """
         try:
-            from .modales_vehiculos import VerVehiculoModal
-
-            modal = VerVehiculoModal(vehiculo_id, self.vehiculo_model, self.funcionario_model, self)
+            datos = self.precarga_vehiculos.tomar(vehiculo_id)
+            modal = self.pool_modales.obtener(
+                VerVehiculoModal,
+                crear=lambda: VerVehiculoModal(
+                    vehiculo_id, self.vehiculo_model, self.funcionario_model, self, vehiculo_data=datos
+                ),
+                vincular=lambda m: m.vincular(vehiculo_id, datos),
+            )
             modal.exec_()
 
         except Exception as e:
             UIDialogs.show_error(self, "Error", f"Error al abrir el modal de visualizacion: {str(e)}")
 
+    def obtener_modal_eliminar(self, vehiculo_id: int, vehiculo_data: dict = None) -> EliminarVehiculoModal:
+        """Modal de eliminación del pool, enlazado al vehículo (las señales se conectan una vez)"""
+
+        def crear():
+            modal = EliminarVehiculoModal(vehiculo_id, self.vehiculo_model, self, vehiculo_data=vehiculo_data)
+
+            # Conectar señal para actualizar tabla cuando se elimine (Optimizado - Asíncrono)
+            modal.vehiculo_eliminado.connect(self.cargar_vehiculos_async)
+            modal.vehiculo_eliminado.connect(self.vehiculo_creado.emit)  # Para sincronizar otros módulos
+            modal.vehiculo_eliminado.connect(self.cargar_combo_funcionarios)  # Actualizar combo
+            return modal
+
+        return self.pool_modales.obtener(
+            EliminarVehiculoModal, crear=crear, vincular=lambda m: m.vincular(vehiculo_id, vehiculo_data)
+        )
+
     def abrir_modal_eliminar_optimizado(self, vehiculo_data: dict):
         """Abre el modal para eliminar un vehículo (OPTIMIZADO - sin consulta adicional)
 
@@ -1007,20 +1113,9 @@ class VehiculosTab(QWidget):
         import time
         try:
 
-            # Crear modal pasando los datos directamente (SIN consulta a BD)
+            # Obtener modal pasando los datos directamente (SIN consulta a BD)
             t_modal = time.time()
-            modal = EliminarVehiculoModal(
-                vehiculo_id=vehiculo_data["id"],
-                vehiculo_model=self.vehiculo_model,
-                parent=self,
-                vehiculo_data=vehiculo_data  # Pasar datos directamente
-            )
-
-            # Conectar señal para actualizar tabla cuando se elimine (Optimizado - Asíncrono)
-            t_connect = time.time()
-            modal.vehiculo_eliminado.connect(self.cargar_vehiculos_async)
-            modal.vehiculo_eliminado.connect(self.vehiculo_creado.emit)  # Para sincronizar otros módulos
-            modal.vehiculo_eliminado.connect(self.cargar_combo_funcionarios)  # Actualizar combo
+            modal = self.obtener_modal_eliminar(vehiculo_data["id"], vehiculo_data)
 
             t_exec = time.time()
             resultado = modal.exec_()
@@ -1040,12 +1135,7 @@ class VehiculosTab(QWidget):
             vehiculo_id (int): ID del vehículo a eliminar
         """
         try:
-            modal = EliminarVehiculoModal(vehiculo_id, self.vehiculo_model, self)
-
-            # Conectar señal para actualizar tabla cuando se elimine (Optimizado - Asíncrono)
-            modal.vehiculo_eliminado.connect(self.cargar_vehiculos_async)
-            modal.vehiculo_eliminado.connect(self.vehiculo_creado.emit)  # Para sincronizar otros módulos
-            modal.vehiculo_eliminado.connect(self.cargar_combo_funcionarios)  # Actualizar combo
+            modal = self.obtener_modal_eliminar(vehiculo_id)
 
             resultado = modal.exec_()
 
@@ -1104,246 +1194,79 @@ class VehiculosTab(QWidget):
         self.mostrar_vehiculos(self.vehiculos_completos)
 
     def importar_desde_excel(self):
-        """Importa vehículos masivamente desde un archivo Excel (.xlsx o .xls)"""
-        try:
-            # Verificar si pandas y openpyxl están instalados
-            try:
-                import pandas as pd
-            except ImportError:
-                QMessageBox.critical(
-                    self,
-                    "Error de Dependencias",
-                    "La librería 'pandas' no está instalada.\n\n"
-                    "Para usar esta función, ejecute:\n"
-                    "pip install pandas openpyxl xlrd"
-                )
-                return
-
-            # Abrir diálogo para seleccionar archivo
-            archivo, _ = QFileDialog.getOpenFileName(
-                self,
-                "Seleccionar archivo Excel de vehículos",
-                "",
-                "Archivos Excel (*.xlsx *.xls);;Todos los archivos (*.*)"
-            )
-
-            if not archivo:
-                return  # Usuario canceló
-
-            # Leer el archivo Excel
-            try:
-                df = pd.read_excel(archivo)
-            except Exception as e:
-                QMessageBox.critical(
-                    self,
-                    "Error al Leer Archivo",
-                    f"No se pudo leer el archivo Excel.\n\nError: {str(e)}\n\n"
-                    "Asegúrese de que el archivo no esté abierto en otra aplicación."
-                )
-                return
-
-            # Validar columnas requeridas
-            columnas_requeridas = ["Cedula", "Tipo_Vehiculo", "Placa"]
-            columnas_opcionales = ["Numero_Parqueadero"]
-
-            columnas_faltantes = [col for col in columnas_requeridas if col not in df.columns]
-            if columnas_faltantes:
-                QMessageBox.critical(
-                    self,
-                    "Error en Estructura del Archivo",
-                    f"El archivo Excel no tiene las columnas requeridas.\n\n"
-                    f"Columnas faltantes: {', '.join(columnas_faltantes)}\n\n"
-                    f"Columnas requeridas:\n{', '.join(columnas_requeridas)}\n\n"
-                    f"Columnas opcionales:\n{', '.join(columnas_opcionales)}"
-                )
-                return
+        """Importa vehículos masivamente desde un archivo Excel (.xlsx, .xls) o CSV"""
+        # Verificar si pandas y openpyxl están instalados (sin importarlos todavía)
+        pendientes = faltantes("pandas", "openpyxl")
+        if pendientes:
+            QMessageBox.critical(self, "Error de Dependencias", mensaje_instalacion(*pendientes))
+            return
 
-            # Reemplazar valores NaN por vacío
-            df = df.fillna("")
+        # Abrir diálogo para seleccionar archivo
+        archivo, _ = QFileDialog.getOpenFileName(
+            self,
+            "Seleccionar archivo Excel de vehículos",
+            "",
+            "Archivos Excel (*.xlsx *.xlsm *.xls);;Archivos CSV (*.csv);;Todos los archivos (*.*)"
+        )
 
-            # Validar que hay datos
-            if len(df) == 0:
-                QMessageBox.warning(self, "Archivo Vacío", "El archivo Excel no contiene datos para importar.")
-                return
+        if not archivo:
+            return  # Usuario canceló
+
+        # Confirmar importación (el archivo se lee por lotes durante el proceso)
+        reply = QMessageBox.question(
+            self,
+            "Confirmar Importación",
+            "¿Desea proceder con la importación?\n\n"
+            "Los vehículos duplicados (misma placa) serán omitidos.\n"
+            "Las cédulas de funcionarios deben existir en la base de datos.",
+            QMessageBox.Yes | QMessageBox.No
+        )
 
-            # Confirmar importación
-            reply = QMessageBox.question(
-                self,
-                "Confirmar Importación",
-                f"Se encontraron {len(df)} registros en el archivo.\n\n"
-                "¿Desea proceder con la importación?\n\n"
-                "Los vehículos duplicados (misma placa) serán omitidos.\n"
-                "Las cédulas de funcionarios deben existir en la base de datos.",
-                QMessageBox.Yes | QMessageBox.No
-            )
+        if reply == QMessageBox.No:
+            return
 
-            if reply == QMessageBox.No:
-                return
+        self.progress_importacion = QProgressDialog("Leyendo archivo...", None, 0, 0, self)
+        self.progress_importacion.setWindowTitle("Importación de Vehículos")
+        self.progress_importacion.setWindowModality(Qt.WindowModal)
+        self.progress_importacion.setMinimumDuration(0)
+        self.progress_importacion.show()
 
-            # Procesar cada fila
-            importados = 0
-            omitidos = 0
-            errores = []
-
-            for index, row in df.iterrows():
-                try:
-                    # Extraer datos básicos
-                    cedula = str(row["Cedula"]).strip()
-                    tipo_vehiculo = str(row["Tipo_Vehiculo"]).strip()
-                    placa = str(row["Placa"]).strip().upper()
-                    numero_parqueadero = str(row.get("Numero_Parqueadero", "")).strip()
-
-                    # Validaciones básicas
-                    if not cedula or not tipo_vehiculo:
-                        omitidos += 1
-                        errores.append(f"Fila {index + 2}: Cédula o Tipo de Vehículo vacíos")
-                        continue
-
-                    # Validar tipo de vehículo
-                    if tipo_vehiculo not in ["Carro", "Moto", "Bicicleta"]:
-                        omitidos += 1
-                        errores.append(f"Fila {index + 2}: Tipo de vehículo inválido '{tipo_vehiculo}' (debe ser Carro, Moto o Bicicleta)")
-                        continue
-
-                    # Validar que la cédula exista en la BD
-                    query_funcionario = "SELECT id FROM funcionarios WHERE cedula = %s AND activo = TRUE"
-                    funcionario = self.db.fetch_one(query_funcionario, (cedula,))
-
-                    if not funcionario:
-                        omitidos += 1
-                        errores.append(f"Fila {index + 2}: Funcionario con cédula '{cedula}' no existe en el sistema")
-                        continue
-
-                    funcionario_id = funcionario["id"]
-
-                    # Validar placa según tipo de vehículo
-                    if tipo_vehiculo == "Bicicleta":
-                        # Bicicletas NO deben tener placa
-                        if placa:
-                            omitidos += 1
-                            errores.append(f"Fila {index + 2}: Las bicicletas NO deben tener placa")
-                            continue
-                        placa = None  # Establecer como None para bicicletas
-                    else:
-                        # Carros y Motos SÍ requieren placa
-                        if not placa:
-                            omitidos += 1
-                            errores.append(f"Fila {index + 2}: La placa es obligatoria para {tipo_vehiculo}")
-                            continue
-
-                        # Validar formato de placa para Carros
-                        if tipo_vehiculo == "Carro":
-                            if len(placa) != 6 or not (placa[:3].isalpha() and placa[3:].isdigit()):
-                                omitidos += 1
-                                errores.append(f"Fila {index + 2}: Formato de placa inválido para Carro '{placa}' (debe ser ABC123)")
-                                continue
-
-                        # Validar formato de placa para Motos
-                        if tipo_vehiculo == "Moto":
-                            valido = False
-                            # Patrón 1: ABC12 (3 letras + 2 números)
-                            if len(placa) == 5 and placa[:3].isalpha() and placa[3:].isdigit():
-                                valido = True
-                            # Patrón 2: ABC12D (3 letras + 2 números + 1 letra)
-                            elif len(placa) == 6 and placa[:3].isalpha() and placa[3:5].isdigit() and placa[5].isalpha():
-                                valido = True
-
-                            if not valido:
-                                omitidos += 1
-                                errores.append(f"Fila {index + 2}: Formato de placa inválido para Moto '{placa}' (debe ser ABC12 o ABC12D)")
-                                continue
-
-                        # Verificar si la placa ya existe
-                        query_placa = "SELECT id FROM vehiculos WHERE placa = %s AND activo = TRUE"
-                        vehiculo_existente = self.db.fetch_one(query_placa, (placa,))
-
-                        if vehiculo_existente:
-                            omitidos += 1
-                            errores.append(f"Fila {index + 2}: La placa '{placa}' ya está registrada")
-                            continue
-
-                    # Validar reglas de negocio antes de insertar
-                    es_valido, mensaje = self.vehiculo_model.validar_vehiculo_antes_registro(
-                        funcionario_id, tipo_vehiculo, placa
-                    )
+        self.importar_worker = ImportarVehiculosWorker(self.db.config, archivo)
+        self.importar_worker.progreso.connect(self._on_progreso_importacion)
+        self.importar_worker.finished.connect(self._on_importacion_completada)
+        self.importar_worker.start()
 
-                    if not es_valido:
-                        omitidos += 1
-                        errores.append(f"Fila {index + 2}: {mensaje}")
-                        continue
+    def _on_progreso_importacion(self, procesados: int, total: int, etapa: str):
+        """Actualiza el diálogo de progreso de la importación"""
+        if not self.progress_importacion:
+            return
+        self.progress_importacion.setLabelText(f"{etapa}\n{procesados} de {total} registros" if total else etapa)
+        self.progress_importacion.setMaximum(total)
+        self.progress_importacion.setValue(procesados)
+
+    def _on_importacion_completada(self, resultado, error: str):
+        """Muestra el reporte final y recarga los datos si se importó algo"""
+        if self.progress_importacion:
+            self.progress_importacion.close()
+            self.progress_importacion = None
+
+        if resultado is None:
+            QMessageBox.critical(self, "Error en Importación", error)
+            return
 
-                    # Insertar vehículo
-                    exito, mensaje_insercion = self.vehiculo_model.crear(
-                        funcionario_id=funcionario_id,
-                        tipo_vehiculo=tipo_vehiculo,
-                        placa=placa
-                    )
+        if resultado.total == 0:
+            QMessageBox.warning(self, "Archivo Vacío", "El archivo no contiene datos para importar.")
+            return
 
-                    if not exito:
-                        omitidos += 1
-                        errores.append(f"Fila {index + 2}: Error al insertar vehículo - {mensaje_insercion}")
-                        continue
-
-                    # Si se especificó un parqueadero, crear asignación
-                    if numero_parqueadero:
-                        try:
-                            num_parq = int(numero_parqueadero)
-
-                            # Verificar que el parqueadero existe
-                            query_parq = "SELECT id FROM parqueaderos WHERE numero_parqueadero = %s AND activo = TRUE"
-                            parqueadero = self.db.fetch_one(query_parq, (num_parq,))
-
-                            if parqueadero:
-                                # Obtener el ID del vehículo recién creado
-                                query_vehiculo = "SELECT id FROM vehiculos WHERE placa = %s AND activo = TRUE" if placa else \
-                                                 "SELECT id FROM vehiculos WHERE funcionario_id = %s AND tipo_vehiculo = %s AND activo = TRUE ORDER BY id DESC LIMIT 1"
-                                params = (placa,) if placa else (funcionario_id, tipo_vehiculo)
-                                vehiculo_nuevo = self.db.fetch_one(query_vehiculo, params)
-
-                                if vehiculo_nuevo:
-                                    # Crear asignación
-                                    query_asignacion = """
-                                        INSERT INTO asignaciones (parqueadero_id, vehiculo_id, activo)
-                                        VALUES (%s, %s, TRUE)
-                                    """
-                                    self.db.execute_query(query_asignacion, (parqueadero["id"], vehiculo_nuevo["id"]))
-                        except ValueError:
-                            # Número de parqueadero inválido, ignorar asignación pero el vehículo ya se creó
-                            pass
-
-                    importados += 1
-
-                except Exception as e:
-                    omitidos += 1
-                    errores.append(f"Fila {index + 2}: Error inesperado - {str(e)}")
-
-            # Mostrar reporte final
-            mensaje_final = f"Importación completada:\n\n"
-            mensaje_final += f"✅ Vehículos importados: {importados}\n"
-            mensaje_final += f"⚠️ Vehículos omitidos: {omitidos}\n\n"
-
-            if errores:
-                mensaje_final += "Detalles de errores:\n"
-                # Mostrar solo los primeros 10 errores para no saturar el diálogo
-                for error in errores[:10]:
-                    mensaje_final += f"  • {error}\n"
-
-                if len(errores) > 10:
-                    mensaje_final += f"\n... y {len(errores) - 10} errores más."
-
-            if importados > 0:
-                QMessageBox.information(self, "Importación Completada", mensaje_final)
-                # Recargar vehículos
-                self.db.force_reconnect()
-                self.cargar_vehiculos_async()
-                self.cargar_combo_funcionarios()
-                self.vehiculo_creado.emit()
-            else:
-                QMessageBox.warning(self, "Importación Sin Éxito", mensaje_final)
+        # Mostrar reporte final
+        mensaje_final = resultado.generar_reporte()
 
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Error Crítico",
-                f"Ocurrió un error inesperado durante la importación:\n\n{str(e)}"
-            )
+        if resultado.importados > 0:
+            QMessageBox.information(self, "Importación Completada", mensaje_final)
+            # Recargar vehículos (el worker hizo commit en su propia conexión)
+            self.db.force_reconnect()
+            self.cargar_vehiculos_async()
+            self.cargar_combo_funcionarios()
+            self.vehiculo_creado.emit()
+        else:
+            QMessageBox.warning(self, "Importación Sin Éxito", mensaje_final)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Gráfica de tendencia embebida (matplotlib) con redibujo incremental
+
+matplotlib se carga en el primer uso (utils.dependencias); sin la librería
+el widget muestra el mensaje de instalación.
+
+Las líneas son artistas animados: un redibujo completo guarda el fondo
+(ejes, etiquetas, leyenda) y los refrescos siguientes solo restauran ese
+fondo y pintan las líneas (blitting). El redibujo completo se hace cuando
+aparece una serie nueva o un punto queda fuera de los límites; los límites
+dejan margen para que los puntos siguientes no lo provoquen.
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+from src.utils.dependencias import cargar, disponible, mensaje_instalacion
+
+# Margen a la derecha del último punto (fracción del rango mostrado)
+MARGEN_TIEMPO = 0.1
+# Margen sobre el valor máximo cuando el eje Y no es fijo
+MARGEN_VALOR = 1.25
+
+COLORES = ("#3B82F6", "#8B5CF6", "#10B981", "#F59E0B", "#EF4444", "#6366F1")
+
+
+class GraficaTendencia(QWidget):
+    """Gráfica de líneas por grupo con refresco por blitting"""
+
+    def __init__(self, titulo: str, etiqueta_y: str, y_max: float = None, parent=None):
+        """
+        Args:
+            titulo: Título de la gráfica
+            etiqueta_y: Etiqueta del eje Y
+            y_max: Límite fijo del eje Y (p. ej. 100 para porcentajes); None lo ajusta a los datos
+        """
+        super().__init__(parent)
+        self.y_max = y_max
+        self.canvas = None
+        self._lineas = {}
+        self._fondo = None
+        self.redibujos_completos = 0
+        self.redibujos_parciales = 0
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        if not disponible("matplotlib"):
+            aviso = QLabel(mensaje_instalacion("matplotlib"))
+            aviso.setAlignment(Qt.AlignCenter)
+            aviso.setStyleSheet("color: #6B7280; font-size: 11px;")
+            layout.addWidget(aviso)
+            return
+
+        backend = cargar("matplotlib.backends.backend_qt5agg")
+        self._fechas = cargar("matplotlib.dates")
+        figura = cargar("matplotlib.figure").Figure(figsize=(5, 2.2), tight_layout=True)
+        figura.patch.set_facecolor("#EFEFEF")
+
+        self.canvas = backend.FigureCanvasQTAgg(figura)
+        self.ejes = figura.add_subplot(111)
+        self.ejes.set_title(titulo, fontsize=10)
+        self.ejes.set_ylabel(etiqueta_y, fontsize=8)
+        self.ejes.tick_params(labelsize=7)
+        self.ejes.grid(True, alpha=0.3)
+        self.ejes.xaxis.set_major_formatter(self._fechas.DateFormatter("%d/%m"))
+        self.canvas.mpl_connect("draw_event", self._al_dibujar)
+        layout.addWidget(self.canvas)
+
+    def mostrar(self, series: Dict[str, List[Tuple[datetime, float]]]):
+        """
+        Muestra las series; si caben en los límites actuales solo repinta las líneas
+
+        Args:
+            series: {grupo: [(momento, valor), ...]} en orden cronológico
+        """
+        if self.canvas is None:
+            return
+
+        nuevas = [grupo for grupo in series if grupo not in self._lineas]
+        for grupo in nuevas:
+            color = COLORES[len(self._lineas) % len(COLORES)]
+            (linea,) = self.ejes.plot([], [], label=grupo, color=color, linewidth=1.5, animated=True)
+            self._lineas[grupo] = linea
+
+        for grupo, puntos in series.items():
+            self._lineas[grupo].set_data([p[0] for p in puntos], [p[1] for p in puntos])
+
+        if nuevas or self._fondo is None or not self._dentro_de_limites(series):
+            self._ajustar_limites(series)
+            if nuevas:
+                self.ejes.legend(loc="upper left", fontsize=7, ncol=len(self._lineas))
+            self.redibujos_completos += 1
+            self.canvas.draw()
+        else:
+            self.redibujos_parciales += 1
+            self.canvas.restore_region(self._fondo)
+            self._dibujar_lineas()
+            self.canvas.blit(self.ejes.bbox)
+
+    def _al_dibujar(self, _evento):
+        """Tras un redibujo completo: guarda el fondo y pinta las líneas animadas"""
+        self._fondo = self.canvas.copy_from_bbox(self.ejes.bbox)
+        self._dibujar_lineas()
+
+    def _dibujar_lineas(self):
+        for linea in self._lineas.values():
+            self.ejes.draw_artist(linea)
+
+    def _extremos(self, series) -> Optional[Tuple[datetime, datetime, float]]:
+        puntos = [p for serie in series.values() for p in serie]
+        if not puntos:
+            return None
+        return min(p[0] for p in puntos), max(p[0] for p in puntos), max(p[1] for p in puntos)
+
+    def _dentro_de_limites(self, series) -> bool:
+        extremos = self._extremos(series)
+        if extremos is None:
+            return True
+        inicio, fin, valor_max = extremos
+        x_min, x_max = self.ejes.get_xlim()
+        return (
+            self._fechas.date2num(inicio) >= x_min
+            and self._fechas.date2num(fin) <= x_max
+            and valor_max <= self.ejes.get_ylim()[1]
+        )
+
+    def _ajustar_limites(self, series):
+        extremos = self._extremos(series)
+        if extremos is None:
+            return
+        inicio, fin, valor_max = extremos
+        margen = max((fin - inicio) * MARGEN_TIEMPO, timedelta(hours=1))
+        self.ejes.set_xlim(inicio, fin + margen)
+        self.ejes.set_ylim(0, self.y_max if self.y_max is not None else max(1.0, valor_max * MARGEN_VALOR))
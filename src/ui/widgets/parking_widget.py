@@ -16,6 +16,8 @@ class ParkingSpaceWidget(QFrame):
 
     # Señal emitida cuando se hace clic en el parqueadero
     clicked = pyqtSignal(int, int)  # parqueadero_id, numero_parqueadero
+    # Señal emitida al pasar el mouse (permite precargar el detalle)
+    hovered = pyqtSignal(int)  # parqueadero_id
 
     def __init__(
         self,
@@ -145,6 +147,7 @@ class ParkingSpaceWidget(QFrame):
         """Efecto hover"""
         current_style = self.styleSheet()
         self.setStyleSheet(current_style + " QFrame { border-width: 3px; }")
+        self.hovered.emit(self.parqueadero_id)
         super().enterEvent(event)
 
     def leaveEvent(self, event):
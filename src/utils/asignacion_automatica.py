@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Asignación automática de parqueaderos a vehículos sin asignar
+
+Calcula un plan sobre una instantánea de ocupación (motor_elegibilidad) que
+ubica la mayor cantidad de vehículos por parqueadero libre consumido:
+
+    1. Carros regulares en espacios existentes que esperan su complemento
+       PAR/IMPAR, y vehículos de directivos exclusivos en sus propios
+       espacios con cupo (no consumen espacios libres)
+    2. Funcionarios con discapacidad (prioridad: primeros espacios del
+       sótano preferido)
+    3. Parejas PAR + IMPAR, un espacio libre por pareja
+    4. Directivos exclusivos y carros con otras excepciones, un espacio
+       libre cada uno (los siguientes vehículos del directivo usan el suyo)
+    5. Carros regulares sin pareja y demás vehículos, un espacio libre cada uno
+
+Cualquier PAR es compatible con cualquier IMPAR, así que el grafo bipartito
+PAR-IMPAR es completo y emparejar en orden (por sótano preferido) ya da un
+emparejamiento máximo: min(#PAR, #IMPAR) parejas.
+
+Los espacios se toman en el orden de sótanos indicado y, dentro de cada
+sótano, por número de parqueadero.
+
+Uso:
+    ocupacion = InstantaneaOcupacion.cargar(db)
+    plan = PlanificadorAsignacion(ocupacion, ["Sótano-1", "Sótano-2"]).planificar(vehiculos)
+    exito, error, rechazados = ParqueaderoModel(db).asignar_masivo(plan.pares())
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .motor_elegibilidad import (
+    CIRC_IMPAR,
+    CIRC_PAR,
+    DISCAPACIDAD,
+    EspacioOcupacion,
+    InstantaneaOcupacion,
+    PerfilVehiculo,
+)
+
+MOTIVO_SIN_ESPACIO = "Sin parqueaderos elegibles disponibles"
+
+
+@dataclass
+class PlanAsignacion:
+    """Resultado de la planificación"""
+
+    # (fila del vehículo, parqueadero asignado)
+    asignaciones: List[Tuple[Dict, EspacioOcupacion]] = field(default_factory=list)
+    # (fila del vehículo, motivo)
+    sin_asignar: List[Tuple[Dict, str]] = field(default_factory=list)
+    espacios_libres_usados: int = 0
+
+    def pares(self) -> List[Tuple[int, int]]:
+        """Tuplas (parqueadero_id, vehiculo_id) para ParqueaderoModel.asignar_masivo"""
+        return [(espacio.id, fila["id"]) for fila, espacio in self.asignaciones]
+
+
+class PlanificadorAsignacion:
+    """Planifica asignaciones masivas respetando las reglas del motor de elegibilidad"""
+
+    def __init__(self, ocupacion: InstantaneaOcupacion, orden_sotanos: Optional[Sequence[str]] = None):
+        """
+        Args:
+            ocupacion: Instantánea actual; el plan la modifica a medida que asigna
+            orden_sotanos: Sótanos a usar, del preferido al último (None = todos en orden)
+        """
+        self.ocupacion = ocupacion
+        self.orden_sotanos = list(orden_sotanos) if orden_sotanos else list(ocupacion.sotanos)
+
+    def planificar(self, vehiculos: List[Dict]) -> PlanAsignacion:
+        """
+        Calcula el plan de asignación
+
+        Args:
+            vehiculos: Filas de VehiculoModel.obtener_sin_asignar (vehículo + funcionario)
+
+        Returns:
+            PlanAsignacion: Asignaciones propuestas y vehículos que no caben
+        """
+        plan = PlanAsignacion()
+
+        directivos, discapacidad, excepciones, otros = [], [], [], []
+        regulares = {CIRC_PAR: [], CIRC_IMPAR: []}
+        for fila in vehiculos:
+            perfil = PerfilVehiculo.desde_fila(fila)
+            item = (fila, perfil)
+            if perfil.es_exclusivo:
+                directivos.append(item)
+            elif perfil.excepciones & DISCAPACIDAD:
+                discapacidad.append(item)
+            elif perfil.excepciones:
+                excepciones.append(item)
+            elif perfil.comparte:
+                regulares[perfil.circulacion].append(item)
+            else:
+                otros.append(item)
+
+        # 1. Capacidad ya existente: complementos y espacios propios de directivos
+        for circulacion, pendientes in regulares.items():
+            regulares[circulacion] = [
+                item for item in pendientes if not self._asignar(plan, item, self._complemento(item[1]))
+            ]
+        directivos = [item for item in directivos if not self._asignar(plan, item, self._propio(item[1]))]
+
+        # 2. Discapacidad
+        for item in discapacidad:
+            self._asignar_libre(plan, item)
+
+        # 3. Parejas PAR + IMPAR: el primero ocupa un espacio libre y el segundo lo completa
+        pares, impares = regulares[CIRC_PAR], regulares[CIRC_IMPAR]
+        n_parejas = min(len(pares), len(impares))
+        sin_pareja = []
+        for item_par, item_impar in zip(pares[:n_parejas], impares[:n_parejas]):
+            espacio = self._asignar_libre(plan, item_par)
+            if espacio is None or not self._asignar(plan, item_impar, espacio):
+                # El IMPAR sigue con los vehículos sin pareja
+                sin_pareja.append(item_impar)
+
+        # 4. Directivos y otras excepciones
+        for item in directivos:
+            if not self._asignar(plan, item, self._propio(item[1])):
+                self._asignar_libre(plan, item)
+        for item in excepciones:
+            self._asignar_libre(plan, item)
+
+        # 5. Sin pareja y demás vehículos
+        for item in sin_pareja + pares[n_parejas:] + impares[n_parejas:] + otros:
+            self._asignar_libre(plan, item)
+
+        return plan
+
+    def _asignar(self, plan: PlanAsignacion, item: Tuple[Dict, PerfilVehiculo], espacio) -> bool:
+        if espacio is None:
+            return False
+        fila, perfil = item
+        # El índice ya filtra por clave; validar protege el plan de un espacio mal indexado
+        if not self.ocupacion.validar(perfil, espacio.id)[0]:
+            return False
+        if not espacio.ocupantes:
+            plan.espacios_libres_usados += 1
+        self.ocupacion.registrar_asignacion(perfil, espacio.id)
+        plan.asignaciones.append((fila, espacio))
+        return True
+
+    def _asignar_libre(self, plan: PlanAsignacion, item: Tuple[Dict, PerfilVehiculo]) -> Optional[EspacioOcupacion]:
+        """Ubica el vehículo en el primer espacio libre; None si no hay o fue rechazado"""
+        espacio = self._por_sotano(lambda sotano: ("libre", item[1].tipo_vehiculo, sotano))
+        if not self._asignar(plan, item, espacio):
+            plan.sin_asignar.append((item[0], MOTIVO_SIN_ESPACIO))
+            return None
+        return espacio
+
+    def _complemento(self, perfil: PerfilVehiculo) -> Optional[EspacioOcupacion]:
+        return self._por_sotano(lambda sotano: ("complemento", perfil.circulacion, sotano))
+
+    def _propio(self, perfil: PerfilVehiculo) -> Optional[EspacioOcupacion]:
+        espacio = self.ocupacion.primero(("propio", perfil.funcionario_id))
+        return espacio if espacio is not None and espacio.sotano in self.orden_sotanos else None
+
+    def _por_sotano(self, clave) -> Optional[EspacioOcupacion]:
+        """Primer espacio con la clave, recorriendo los sótanos en orden de preferencia"""
+        for sotano in self.orden_sotanos:
+            espacio = self.ocupacion.primero(clave(sotano))
+            if espacio is not None:
+                return espacio
+        return None
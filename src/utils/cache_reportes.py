@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Caché de resultados de reportes
+
+Los reportes se recalculan con cada cambio de filtro y con cada señal entre
+pestañas, aunque ni los filtros ni los datos hayan cambiado. CacheReportes
+guarda las filas de cada reporte con la clave
+
+    (reporte, filtros normalizados, versión de los datos)
+
+La versión la incrementa cada escritura confirmada (database.version_datos),
+así que tras una asignación o edición las entradas viejas quedan
+inalcanzables y se descartan. Dentro de una misma versión, volver a un
+conjunto de filtros ya consultado se sirve desde memoria.
+
+Cada reporte indica de qué contador depende: los reportes sobre tablas de
+rollup usan version_rollups, de modo que el agregado periódico no invalida
+los demás. Como la versión es local al proceso, cada entrada vence además a
+los REPORT_CACHE_TTL_S segundos (escrituras hechas desde otros puestos).
+
+Expulsión LRU por cantidad de entradas y por presupuesto de memoria
+(estimado a partir del tamaño de las filas).
+
+Uso:
+    cache = CacheReportes()
+    filas = cache.obtener("vehiculos", filtros_activos, lambda: db.fetch_all(query, params))
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from ..config.settings import REPORT_CACHE_ENTRIES, REPORT_CACHE_MB, REPORT_CACHE_TTL_S
+from ..database.version_datos import VersionDatos, version_datos
+
+
+def normalizar_filtros(filtros: Optional[Dict]) -> Tuple:
+    """
+    Convierte un diccionario de filtros en una tupla ordenable y hasheable
+
+    Los filtros en None (sin aplicar) se omiten, de modo que {"cargo": None}
+    y {} producen la misma clave; las fechas se representan en ISO.
+    """
+    normalizados = []
+    for nombre, valor in (filtros or {}).items():
+        if valor is None or valor == "":
+            continue
+        if isinstance(valor, date):
+            valor = valor.isoformat()
+        normalizados.append((nombre, valor))
+    return tuple(sorted(normalizados))
+
+
+def estimar_bytes(filas: List[Dict]) -> int:
+    """Tamaño aproximado de un resultado de fetch_all (lista de diccionarios)"""
+    total = sys.getsizeof(filas)
+    for fila in filas or ():
+        total += sys.getsizeof(fila)
+        for valor in fila.values():
+            total += sys.getsizeof(valor)
+    return total
+
+
+class CacheReportes:
+    """Caché LRU de resultados de reportes con presupuesto de memoria"""
+
+    def __init__(
+        self,
+        max_entradas: int = REPORT_CACHE_ENTRIES,
+        presupuesto_mb: float = REPORT_CACHE_MB,
+        version: VersionDatos = None,
+        max_edad_s: float = REPORT_CACHE_TTL_S,
+        reloj: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_entradas: Cantidad máxima de resultados guardados
+            presupuesto_mb: Memoria máxima estimada para los resultados
+            version: Fuente de la versión de datos por defecto (la global)
+            max_edad_s: Segundos que un resultado se sirve desde memoria
+            reloj: Fuente de tiempo (inyectable en pruebas)
+        """
+        self.max_entradas = max_entradas
+        self.presupuesto_bytes = int(presupuesto_mb * 1024 * 1024)
+        self.version = version or version_datos
+        self.max_edad_s = max_edad_s
+        self.reloj = reloj
+        # clave -> (filas, tamaño, fuente de versión, momento de carga)
+        self._entradas: "OrderedDict[Hashable, Tuple[List[Dict], int, VersionDatos, float]]" = OrderedDict()
+        self._bytes = 0
+        self._versiones_vistas: Dict[VersionDatos, int] = {}
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(
+        self,
+        reporte: str,
+        filtros: Optional[Dict],
+        cargar: Callable[[], List[Dict]],
+        version: VersionDatos = None,
+    ) -> List[Dict]:
+        """
+        Filas del reporte para los filtros, desde memoria o ejecutando cargar()
+
+        Args:
+            reporte: Nombre del reporte
+            filtros: Filtros activos
+            cargar: Ejecuta la consulta si no hay resultado vigente
+            version: Contador del que dependen los datos del reporte (por defecto el de la caché)
+
+        Returns:
+            Filas del reporte (no modificar: la lista es compartida con la caché)
+        """
+        fuente = version or self.version
+        actual = fuente.actual()
+        if self._versiones_vistas.get(fuente) != actual:
+            # Hubo escrituras: ninguna entrada anterior de esta fuente puede volver a coincidir
+            self._descartar(lambda entrada: entrada[2] is fuente)
+            self._versiones_vistas[fuente] = actual
+
+        ahora = self.reloj()
+        clave = (reporte, normalizar_filtros(filtros), actual)
+        entrada = self._entradas.get(clave)
+        if entrada is not None and ahora - entrada[3] <= self.max_edad_s:
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return entrada[0]
+        if entrada is not None:
+            # Vencida: los datos pudieron cambiar desde otro puesto
+            self._bytes -= self._entradas.pop(clave)[1]
+
+        self.fallos += 1
+        filas = cargar() or []
+        tamano = estimar_bytes(filas)
+        # Un resultado vacío puede venir de un error ya registrado (fetch_all retorna []):
+        # no se guarda para no fijarlo hasta la próxima escritura
+        if filas and tamano <= self.presupuesto_bytes:
+            self._entradas[clave] = (filas, tamano, fuente, ahora)
+            self._bytes += tamano
+            self._expulsar()
+        return filas
+
+    def limpiar(self):
+        """Descarta todas las entradas"""
+        self._entradas.clear()
+        self._bytes = 0
+
+    def _descartar(self, condicion: Callable[[Tuple], bool]):
+        for clave in [c for c, entrada in self._entradas.items() if condicion(entrada)]:
+            self._bytes -= self._entradas.pop(clave)[1]
+
+    def estadisticas(self) -> Dict:
+        """Entradas, memoria estimada y tasa de aciertos"""
+        consultas = self.aciertos + self.fallos
+        return {
+            "entradas": len(self._entradas),
+            "bytes": self._bytes,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+        }
+
+    def _expulsar(self):
+        while self._entradas and (len(self._entradas) > self.max_entradas or self._bytes > self.presupuesto_bytes):
+            _, entrada = self._entradas.popitem(last=False)
+            self._bytes -= entrada[1]
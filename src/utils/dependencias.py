@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Carga diferida de dependencias opcionales
+
+reportlab, openpyxl, matplotlib y pandas tardan segundos en importarse en
+los equipos cliente y solo se usan al exportar o importar archivos.
+Este módulo permite consultar si están instaladas sin importarlas
+(importlib.util.find_spec) y cargarlas en el primer uso, guardando el
+módulo en caché para los usos siguientes.
+
+Uso:
+    if not disponible("reportlab"):
+        QMessageBox.warning(self, "Librería no disponible", mensaje_instalacion("reportlab"))
+        return
+    platypus = cargar("reportlab.platypus")
+"""
+
+import importlib
+import importlib.util
+from typing import Dict
+
+# Paquetes opcionales conocidos -> paquete pip que los provee
+PAQUETES_OPCIONALES = {
+    "reportlab": "reportlab",
+    "openpyxl": "openpyxl",
+    "matplotlib": "matplotlib",
+    "pandas": "pandas",
+    "xlrd": "xlrd",
+}
+
+_disponibles: Dict[str, bool] = {}
+_modulos: Dict[str, object] = {}
+
+
+class DependenciaNoDisponible(ImportError):
+    """Se intentó usar una dependencia opcional que no está instalada"""
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        super().__init__(mensaje_instalacion(nombre))
+
+
+def _paquete_raiz(nombre: str) -> str:
+    return nombre.split(".", 1)[0]
+
+
+def disponible(nombre: str) -> bool:
+    """
+    Indica si una dependencia está instalada, sin importarla
+
+    Args:
+        nombre: Nombre del paquete o módulo (p. ej. "reportlab" o "reportlab.platypus")
+
+    Returns:
+        bool: True si el paquete raíz puede importarse
+    """
+    raiz = _paquete_raiz(nombre)
+    if raiz not in _disponibles:
+        try:
+            _disponibles[raiz] = importlib.util.find_spec(raiz) is not None
+        except (ImportError, ValueError):
+            _disponibles[raiz] = False
+    return _disponibles[raiz]
+
+
+def cargar(nombre: str):
+    """
+    Importa una dependencia opcional en el primer uso y la guarda en caché
+
+    Args:
+        nombre: Nombre del módulo a importar (p. ej. "openpyxl.styles")
+
+    Returns:
+        module: El módulo importado
+
+    Raises:
+        DependenciaNoDisponible: Si el paquete no está instalado
+    """
+    modulo = _modulos.get(nombre)
+    if modulo is not None:
+        return modulo
+
+    if not disponible(nombre):
+        raise DependenciaNoDisponible(_paquete_raiz(nombre))
+
+    try:
+        modulo = importlib.import_module(nombre)
+    except ImportError as e:
+        # Instalado pero roto (p. ej. dependencia nativa faltante)
+        _disponibles[_paquete_raiz(nombre)] = False
+        raise DependenciaNoDisponible(_paquete_raiz(nombre)) from e
+
+    _modulos[nombre] = modulo
+    return modulo
+
+
+def faltantes(*nombres: str) -> list:
+    """
+    Filtra las dependencias que no están instaladas
+
+    Args:
+        *nombres: Paquetes a verificar
+
+    Returns:
+        list: Paquetes faltantes, en el orden recibido
+    """
+    return [nombre for nombre in nombres if not disponible(nombre)]
+
+
+def mensaje_instalacion(*nombres: str) -> str:
+    """
+    Mensaje para el usuario con el comando de instalación
+
+    Args:
+        *nombres: Paquetes faltantes
+
+    Returns:
+        str: Texto listo para un QMessageBox
+    """
+    paquetes = [PAQUETES_OPCIONALES.get(_paquete_raiz(n), _paquete_raiz(n)) for n in nombres]
+    lista = ", ".join(f"'{p}'" for p in paquetes)
+    return (
+        f"Esta función requiere la librería {lista}.\n\n"
+        f"Instalar con: pip install {' '.join(paquetes)}"
+    )
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""
+Pipeline de importación masiva de funcionarios desde Excel
+
+Reemplaza el recorrido fila por fila (iterrows + validaciones individuales +
+una consulta de cédula por fila) por etapas que operan sobre lotes completos:
+
+    1. Validación vectorizada por columnas (pandas)
+    2. Una consulta en bloque de cédulas ya registradas
+    3. Inserción masiva por lotes (INSERT multi-fila)
+    4. Reporte consolidado de errores
+
+Soporta modo simulación (dry run): se ejecutan las etapas 1, 2 y 4 sin
+escribir en la base de datos.
+"""
+
+import csv
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from ..config.settings import CARGOS_DISPONIBLES, DIRECCIONES_DISPONIBLES
+from ..models.funcionario import FuncionarioModel
+from .validaciones import ValidadorCampos
+
+# Columnas del archivo Excel
+COLUMNAS_REQUERIDAS = ["Cedula", "Nombre", "Apellidos", "Direccion", "Cargo", "Celular"]
+COLUMNAS_OPCIONALES = ["Tarjeta_Prox", "Tipo_Excepcion"]
+
+# Banderas de excepción según la columna Tipo_Excepcion
+BANDERAS = [
+    "permite_compartir",
+    "pico_placa_solidario",
+    "discapacidad",
+    "tiene_parqueadero_exclusivo",
+    "tiene_carro_hibrido",
+]
+
+BANDERAS_SIN_EXCEPCION = {
+    "permite_compartir": True,
+    "pico_placa_solidario": False,
+    "discapacidad": False,
+    "tiene_parqueadero_exclusivo": False,
+    "tiene_carro_hibrido": False,
+}
+
+BANDERAS_POR_EXCEPCION = {
+    "carro_hibrido": {**BANDERAS_SIN_EXCEPCION, "permite_compartir": False, "tiene_carro_hibrido": True},
+    "exclusivo_directivo": {**BANDERAS_SIN_EXCEPCION, "permite_compartir": False, "tiene_parqueadero_exclusivo": True},
+    "pico_placa_solidario": {**BANDERAS_SIN_EXCEPCION, "pico_placa_solidario": True},
+    "discapacidad": {**BANDERAS_SIN_EXCEPCION, "discapacidad": True},
+}
+
+# Callback de progreso: (procesados, total, etapa)
+CallbackProgreso = Callable[[int, int, str], None]
+
+
+@dataclass
+class ErrorImportacion:
+    """Error asociado a una fila del archivo"""
+
+    fila: int
+    cedula: str
+    motivo: str
+    detalle: str = ""
+
+    def __str__(self) -> str:
+        return f"Fila {self.fila}: {self.detalle or self.motivo}"
+
+
+@dataclass
+class ResultadoImportacion:
+    """Resultado consolidado de una importación (real o simulada)"""
+
+    total: int = 0
+    importados: int = 0
+    dry_run: bool = False
+    errores: List[ErrorImportacion] = field(default_factory=list)
+    advertencias: List[ErrorImportacion] = field(default_factory=list)
+    # Registros que pasaron todas las validaciones (no se conservan: la importación es por lotes)
+    validos: int = 0
+
+    @property
+    def omitidos(self) -> int:
+        """Registros omitidos por errores"""
+        return len(self.errores)
+
+    def resumen_por_motivo(self) -> Dict[str, int]:
+        """Cantidad de errores agrupados por motivo"""
+        return dict(Counter(error.motivo for error in self.errores).most_common())
+
+    def generar_reporte(self, max_detalles: int = 10) -> str:
+        """
+        Genera el texto del reporte consolidado para mostrar al usuario
+
+        Args:
+            max_detalles: Cantidad máxima de errores individuales a listar
+
+        Returns:
+            str: Reporte legible
+        """
+        if self.dry_run:
+            lineas = [
+                "🔍 Validación (simulación) completada\n",
+                f"Registros en el archivo: {self.total}",
+                f"Registros válidos para importar: {self.validos}",
+            ]
+        else:
+            lineas = [
+                "✅ Importación Completada\n",
+                f"Registros importados exitosamente: {self.importados}",
+            ]
+        lineas.append(f"Registros omitidos/con errores: {self.omitidos}")
+
+        if self.errores:
+            lineas.append("\n📊 Errores por motivo:")
+            lineas.extend(f"   • {motivo}: {cantidad}" for motivo, cantidad in self.resumen_por_motivo().items())
+
+            lineas.append(f"\n⚠️ Detalles de errores (primeros {max_detalles}):")
+            lineas.extend(str(error) for error in self.errores[:max_detalles])
+            if len(self.errores) > max_detalles:
+                lineas.append(f"\n... y {len(self.errores) - max_detalles} errores más.")
+
+        if self.advertencias:
+            lineas.append(f"\n⚠️ Advertencias ({len(self.advertencias)}):")
+            lineas.extend(str(advertencia) for advertencia in self.advertencias[:max_detalles])
+
+        return "\n".join(lineas)
+
+    def exportar_errores_csv(self, ruta: str) -> None:
+        """
+        Guarda el reporte completo de errores en un archivo CSV
+
+        Args:
+            ruta: Ruta del archivo de salida
+        """
+        with open(ruta, "w", newline="", encoding="utf-8-sig") as archivo:
+            writer = csv.writer(archivo)
+            writer.writerow(["Fila", "Cedula", "Motivo", "Detalle"])
+            for error in sorted(self.errores + self.advertencias, key=lambda e: e.fila):
+                writer.writerow([error.fila, error.cedula, error.motivo, error.detalle])
+
+
+def normalizar_texto(serie: pd.Series, numerico: bool = False) -> pd.Series:
+    """Convierte una columna a texto limpio (Excel entrega números como float)"""
+    texto = serie.fillna("").astype(str).str.strip()
+    if numerico:
+        texto = texto.str.replace(r"\.0$", "", regex=True)
+    return texto
+
+
+class ImportadorFuncionarios:
+    """Ejecuta el pipeline de importación masiva de funcionarios"""
+
+    def __init__(self, db, tamano_lote: int = 500):
+        self.model = FuncionarioModel(db)
+        self.tamano_lote = tamano_lote
+        # Cédulas ya aceptadas en lotes anteriores (duplicados dentro del archivo)
+        self._cedulas_vistas = set()
+
+    @staticmethod
+    def columnas_faltantes(columnas: Iterable[str]) -> List[str]:
+        """Retorna las columnas requeridas que no están en el archivo"""
+        columnas = set(columnas)
+        return [col for col in COLUMNAS_REQUERIDAS if col not in columnas]
+
+    @staticmethod
+    def normalizar(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Lleva el DataFrame del Excel a columnas normalizadas del modelo
+
+        Args:
+            df: DataFrame leído del archivo
+
+        Returns:
+            pd.DataFrame: Columnas cedula, nombre, apellidos, direccion_grupo, cargo,
+                          celular, tarjeta y tipo_excepcion como texto limpio
+        """
+        vacia = pd.Series("", index=df.index)
+        return pd.DataFrame(
+            {
+                "cedula": normalizar_texto(df["Cedula"], numerico=True),
+                "nombre": normalizar_texto(df["Nombre"]),
+                "apellidos": normalizar_texto(df["Apellidos"]),
+                "direccion_grupo": normalizar_texto(df["Direccion"]),
+                "cargo": normalizar_texto(df["Cargo"]),
+                "celular": normalizar_texto(df["Celular"], numerico=True),
+                "tarjeta": normalizar_texto(df.get("Tarjeta_Prox", vacia), numerico=True),
+                "tipo_excepcion": normalizar_texto(df.get("Tipo_Excepcion", vacia)).str.lower(),
+            },
+            index=df.index,
+        )
+
+    def validar(self, df: pd.DataFrame, fila_inicial: int = 2) -> Tuple[pd.DataFrame, List[ErrorImportacion]]:
+        """
+        Etapas 1 y 2: validación vectorizada y verificación en bloque de cédulas
+
+        Cada fila reporta solo su primer error, en el mismo orden que la
+        validación individual del formulario.
+
+        Args:
+            df: DataFrame leído del archivo (columnas originales del Excel)
+            fila_inicial: Número de fila en Excel de la primera fila de df
+
+        Returns:
+            Tuple[pd.DataFrame, List[ErrorImportacion]]: (filas válidas normalizadas, errores)
+        """
+        datos = self.normalizar(df)
+        filas = pd.Series(range(fila_inicial, fila_inicial + len(datos)), index=datos.index)
+        pendiente = pd.Series(True, index=datos.index)
+        errores = []
+
+        def descartar(mascara: pd.Series, motivo: str, detalle: Callable[[pd.Series], str]):
+            nonlocal pendiente
+            fallidas = mascara & pendiente
+            # Solo se itera sobre las filas con error para construir el mensaje
+            for idx in fallidas[fallidas].index:
+                fila = datos.loc[idx]
+                errores.append(ErrorImportacion(int(filas[idx]), fila["cedula"], motivo, detalle(fila)))
+            pendiente &= ~fallidas
+
+        cedula = datos["cedula"]
+
+        descartar(
+            (cedula == "") | (datos["nombre"] == "") | (datos["apellidos"] == ""),
+            "Campos obligatorios vacíos",
+            lambda f: "Cédula, Nombre o Apellidos vacíos",
+        )
+        descartar(
+            ~cedula.str.fullmatch(ValidadorCampos.REGEX_CEDULA.strip("^$")),
+            "Cédula inválida",
+            lambda f: f"Cédula inválida '{f['cedula']}' (debe ser 7-10 dígitos)",
+        )
+        descartar(
+            ~datos["nombre"].str.match(ValidadorCampos.REGEX_NOMBRE)
+            | ~datos["apellidos"].str.match(ValidadorCampos.REGEX_NOMBRE),
+            "Nombre inválido",
+            lambda f: f"Nombre o apellidos inválidos '{f['nombre']} {f['apellidos']}' (solo letras y espacios)",
+        )
+        descartar(
+            (datos["celular"] != "") & ~datos["celular"].str.fullmatch(ValidadorCampos.REGEX_CELULAR.strip("^$")),
+            "Celular inválido",
+            lambda f: f"Celular inválido '{f['celular']}' (debe ser 10 dígitos)",
+        )
+        descartar(
+            ~datos["cargo"].isin(CARGOS_DISPONIBLES),
+            "Cargo inválido",
+            lambda f: f"Cargo inválido '{f['cargo']}' (no existe en el sistema)",
+        )
+        descartar(
+            ~datos["direccion_grupo"].isin(DIRECCIONES_DISPONIBLES),
+            "Dirección inválida",
+            lambda f: f"Dirección inválida '{f['direccion_grupo']}' (no existe en el sistema)",
+        )
+        descartar(
+            cedula.where(pendiente).duplicated(keep="first") | cedula.isin(self._cedulas_vistas),
+            "Cédula repetida en el archivo",
+            lambda f: f"Cédula '{f['cedula']}' repetida en el archivo",
+        )
+
+        # Etapa 2: una sola consulta para todas las cédulas restantes
+        registradas = self.model.obtener_cedulas_registradas(cedula[pendiente].tolist())
+        if registradas:
+            def detalle_registrada(f: pd.Series) -> str:
+                existente = registradas[f["cedula"]]
+                estado = "" if existente.get("activo") else " (inactivo, use Reactivar)"
+                return (
+                    f"Cédula duplicada '{f['cedula']}' - "
+                    f"{existente['nombre']} {existente['apellidos']}{estado}"
+                )
+
+            descartar(cedula.isin(registradas.keys()), "Cédula ya registrada", detalle_registrada)
+
+        validos = datos[pendiente].copy()
+        validos["fila"] = filas[pendiente]
+        self._cedulas_vistas.update(validos["cedula"])
+
+        # Banderas de excepción (mapeo vectorizado)
+        tipo = validos["tipo_excepcion"]
+        for bandera in BANDERAS:
+            mapa = {excepcion: banderas[bandera] for excepcion, banderas in BANDERAS_POR_EXCEPCION.items()}
+            validos[bandera] = tipo.map(mapa).fillna(BANDERAS_SIN_EXCEPCION[bandera]).astype(bool)
+
+        return validos.drop(columns=["tipo_excepcion"]), errores
+
+    def importar_lotes(
+        self, lector, dry_run: bool = False, progreso: Optional[CallbackProgreso] = None
+    ) -> ResultadoImportacion:
+        """
+        Ejecuta el pipeline lote a lote sobre un LectorImportacion (streaming)
+
+        Cada lote se valida (y, si no es simulación, se inserta) antes de leer
+        el siguiente, por lo que la memoria queda acotada por el tamaño del lote.
+        En modo simulación solo se cuentan los válidos y se guardan los errores;
+        para importar se vuelve a leer el archivo con dry_run=False.
+
+        Args:
+            lector: LectorImportacion ya abierto
+            dry_run: Si True, solo valida y no escribe en la base de datos
+            progreso: Callback opcional (procesados, total, etapa)
+
+        Returns:
+            ResultadoImportacion: Resultado consolidado
+        """
+        resultado = ResultadoImportacion(dry_run=dry_run)
+        etapa = "Validando registros..." if dry_run else "Importando registros..."
+        self._cedulas_vistas = set()
+
+        for lote in lector:
+            validos, errores = self.validar(lote.a_dataframe(), lote.fila_inicial)
+            resultado.total += len(lote)
+            resultado.validos += len(validos)
+            resultado.errores.extend(errores)
+
+            if not dry_run:
+                self._insertar_lote(validos.to_dict("records"), resultado)
+
+            if progreso:
+                # El total del archivo es estimado (metadata); nunca menor a lo ya leído
+                progreso(resultado.total, max(lector.total_estimado or 0, resultado.total), etapa)
+
+        return resultado
+
+    def _insertar_lote(self, lote: List[Dict], resultado: ResultadoImportacion):
+        """
+        Inserta un lote; si falla, reintenta fila por fila para aislar el error
+
+        Args:
+            lote: Registros validados
+            resultado: Resultado a actualizar (importados y errores)
+        """
+        for inicio in range(0, len(lote), self.tamano_lote):
+            bloque = lote[inicio:inicio + self.tamano_lote]
+            exito, _ = self.model.crear_masivo(bloque)
+
+            if exito:
+                resultado.importados += len(bloque)
+                continue
+
+            for registro in bloque:
+                exito_fila, error = self.model.crear_masivo([registro])
+                if exito_fila:
+                    resultado.importados += 1
+                else:
+                    resultado.errores.append(
+                        ErrorImportacion(
+                            int(registro["fila"]), registro["cedula"], "Error al insertar", f"Cédula '{registro['cedula']}': {error}"
+                        )
+                    )
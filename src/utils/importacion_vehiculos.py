@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+Importación masiva de vehículos desde Excel
+
+Antes cada fila hacía varias consultas (funcionario por cédula, placa,
+parqueadero, relectura del vehículo insertado) más un INSERT de asignación.
+Ahora todas las búsquedas se resuelven al inicio con consultas por conjunto
+y la validación de cada fila trabaja solo en memoria:
+
+    1. Búsquedas en bloque: funcionarios, placas, vehículos actuales y parqueaderos
+    2. Validación fila por fila contra diccionarios (sin consultas)
+    3. Inserción masiva de vehículos por lotes
+    4. Resolución de IDs en bloque e inserción masiva de asignaciones
+
+Con importar_lotes() las etapas se ejecutan lote a lote sobre un
+LectorImportacion; las búsquedas ya resueltas se reutilizan entre lotes.
+"""
+
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from ..config.settings import TipoVehiculo
+from ..models.funcionario import FuncionarioModel
+from ..models.parqueadero import ParqueaderoModel
+from ..models.vehiculo import VehiculoModel
+from .importacion_funcionarios import CallbackProgreso, ErrorImportacion, ResultadoImportacion, normalizar_texto
+
+# Columnas del archivo Excel
+COLUMNAS_REQUERIDAS = ["Cedula", "Tipo_Vehiculo", "Placa"]
+COLUMNAS_OPCIONALES = ["Numero_Parqueadero"]
+
+TIPOS_VEHICULO = TipoVehiculo.values()
+
+
+def validar_formato_placa(tipo_vehiculo: str, placa: str) -> Optional[str]:
+    """
+    Valida la placa según el tipo de vehículo
+
+    Args:
+        tipo_vehiculo: Carro, Moto o Bicicleta
+        placa: Placa en mayúsculas (vacía si no tiene)
+
+    Returns:
+        Optional[str]: Mensaje de error o None si es válida
+    """
+    if tipo_vehiculo == TipoVehiculo.BICICLETA.value:
+        return "Las bicicletas NO deben tener placa" if placa else None
+
+    if not placa:
+        return f"La placa es obligatoria para {tipo_vehiculo}"
+
+    if tipo_vehiculo == TipoVehiculo.CARRO.value:
+        if len(placa) != 6 or not (placa[:3].isalpha() and placa[3:].isdigit()):
+            return f"Formato de placa inválido para Carro '{placa}' (debe ser ABC123)"
+
+    if tipo_vehiculo == TipoVehiculo.MOTO.value:
+        # ABC12 (3 letras + 2 números) o ABC12D (3 letras + 2 números + 1 letra)
+        valido = (len(placa) == 5 and placa[:3].isalpha() and placa[3:].isdigit()) or (
+            len(placa) == 6 and placa[:3].isalpha() and placa[3:5].isdigit() and placa[5].isalpha()
+        )
+        if not valido:
+            return f"Formato de placa inválido para Moto '{placa}' (debe ser ABC12 o ABC12D)"
+
+    return None
+
+
+class ImportadorVehiculos:
+    """Ejecuta la importación masiva de vehículos con búsquedas pre-resueltas"""
+
+    def __init__(self, db, tamano_lote: int = 500):
+        self.funcionario_model = FuncionarioModel(db)
+        self.vehiculo_model = VehiculoModel(db)
+        self.parqueadero_model = ParqueaderoModel(db)
+        self.tamano_lote = tamano_lote
+
+        # Búsquedas ya resueltas (se conservan entre lotes del mismo archivo)
+        self._funcionarios: Dict[str, Optional[Dict]] = {}
+        self._placas_registradas: Dict[str, Optional[Dict]] = {}
+        self._vehiculos_actuales: Dict[int, List[Dict]] = {}
+        self._parqueaderos: Dict[int, Optional[Dict]] = {}
+        self._placas_en_archivo = set()
+
+    @staticmethod
+    def columnas_faltantes(columnas) -> List[str]:
+        """Retorna las columnas requeridas que no están en el archivo"""
+        columnas = set(columnas)
+        return [col for col in COLUMNAS_REQUERIDAS if col not in columnas]
+
+    @staticmethod
+    def _leer_filas(df: pd.DataFrame, fila_inicial: int) -> List[Dict]:
+        """Normaliza el DataFrame a una lista de filas con su número en Excel"""
+        vacia = pd.Series("", index=df.index)
+        datos = pd.DataFrame(
+            {
+                "cedula": normalizar_texto(df["Cedula"], numerico=True),
+                "tipo_vehiculo": normalizar_texto(df["Tipo_Vehiculo"]),
+                "placa": normalizar_texto(df["Placa"]).str.upper(),
+                "numero_parqueadero": normalizar_texto(df.get("Numero_Parqueadero", vacia), numerico=True),
+            }
+        )
+        datos["fila"] = range(fila_inicial, fila_inicial + len(datos))
+        return datos.to_dict("records")
+
+    def importar(self, df: pd.DataFrame, fila_inicial: int = 2) -> ResultadoImportacion:
+        """
+        Importa los vehículos del DataFrame
+
+        Args:
+            df: DataFrame leído del archivo
+            fila_inicial: Número de fila en Excel de la primera fila de df
+
+        Returns:
+            ResultadoImportacion: Resultado consolidado
+        """
+        resultado = ResultadoImportacion(total=len(df))
+        self._procesar_lote(df, fila_inicial, resultado)
+        return resultado
+
+    def importar_lotes(self, lector, progreso: Optional[CallbackProgreso] = None) -> ResultadoImportacion:
+        """
+        Importa lote a lote desde un LectorImportacion (streaming)
+
+        Cada lote se valida e inserta antes de leer el siguiente; las
+        búsquedas se hacen solo para las claves que aún no se conocen.
+
+        Args:
+            lector: LectorImportacion ya abierto
+            progreso: Callback opcional (procesados, total, etapa)
+
+        Returns:
+            ResultadoImportacion: Resultado consolidado
+        """
+        resultado = ResultadoImportacion()
+
+        for lote in lector:
+            resultado.total += len(lote)
+            self._procesar_lote(lote.a_dataframe(), lote.fila_inicial, resultado)
+
+            if progreso:
+                progreso(resultado.total, max(lector.total_estimado or 0, resultado.total), "Importando vehículos...")
+
+        return resultado
+
+    def _resolver_busquedas(self, filas: List[Dict]):
+        """Etapa 1: consultas por conjunto solo para las claves nuevas del lote"""
+        cedulas = [f["cedula"] for f in filas if f["cedula"] and f["cedula"] not in self._funcionarios]
+        if cedulas:
+            registrados = self.funcionario_model.obtener_cedulas_registradas(cedulas)
+            for cedula in cedulas:
+                funcionario = registrados.get(cedula)
+                self._funcionarios[cedula] = funcionario if funcionario and funcionario.get("activo") else None
+
+            nuevos = [f for f in (self._funcionarios[c] for c in cedulas) if f and f["id"] not in self._vehiculos_actuales]
+            if nuevos:
+                self._vehiculos_actuales.update(self.vehiculo_model.obtener_por_funcionarios([f["id"] for f in nuevos]))
+                self.vehiculo_model.validador.precargar_exclusivos(
+                    {f["id"]: bool(f.get("tiene_parqueadero_exclusivo")) for f in nuevos}
+                )
+
+        placas = [f["placa"] for f in filas if f["placa"] and f["placa"] not in self._placas_registradas]
+        if placas:
+            registradas = self.vehiculo_model.obtener_placas_registradas(placas)
+            self._placas_registradas.update({placa: registradas.get(placa) for placa in placas})
+
+        numeros = [
+            int(f["numero_parqueadero"])
+            for f in filas
+            if f["numero_parqueadero"].isdigit() and int(f["numero_parqueadero"]) not in self._parqueaderos
+        ]
+        if numeros:
+            parqueaderos = self.parqueadero_model.obtener_por_numeros(numeros)
+            self._parqueaderos.update({numero: parqueaderos.get(numero) for numero in numeros})
+
+    def _procesar_lote(self, df: pd.DataFrame, fila_inicial: int, resultado: ResultadoImportacion):
+        """Ejecuta las cuatro etapas sobre un lote de filas"""
+        filas = self._leer_filas(df, fila_inicial)
+        self._resolver_busquedas(filas)
+
+        # Etapa 2: validación en memoria
+        registros = []
+        for fila in filas:
+            error = self._validar_fila(fila)
+            if error:
+                resultado.errores.append(ErrorImportacion(fila["fila"], fila["cedula"], error[0], error[1]))
+                continue
+
+            funcionario_id = self._funcionarios[fila["cedula"]]["id"]
+            placa = fila["placa"] or None
+            parqueadero = (
+                self._parqueaderos.get(int(fila["numero_parqueadero"])) if fila["numero_parqueadero"].isdigit() else None
+            )
+
+            # Las filas siguientes del mismo funcionario deben ver este vehículo
+            self._vehiculos_actuales[funcionario_id].append(
+                {"funcionario_id": funcionario_id, "tipo_vehiculo": fila["tipo_vehiculo"], "placa": placa}
+            )
+            if placa:
+                self._placas_en_archivo.add(placa)
+
+            registros.append(
+                {
+                    "fila": fila["fila"],
+                    "cedula": fila["cedula"],
+                    "funcionario_id": funcionario_id,
+                    "tipo_vehiculo": fila["tipo_vehiculo"],
+                    "placa": placa,
+                    "parqueadero_id": parqueadero["id"] if parqueadero else None,
+                    "numero_parqueadero": fila["numero_parqueadero"],
+                }
+            )
+
+        # Etapas 3 y 4: inserción masiva
+        insertados = self._insertar_vehiculos(registros, resultado)
+        self._insertar_asignaciones(resultado, insertados)
+
+    def _validar_fila(self, fila: Dict) -> Optional[tuple]:
+        """
+        Valida una fila contra las búsquedas pre-resueltas
+
+        Returns:
+            Optional[tuple]: (motivo, detalle) del primer error, o None si es válida
+        """
+        cedula = fila["cedula"]
+        tipo_vehiculo = fila["tipo_vehiculo"]
+        placa = fila["placa"]
+
+        if not cedula or not tipo_vehiculo:
+            return "Campos obligatorios vacíos", "Cédula o Tipo de Vehículo vacíos"
+
+        if tipo_vehiculo not in TIPOS_VEHICULO:
+            return (
+                "Tipo de vehículo inválido",
+                f"Tipo de vehículo inválido '{tipo_vehiculo}' (debe ser Carro, Moto o Bicicleta)",
+            )
+
+        funcionario = self._funcionarios.get(cedula)
+        if not funcionario:
+            return "Funcionario no existe", f"Funcionario con cédula '{cedula}' no existe en el sistema"
+
+        error_placa = validar_formato_placa(tipo_vehiculo, placa)
+        if error_placa:
+            return "Placa inválida", error_placa
+
+        if placa and self._placas_registradas.get(placa):
+            return "Placa ya registrada", f"La placa '{placa}' ya está registrada"
+
+        if placa and placa in self._placas_en_archivo:
+            return "Placa repetida en el archivo", f"La placa '{placa}' está repetida en el archivo"
+
+        # Reglas de negocio (cantidad, combinaciones, pico y placa) sin consultas
+        es_valido, mensaje = self.vehiculo_model.validador.validar_registro_vehiculo(
+            self._vehiculos_actuales[funcionario["id"]], tipo_vehiculo, placa or None, funcionario["id"]
+        )
+        if not es_valido:
+            return "Regla de negocio", mensaje
+
+        return None
+
+    def _insertar_vehiculos(self, registros: List[Dict], resultado: ResultadoImportacion) -> List[Dict]:
+        """
+        Etapa 3: inserta los vehículos válidos en lotes
+
+        Si un lote falla, se reintenta fila por fila para aislar el error.
+
+        Returns:
+            List[Dict]: Registros insertados correctamente
+        """
+        insertados = []
+
+        for inicio in range(0, len(registros), self.tamano_lote):
+            lote = registros[inicio:inicio + self.tamano_lote]
+            exito, _ = self.vehiculo_model.crear_masivo(lote)
+
+            if exito:
+                insertados.extend(lote)
+                continue
+
+            for registro in lote:
+                exito_fila, error = self.vehiculo_model.crear_masivo([registro])
+                if exito_fila:
+                    insertados.append(registro)
+                else:
+                    resultado.errores.append(
+                        ErrorImportacion(
+                            registro["fila"],
+                            registro["cedula"],
+                            "Error al insertar",
+                            f"Error al insertar vehículo - {error}",
+                        )
+                    )
+
+        resultado.importados += len(insertados)
+        return insertados
+
+    def _insertar_asignaciones(self, resultado: ResultadoImportacion, insertados: List[Dict]):
+        """
+        Etapa 4: resuelve los IDs de los vehículos nuevos con una consulta en
+        bloque e inserta sus asignaciones de parqueadero
+
+        Un fallo de asignación no revierte el vehículo: se reporta como advertencia.
+        """
+        con_parqueadero = [r for r in insertados if r["parqueadero_id"]]
+        if not con_parqueadero:
+            return
+
+        ids = self.vehiculo_model.obtener_ids_por_funcionarios([r["funcionario_id"] for r in con_parqueadero])
+
+        pendientes = []
+        for registro in con_parqueadero:
+            vehiculo_id = ids.get((registro["funcionario_id"], registro["tipo_vehiculo"], registro["placa"]))
+            if vehiculo_id:
+                pendientes.append((registro, (registro["parqueadero_id"], vehiculo_id)))
+
+        for inicio in range(0, len(pendientes), self.tamano_lote):
+            lote = pendientes[inicio:inicio + self.tamano_lote]
+            exito, _ = self.parqueadero_model.crear_asignaciones_masivo([par for _, par in lote])
+            if exito:
+                continue
+
+            for registro, par in lote:
+                exito_fila, error = self.parqueadero_model.crear_asignaciones_masivo([par])
+                if not exito_fila:
+                    resultado.advertencias.append(
+                        ErrorImportacion(
+                            registro["fila"],
+                            registro["cedula"],
+                            "Error al asignar parqueadero",
+                            f"Vehículo importado, pero no se asignó el parqueadero "
+                            f"{registro['numero_parqueadero']} - {error}",
+                        )
+                    )
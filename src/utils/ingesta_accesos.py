@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+"""
+Ingesta de eventos de acceso (Entrada/Salida) en historial_accesos
+
+Las porterías reportan eventos en ráfagas (miles por minuto en el cambio de
+turno). Registrar cada evento con su propio INSERT y commit desde el hilo de
+la interfaz la bloquearía, así que la ingesta se divide en:
+
+    1. registrar(): valida la placa contra un índice en memoria y encola el
+       evento en una cola acotada. No toca la base de datos.
+    2. Un hilo escritor con conexión propia que vacía la cola en lotes
+       (un INSERT multi-fila por lote, ver DatabaseManager.execute_many).
+
+Contrapresión: si la cola está llena, el evento se escribe en un archivo de
+derrame local (JSON por línea, con fsync) en lugar de bloquear a quien
+registra; los productores que no son la interfaz pueden pedir esperar
+(espera_s). Los lotes que no se pueden escribir por falta de conexión
+también van al archivo, y el escritor los reintenta al recuperar la conexión
+y al arrancar, de modo que un cierre inesperado no pierde eventos (entrega
+al menos una vez).
+
+Uso:
+    ingesta = IngestaAccesos(db.config)
+    ingesta.iniciar()
+    exito, mensaje = ingesta.registrar("ABC123", "Entrada")
+    ...
+    ingesta.detener()
+"""
+
+import json
+import os
+import queue
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from ..config.settings import ACCESS_BATCH_SIZE, ACCESS_FLUSH_MS, ACCESS_QUEUE_SIZE
+from ..core.logger import logger
+from ..database.manager import ConexionIndependiente
+from .resource_path import get_data_dir
+
+TIPOS_EVENTO = ("Entrada", "Salida")
+
+# Segundos tras los que el escritor recarga el índice de placas
+VIGENCIA_INDICE_S = 300
+
+# Espera mínima entre reintentos del archivo de derrame sin conexión
+REINTENTO_DERRAME_S = 30
+
+ARCHIVO_DERRAME = "accesos_pendientes.jsonl"
+
+QUERY_INSERTAR = """
+    INSERT INTO historial_accesos (vehiculo_id, parqueadero_id, tipo_evento, fecha_hora, observaciones)
+    VALUES (%s, %s, %s, %s, %s)
+"""
+
+_RE_NO_ALFANUMERICO = re.compile(r"[^A-Z0-9]")
+
+
+def normalizar_placa(placa: str) -> str:
+    """Placa en mayúsculas y sin espacios ni guiones ("abc-123" -> "ABC123")"""
+    return _RE_NO_ALFANUMERICO.sub("", (placa or "").upper())
+
+
+class IndicePlacas:
+    """Placa normalizada -> (vehiculo_id, parqueadero_id asignado o None)"""
+
+    def __init__(self, vigencia_s: float = VIGENCIA_INDICE_S):
+        self.vigencia_s = vigencia_s
+        self._placas: Dict[str, Tuple[int, Optional[int]]] = {}
+        self._cargado_en: Optional[float] = None
+
+    def cargar(self, db) -> int:
+        """
+        Carga las placas de los vehículos activos con su asignación vigente
+
+        Returns:
+            int: Cantidad de placas indexadas
+        """
+        query = """
+            SELECT v.id, v.placa, a.parqueadero_id
+            FROM vehiculos v
+            LEFT JOIN asignaciones a ON a.vehiculo_id = v.id AND a.activo = TRUE
+            WHERE v.activo = TRUE AND v.placa IS NOT NULL
+        """
+        placas = {normalizar_placa(f["placa"]): (f["id"], f["parqueadero_id"]) for f in db.fetch_all(query) or []}
+        # Reemplazo atómico: registrar() puede leer desde otro hilo mientras tanto
+        self._placas = placas
+        self._cargado_en = time.monotonic()
+        return len(placas)
+
+    def vencido(self) -> bool:
+        return self._cargado_en is None or time.monotonic() - self._cargado_en > self.vigencia_s
+
+    def buscar(self, placa: str) -> Optional[Tuple[int, Optional[int]]]:
+        return self._placas.get(normalizar_placa(placa))
+
+    def __len__(self) -> int:
+        return len(self._placas)
+
+
+@dataclass
+class EventoAcceso:
+    """Evento validado, listo para insertar"""
+
+    vehiculo_id: int
+    parqueadero_id: int
+    tipo_evento: str
+    fecha_hora: datetime
+    observaciones: Optional[str] = None
+
+    def fila(self) -> tuple:
+        return (self.vehiculo_id, self.parqueadero_id, self.tipo_evento, self.fecha_hora, self.observaciones)
+
+    def a_dict(self) -> Dict:
+        return {
+            "vehiculo_id": self.vehiculo_id,
+            "parqueadero_id": self.parqueadero_id,
+            "tipo_evento": self.tipo_evento,
+            "fecha_hora": self.fecha_hora.isoformat(),
+            "observaciones": self.observaciones,
+        }
+
+    @classmethod
+    def desde_dict(cls, datos: Dict) -> "EventoAcceso":
+        return cls(
+            datos["vehiculo_id"],
+            datos["parqueadero_id"],
+            datos["tipo_evento"],
+            datetime.fromisoformat(datos["fecha_hora"]),
+            datos.get("observaciones"),
+        )
+
+
+class IngestaAccesos:
+    """Cola acotada de eventos de acceso con escritor en segundo plano"""
+
+    def __init__(
+        self,
+        db_config=None,
+        indice: IndicePlacas = None,
+        capacidad: int = ACCESS_QUEUE_SIZE,
+        tamano_lote: int = ACCESS_BATCH_SIZE,
+        intervalo_ms: int = ACCESS_FLUSH_MS,
+        ruta_derrame: str = None,
+    ):
+        """
+        Args:
+            db_config: Configuración para la conexión propia del escritor
+            indice: Índice de placas (por defecto uno nuevo, cargado al iniciar)
+            capacidad: Eventos máximos en memoria antes de derramar a disco
+            tamano_lote: Filas máximas por INSERT
+            intervalo_ms: Espera máxima antes de escribir un lote incompleto
+            ruta_derrame: Archivo de derrame (por defecto en el directorio de datos)
+        """
+        self.db_config = db_config
+        self.indice = indice or IndicePlacas()
+        self.tamano_lote = max(1, tamano_lote)
+        self.intervalo_s = intervalo_ms / 1000
+        self.ruta_derrame = ruta_derrame or str(get_data_dir() / ARCHIVO_DERRAME)
+        self.contadores = Counter()
+        self._cola: "queue.Queue[EventoAcceso]" = queue.Queue(maxsize=max(1, capacidad))
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self._lock_derrame = threading.Lock()
+        self._derrame_pendiente = os.path.exists(self.ruta_derrame) or os.path.exists(self._ruta_en_proceso)
+        self._ultimo_reintento = 0.0
+
+    # ------------------------------------------------------------------
+    # API para productores (interfaz, lectores de portería)
+    # ------------------------------------------------------------------
+
+    def iniciar(self):
+        """Carga el índice de placas (si hace falta) y arranca el escritor"""
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        if self.indice.vencido():
+            with ConexionIndependiente(self.db_config) as db:
+                if db.connection:
+                    logger.info(f"Índice de placas cargado: {self.indice.cargar(db)} placas")
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ejecutar, name="IngestaAccesos", daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout: float = 10.0):
+        """Escribe lo pendiente y detiene el escritor (lo que no alcance queda en disco)"""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+            self._hilo = None
+        restantes = self._vaciar_cola()
+        if restantes:
+            self._derramar(restantes)
+
+    def registrar(
+        self,
+        placa: str,
+        tipo_evento: str,
+        fecha_hora: datetime = None,
+        parqueadero_id: int = None,
+        observaciones: str = None,
+        espera_s: float = 0,
+    ) -> Tuple[bool, str]:
+        """
+        Valida y encola un evento de portería
+
+        Args:
+            placa: Placa leída en la portería
+            tipo_evento: "Entrada" o "Salida"
+            fecha_hora: Momento del evento (por defecto ahora)
+            parqueadero_id: Espacio del evento (por defecto el asignado al vehículo)
+            observaciones: Texto libre opcional
+            espera_s: Segundos que se puede esperar si la cola está llena (0 desde la interfaz)
+
+        Returns:
+            Tuple[bool, str]: (aceptado, mensaje)
+        """
+        if tipo_evento not in TIPOS_EVENTO:
+            self.contadores["rechazados"] += 1
+            return False, f"Tipo de evento no válido: {tipo_evento}"
+
+        registro = self.indice.buscar(placa)
+        if registro is None:
+            self.contadores["rechazados"] += 1
+            return False, f"Placa no registrada: {placa}"
+
+        vehiculo_id, asignado = registro
+        parqueadero_id = parqueadero_id or asignado
+        if parqueadero_id is None:
+            self.contadores["rechazados"] += 1
+            return False, f"El vehículo {normalizar_placa(placa)} no tiene parqueadero asignado"
+
+        evento = EventoAcceso(vehiculo_id, parqueadero_id, tipo_evento, fecha_hora or datetime.now(), observaciones)
+        self.contadores["aceptados"] += 1
+        try:
+            if espera_s > 0:
+                self._cola.put(evento, timeout=espera_s)
+            else:
+                self._cola.put_nowait(evento)
+        except queue.Full:
+            self._derramar([evento])
+            return True, "Cola llena: evento guardado en disco"
+        return True, ""
+
+    def pendientes(self) -> int:
+        """Eventos en cola (los productores pueden usarlo para moderar el ritmo)"""
+        return self._cola.qsize()
+
+    def estadisticas(self) -> Dict:
+        return {
+            "aceptados": self.contadores["aceptados"],
+            "rechazados": self.contadores["rechazados"],
+            "insertados": self.contadores["insertados"],
+            "derramados": self.contadores["derramados"],
+            "descartados": self.contadores["descartados"],
+            "pendientes": self.pendientes(),
+        }
+
+    # ------------------------------------------------------------------
+    # Escritor
+    # ------------------------------------------------------------------
+
+    def _ejecutar(self):
+        try:
+            with ConexionIndependiente(self.db_config) as db:
+                if self._derrame_pendiente:
+                    self._recuperar_derrame(db)
+                while not (self._detener.is_set() and self._cola.empty()):
+                    lote = self._tomar_lote()
+                    escrito = self._escribir(db, lote) if lote else False
+                    if self.indice.vencido() and db.ensure_connection():
+                        self.indice.cargar(db)
+                    if self._derrame_pendiente and (escrito or self._toca_reintento()):
+                        self._recuperar_derrame(db)
+        except Exception as e:
+            logger.error(f"Error en el escritor de accesos: {e}")
+
+    def _tomar_lote(self) -> List[EventoAcceso]:
+        """Espera el primer evento y junta hasta tamano_lote durante intervalo_s como máximo"""
+        try:
+            lote = [self._cola.get(timeout=self.intervalo_s)]
+        except queue.Empty:
+            return []
+        limite = time.monotonic() + self.intervalo_s
+        while len(lote) < self.tamano_lote:
+            restante = limite - time.monotonic()
+            try:
+                if restante <= 0 or self._detener.is_set():
+                    lote.append(self._cola.get_nowait())
+                else:
+                    lote.append(self._cola.get(timeout=restante))
+            except queue.Empty:
+                break
+        return lote
+
+    def _escribir(self, db, lote: List[EventoAcceso]) -> bool:
+        """
+        Inserta un lote; sin conexión lo derrama a disco
+
+        Returns:
+            bool: True si el lote quedó escrito (o descartado por datos inválidos)
+        """
+        exito, error = db.execute_many(QUERY_INSERTAR, [e.fila() for e in lote])
+        if exito:
+            self.contadores["insertados"] += len(lote)
+            return True
+
+        if not db.ensure_connection():
+            logger.warning(f"Sin conexión: {len(lote)} eventos de acceso guardados en disco")
+            self._derramar(lote)
+            return False
+
+        # Con conexión, el error es de datos (p. ej. un vehículo eliminado): se aísla
+        # la fila culpable para no perder el resto del lote
+        logger.error(f"Error insertando lote de accesos ({error}); se reintenta fila por fila")
+        for evento in lote:
+            exito, error = db.execute_query(QUERY_INSERTAR, evento.fila())
+            if exito:
+                self.contadores["insertados"] += 1
+            else:
+                self.contadores["descartados"] += 1
+                logger.error(f"Evento de acceso descartado {evento.a_dict()}: {error}")
+        return True
+
+    def _vaciar_cola(self) -> List[EventoAcceso]:
+        eventos = []
+        while True:
+            try:
+                eventos.append(self._cola.get_nowait())
+            except queue.Empty:
+                return eventos
+
+    # ------------------------------------------------------------------
+    # Archivo de derrame
+    # ------------------------------------------------------------------
+
+    @property
+    def _ruta_en_proceso(self) -> str:
+        return self.ruta_derrame + ".procesando"
+
+    def _derramar(self, eventos: List[EventoAcceso]):
+        """Agrega eventos al archivo de derrame y fuerza su escritura a disco"""
+        with self._lock_derrame:
+            directorio = os.path.dirname(self.ruta_derrame)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            with open(self.ruta_derrame, "a", encoding="utf-8") as archivo:
+                for evento in eventos:
+                    archivo.write(json.dumps(evento.a_dict(), ensure_ascii=False) + "\n")
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            self.contadores["derramados"] += len(eventos)
+            self._derrame_pendiente = True
+
+    def _toca_reintento(self) -> bool:
+        return time.monotonic() - self._ultimo_reintento >= REINTENTO_DERRAME_S
+
+    def _recuperar_derrame(self, db):
+        """Reinserta los eventos derramados (los que vuelvan a fallar se derraman de nuevo)"""
+        self._ultimo_reintento = time.monotonic()
+        with self._lock_derrame:
+            # Un .procesando que sobrevivió a un cierre inesperado se procesa primero
+            if not os.path.exists(self._ruta_en_proceso):
+                if not os.path.exists(self.ruta_derrame):
+                    self._derrame_pendiente = False
+                    return
+                os.replace(self.ruta_derrame, self._ruta_en_proceso)
+            self._derrame_pendiente = os.path.exists(self.ruta_derrame)
+
+        eventos = []
+        with open(self._ruta_en_proceso, encoding="utf-8") as archivo:
+            for linea in archivo:
+                try:
+                    eventos.append(EventoAcceso.desde_dict(json.loads(linea)))
+                except (ValueError, KeyError) as e:
+                    # Línea truncada por un cierre durante la escritura
+                    logger.error(f"Línea de derrame no válida ignorada: {e}")
+
+        for i in range(0, len(eventos), self.tamano_lote):
+            self._escribir(db, eventos[i:i + self.tamano_lote])
+        os.remove(self._ruta_en_proceso)
+        if eventos:
+            logger.info(f"{len(eventos)} eventos de acceso recuperados del archivo de derrame")
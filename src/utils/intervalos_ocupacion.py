@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de intervalos de ocupación
+
+Cada asignación ocupa su parqueadero en el intervalo [inicio, fin); fin es
+None mientras sigue activa. IndiceIntervalos guarda los inicios y los fines
+ordenados: el número de asignaciones activas en un momento t es
+    #(inicio <= t) - #(fin <= t)
+con dos búsquedas binarias, y una serie de momentos se resuelve con un solo
+barrido de los eventos (entradas y salidas) en orden.
+
+ParqueaderoModel carga aquí solo los intervalos que se cruzan con el rango
+consultado (predicado de rango indexado, migración 007).
+"""
+
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+TIPOS_VEHICULO = ("Carro", "Moto", "Bicicleta")
+
+# (inicio, fin o None, parqueadero_id, tipo_vehiculo)
+Intervalo = Tuple[datetime, Optional[datetime], Hashable, str]
+
+
+def momentos(desde: datetime, hasta: datetime, paso: timedelta) -> Iterator[datetime]:
+    """Momentos desde `desde` hasta `hasta` (inclusive) cada `paso`"""
+    if paso <= timedelta(0):
+        raise ValueError("El paso de la serie debe ser positivo")
+    momento = desde
+    while momento <= hasta:
+        yield momento
+        momento += paso
+
+
+class IndiceIntervalos:
+    """Intervalos [inicio, fin) ordenados por inicio y por fin"""
+
+    def __init__(self, intervalos: Iterable[Intervalo]):
+        self._intervalos = list(intervalos)
+        self._inicios = sorted(i[0] for i in self._intervalos)
+        self._fines = sorted(i[1] for i in self._intervalos if i[1] is not None)
+
+    def __len__(self) -> int:
+        return len(self._intervalos)
+
+    def activos_en(self, momento: datetime) -> int:
+        """Cantidad de intervalos activos en un momento"""
+        return bisect_right(self._inicios, momento) - bisect_right(self._fines, momento)
+
+    def serie(self, puntos: Iterable[datetime]) -> List[Dict]:
+        """
+        Ocupación en cada momento, con un solo barrido de entradas y salidas
+
+        Args:
+            puntos: Momentos a muestrear (se procesan en orden)
+
+        Returns:
+            Lista de {momento, vehiculos, espacios_ocupados, carros, motos, bicicletas}
+        """
+        eventos = sorted(
+            [(inicio, 1, espacio, tipo) for inicio, _, espacio, tipo in self._intervalos]
+            + [(fin, -1, espacio, tipo) for _, fin, espacio, tipo in self._intervalos if fin is not None],
+            key=lambda e: e[0],
+        )
+        por_espacio = Counter()
+        por_tipo = Counter()
+        vehiculos = ocupados = 0
+        siguiente = 0
+
+        resultado = []
+        for momento in sorted(puntos):
+            while siguiente < len(eventos) and eventos[siguiente][0] <= momento:
+                _, delta, espacio, tipo = eventos[siguiente]
+                siguiente += 1
+                vehiculos += delta
+                por_tipo[tipo] += delta
+                antes = por_espacio[espacio]
+                por_espacio[espacio] = antes + delta
+                if antes == 0 and delta > 0:
+                    ocupados += 1
+                elif antes + delta == 0:
+                    ocupados -= 1
+
+            resultado.append({
+                "momento": momento,
+                "vehiculos": vehiculos,
+                "espacios_ocupados": ocupados,
+                "carros": por_tipo["Carro"],
+                "motos": por_tipo["Moto"],
+                "bicicletas": por_tipo["Bicicleta"],
+            })
+        return resultado
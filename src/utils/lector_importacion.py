@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Lectura por lotes de archivos de importación (Excel o CSV)
+
+pd.read_excel() carga la hoja completa en memoria antes de procesar la
+primera fila. LectorImportacion recorre el archivo en streaming
+(openpyxl read_only=True o el módulo csv) y entrega lotes de filas de
+tamaño fijo, de modo que la memoria queda acotada por el tamaño del lote y
+el progreso puede mostrarse desde el primer lote.
+
+Uso:
+    with LectorImportacion(ruta, tamano_lote=500) as lector:
+        faltantes = [c for c in requeridas if c not in lector.columnas]
+        for lote in lector:
+            df = lote.a_dataframe()
+            ...
+"""
+
+import csv
+import os
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, Iterator, List, Optional
+
+# Fila 1 del archivo = encabezados
+FILA_PRIMER_DATO = 2
+
+EXTENSIONES_EXCEL = (".xlsx", ".xlsm")
+EXTENSIONES_SOPORTADAS = EXTENSIONES_EXCEL + (".xls", ".csv")
+
+
+@dataclass
+class LoteImportacion:
+    """Bloque de filas consecutivas del archivo"""
+
+    fila_inicial: int
+    columnas: List[str]
+    filas: List[Dict]
+
+    def __len__(self) -> int:
+        return len(self.filas)
+
+    def a_dataframe(self):
+        """Convierte el lote en DataFrame con las columnas del encabezado"""
+        import pandas as pd
+
+        return pd.DataFrame(self.filas, columns=self.columnas)
+
+
+class LectorImportacion:
+    """Lector en streaming de archivos .xlsx/.xlsm/.csv (y .xls como respaldo)"""
+
+    def __init__(self, ruta: str, tamano_lote: int = 500):
+        """
+        Abre el archivo y lee la fila de encabezados
+
+        Args:
+            ruta: Ruta del archivo
+            tamano_lote: Cantidad de filas por lote
+
+        Raises:
+            ValueError: Si la extensión no está soportada
+        """
+        self.ruta = ruta
+        self.tamano_lote = tamano_lote
+        self.extension = os.path.splitext(ruta)[1].lower()
+        self.columnas: List[str] = []
+        # Filas de datos según la metadata del archivo (None si no se conoce, p. ej. CSV)
+        self.total_estimado: Optional[int] = None
+
+        self._filas = iter(())
+        self._cerrar = None
+
+        if self.extension in EXTENSIONES_EXCEL:
+            self._abrir_excel()
+        elif self.extension == ".csv":
+            self._abrir_csv()
+        elif self.extension == ".xls":
+            self._abrir_xls()
+        else:
+            raise ValueError(
+                f"Formato de archivo no soportado: '{self.extension}'.\n"
+                f"Formatos soportados: {', '.join(EXTENSIONES_SOPORTADAS)}"
+            )
+
+    def _abrir_excel(self):
+        from openpyxl import load_workbook
+
+        libro = load_workbook(self.ruta, read_only=True, data_only=True)
+        self._cerrar = libro.close
+
+        hoja = libro.active
+        filas = hoja.iter_rows(values_only=True)
+        encabezado = next(filas, None) or ()
+
+        self.columnas = [str(valor).strip() if valor is not None else "" for valor in encabezado]
+        if hoja.max_row:
+            self.total_estimado = max(hoja.max_row - 1, 0)
+        self._filas = filas
+
+    def _abrir_csv(self):
+        archivo = open(self.ruta, newline="", encoding="utf-8-sig")
+        self._cerrar = archivo.close
+
+        # Excel en español suele exportar CSV separados por ';'
+        muestra = archivo.read(4096)
+        archivo.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+
+        filas = csv.reader(archivo, dialecto)
+        self.columnas = [valor.strip() for valor in next(filas, [])]
+        self._filas = filas
+
+    def _abrir_xls(self):
+        # openpyxl no lee el formato binario .xls: se carga completo con pandas
+        import pandas as pd
+
+        df = pd.read_excel(self.ruta, dtype=object)
+        self.columnas = [str(columna).strip() for columna in df.columns]
+        self.total_estimado = len(df)
+        self._filas = (
+            tuple(None if pd.isna(valor) else valor for valor in fila) for fila in df.itertuples(index=False)
+        )
+
+    @staticmethod
+    def _es_vacia(valores) -> bool:
+        return all(valor is None or str(valor).strip() == "" for valor in valores)
+
+    def __iter__(self) -> Iterator[LoteImportacion]:
+        """
+        Entrega lotes de filas consecutivas
+
+        Las filas vacías intermedias se conservan para no alterar la
+        numeración de filas; las filas vacías al final del archivo se descartan.
+        Solo se cuentan hasta que aparece una fila con datos: un .xlsx con un
+        rango usado de un millón de filas con formato no ocupa memoria.
+        """
+        try:
+            lote = []
+            vacias = 0
+            fila_inicial = FILA_PRIMER_DATO
+
+            for valores in self._filas:
+                if self._es_vacia(valores):
+                    vacias += 1
+                    continue
+                # Filas cortas (CSV) se completan con None hasta el ancho del encabezado
+                valores = tuple(valores) + (None,) * (len(self.columnas) - len(valores))
+                fila = dict(zip(self.columnas, valores))
+
+                pendientes = chain((dict.fromkeys(self.columnas) for _ in range(vacias)), (fila,))
+                for pendiente in pendientes:
+                    lote.append(pendiente)
+                    if len(lote) == self.tamano_lote:
+                        yield LoteImportacion(fila_inicial, self.columnas, lote)
+                        fila_inicial += len(lote)
+                        lote = []
+                vacias = 0
+
+            if lote:
+                yield LoteImportacion(fila_inicial, self.columnas, lote)
+        finally:
+            self.cerrar()
+
+    def cerrar(self):
+        """Libera el archivo abierto"""
+        if self._cerrar:
+            self._cerrar()
+            self._cerrar = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.cerrar()
+        return False
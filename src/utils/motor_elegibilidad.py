@@ -0,0 +1,429 @@
+# -*- coding: utf-8 -*-
+"""
+Motor de elegibilidad de parqueaderos
+
+Evalúa en memoria si un vehículo puede ocupar un parqueadero, a partir de una
+instantánea de la ocupación (dos consultas). Reúne las reglas que antes
+estaban repartidas entre ValidadorAsignacion, ParqueaderoModel y la interfaz:
+
+    - Motos y bicicletas: solo espacios de su tipo sin asignaciones
+    - Carros con excepción (pico y placa solidario, discapacidad, híbrido):
+      solo espacios sin asignaciones
+    - Directivo exclusivo: espacios libres o sus propios espacios con menos
+      de 4 vehículos
+    - Carros regulares: espacios libres o con un único carro regular de
+      circulación complementaria (PAR con IMPAR)
+
+Las excepciones y la circulación se codifican como máscaras de bits, y cada
+parqueadero se indexa por la única "clave" por la que puede recibir un
+vehículo más; así "todos los espacios elegibles" es una unión de conjuntos
+en lugar de un recorrido con consultas por espacio.
+
+Las asignaciones individuales (ParqueaderoModel.asignar_vehiculo) y la
+automática (ParqueaderoModel.asignar_masivo) pasan por sp_asignar_vehiculo,
+que vuelve a validar en la base de datos: una instantánea desactualizada
+como mucho ofrece un espacio que el procedimiento rechaza.
+
+Uso:
+    ocupacion = InstantaneaOcupacion.cargar(db)
+    perfil = PerfilVehiculo.desde_fila(vehiculo_data)
+    for espacio in ocupacion.candidatos(perfil, sotano="Sótano-1"):
+        print(espacio.numero_parqueadero, espacio.estado_display)
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .validaciones_asignaciones import ValidadorAsignacion
+
+# Excepciones del funcionario (bits)
+SOLIDARIO = 1
+DISCAPACIDAD = 2
+HIBRIDO = 4
+EXCLUSIVO = 8
+
+# Circulación del vehículo (bits)
+CIRC_PAR = 1
+CIRC_IMPAR = 2
+CIRC_HIBRIDO = 4
+CIRC_COMPARTIBLE = CIRC_PAR | CIRC_IMPAR
+
+_BITS_CIRCULACION = {"PAR": CIRC_PAR, "IMPAR": CIRC_IMPAR, "HÍBRIDO": CIRC_HIBRIDO}
+
+_NOMBRES_EXCEPCION = (
+    (SOLIDARIO, "Pico y Placa Solidario"),
+    (DISCAPACIDAD, "Funcionario con Discapacidad"),
+    (HIBRIDO, "Vehículo Híbrido"),
+)
+
+MAX_VEHICULOS_EXCLUSIVO = 4
+
+SOTANO_POR_DEFECTO = "Sótano-1"
+
+
+def mascara_circulacion(tipo_circulacion: Optional[str]) -> int:
+    """Bit de circulación ('PAR', 'IMPAR', 'HÍBRIDO'); 0 si no aplica"""
+    return _BITS_CIRCULACION.get(tipo_circulacion or "", 0)
+
+
+def mascara_excepciones(fila: Dict) -> int:
+    """
+    Máscara de excepciones a partir de una fila vehículo + funcionario
+
+    Args:
+        fila: Debe incluir 'pico_placa_solidario', 'discapacidad',
+              'tiene_parqueadero_exclusivo' y opcionalmente 'tiene_carro_hibrido'
+              y 'tipo_circulacion'
+
+    Returns:
+        int: Combinación de SOLIDARIO, DISCAPACIDAD, HIBRIDO y EXCLUSIVO
+    """
+    mascara = 0
+    if fila.get("pico_placa_solidario"):
+        mascara |= SOLIDARIO
+    if fila.get("discapacidad"):
+        mascara |= DISCAPACIDAD
+    if fila.get("tiene_carro_hibrido") or fila.get("tipo_circulacion") == "HÍBRIDO":
+        mascara |= HIBRIDO
+    if fila.get("tiene_parqueadero_exclusivo"):
+        mascara |= EXCLUSIVO
+    return mascara
+
+
+@dataclass(frozen=True)
+class PerfilVehiculo:
+    """Lo que las reglas necesitan saber de un vehículo y su funcionario"""
+
+    vehiculo_id: Optional[int]
+    funcionario_id: Optional[int]
+    tipo_vehiculo: str
+    circulacion: int = 0
+    excepciones: int = 0
+
+    @classmethod
+    def desde_fila(cls, fila: Dict) -> "PerfilVehiculo":
+        """Construye el perfil desde una fila de vehiculos JOIN funcionarios"""
+        tipo_vehiculo = fila.get("tipo_vehiculo") or "Carro"
+        es_carro = tipo_vehiculo == "Carro"
+        return cls(
+            vehiculo_id=fila.get("vehiculo_id", fila.get("id")),
+            funcionario_id=fila.get("funcionario_id"),
+            tipo_vehiculo=tipo_vehiculo,
+            circulacion=mascara_circulacion(fila.get("tipo_circulacion")) if es_carro else 0,
+            excepciones=mascara_excepciones(fila) if es_carro else 0,
+        )
+
+    @property
+    def es_carro(self) -> bool:
+        return self.tipo_vehiculo == "Carro"
+
+    @property
+    def es_exclusivo(self) -> bool:
+        return bool(self.excepciones & EXCLUSIVO) and self.funcionario_id is not None
+
+    @property
+    def comparte(self) -> bool:
+        """Carro regular PAR/IMPAR que puede formar pareja"""
+        return self.es_carro and not self.excepciones and bool(self.circulacion & CIRC_COMPARTIBLE)
+
+
+@dataclass
+class EspacioOcupacion:
+    """Parqueadero con sus ocupantes actuales y su clave en el índice"""
+
+    id: int
+    numero_parqueadero: int
+    sotano: str
+    tipo_espacio: str
+    ocupantes: List[PerfilVehiculo] = field(default_factory=list)
+    clave: Optional[Tuple] = None
+
+    @property
+    def total(self) -> int:
+        return len(self.ocupantes)
+
+    @property
+    def carros(self) -> int:
+        return sum(1 for o in self.ocupantes if o.es_carro)
+
+    @property
+    def estado_display(self) -> str:
+        """Estado para mostrar en combos ('Disponible', 'Parcial (n/4)', ...)"""
+        if not self.ocupantes:
+            return "Disponible"
+        if self.clave and self.clave[0] == "propio":
+            return f"Parcial ({self.total}/{MAX_VEHICULOS_EXCLUSIVO})"
+        if self.clave and self.clave[0] == "complemento":
+            return "Parcialmente_Asignado"
+        return "Completo"
+
+    def calcular_clave(self) -> Optional[Tuple]:
+        """
+        Única vía por la que este espacio puede recibir otro vehículo
+
+        Returns:
+            ("libre", tipo_espacio, sotano), ("complemento", circulacion_requerida, sotano),
+            ("propio", funcionario_id) o None si está completo
+        """
+        if not self.ocupantes:
+            return ("libre", self.tipo_espacio, self.sotano)
+        if self.tipo_espacio != "Carro":
+            return None
+
+        primero = self.ocupantes[0]
+        if primero.es_exclusivo:
+            mismo_dueno = all(o.funcionario_id == primero.funcionario_id for o in self.ocupantes)
+            if mismo_dueno and self.total < MAX_VEHICULOS_EXCLUSIVO:
+                return ("propio", primero.funcionario_id)
+            return None
+
+        if self.total == 1 and primero.comparte:
+            return ("complemento", CIRC_COMPARTIBLE ^ (primero.circulacion & CIRC_COMPARTIBLE), self.sotano)
+        return None
+
+
+class InstantaneaOcupacion:
+    """Ocupación de parqueaderos en memoria, indexada por clave de elegibilidad"""
+
+    def __init__(self, espacios: Iterable[EspacioOcupacion] = ()):
+        self._espacios: Dict[int, EspacioOcupacion] = {}
+        self._indice: Dict[Tuple, Set[int]] = {}
+        self._ubicacion: Dict[int, int] = {}  # vehiculo_id -> parqueadero_id
+        self.sotanos: List[str] = []
+        for espacio in espacios:
+            self.agregar_espacio(espacio)
+
+    @classmethod
+    def desde_filas(cls, parqueaderos: Iterable[Dict], ocupantes: Iterable[Dict] = ()) -> "InstantaneaOcupacion":
+        """
+        Construye la instantánea desde filas de la base de datos
+
+        Args:
+            parqueaderos: Filas con id, numero_parqueadero, tipo_espacio y sotano
+            ocupantes: Filas de asignaciones activas con parqueadero_id y los
+                       datos del vehículo y del funcionario
+
+        Returns:
+            InstantaneaOcupacion: Instantánea indexada
+        """
+        espacios = {
+            p["id"]: EspacioOcupacion(
+                id=p["id"],
+                numero_parqueadero=p["numero_parqueadero"],
+                sotano=p.get("sotano") or SOTANO_POR_DEFECTO,
+                tipo_espacio=p.get("tipo_espacio") or "Carro",
+            )
+            for p in parqueaderos
+        }
+        for fila in ocupantes:
+            espacio = espacios.get(fila["parqueadero_id"])
+            if espacio is not None:
+                espacio.ocupantes.append(PerfilVehiculo.desde_fila(fila))
+        return cls(espacios.values())
+
+    @classmethod
+    def cargar(cls, db, parqueadero_id: int = None, parqueadero_ids: Iterable[int] = None) -> "InstantaneaOcupacion":
+        """
+        Carga la ocupación actual con dos consultas
+
+        Args:
+            db: DatabaseManager
+            parqueadero_id: Si se indica, solo ese parqueadero (validación puntual)
+            parqueadero_ids: Si se indica, solo esos parqueaderos (asignación masiva)
+
+        Returns:
+            InstantaneaOcupacion: Instantánea de los parqueaderos activos
+        """
+        if parqueadero_id is not None:
+            parqueadero_ids = [parqueadero_id]
+        if parqueadero_ids is None:
+            filtro_parqueadero = filtro_asignacion = ""
+            params = None
+        else:
+            ids = list(parqueadero_ids)
+            if not ids:
+                return cls()
+            placeholders = ", ".join(["%s"] * len(ids))
+            filtro_parqueadero = f" AND p.id IN ({placeholders})"
+            filtro_asignacion = f" AND a.parqueadero_id IN ({placeholders})"
+            params = tuple(ids)
+
+        parqueaderos = db.fetch_all(
+            f"""
+            SELECT p.id, p.numero_parqueadero, p.tipo_espacio,
+                   COALESCE(p.sotano, 'Sótano-1') as sotano
+            FROM parqueaderos p
+            WHERE p.activo = TRUE{filtro_parqueadero}
+            """,
+            params,
+        )
+        ocupantes = db.fetch_all(
+            f"""
+            SELECT a.parqueadero_id, v.id as vehiculo_id, v.funcionario_id,
+                   v.tipo_vehiculo, v.tipo_circulacion,
+                   f.pico_placa_solidario, f.discapacidad,
+                   f.tiene_parqueadero_exclusivo, f.tiene_carro_hibrido
+            FROM asignaciones a
+            JOIN vehiculos v ON a.vehiculo_id = v.id
+            JOIN funcionarios f ON v.funcionario_id = f.id
+            WHERE a.activo = TRUE{filtro_asignacion}
+            ORDER BY a.fecha_asignacion
+            """,
+            params,
+        )
+        return cls.desde_filas(parqueaderos or [], ocupantes or [])
+
+    # ------------------------------------------------------------------ índice
+
+    def agregar_espacio(self, espacio: EspacioOcupacion):
+        """Agrega (o reemplaza) un parqueadero y lo indexa"""
+        if espacio.id in self._espacios:
+            self._desindexar(self._espacios[espacio.id])
+        self._espacios[espacio.id] = espacio
+        if espacio.sotano not in self.sotanos:
+            self.sotanos.append(espacio.sotano)
+            self.sotanos.sort()
+        for ocupante in espacio.ocupantes:
+            if ocupante.vehiculo_id is not None:
+                self._ubicacion[ocupante.vehiculo_id] = espacio.id
+        self._indexar(espacio)
+
+    def _indexar(self, espacio: EspacioOcupacion):
+        espacio.clave = espacio.calcular_clave()
+        if espacio.clave is not None:
+            self._indice.setdefault(espacio.clave, set()).add(espacio.id)
+
+    def _desindexar(self, espacio: EspacioOcupacion):
+        if espacio.clave is not None:
+            self._indice.get(espacio.clave, set()).discard(espacio.id)
+
+    def _claves(self, perfil: PerfilVehiculo, sotano: str) -> List[Tuple]:
+        """Claves del índice por las que este perfil puede entrar a un espacio del sótano"""
+        claves = [("libre", perfil.tipo_vehiculo, sotano)]
+        if perfil.es_exclusivo:
+            claves.append(("propio", perfil.funcionario_id))
+        elif perfil.comparte:
+            claves.append(("complemento", perfil.circulacion & CIRC_COMPARTIBLE, sotano))
+        return claves
+
+    # ---------------------------------------------------------------- consultas
+
+    def espacio(self, parqueadero_id: int) -> Optional[EspacioOcupacion]:
+        return self._espacios.get(parqueadero_id)
+
+    def parqueadero_de(self, vehiculo_id: int) -> Optional[int]:
+        """Parqueadero donde está asignado el vehículo, si lo está"""
+        return self._ubicacion.get(vehiculo_id)
+
+    def candidatos(self, perfil: PerfilVehiculo, sotano: str = None) -> List[EspacioOcupacion]:
+        """
+        Todos los parqueaderos elegibles para el perfil
+
+        Args:
+            perfil: Vehículo a ubicar
+            sotano: Limitar a un sótano (None = todos)
+
+        Returns:
+            List[EspacioOcupacion]: Ordenados por número de parqueadero
+        """
+        ids: Set[int] = set()
+        for s in [sotano] if sotano else self.sotanos:
+            for clave in self._claves(perfil, s):
+                ids |= self._indice.get(clave, set())
+
+        espacios = [self._espacios[i] for i in ids]
+        if sotano:
+            # Las claves "propio" no dependen del sótano
+            espacios = [e for e in espacios if e.sotano == sotano]
+        return sorted(espacios, key=lambda e: e.numero_parqueadero)
+
+    def primero(self, clave: Tuple) -> Optional[EspacioOcupacion]:
+        """Parqueadero de menor número con esa clave, sin ordenar todo el conjunto"""
+        ids = self._indice.get(clave)
+        if not ids:
+            return None
+        return min((self._espacios[i] for i in ids), key=lambda e: e.numero_parqueadero)
+
+    def es_elegible(self, perfil: PerfilVehiculo, parqueadero_id: int) -> bool:
+        espacio = self._espacios.get(parqueadero_id)
+        return espacio is not None and espacio.clave in self._claves(perfil, espacio.sotano)
+
+    def validar(self, perfil: PerfilVehiculo, parqueadero_id: int) -> Tuple[bool, str]:
+        """
+        Valida la asignación de un vehículo a un parqueadero
+
+        Args:
+            perfil: Vehículo a asignar
+            parqueadero_id: Parqueadero destino
+
+        Returns:
+            Tuple[bool, str]: (es_válido, mensaje_error)
+        """
+        espacio = self._espacios.get(parqueadero_id)
+        if espacio is None:
+            return False, "🚫 Parqueadero no encontrado o inactivo"
+        if espacio.clave in self._claves(perfil, espacio.sotano):
+            return True, ""
+
+        if espacio.tipo_espacio != perfil.tipo_vehiculo:
+            return False, (
+                f"🚫 El parqueadero es para {espacio.tipo_espacio}\n\n"
+                f"💡 Seleccione un parqueadero para {perfil.tipo_vehiculo}"
+            )
+
+        if not perfil.es_carro:
+            return False, "🚫 El parqueadero ya está ocupado\n\n💡 Seleccione un parqueadero disponible"
+
+        if perfil.es_exclusivo:
+            if any(o.funcionario_id != perfil.funcionario_id for o in espacio.ocupantes):
+                return False, (
+                    "🚫 Este parqueadero ya está asignado a otro directivo.\n\n"
+                    "Los directivos exclusivos solo pueden compartir parqueaderos con sus propios vehículos."
+                )
+            return False, (
+                f"🚫 El directivo ya tiene {MAX_VEHICULOS_EXCLUSIVO} vehículos asignados "
+                f"a este parqueadero exclusivo (límite máximo)"
+            )
+
+        if perfil.excepciones:
+            excepciones_str = [nombre for bit, nombre in _NOMBRES_EXCEPCION if perfil.excepciones & bit]
+            return False, (
+                f"🚫 Este vehículo tiene excepción de pico y placa ({', '.join(excepciones_str)}).\n\n"
+                f"⚠️ Los vehículos con excepciones SOLO pueden asignarse a parqueaderos 100% DISPONIBLES.\n"
+                f"No pueden compartir con otros vehículos.\n\n"
+                f"Por favor, seleccione un parqueadero que esté completamente desocupado."
+            )
+
+        if any(o.excepciones for o in espacio.ocupantes):
+            return False, (
+                "🚫 Parqueadero ocupado por funcionario con excepción de pico y placa\n\n"
+                "⚠️ El parqueadero es exclusivo\n\n"
+                "💡 Seleccione otro parqueadero disponible"
+            )
+
+        if any(o.circulacion & perfil.circulacion for o in espacio.ocupantes) and espacio.total == 1:
+            tipo_circulacion = next(t for t, bit in _BITS_CIRCULACION.items() if bit == perfil.circulacion)
+            return ValidadorAsignacion.validar_pico_placa("Carro", tipo_circulacion, False, 1)
+
+        return False, "🚫 El parqueadero está completo\n\n💡 Seleccione otro parqueadero disponible"
+
+    # -------------------------------------------------------------- mutaciones
+
+    def registrar_asignacion(self, perfil: PerfilVehiculo, parqueadero_id: int):
+        """Refleja en la instantánea una asignación ya confirmada"""
+        espacio = self._espacios[parqueadero_id]
+        self._desindexar(espacio)
+        espacio.ocupantes.append(perfil)
+        if perfil.vehiculo_id is not None:
+            self._ubicacion[perfil.vehiculo_id] = parqueadero_id
+        self._indexar(espacio)
+
+    def liberar(self, vehiculo_id: int):
+        """Refleja en la instantánea la liberación de un vehículo"""
+        parqueadero_id = self._ubicacion.pop(vehiculo_id, None)
+        if parqueadero_id is None:
+            return
+        espacio = self._espacios[parqueadero_id]
+        self._desindexar(espacio)
+        espacio.ocupantes = [o for o in espacio.ocupantes if o.vehiculo_id != vehiculo_id]
+        self._indexar(espacio)
@@ -0,0 +1,566 @@
+# -*- coding: utf-8 -*-
+"""
+Rollups de accesos y ocupación por hora y por día
+
+Los reportes históricos agregan sobre tablas pequeñas (migración 005) en
+lugar de recorrer historial_accesos y asignaciones:
+
+    rollup_accesos_hora / _dia     entradas y salidas por parqueadero y tipo de vehículo
+    rollup_asignaciones_dia        asignaciones nuevas por parqueadero y tipo
+    rollup_ocupacion_hora / _dia   muestra horaria de la ocupación de cada parqueadero
+
+AgregadorRollups procesa solo las filas con id mayor que la marca de agua de
+cada fuente, en lotes de ROLLUP_BATCH_SIZE: cada lote y su nueva marca se
+confirman en la misma transacción, así que una pasada interrumpida no
+cuenta dos veces. La marca no cruza un hueco de ids reciente: puede ser una
+transacción que ya tomó su AUTO_INCREMENT y confirma después de ids mayores
+(lotes de ingesta en paralelo a los SP); solo tras ROLLUP_GAP_WAIT_S se da el
+hueco por definitivo (rollback o fila borrada). La ocupación no se puede reconstruir desde asignaciones
+(las liberaciones eliminan la fila), por eso se muestrea cada hora.
+
+ProgramadorRollups ejecuta el agregador en un hilo con conexión propia;
+ConsultasRollups es la API de lectura para reportes y gráficas.
+
+Uso:
+    programador = ProgramadorRollups(db.config)
+    programador.iniciar()
+
+    ConsultasRollups(db).ocupacion_mensual(date(2024, 1, 1), date(2024, 12, 31))
+
+    serie = SerieTendencia(ConsultasRollups(db), por="sotano")
+    puntos = serie.actualizar()  # después de la primera carga, solo consulta el último punto
+"""
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from mysql.connector import Error
+
+from ..config.settings import (
+    DASHBOARD_TREND_DAYS,
+    DASHBOARD_TREND_POINTS,
+    ROLLUP_BATCH_SIZE,
+    ROLLUP_GAP_WAIT_S,
+    ROLLUP_INTERVAL_S,
+)
+from ..core.logger import logger
+from ..database.manager import ConexionIndependiente
+from ..database.version_datos import version_rollups
+
+TABLA_MARCAS = "rollup_marcas"
+
+# Fuente -> (tabla con id creciente, consultas que agregan el rango (desde, hasta])
+FUENTES = {
+    "accesos": (
+        "historial_accesos",
+        (
+            """
+            INSERT INTO rollup_accesos_hora (hora, parqueadero_id, tipo_vehiculo, entradas, salidas)
+            SELECT TIMESTAMP(DATE(h.fecha_hora), MAKETIME(HOUR(h.fecha_hora), 0, 0)) AS hora_evento,
+                   h.parqueadero_id, v.tipo_vehiculo,
+                   SUM(h.tipo_evento = 'Entrada'), SUM(h.tipo_evento = 'Salida')
+            FROM historial_accesos h
+            JOIN vehiculos v ON v.id = h.vehiculo_id
+            WHERE h.id > %s AND h.id <= %s
+            GROUP BY hora_evento, h.parqueadero_id, v.tipo_vehiculo
+            ON DUPLICATE KEY UPDATE
+                entradas = entradas + VALUES(entradas),
+                salidas = salidas + VALUES(salidas)
+            """,
+            """
+            INSERT INTO rollup_accesos_dia (fecha, parqueadero_id, tipo_vehiculo, entradas, salidas)
+            SELECT DATE(h.fecha_hora) AS fecha_evento, h.parqueadero_id, v.tipo_vehiculo,
+                   SUM(h.tipo_evento = 'Entrada'), SUM(h.tipo_evento = 'Salida')
+            FROM historial_accesos h
+            JOIN vehiculos v ON v.id = h.vehiculo_id
+            WHERE h.id > %s AND h.id <= %s
+            GROUP BY fecha_evento, h.parqueadero_id, v.tipo_vehiculo
+            ON DUPLICATE KEY UPDATE
+                entradas = entradas + VALUES(entradas),
+                salidas = salidas + VALUES(salidas)
+            """,
+        ),
+    ),
+    "asignaciones": (
+        "asignaciones",
+        (
+            """
+            INSERT INTO rollup_asignaciones_dia (fecha, parqueadero_id, tipo_vehiculo, asignaciones)
+            SELECT DATE(a.fecha_asignacion) AS fecha_inicio, a.parqueadero_id, v.tipo_vehiculo, COUNT(*)
+            FROM asignaciones a
+            JOIN vehiculos v ON v.id = a.vehiculo_id
+            WHERE a.id > %s AND a.id <= %s
+            GROUP BY fecha_inicio, a.parqueadero_id, v.tipo_vehiculo
+            ON DUPLICATE KEY UPDATE asignaciones = asignaciones + VALUES(asignaciones)
+            """,
+        ),
+    ),
+}
+
+QUERY_MUESTRA_OCUPACION = """
+    INSERT INTO rollup_ocupacion_hora (hora, parqueadero_id, ocupado, carros, motos, bicicletas)
+    SELECT %s, p.id, COUNT(a.id) > 0,
+           COALESCE(SUM(v.tipo_vehiculo = 'Carro'), 0),
+           COALESCE(SUM(v.tipo_vehiculo = 'Moto'), 0),
+           COALESCE(SUM(v.tipo_vehiculo = 'Bicicleta'), 0)
+    FROM parqueaderos p
+    LEFT JOIN asignaciones a ON a.parqueadero_id = p.id AND a.activo = TRUE
+    LEFT JOIN vehiculos v ON v.id = a.vehiculo_id
+    WHERE p.activo = TRUE
+    GROUP BY p.id
+    ON DUPLICATE KEY UPDATE
+        ocupado = VALUES(ocupado),
+        carros = VALUES(carros),
+        motos = VALUES(motos),
+        bicicletas = VALUES(bicicletas)
+"""
+
+QUERY_OCUPACION_DIA = """
+    INSERT INTO rollup_ocupacion_dia (
+        fecha, parqueadero_id, horas, horas_ocupado, carros_suma, motos_suma, bicicletas_suma, vehiculos_max
+    )
+    SELECT DATE(hora) AS fecha_muestra, parqueadero_id, COUNT(*), SUM(ocupado),
+           SUM(carros), SUM(motos), SUM(bicicletas), MAX(carros + motos + bicicletas)
+    FROM rollup_ocupacion_hora
+    WHERE hora >= %s AND hora < %s
+    GROUP BY fecha_muestra, parqueadero_id
+    ON DUPLICATE KEY UPDATE
+        horas = VALUES(horas),
+        horas_ocupado = VALUES(horas_ocupado),
+        carros_suma = VALUES(carros_suma),
+        motos_suma = VALUES(motos_suma),
+        bicicletas_suma = VALUES(bicicletas_suma),
+        vehiculos_max = VALUES(vehiculos_max)
+"""
+
+
+def rollups_disponibles(db) -> bool:
+    """Indica si la migración 005 está aplicada"""
+    try:
+        return db.fetch_one(f"SHOW TABLES LIKE '{TABLA_MARCAS}'") is not None
+    except Exception as e:
+        print(f"Advertencia al verificar tabla '{TABLA_MARCAS}': {e}")
+        return False
+
+
+class AgregadorRollups:
+    """Mantiene las tablas de rollup de forma incremental"""
+
+    def __init__(
+        self,
+        db,
+        tamano_lote: int = ROLLUP_BATCH_SIZE,
+        espera_hueco_s: float = ROLLUP_GAP_WAIT_S,
+        reloj: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            db: Conexión propia (ConexionIndependiente) o DatabaseManager
+            tamano_lote: Filas máximas de la fuente por transacción
+            espera_hueco_s: Segundos antes de cruzar un hueco de ids con la marca
+            reloj: Fuente de tiempo (inyectable en pruebas)
+        """
+        self.db = db
+        self.tamano_lote = tamano_lote
+        self.espera_hueco_s = espera_hueco_s
+        self.reloj = reloj
+        # Fuente -> {primer id del hueco: momento en que se vio por primera vez}
+        self._huecos: Dict[str, Dict[int, float]] = {}
+
+    def procesar(self, momento: datetime = None) -> Dict[str, int]:
+        """
+        Pasada completa: fuentes pendientes hasta alcanzar su máximo id y muestra de ocupación
+
+        Returns:
+            Dict con las filas procesadas por fuente y las muestras de ocupación escritas
+        """
+        resultado = {nombre: 0 for nombre in FUENTES}
+        for nombre in FUENTES:
+            while True:
+                filas = self.procesar_fuente(nombre)
+                resultado[nombre] += filas
+                if filas < self.tamano_lote:
+                    break
+        resultado["ocupacion"] = self.registrar_ocupacion(momento)
+        return resultado
+
+    def procesar_fuente(self, nombre: str) -> int:
+        """
+        Agrega el siguiente lote de filas de una fuente y avanza su marca de agua
+
+        Returns:
+            int: Filas de la fuente procesadas (0 si estaba al día o hubo error)
+        """
+        tabla, consultas = FUENTES[nombre]
+        if not self.db.ensure_connection():
+            return 0
+        cursor = self.db.cursor
+        try:
+            # FOR UPDATE: dos agregadores simultáneos no procesan el mismo rango
+            cursor.execute(f"SELECT ultimo_id FROM {TABLA_MARCAS} WHERE nombre = %s FOR UPDATE", (nombre,))
+            marca = cursor.fetchone()
+            desde = marca["ultimo_id"] if marca else 0
+
+            cursor.execute(f"SELECT id FROM {tabla} WHERE id > %s ORDER BY id LIMIT %s", (desde, self.tamano_lote))
+            hasta, filas = self._tramo_sin_huecos(nombre, desde, [fila["id"] for fila in cursor.fetchall()])
+            if not filas:
+                self.db.connection.rollback()
+                return 0
+
+            for consulta in consultas:
+                cursor.execute(consulta, (desde, hasta))
+            cursor.execute(
+                f"""
+                INSERT INTO {TABLA_MARCAS} (nombre, ultimo_id) VALUES (%s, %s)
+                ON DUPLICATE KEY UPDATE ultimo_id = VALUES(ultimo_id)
+                """,
+                (nombre, hasta),
+            )
+            self.db.connection.commit()
+            version_rollups.incrementar()
+            return filas
+        except Error as e:
+            self.db.connection.rollback()
+            logger.error(f"Error agregando rollup '{nombre}': {e}")
+            return 0
+
+    def _tramo_sin_huecos(self, nombre: str, desde: int, ids: List[int]) -> Tuple[int, int]:
+        """
+        Corta el lote en el primer hueco de ids visto hace menos de espera_hueco_s
+
+        Un id que falta puede pertenecer a una transacción que todavía no
+        confirma; si la marca lo saltara, esa fila no se agregaría nunca. El
+        hueco se cruza cuando se llena o cuando supera la espera.
+
+        Args:
+            nombre: Fuente del lote
+            desde: Marca de agua actual
+            ids: Ids confirmados mayores que la marca, en orden
+
+        Returns:
+            Tuple (hasta, filas) del tramo que se puede agregar
+        """
+        ahora = self.reloj()
+        vistos = self._huecos.setdefault(nombre, {})
+        hasta, filas = desde, 0
+        for id_fila in ids:
+            if id_fila > hasta + 1 and ahora - vistos.setdefault(hasta + 1, ahora) < self.espera_hueco_s:
+                break
+            hasta, filas = id_fila, filas + 1
+        for inicio in [i for i in vistos if i <= hasta]:
+            del vistos[inicio]
+        return hasta, filas
+
+    def registrar_ocupacion(self, momento: datetime = None) -> int:
+        """
+        Escribe la muestra de ocupación de la hora actual y recalcula el día
+
+        Se puede llamar varias veces por hora: la muestra de la hora queda con
+        el último estado observado.
+
+        Returns:
+            int: Filas de rollup_ocupacion_hora modificadas
+        """
+        hora = (momento or datetime.now()).replace(minute=0, second=0, microsecond=0)
+        dia = hora.replace(hour=0)
+        if not self.db.ensure_connection():
+            return 0
+        cursor = self.db.cursor
+        try:
+            cursor.execute(QUERY_MUESTRA_OCUPACION, (hora,))
+            # ON DUPLICATE KEY UPDATE sin cambios cuenta 0 filas
+            modificadas = cursor.rowcount
+            if modificadas > 0:
+                cursor.execute(QUERY_OCUPACION_DIA, (dia, dia + timedelta(days=1)))
+            self.db.connection.commit()
+            if modificadas > 0:
+                version_rollups.incrementar()
+            return max(modificadas, 0)
+        except Error as e:
+            self.db.connection.rollback()
+            logger.error(f"Error registrando muestra de ocupación: {e}")
+            return 0
+
+
+class ProgramadorRollups:
+    """Ejecuta AgregadorRollups periódicamente en un hilo con conexión propia"""
+
+    def __init__(self, db_config=None, intervalo_s: float = ROLLUP_INTERVAL_S):
+        self.db_config = db_config
+        self.intervalo_s = intervalo_s
+        self._detener = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+
+    def iniciar(self):
+        if self._hilo is not None and self._hilo.is_alive():
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._ejecutar, name="ProgramadorRollups", daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout: float = 5.0):
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+            self._hilo = None
+
+    def _ejecutar(self):
+        try:
+            with ConexionIndependiente(self.db_config) as db:
+                if not db.connection or not rollups_disponibles(db):
+                    logger.info("Rollups de historial no disponibles (migración 005 no aplicada)")
+                    return
+                agregador = AgregadorRollups(db)
+                while not self._detener.is_set():
+                    resultado = agregador.procesar()
+                    if resultado["accesos"] or resultado["asignaciones"]:
+                        logger.debug(f"Rollups actualizados: {resultado}")
+                    self._detener.wait(self.intervalo_s)
+        except Exception as e:
+            logger.error(f"Error en el programador de rollups: {e}")
+
+
+class ConsultasRollups:
+    """Lecturas históricas para reportes y gráficas (solo tablas de rollup)"""
+
+    def __init__(self, db):
+        self.db = db
+        self._columna_sotano = None
+
+    def disponible(self) -> bool:
+        return rollups_disponibles(self.db)
+
+    def _tiene_sotano(self) -> bool:
+        if self._columna_sotano is None:
+            self._columna_sotano = self.db.fetch_one("SHOW COLUMNS FROM parqueaderos LIKE 'sotano'") is not None
+        return self._columna_sotano
+
+    def ocupacion_diaria(self, desde: date, hasta: date, sotano: str = None) -> List[Dict]:
+        """
+        Ocupación promedio por día
+
+        Returns:
+            Lista de {fecha, espacios, ocupacion_pct, vehiculos_promedio, vehiculos_max}
+        """
+        query = """
+            SELECT o.fecha,
+                   COUNT(*) AS espacios,
+                   ROUND(100 * SUM(o.horas_ocupado) / SUM(o.horas), 1) AS ocupacion_pct,
+                   ROUND(SUM(o.carros_suma + o.motos_suma + o.bicicletas_suma) * COUNT(*) / SUM(o.horas), 1)
+                       AS vehiculos_promedio,
+                   SUM(o.vehiculos_max) AS vehiculos_max
+            FROM rollup_ocupacion_dia o
+        """
+        params = [desde, hasta]
+        condiciones = "WHERE o.fecha BETWEEN %s AND %s"
+        if sotano and self._tiene_sotano():
+            query += " JOIN parqueaderos p ON p.id = o.parqueadero_id"
+            condiciones += " AND COALESCE(p.sotano, 'Sótano-1') = %s"
+            params.append(sotano)
+        query += f" {condiciones} GROUP BY o.fecha ORDER BY o.fecha"
+        return self.db.fetch_all(query, tuple(params)) or []
+
+    def ocupacion_mensual(self, desde: date, hasta: date) -> List[Dict]:
+        """
+        Ocupación, accesos y asignaciones nuevas por mes
+
+        Returns:
+            Lista de {mes, espacios, ocupacion_pct, vehiculos_promedio, carros, motos,
+            bicicletas, entradas, salidas, asignaciones}, del mes más antiguo al más reciente
+        """
+        params = (desde, hasta)
+        ocupacion = self.db.fetch_all(
+            """
+            SELECT DATE_FORMAT(fecha, '%Y-%m') AS mes,
+                   COUNT(DISTINCT parqueadero_id) AS espacios,
+                   ROUND(100 * SUM(horas_ocupado) / SUM(horas), 1) AS ocupacion_pct,
+                   ROUND(SUM(carros_suma + motos_suma + bicicletas_suma)
+                         * COUNT(DISTINCT parqueadero_id) / SUM(horas), 1) AS vehiculos_promedio,
+                   ROUND(SUM(carros_suma) * COUNT(DISTINCT parqueadero_id) / SUM(horas), 1) AS carros,
+                   ROUND(SUM(motos_suma) * COUNT(DISTINCT parqueadero_id) / SUM(horas), 1) AS motos,
+                   ROUND(SUM(bicicletas_suma) * COUNT(DISTINCT parqueadero_id) / SUM(horas), 1) AS bicicletas
+            FROM rollup_ocupacion_dia
+            WHERE fecha BETWEEN %s AND %s
+            GROUP BY mes
+            """,
+            params,
+        ) or []
+        accesos = self.db.fetch_all(
+            """
+            SELECT DATE_FORMAT(fecha, '%Y-%m') AS mes,
+                   CAST(SUM(entradas) AS SIGNED) AS entradas, CAST(SUM(salidas) AS SIGNED) AS salidas
+            FROM rollup_accesos_dia
+            WHERE fecha BETWEEN %s AND %s
+            GROUP BY mes
+            """,
+            params,
+        ) or []
+        asignaciones = self.db.fetch_all(
+            """
+            SELECT DATE_FORMAT(fecha, '%Y-%m') AS mes, CAST(SUM(asignaciones) AS SIGNED) AS asignaciones
+            FROM rollup_asignaciones_dia
+            WHERE fecha BETWEEN %s AND %s
+            GROUP BY mes
+            """,
+            params,
+        ) or []
+
+        vacio = {
+            "espacios": 0,
+            "ocupacion_pct": None,
+            "vehiculos_promedio": None,
+            "carros": None,
+            "motos": None,
+            "bicicletas": None,
+            "entradas": 0,
+            "salidas": 0,
+            "asignaciones": 0,
+        }
+        meses: Dict[str, Dict] = {}
+        for filas in (ocupacion, accesos, asignaciones):
+            for fila in filas:
+                meses.setdefault(fila["mes"], {"mes": fila["mes"], **vacio}).update(fila)
+        return [meses[mes] for mes in sorted(meses)]
+
+    def accesos(self, desde: datetime, hasta: datetime, periodo: str = "dia", por: str = None) -> List[Dict]:
+        """
+        Entradas y salidas por hora o por día
+
+        Args:
+            desde, hasta: Rango (inclusive)
+            periodo: "hora" o "dia"
+            por: None, "parqueadero", "tipo_vehiculo" o "sotano"
+
+        Returns:
+            Lista de {periodo, [grupo], entradas, salidas}
+        """
+        tabla, columna = ("rollup_accesos_hora", "hora") if periodo == "hora" else ("rollup_accesos_dia", "fecha")
+        grupos = {
+            "parqueadero": "p.numero_parqueadero",
+            "tipo_vehiculo": "r.tipo_vehiculo",
+            "sotano": "COALESCE(p.sotano, 'Sótano-1')" if self._tiene_sotano() else None,
+        }
+        grupo = grupos.get(por) if por else None
+
+        seleccion = f"r.{columna} AS periodo"
+        agrupacion = f"r.{columna}"
+        union = ""
+        if grupo:
+            seleccion += f", {grupo} AS grupo"
+            agrupacion += f", {grupo}"
+            if por in ("parqueadero", "sotano"):
+                union = "JOIN parqueaderos p ON p.id = r.parqueadero_id"
+
+        query = f"""
+            SELECT {seleccion},
+                   CAST(SUM(r.entradas) AS SIGNED) AS entradas, CAST(SUM(r.salidas) AS SIGNED) AS salidas
+            FROM {tabla} r
+            {union}
+            WHERE r.{columna} BETWEEN %s AND %s
+            GROUP BY {agrupacion}
+            ORDER BY {agrupacion}
+        """
+        return self.db.fetch_all(query, (desde, hasta)) or []
+
+    def tendencia_ocupacion(self, desde: datetime, segundos_por_punto: int, por: str = "tipo") -> List[Dict]:
+        """
+        Tendencia de ocupación desde las muestras horarias, agrupada en la base de datos
+
+        Cada punto promedia las muestras de `segundos_por_punto` segundos, así la
+        serie tiene a lo sumo (rango / segundos_por_punto) puntos.
+
+        Args:
+            desde: Primer momento incluido
+            segundos_por_punto: Ancho de cada punto (múltiplo de 3600)
+            por: "sotano" (porcentaje de espacios ocupados) o "tipo" (vehículos promedio por tipo)
+
+        Returns:
+            Lista de {momento, grupo, valor} ordenada por momento
+        """
+        punto = "FROM_UNIXTIME(FLOOR(UNIX_TIMESTAMP(r.hora) / %s) * %s)"
+        if por == "sotano":
+            grupo = "COALESCE(p.sotano, 'Sótano-1')" if self._tiene_sotano() else "'General'"
+            query = f"""
+                SELECT {punto} AS momento, {grupo} AS grupo,
+                       ROUND(100 * SUM(r.ocupado) / COUNT(*), 1) AS valor
+                FROM rollup_ocupacion_hora r
+                JOIN parqueaderos p ON p.id = r.parqueadero_id
+                WHERE r.hora >= %s
+                GROUP BY momento, grupo
+                ORDER BY momento
+            """
+            return self.db.fetch_all(query, (segundos_por_punto, segundos_por_punto, desde)) or []
+
+        query = f"""
+            SELECT {punto} AS momento,
+                   ROUND(SUM(r.carros) / COUNT(DISTINCT r.hora), 1) AS carros,
+                   ROUND(SUM(r.motos) / COUNT(DISTINCT r.hora), 1) AS motos,
+                   ROUND(SUM(r.bicicletas) / COUNT(DISTINCT r.hora), 1) AS bicicletas
+            FROM rollup_ocupacion_hora r
+            WHERE r.hora >= %s
+            GROUP BY momento
+            ORDER BY momento
+        """
+        filas = self.db.fetch_all(query, (segundos_por_punto, segundos_por_punto, desde)) or []
+        return [
+            {"momento": fila["momento"], "grupo": grupo, "valor": fila[columna]}
+            for fila in filas
+            for grupo, columna in (("Carros", "carros"), ("Motos", "motos"), ("Bicicletas", "bicicletas"))
+        ]
+
+
+class SerieTendencia:
+    """
+    Series de tendencia en caché entre refrescos
+
+    La primera carga trae la ventana completa; las siguientes solo consultan
+    desde el último punto (que puede seguir acumulando muestras) y lo
+    reemplazan junto con los nuevos. Los puntos que salen de la ventana se
+    descartan.
+    """
+
+    def __init__(
+        self,
+        consultas: ConsultasRollups,
+        por: str = "tipo",
+        dias: int = DASHBOARD_TREND_DAYS,
+        puntos_max: int = DASHBOARD_TREND_POINTS,
+    ):
+        """
+        Args:
+            consultas: ConsultasRollups de la conexión de la UI
+            por: "sotano" o "tipo"
+            dias: Días mostrados
+            puntos_max: Puntos máximos por serie
+        """
+        self.consultas = consultas
+        self.por = por
+        self.ventana = timedelta(days=dias)
+        horas_por_punto = max(1, -(-dias * 24 // max(1, puntos_max)))
+        self.segundos_por_punto = horas_por_punto * 3600
+        self.series: Dict[str, List[Tuple[datetime, float]]] = {}
+        self._ultimo: Optional[datetime] = None
+
+    def actualizar(self, ahora: datetime = None) -> Dict[str, List[Tuple[datetime, float]]]:
+        """
+        Trae los puntos nuevos y retorna las series completas
+
+        Returns:
+            {grupo: [(momento, valor), ...]} en orden cronológico
+        """
+        inicio = (ahora or datetime.now()) - self.ventana
+        desde = self._ultimo if self._ultimo is not None and self._ultimo > inicio else inicio
+        filas = self.consultas.tendencia_ocupacion(desde, self.segundos_por_punto, self.por)
+
+        # El último punto en caché se vuelve a calcular: se reemplaza
+        ancho = timedelta(seconds=self.segundos_por_punto)
+        for grupo, puntos in self.series.items():
+            self.series[grupo] = [p for p in puntos if inicio - ancho < p[0] < desde]
+        for fila in filas:
+            valor = float(fila["valor"]) if fila["valor"] is not None else 0.0
+            self.series.setdefault(str(fila["grupo"]), []).append((fila["momento"], valor))
+            if self._ultimo is None or fila["momento"] > self._ultimo:
+                self._ultimo = fila["momento"]
+        return self.series
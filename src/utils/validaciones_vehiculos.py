@@ -33,6 +33,47 @@ class ValidadorVehiculos:
 
     def __init__(self, db_manager=None):
         self.db = db_manager
+        # {funcionario_id: tiene_parqueadero_exclusivo} precargado (importación masiva)
+        self._exclusivos = {}
+
+    def precargar_exclusivos(self, exclusivos: Dict[int, bool]):
+        """
+        Precarga la bandera de parqueadero exclusivo de varios funcionarios
+
+        Evita una consulta por validación cuando se validan muchos vehículos
+        seguidos (importación masiva).
+
+        Args:
+            exclusivos (Dict[int, bool]): {funcionario_id: tiene_parqueadero_exclusivo}
+        """
+        self._exclusivos.update(exclusivos)
+
+    def _tiene_parqueadero_exclusivo(self, funcionario_id: int = None) -> bool:
+        """
+        Indica si el funcionario (activo) tiene parqueadero exclusivo
+
+        Args:
+            funcionario_id (int): ID del funcionario
+
+        Returns:
+            bool: True si tiene parqueadero exclusivo
+        """
+        if not funcionario_id:
+            return False
+
+        if funcionario_id in self._exclusivos:
+            return self._exclusivos[funcionario_id]
+
+        if not self.db:
+            return False
+
+        query = """
+            SELECT tiene_parqueadero_exclusivo
+            FROM funcionarios
+            WHERE id = %s AND activo = TRUE
+        """
+        funcionario_data = self.db.fetch_one(query, (funcionario_id,), preparada=True)
+        return bool(funcionario_data and funcionario_data.get("tiene_parqueadero_exclusivo", False))
 
     def obtener_tipo_placa(self, placa: str) -> TipoCirculacion:
         """
@@ -82,19 +123,9 @@ class ValidadorVehiculos:
 
         # Verificar si es directivo con parqueadero exclusivo
         max_vehiculos = self.MAX_VEHICULOS_POR_FUNCIONARIO
-        if funcionario_id and self.db:
-            query = """
-                SELECT tiene_parqueadero_exclusivo
-                FROM funcionarios
-                WHERE id = %s AND activo = TRUE
-            """
-            funcionario_data = self.db.fetch_one(query, (funcionario_id,))
-            if funcionario_data:
-                tiene_exclusivo = funcionario_data.get("tiene_parqueadero_exclusivo", False)
-
-                # Si tiene parqueadero exclusivo, permite hasta 4 vehículos (sin restricción de cargo)
-                if tiene_exclusivo:
-                    max_vehiculos = self.MAX_VEHICULOS_DIRECTIVO_EXCLUSIVO
+        # Si tiene parqueadero exclusivo, permite hasta 4 vehículos (sin restricción de cargo)
+        if self._tiene_parqueadero_exclusivo(funcionario_id):
+            max_vehiculos = self.MAX_VEHICULOS_DIRECTIVO_EXCLUSIVO
 
         if total_actual >= max_vehiculos:
             return (
@@ -127,19 +158,9 @@ class ValidadorVehiculos:
             return False, mensaje
 
         # Verificar si tiene parqueadero exclusivo (exento de restricción PAR/IMPAR)
-        if funcionario_id and self.db:
-            query = """
-                SELECT tiene_parqueadero_exclusivo
-                FROM funcionarios
-                WHERE id = %s AND activo = TRUE
-            """
-            funcionario_data = self.db.fetch_one(query, (funcionario_id,))
-            if funcionario_data:
-                tiene_exclusivo = funcionario_data.get("tiene_parqueadero_exclusivo", False)
-
-                # Si tiene parqueadero exclusivo: NO validar PAR/IMPAR (sin restricción de cargo)
-                if tiene_exclusivo:
-                    return True, ""
+        # Si tiene parqueadero exclusivo: NO validar PAR/IMPAR (sin restricción de cargo)
+        if self._tiene_parqueadero_exclusivo(funcionario_id):
+            return True, ""
 
         carros_actuales = [v for v in vehiculos_actuales if v.get("tipo_vehiculo") == TipoVehiculo.CARRO.value]
 
@@ -196,20 +217,10 @@ class ValidadorVehiculos:
         # Verificar si es directivo con parqueadero exclusivo
         max_vehiculos = self.MAX_VEHICULOS_POR_FUNCIONARIO
         es_directivo_exclusivo = False
-        if funcionario_id and self.db:
-            query = """
-                SELECT tiene_parqueadero_exclusivo
-                FROM funcionarios
-                WHERE id = %s AND activo = TRUE
-            """
-            funcionario_data = self.db.fetch_one(query, (funcionario_id,))
-            if funcionario_data:
-                tiene_exclusivo = funcionario_data.get("tiene_parqueadero_exclusivo", False)
-
-                # Si tiene parqueadero exclusivo, permite hasta 4 vehículos (sin restricción de cargo)
-                if tiene_exclusivo:
-                    max_vehiculos = self.MAX_VEHICULOS_DIRECTIVO_EXCLUSIVO
-                    es_directivo_exclusivo = True
+        # Si tiene parqueadero exclusivo, permite hasta 4 vehículos (sin restricción de cargo)
+        if self._tiene_parqueadero_exclusivo(funcionario_id):
+            max_vehiculos = self.MAX_VEHICULOS_DIRECTIVO_EXCLUSIVO
+            es_directivo_exclusivo = True
 
         # Si ya tiene el máximo de vehículos, no puede agregar más
         if total_actual >= max_vehiculos:
@@ -317,6 +317,17 @@ def large_dataset_vehiculos():
     return vehiculos
 
 
+@pytest.fixture(scope="session")
+def datos_sinteticos():
+    """
+    Generador determinista de datos a escala pequeña (1.000 funcionarios, 200 espacios)
+    Ver src/database/datos_sinteticos.py y scripts/generar_datos_sinteticos.py
+    """
+    from src.database.datos_sinteticos import ESCALAS, GeneradorDatos
+
+    return GeneradorDatos(ESCALAS["pequena"], semilla=42, hasta=datetime(2024, 6, 1))
+
+
 # ============================================================
 # FIXTURES DE ENTORNO
 # ============================================================
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""Tests de Performance: Generador de datos sintéticos a escala"""
+
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from itertools import islice
+from unittest.mock import MagicMock
+
+import pytest
+
+
+class TestGeneradorDatos:
+    """Determinismo y distribuciones realistas"""
+
+    def test_misma_semilla_mismas_filas(self, datos_sinteticos):
+        from src.database.datos_sinteticos import GeneradorDatos
+
+        otro = GeneradorDatos(datos_sinteticos.escala, semilla=42, hasta=datos_sinteticos.hasta)
+        distinto = GeneradorDatos(datos_sinteticos.escala, semilla=7, hasta=datos_sinteticos.hasta)
+
+        for tabla in ("funcionarios", "vehiculos", "parqueaderos", "asignaciones"):
+            assert otro.filas(tabla) == datos_sinteticos.filas(tabla)
+        assert list(islice(otro.historial_accesos(), 500)) == list(islice(datos_sinteticos.historial_accesos(), 500))
+        assert distinto.vehiculos() != datos_sinteticos.vehiculos()
+
+    def test_vehiculos_respetan_reglas(self, datos_sinteticos):
+        exclusivos = {f[0] for f in datos_sinteticos.funcionarios() if f[11]}
+        vehiculos = datos_sinteticos.vehiculos()
+
+        placas = [v[3] for v in vehiculos if v[3]]
+        assert len(placas) == len(set(placas))
+
+        carros = Counter(v[1] for v in vehiculos if v[2] == "Carro")
+        assert all(n <= (4 if f in exclusivos else 2) for f, n in carros.items())
+
+        for _, _, tipo, placa, ultimo, circulacion in vehiculos:
+            if tipo == "Carro":
+                assert circulacion == ("IMPAR" if ultimo in "12345" else "PAR")
+            else:
+                assert circulacion == "N/A"
+        assert {v[5] for v in vehiculos} == {"PAR", "IMPAR", "N/A"}
+
+    def test_asignaciones_sin_sobrecupo(self, datos_sinteticos):
+        tipos_espacio = {p[0]: p[2] for p in datos_sinteticos.parqueaderos()}
+        asignaciones = datos_sinteticos.asignaciones()
+
+        activas = Counter(a[2] for a in asignaciones if a[5])
+        assert activas and max(activas.values()) == 1
+
+        activas_por_espacio = Counter(a[1] for a in asignaciones if a[5])
+        por_espacio = defaultdict(list)
+        for _, parqueadero_id, _, inicio, fin, _ in asignaciones:
+            por_espacio[parqueadero_id].append((inicio, fin or datetime.max))
+        for parqueadero_id, intervalos in por_espacio.items():
+            # Un directivo exclusivo puede tener hasta 4 carros activos en su espacio
+            capacidad = 2 if tipos_espacio[parqueadero_id] == "Carro" else 1
+            capacidad = max(capacidad, activas_por_espacio[parqueadero_id])
+            for inicio, _ in intervalos:
+                simultaneas = sum(1 for i, f in intervalos if i <= inicio < f)
+                assert simultaneas <= capacidad
+
+    def test_vehiculo_sin_intervalos_superpuestos(self, datos_sinteticos):
+        """Un vehículo nunca está en dos espacios a la vez"""
+        por_vehiculo = defaultdict(list)
+        for _, _, vehiculo_id, inicio, fin, _ in datos_sinteticos.asignaciones():
+            por_vehiculo[vehiculo_id].append((inicio, fin or datetime.max))
+
+        assert any(len(intervalos) > 1 for intervalos in por_vehiculo.values())
+        for intervalos in por_vehiculo.values():
+            intervalos.sort()
+            for (_, fin), (siguiente, _) in zip(intervalos, intervalos[1:]):
+                assert fin <= siguiente
+
+    def test_asignaciones_activas_cumplen_reglas(self, datos_sinteticos):
+        """Las asignaciones activas pasan InstantaneaOcupacion.validar una por una"""
+        from src.utils.motor_elegibilidad import InstantaneaOcupacion, PerfilVehiculo
+
+        funcionarios = {f[0]: f for f in datos_sinteticos.funcionarios()}
+        vehiculos = {v[0]: v for v in datos_sinteticos.vehiculos()}
+        ocupacion = InstantaneaOcupacion.desde_filas(
+            {"id": p[0], "numero_parqueadero": p[1], "tipo_espacio": p[2], "sotano": p[3]}
+            for p in datos_sinteticos.parqueaderos()
+        )
+        no_comparten = set()
+        for _, parqueadero_id, vehiculo_id, _, _, activo in datos_sinteticos.asignaciones():
+            if not activo:
+                continue
+            _, funcionario_id, tipo, _, _, circulacion = vehiculos[vehiculo_id]
+            funcionario = funcionarios[funcionario_id]
+            perfil = PerfilVehiculo.desde_fila({
+                "id": vehiculo_id,
+                "funcionario_id": funcionario_id,
+                "tipo_vehiculo": tipo,
+                "tipo_circulacion": circulacion,
+                "pico_placa_solidario": funcionario[9],
+                "discapacidad": funcionario[10],
+                "tiene_parqueadero_exclusivo": funcionario[11],
+                "tiene_carro_hibrido": funcionario[12],
+            })
+            assert ocupacion.validar(perfil, parqueadero_id) == (True, "")
+            ocupacion.registrar_asignacion(perfil, parqueadero_id)
+            if perfil.comparte and not funcionario[8]:
+                no_comparten.add(parqueadero_id)
+
+        assert no_comparten
+        assert all(ocupacion.espacio(p).total == 1 for p in no_comparten)
+
+    def test_historial_cronologico_y_con_pico_y_placa(self, datos_sinteticos):
+        from src.database.datos_sinteticos import restringido_por_pico_placa
+
+        vehiculos = {v[0]: v for v in datos_sinteticos.vehiculos()}
+        exentos = {f[0] for f in datos_sinteticos.funcionarios() if f[10] or f[11] or f[12]}
+        eventos = list(datos_sinteticos.historial_accesos())
+
+        assert len(eventos) > 1000
+        assert [e[3] for e in eventos] == sorted(e[3] for e in eventos)
+        for vehiculo_id, _, _, fecha_hora in eventos:
+            _, funcionario_id, _, _, _, circulacion = vehiculos[vehiculo_id]
+            if funcionario_id not in exentos:
+                assert not restringido_por_pico_placa(circulacion, fecha_hora.date())
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestEscalaMedia:
+    """Las consultas en memoria deben sostenerse a escala realista"""
+
+    def test_generacion_escala_media(self):
+        """10.000 funcionarios con 180 días de historial en menos de 15 s"""
+        from src.database.datos_sinteticos import ESCALAS, GeneradorDatos
+
+        inicio = time.perf_counter()
+        generador = GeneradorDatos(ESCALAS["media"], hasta=datetime(2024, 6, 1))
+        eventos = sum(1 for _ in generador.historial_accesos())
+        elapsed = time.perf_counter() - inicio
+
+        assert len(generador.funcionarios()) == 10_000
+        assert eventos > 100_000
+        assert elapsed < 15, f"Generación demasiado lenta: {elapsed:.1f}s"
+
+    def test_serie_de_ocupacion_sobre_intervalos_reales(self):
+        """Serie horaria de 180 días sobre todas las asignaciones en menos de 1 s"""
+        from src.database.datos_sinteticos import ESCALAS, GeneradorDatos
+        from src.utils.intervalos_ocupacion import IndiceIntervalos, momentos
+
+        generador = GeneradorDatos(ESCALAS["media"], hasta=datetime(2024, 6, 1))
+        tipos = {v[0]: v[2] for v in generador.vehiculos()}
+        intervalos = [(a[3], a[4], a[1], tipos[a[2]]) for a in generador.asignaciones()]
+
+        inicio = time.perf_counter()
+        serie = IndiceIntervalos(intervalos).serie(momentos(generador.desde, generador.hasta, timedelta(hours=1)))
+        elapsed = time.perf_counter() - inicio
+
+        activas = sum(1 for a in generador.asignaciones() if a[5])
+        assert serie[-1]["vehiculos"] == activas
+        assert elapsed < 1, f"Serie demasiado lenta: {elapsed:.2f}s"
+
+
+class TestCargadorDatos:
+    """Carga por lotes multi-fila"""
+
+    def test_no_carga_sobre_una_base_con_datos(self, datos_sinteticos):
+        from src.database.datos_sinteticos import CargadorDatos
+
+        db = MagicMock()
+        db.fetch_one.return_value = {"total": 5}
+
+        exito, mensaje = CargadorDatos(db).preparar(datos_sinteticos)
+
+        assert exito is False and "vaciar" in mensaje
+        db.execute_query.assert_not_called()
+
+    def test_carga_en_lotes(self, datos_sinteticos):
+        from src.database.datos_sinteticos import COLUMNAS, CargadorDatos
+
+        db = MagicMock()
+        db.execute_many.return_value = (True, "")
+        db.execute_query.return_value = (True, "")
+
+        resumen = CargadorDatos(db, tamano_lote=500).cargar(datos_sinteticos)
+
+        assert resumen["funcionarios"]["filas"] == 1000
+        lotes_funcionarios = [c for c in db.execute_many.call_args_list if "INSERT INTO funcionarios" in c[0][0]]
+        assert [len(c[0][1]) for c in lotes_funcionarios] == [500, 500]
+        assert all(len(fila) == len(COLUMNAS["funcionarios"]) for c in lotes_funcionarios for fila in c[0][1])
+        assert resumen["historial_accesos"]["filas"] == sum(1 for _ in datos_sinteticos.historial_accesos())
+
+        # ANALYZE TABLE devuelve filas: se lee con fetch_all, no con execute_query
+        assert "ANALYZE TABLE" in db.fetch_all.call_args[0][0]
+        assert not any("ANALYZE" in c[0][0] for c in db.execute_query.call_args_list)
+
+    def test_analyze_con_error_se_informa(self):
+        from src.database.datos_sinteticos import CargadorDatos
+
+        db = MagicMock()
+        db.fetch_all.return_value = [
+            {"Table": "pruebas.funcionarios", "Op": "analyze", "Msg_type": "status", "Msg_text": "OK"},
+            {"Table": "pruebas.vehiculos", "Op": "analyze", "Msg_type": "error", "Msg_text": "Table is locked"},
+        ]
+        assert CargadorDatos(db)._analizar() is False
+
+        db.fetch_all.return_value = []
+        assert CargadorDatos(db)._analizar() is False
+
+        db.fetch_all.return_value = [{"Table": "pruebas.funcionarios", "Op": "analyze", "Msg_type": "status", "Msg_text": "OK"}]
+        assert CargadorDatos(db)._analizar() is True
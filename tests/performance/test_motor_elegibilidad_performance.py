@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Tests de Performance: Motor de elegibilidad"""
+
+import time
+
+import pytest
+
+
+@pytest.mark.performance
+class TestPerformanceElegibilidad:
+    """Consultas de elegibilidad sobre una instantánea grande"""
+
+    def test_candidatos_1000_espacios(self):
+        """Listar los espacios elegibles de 1000 parqueaderos debe tomar menos de 1ms"""
+        from src.utils.motor_elegibilidad import InstantaneaOcupacion, PerfilVehiculo
+
+        sotanos = ["Sótano-1", "Sótano-2", "Sótano-3"]
+        parqueaderos = [
+            {"id": i, "numero_parqueadero": i, "tipo_espacio": "Carro", "sotano": sotanos[i % 3]}
+            for i in range(1, 1001)
+        ]
+        # La mitad de los espacios con un carro regular (PAR o IMPAR alternado)
+        ocupantes = [
+            {
+                "parqueadero_id": i,
+                "vehiculo_id": i,
+                "funcionario_id": i,
+                "tipo_vehiculo": "Carro",
+                "tipo_circulacion": "PAR" if i % 4 else "IMPAR",
+            }
+            for i in range(1, 1001, 2)
+        ]
+        ocupacion = InstantaneaOcupacion.desde_filas(parqueaderos, ocupantes)
+        perfil = PerfilVehiculo.desde_fila(
+            {"id": 5000, "funcionario_id": 5000, "tipo_vehiculo": "Carro", "tipo_circulacion": "IMPAR"}
+        )
+
+        repeticiones = 200
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            espacios = ocupacion.candidatos(perfil, "Sótano-2")
+        elapsed = (time.perf_counter() - inicio) * 1000 / repeticiones
+
+        assert espacios
+        assert elapsed < 1, f"Consulta de elegibilidad demasiado lenta: {elapsed:.3f}ms"
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Tests de Performance: Tiempo de importación en frío (python -X importtime)"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from tests.conftest import PROJECT_ROOT
+
+# Librerías que solo deben cargarse al exportar/importar archivos
+DEPENDENCIAS_PESADAS = {"pandas", "numpy", "openpyxl", "reportlab", "matplotlib"}
+
+# Presupuesto de importación en frío (ms); ajustable para equipos lentos
+PRESUPUESTO_MS = int(os.environ.get("PARKING_IMPORT_BUDGET_MS", "1000"))
+
+
+def _importtime(modulo: str) -> dict:
+    """Importa el módulo en un proceso nuevo y devuelve {módulo: acumulado_us}"""
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    tiempos = {}
+    for linea in salida.stderr.splitlines():
+        if not linea.startswith("import time:") or "[us]" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        tiempos[nombre.strip()] = int(acumulado)
+    return tiempos
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestTiempoArranque:
+    """El arranque no debe pagar el costo de las dependencias opcionales"""
+
+    @pytest.mark.parametrize(
+        "modulo",
+        ["scripts.main_modular", "src.ui.reportes_tab", "src.ui.funcionarios_tab", "src.ui.vehiculos_tab"],
+    )
+    def test_sin_dependencias_pesadas(self, modulo):
+        """Importar la ventana o una pestaña no carga pandas, openpyxl, reportlab ni matplotlib"""
+        cargadas = {nombre.split(".")[0] for nombre in _importtime(modulo)}
+
+        assert not cargadas & DEPENDENCIAS_PESADAS, f"{modulo} importa {sorted(cargadas & DEPENDENCIAS_PESADAS)}"
+
+    def test_presupuesto_importacion_ventana(self):
+        """La importación en frío de la ventana principal se mantiene dentro del presupuesto"""
+        tiempos = _importtime("scripts.main_modular")
+        total_ms = tiempos["scripts.main_modular"] / 1000
+
+        assert total_ms < PRESUPUESTO_MS, f"Importación en frío: {total_ms:.0f}ms (presupuesto {PRESUPUESTO_MS}ms)"
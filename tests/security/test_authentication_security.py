@@ -46,6 +46,52 @@ class TestPasswordSecurity:
         assert not AuthManager.verify_password(wrong_password, hashed)
 
 
+class TestBcryptCost:
+    """Tests del costo configurable de bcrypt (BCRYPT_ROUNDS)"""
+
+    def test_hash_usa_costo_configurado(self):
+        """El hash se genera con BCRYPT_ROUNDS"""
+        from src.auth.auth_manager import AuthManager
+
+        with patch("src.auth.auth_manager.BCRYPT_ROUNDS", 4):
+            hashed = AuthManager.hash_password("clave")
+
+        assert hashed.startswith(b"$2b$04$")
+
+    def test_needs_rehash(self):
+        """Detecta hashes con un costo distinto al configurado"""
+        from src.auth.auth_manager import AuthManager
+
+        hashed = bcrypt.hashpw(b"clave", bcrypt.gensalt(rounds=4))
+
+        assert AuthManager.needs_rehash(hashed, rounds=5)
+        assert not AuthManager.needs_rehash(hashed.decode(), rounds=4)
+        assert not AuthManager.needs_rehash("no-es-bcrypt", rounds=4)
+
+    def test_login_rehash_transparente(self, mock_db_manager):
+        """Un login exitoso con costo desactualizado guarda un hash nuevo"""
+        from src.auth.auth_manager import AuthManager
+
+        mock_db_manager.fetch_one.return_value = {
+            "id": 7,
+            "username": "admin",
+            "password_hash": bcrypt.hashpw(b"clave", bcrypt.gensalt(rounds=4)).decode(),
+            "rol": "admin",
+            "activo": True,
+        }
+        mock_db_manager.execute_query.return_value = (True, "")
+
+        auth = AuthManager()
+        with patch("src.auth.auth_manager.BCRYPT_ROUNDS", 5):
+            success, _ = auth.authenticate("admin", "clave", db=mock_db_manager)
+
+        assert success is True
+        updates = [c.args for c in mock_db_manager.execute_query.call_args_list if "password_hash" in c.args[0]]
+        assert len(updates) == 1
+        assert updates[0][1][0].startswith("$2b$05$")
+        assert bcrypt.checkpw(b"clave", updates[0][1][0].encode())
+
+
 class TestBruteForceProtection:
     """Tests de protección contra fuerza bruta"""
 
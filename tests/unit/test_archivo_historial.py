@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Archivo por lotes y particiones del historial"""
+
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+
+def _db(tablas=("historial_accesos_archivo", "asignaciones_archivo", "rollup_marcas")):
+    """Conexión falsa con las tablas opcionales indicadas"""
+    db = MagicMock()
+    db.ensure_connection.return_value = True
+
+    def fetch_one(query, params=None):
+        if query.startswith("SHOW TABLES"):
+            return {"tabla": query} if any(f"'{t}'" in query for t in tablas) else None
+        if "rollup_marcas" in query:
+            return {"ultimo_id": 500}
+        return None
+
+    db.fetch_one.side_effect = fetch_one
+    db.fetch_all.return_value = [
+        {"Field": "id", "Extra": "auto_increment"},
+        {"Field": "fecha_hora", "Extra": ""},
+        {"Field": "vehiculo_activo", "Extra": "VIRTUAL GENERATED"},
+    ]
+    return db
+
+
+class TestArchivador:
+    """Lotes con copia y borrado en la misma transacción"""
+
+    def test_mueve_lote_acotado_por_la_marca_de_rollups(self):
+        from src.database.archivo_historial import ArchivadorHistorial
+        from src.database.version_datos import version_archivo, version_datos
+
+        db = _db()
+        db.cursor.fetchall.side_effect = [[{"id": 1}, {"id": 2}], []]
+        antes, global_antes = version_archivo.actual(), version_datos.actual()
+        corte = datetime(2024, 1, 1)
+
+        assert ArchivadorHistorial(db, tamano_lote=2, dormir=MagicMock()).archivar("accesos", corte) == 2
+
+        llamadas = db.cursor.execute.call_args_list
+        assert "id <= %s" in llamadas[0][0][0] and "FOR UPDATE" in llamadas[0][0][0]
+        assert llamadas[0][0][1] == (corte, 500, 2)
+        assert "INSERT INTO historial_accesos_archivo (id, fecha_hora) SELECT id, fecha_hora" in llamadas[1][0][0]
+        assert llamadas[1][0][1] == (1, 2)
+        assert "DELETE FROM historial_accesos" in llamadas[2][0][0]
+        assert llamadas[2][0][1] == (1, 2, corte, 500)
+        db.connection.commit.assert_called_once()
+        assert version_archivo.actual() == antes + 1
+        assert version_datos.actual() == global_antes
+
+    def test_pausa_entre_lotes_completos(self):
+        from src.database.archivo_historial import ArchivadorHistorial
+
+        archivador = ArchivadorHistorial(_db(), tamano_lote=10, pausa_ms=250, dormir=MagicMock())
+        archivador._mover_lote = MagicMock(side_effect=[10, 10, 4])
+
+        assert archivador.archivar("asignaciones", datetime(2024, 1, 1)) == 24
+        assert archivador.dormir.call_count == 2
+        archivador.dormir.assert_called_with(0.25)
+
+    def test_sin_tabla_de_archivo_no_hace_nada(self):
+        from src.database.archivo_historial import ArchivadorHistorial
+
+        db = _db(tablas=())
+        assert ArchivadorHistorial(db).archivar("accesos", datetime(2024, 1, 1)) == 0
+        db.cursor.execute.assert_not_called()
+
+    def test_error_revierte_el_lote(self):
+        from mysql.connector import Error
+
+        from src.database.archivo_historial import ArchivadorHistorial
+
+        db = _db()
+        db.cursor.fetchall.return_value = [{"id": 7}]
+        db.cursor.execute.side_effect = [None, None, Error("lock wait timeout")]
+
+        assert ArchivadorHistorial(db, dormir=MagicMock()).archivar("asignaciones", datetime(2024, 1, 1)) == 0
+        db.connection.rollback.assert_called_once()
+        db.connection.commit.assert_not_called()
+
+
+class TestParticiones:
+    """Mantenimiento de particiones mensuales"""
+
+    def test_crea_meses_faltantes_desde_pmax(self):
+        from src.database.archivo_historial import ArchivadorHistorial
+
+        db = _db()
+        db.fetch_all.return_value = [
+            {"nombre": "p202610", "limite": datetime(2026, 11, 1), "filas": 10},
+            {"nombre": "pmax", "limite": None, "filas": 0},
+        ]
+        db.execute_query.return_value = (True, "")
+
+        creadas = ArchivadorHistorial(db).mantener_particiones(meses_adelante=1, hoy=date(2026, 11, 15))
+
+        assert creadas == ["p202611", "p202612"]
+        sentencia = db.execute_query.call_args_list[0][0][0]
+        assert "REORGANIZE PARTITION pmax" in sentencia
+        assert "UNIX_TIMESTAMP('2026-12-01 00:00:00')" in sentencia
+
+    def test_elimina_solo_particiones_antiguas_vacias(self):
+        from src.database.archivo_historial import ArchivadorHistorial
+
+        db = _db()
+        db.fetch_all.return_value = [
+            {"nombre": "p_anteriores", "limite": datetime(2026, 1, 1), "filas": 0},
+            {"nombre": "p202601", "limite": datetime(2026, 2, 1), "filas": 0},
+            {"nombre": "p202602", "limite": datetime(2026, 3, 1), "filas": 5},
+            {"nombre": "pmax", "limite": None, "filas": 0},
+        ]
+        db.fetch_one.side_effect = lambda query, params=None: {"hay": 1} if "p202601" in query else None
+        db.execute_query.return_value = (True, "")
+
+        eliminadas = ArchivadorHistorial(db).eliminar_particiones_vacias(datetime(2026, 6, 1))
+
+        assert eliminadas == ["p_anteriores"]
+        db.execute_query.assert_called_once_with("ALTER TABLE historial_accesos DROP PARTITION p_anteriores")
+
+
+class TestHistorialUnificado:
+    """Consultas sobre tablas activas y de archivo"""
+
+    def test_accesos_une_archivo(self):
+        from src.database.archivo_historial import HistorialUnificado
+
+        db = _db()
+        HistorialUnificado(db).accesos(vehiculo_id=3, limite=50)
+
+        query, params = db.fetch_all.call_args[0]
+        assert "UNION ALL" in query and "historial_accesos_archivo" in query
+        assert params == (3, 50, 3, 50, 50)
+
+    def test_historial_de_parqueadero_incluye_archivo(self):
+        from src.models.parqueadero import ParqueaderoModel
+
+        db = _db()
+        db.fetch_all.return_value = []
+        ParqueaderoModel(db).obtener_historial(7, 20)
+
+        query, params = db.fetch_all.call_args[0]
+        assert "FROM asignaciones a" in query and "FROM asignaciones_archivo a" in query
+        assert params == (7, 20, 7, 20, 20)
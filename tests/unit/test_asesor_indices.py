@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Asesor de índices basado en EXPLAIN"""
+
+import json
+
+PLAN_FUNCIONARIOS = {
+    "query_block": {
+        "select_id": 1,
+        "ordering_operation": {
+            "using_filesort": True,
+            "grouping_operation": {
+                "nested_loop": [
+                    {"table": {"table_name": "f", "access_type": "ALL", "rows_examined_per_scan": 5000}},
+                    {"table": {"table_name": "v", "access_type": "ref", "rows_examined_per_scan": 1}},
+                ]
+            },
+        },
+    }
+}
+
+PLAN_CON_INDICE = {
+    "query_block": {
+        "select_id": 1,
+        "ordering_operation": {
+            "using_filesort": False,
+            "table": {"table_name": "f", "access_type": "ref", "key": "idx_activo_apellidos_nombre"},
+        },
+    }
+}
+
+
+class TestHallazgosPlan:
+    """Lectura del plan JSON"""
+
+    def test_detecta_escaneo_completo_y_filesort(self):
+        from src.database.asesor_indices import ESCANEO_COMPLETO, FILESORT, hallazgos_plan
+
+        hallazgos = hallazgos_plan(PLAN_FUNCIONARIOS)
+
+        assert (FILESORT, "f", 5000) in hallazgos
+        assert (ESCANEO_COMPLETO, "f", 5000) in hallazgos
+        assert len(hallazgos) == 2
+
+    def test_plan_con_indice_no_tiene_hallazgos(self):
+        from src.database.asesor_indices import hallazgos_plan
+
+        assert hallazgos_plan(PLAN_CON_INDICE) == []
+
+    def test_tablas_pequenas_y_derivadas_se_omiten(self):
+        from src.database.asesor_indices import hallazgos_plan
+
+        plan = {
+            "query_block": {
+                "nested_loop": [
+                    {"table": {"table_name": "p", "access_type": "ALL", "rows": 20}},
+                    {"table": {"table_name": "<derived2>", "access_type": "ALL", "rows": 900}},
+                ]
+            }
+        }
+
+        assert hallazgos_plan(plan) == []
+        assert hallazgos_plan(plan, min_filas=10) == [("escaneo_completo", "p", 20)]
+
+
+class TestCapturaConsultas:
+    """Catálogo de consultas ejecutadas por la aplicación"""
+
+    def test_captura_selects_por_huella_y_restaura(self, mock_db_manager):
+        from src.database.asesor_indices import CapturaConsultas
+
+        original = mock_db_manager.fetch_all
+        with CapturaConsultas(mock_db_manager) as captura:
+            mock_db_manager.fetch_all("SELECT * FROM vehiculos WHERE id = %s", (1,))
+            mock_db_manager.fetch_all("SELECT * FROM vehiculos WHERE id = %s", (2,))
+            mock_db_manager.fetch_one("SHOW COLUMNS FROM parqueaderos LIKE 'sotano'")
+
+        consultas = captura.consultas()
+        assert len(consultas) == 1
+        assert consultas[0].params == (1,)
+        assert "test_asesor_indices.py" in consultas[0].origen
+        # Las consultas se ejecutan normalmente y los métodos quedan restaurados
+        assert original.call_count == 2
+        assert mock_db_manager.fetch_all is original
+
+    def test_analizar_y_linea_base(self, mock_db_manager, tmp_path):
+        from src.database.asesor_indices import (
+            ConsultaCapturada,
+            analizar,
+            cargar_linea_base,
+            guardar_linea_base,
+        )
+
+        planes = {"f": PLAN_FUNCIONARIOS, "p": PLAN_CON_INDICE}
+        mock_db_manager.fetch_one.side_effect = lambda query, params=None: (
+            {"EXPLAIN": json.dumps(planes["f" if "funcionarios" in query else "p"])}
+            if "desconocida" not in query
+            else None
+        )
+        consultas = [
+            ConsultaCapturada("SELECT * FROM funcionarios ORDER BY apellidos", None, "a.py:1 f"),
+            ConsultaCapturada("SELECT * FROM parqueaderos", None, "b.py:2 g"),
+            ConsultaCapturada("SELECT * FROM tabla_desconocida", None, "c.py:3 h"),
+        ]
+
+        hallazgos, errores = analizar(mock_db_manager, consultas)
+
+        assert {h.tipo for h in hallazgos} == {"escaneo_completo", "filesort"}
+        assert [c.origen for c in errores] == ["c.py:3 h"]
+        assert mock_db_manager.fetch_one.call_args_list[0][0][0].startswith("EXPLAIN FORMAT=JSON SELECT")
+
+        ruta = str(tmp_path / "linea_base.json")
+        assert cargar_linea_base(ruta) == set()
+        guardar_linea_base(ruta, hallazgos)
+        assert cargar_linea_base(ruta) == {h.clave for h in hallazgos}
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Asignación automática de parqueaderos"""
+
+
+def _vehiculo(vehiculo_id, funcionario_id, circulacion="PAR", **flags):
+    fila = {
+        "id": vehiculo_id,
+        "funcionario_id": funcionario_id,
+        "tipo_vehiculo": "Carro",
+        "tipo_circulacion": circulacion,
+    }
+    fila.update(flags)
+    return fila
+
+
+def _ocupacion(libres_por_sotano, ocupantes=()):
+    """Instantánea con espacios de carro numerados consecutivamente por sótano"""
+    from src.utils.motor_elegibilidad import InstantaneaOcupacion
+
+    parqueaderos, numero = [], 0
+    for sotano, cantidad in libres_por_sotano.items():
+        for _ in range(cantidad):
+            numero += 1
+            parqueaderos.append({"id": numero, "numero_parqueadero": numero, "tipo_espacio": "Carro", "sotano": sotano})
+    return InstantaneaOcupacion.desde_filas(parqueaderos, ocupantes)
+
+
+def _destinos(plan):
+    return {fila["id"]: espacio.id for fila, espacio in plan.asignaciones}
+
+
+class TestPlanificador:
+    """Tests del cálculo del plan"""
+
+    def test_parejas_par_impar_comparten_espacio(self):
+        """Dos PAR y dos IMPAR ocupan solo dos espacios libres"""
+        from src.utils.asignacion_automatica import PlanificadorAsignacion
+
+        vehiculos = [_vehiculo(1, 1, "PAR"), _vehiculo(2, 2, "PAR"), _vehiculo(3, 3, "IMPAR"), _vehiculo(4, 4, "IMPAR")]
+        plan = PlanificadorAsignacion(_ocupacion({"Sótano-1": 3})).planificar(vehiculos)
+
+        assert plan.espacios_libres_usados == 2
+        assert not plan.sin_asignar
+        destinos = _destinos(plan)
+        assert destinos[1] == destinos[3] and destinos[2] == destinos[4]
+
+    def test_par_rechazado_no_arrastra_al_impar(self):
+        """Si el espacio del PAR es rechazado, el IMPAR no se ubica ahí: pasa a los sin pareja"""
+        from src.utils.asignacion_automatica import PlanificadorAsignacion
+
+        ocupacion = _ocupacion({"Sótano-1": 2})
+        validar = ocupacion.validar
+        ocupacion.validar = lambda perfil, parqueadero_id: (
+            (False, "rechazado") if parqueadero_id == 1 else validar(perfil, parqueadero_id)
+        )
+        plan = PlanificadorAsignacion(ocupacion).planificar([_vehiculo(1, 1, "PAR"), _vehiculo(2, 2, "IMPAR")])
+
+        # Ambos quedan sin asignar (el índice sigue ofreciendo el espacio 1) y ninguno se pierde del plan
+        assert sorted(fila["id"] for fila, _ in plan.sin_asignar) == [1, 2]
+        assert plan.asignaciones == []
+
+    def test_completa_espacios_existentes_antes_de_usar_libres(self):
+        """Un IMPAR completa el espacio que ya tiene un PAR regular"""
+        from src.utils.asignacion_automatica import PlanificadorAsignacion
+
+        ocupantes = [dict(_vehiculo(90, 90, "PAR"), parqueadero_id=2)]
+        plan = PlanificadorAsignacion(_ocupacion({"Sótano-1": 2}, ocupantes)).planificar([_vehiculo(1, 1, "IMPAR")])
+
+        assert _destinos(plan) == {1: 2}
+        assert plan.espacios_libres_usados == 0
+
+    def test_excepciones_no_comparten(self):
+        """Solidario, discapacidad e híbrido ocupan un espacio cada uno; nadie se suma"""
+        from src.utils.asignacion_automatica import PlanificadorAsignacion
+
+        vehiculos = [
+            _vehiculo(1, 1, "PAR", pico_placa_solidario=True),
+            _vehiculo(2, 2, "IMPAR", discapacidad=True),
+            _vehiculo(3, 3, "HÍBRIDO"),
+            _vehiculo(4, 4, "IMPAR"),
+        ]
+        plan = PlanificadorAsignacion(_ocupacion({"Sótano-1": 4})).planificar(vehiculos)
+
+        assert len(set(_destinos(plan).values())) == 4
+
+    def test_discapacidad_tiene_prioridad_en_sotano_preferido(self):
+        """Con un único espacio en el sótano preferido, lo recibe el funcionario con discapacidad"""
+        from src.utils.asignacion_automatica import PlanificadorAsignacion
+
+        ocupacion = _ocupacion({"Sótano-1": 1, "Sótano-2": 1})
+        vehiculos = [_vehiculo(1, 1, "PAR", pico_placa_solidario=True), _vehiculo(2, 2, "IMPAR", discapacidad=True)]
+        plan = PlanificadorAsignacion(ocupacion, ["Sótano-1", "Sótano-2"]).planificar(vehiculos)
+
+        assert _destinos(plan) == {2: 1, 1: 2}
+
+    def test_directivo_exclusivo_agrupa_sus_vehiculos(self):
+        """Los vehículos del directivo van a su propio espacio hasta 4"""
+        from src.utils.asignacion_automatica import PlanificadorAsignacion
+
+        vehiculos = [_vehiculo(i, 50, "PAR" if i % 2 else "IMPAR", tiene_parqueadero_exclusivo=True) for i in range(1, 6)]
+        plan = PlanificadorAsignacion(_ocupacion({"Sótano-1": 3})).planificar(vehiculos)
+
+        destinos = _destinos(plan)
+        assert len(destinos) == 5
+        assert sorted(list(destinos.values()).count(e) for e in set(destinos.values())) == [1, 4]
+
+    def test_sin_espacio_y_sotanos_excluidos(self):
+        """Los sótanos no seleccionados no se usan; lo que no cabe queda reportado"""
+        from src.utils.asignacion_automatica import MOTIVO_SIN_ESPACIO, PlanificadorAsignacion
+
+        ocupacion = _ocupacion({"Sótano-1": 1, "Sótano-2": 5})
+        vehiculos = [_vehiculo(1, 1, "PAR"), _vehiculo(2, 2, "PAR")]
+        plan = PlanificadorAsignacion(ocupacion, ["Sótano-1"]).planificar(vehiculos)
+
+        assert _destinos(plan) == {1: 1}
+        assert [(f["id"], motivo) for f, motivo in plan.sin_asignar] == [(2, MOTIVO_SIN_ESPACIO)]
+        assert plan.pares() == [(1, 1)]
+
+    def test_plan_respeta_el_motor_de_elegibilidad(self):
+        """Cada asignación del plan es válida sobre la ocupación original"""
+        from src.utils.asignacion_automatica import PlanificadorAsignacion
+        from src.utils.motor_elegibilidad import PerfilVehiculo
+
+        vehiculos = [_vehiculo(i, i, ("PAR", "IMPAR", "HÍBRIDO")[i % 3], discapacidad=(i % 7 == 0)) for i in range(1, 40)]
+        plan = PlanificadorAsignacion(_ocupacion({"Sótano-1": 10, "Sótano-2": 10})).planificar(vehiculos)
+
+        revision = _ocupacion({"Sótano-1": 10, "Sótano-2": 10})
+        for fila, espacio in plan.asignaciones:
+            perfil = PerfilVehiculo.desde_fila(fila)
+            assert revision.validar(perfil, espacio.id) == (True, "")
+            revision.registrar_asignacion(perfil, espacio.id)
+        assert len(plan.asignaciones) + len(plan.sin_asignar) == len(vehiculos)
+
+
+class TestObtenerSinAsignar:
+    """VehiculoModel.obtener_sin_asignar alimenta al planificador"""
+
+    def test_filtro_de_circulacion_parametrizado(self, mock_db_manager):
+        """El filtro se pasa como parámetro e incluye las excepciones del funcionario"""
+        from src.models.vehiculo import VehiculoModel
+
+        VehiculoModel(mock_db_manager).obtener_sin_asignar("PAR")
+
+        query, params = mock_db_manager.fetch_all.call_args[0]
+        assert "'PAR'" not in query
+        assert params == ("PAR",)
+        assert "tiene_parqueadero_exclusivo" in query
+
+
+class TestAsignarMasivo:
+    """ParqueaderoModel.asignar_masivo revalida el plan antes de guardarlo"""
+
+    def _db(self, ocupantes=(), vehiculos=()):
+        from unittest.mock import MagicMock
+
+        db = MagicMock()
+        db.ensure_connection.return_value = True
+        parqueaderos = [
+            {"id": i, "numero_parqueadero": i, "tipo_espacio": "Carro", "sotano": "Sótano-1"} for i in (1, 2)
+        ]
+        # InstantaneaOcupacion.cargar: parqueaderos y ocupantes vigentes
+        db.fetch_all.side_effect = [parqueaderos, list(ocupantes)]
+        # Cursor: filas bloqueadas y vehículos del plan
+        db.cursor.fetchall.side_effect = [[{"id": 1}, {"id": 2}], [dict(v, asignado_en=None) for v in vehiculos]]
+        return db
+
+    def test_bloquea_revalida_y_usa_el_procedimiento(self):
+        """Un espacio ocupado por otro operador tras planificar se rechaza sin llamar al SP"""
+        from src.models.parqueadero import ParqueaderoModel
+
+        # Desde que se calculó el plan, el espacio 1 recibió un PAR y un IMPAR
+        ocupantes = [dict(_vehiculo(90, 90, "PAR"), parqueadero_id=1), dict(_vehiculo(91, 91, "IMPAR"), parqueadero_id=1)]
+        db = self._db(ocupantes, [_vehiculo(1, 1, "PAR"), _vehiculo(2, 2, "IMPAR")])
+
+        exito, error, rechazados = ParqueaderoModel(db).asignar_masivo([(1, 1), (2, 2)])
+
+        assert (exito, error) == (True, "")
+        assert list(rechazados) == [1]
+        assert "FOR UPDATE" in db.cursor.execute.call_args_list[0][0][0]
+        db.cursor.callproc.assert_called_once_with("sp_asignar_vehiculo", (2, 2))
+        db.connection.commit.assert_called()
+        db.connection.rollback.assert_not_called()
+
+    def test_rechazo_del_procedimiento_solo_omite_ese_par(self):
+        """Un SIGNAL de sp_asignar_vehiculo se reporta y el resto del plan se confirma"""
+        from mysql.connector import Error
+
+        from src.models.parqueadero import ParqueaderoModel
+
+        db = self._db(vehiculos=[_vehiculo(1, 1, "PAR"), _vehiculo(2, 2, "IMPAR")])
+        db.cursor.callproc.side_effect = [
+            Error(msg="Parqueadero ocupado por funcionario con excepción", errno=1644, sqlstate="45000"),
+            None,
+        ]
+
+        exito, _, rechazados = ParqueaderoModel(db).asignar_masivo([(1, 1), (2, 2)])
+
+        assert exito and rechazados == {1: "Parqueadero ocupado por funcionario con excepción"}
+        assert db.cursor.callproc.call_count == 2
+
+    def test_error_de_conexion_revierte_todo(self):
+        """Un error que no es de reglas de negocio revierte la transacción completa"""
+        from mysql.connector import Error
+
+        from src.models.parqueadero import ParqueaderoModel
+
+        db = self._db(vehiculos=[_vehiculo(1, 1, "PAR")])
+        db.cursor.callproc.side_effect = Error(msg="Lost connection", errno=2013)
+
+        exito, error, rechazados = ParqueaderoModel(db).asignar_masivo([(1, 1)])
+
+        assert not exito and "Lost connection" in error and rechazados == {}
+        db.connection.rollback.assert_called_once()
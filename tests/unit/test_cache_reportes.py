@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Caché de resultados de reportes"""
+
+from datetime import date
+from unittest.mock import Mock
+
+FILAS = [{"placa": "ABC123", "tipo_vehiculo": "Carro"}]
+
+
+def _cache(**kwargs):
+    from src.database.version_datos import VersionDatos
+    from src.utils.cache_reportes import CacheReportes
+
+    version = VersionDatos()
+    return CacheReportes(version=version, **kwargs), version
+
+
+class TestCacheReportes:
+    """Clave (reporte, filtros, versión), LRU y presupuesto"""
+
+    def test_mismos_filtros_se_sirven_de_memoria(self):
+        cache, _ = _cache()
+        cargar = Mock(return_value=FILAS)
+
+        primero = cache.obtener("vehiculos", {"cargo": None, "tipo_vehiculo": "Carro"}, cargar)
+        segundo = cache.obtener("vehiculos", {"tipo_vehiculo": "Carro"}, cargar)
+
+        assert primero is segundo
+        cargar.assert_called_once()
+        assert cache.estadisticas()["aciertos"] == 1
+
+    def test_filtros_distintos_y_fechas(self):
+        from src.utils.cache_reportes import normalizar_filtros
+
+        assert normalizar_filtros({"fecha_inicio": date(2024, 1, 31), "cargo": ""}) == (
+            ("fecha_inicio", "2024-01-31"),
+        )
+        cache, _ = _cache()
+        cargar = Mock(return_value=FILAS)
+        cache.obtener("vehiculos", {"tipo_vehiculo": "Carro"}, cargar)
+        cache.obtener("vehiculos", {"tipo_vehiculo": "Moto"}, cargar)
+        cache.obtener("general", {"tipo_vehiculo": "Carro"}, cargar)
+
+        assert cargar.call_count == 3
+
+    def test_escritura_invalida(self):
+        """Una nueva versión de datos descarta todas las entradas"""
+        cache, version = _cache()
+        cargar = Mock(return_value=FILAS)
+
+        cache.obtener("vehiculos", {}, cargar)
+        version.incrementar()
+        cache.obtener("vehiculos", {}, cargar)
+
+        assert cargar.call_count == 2
+        assert cache.estadisticas()["entradas"] == 1
+
+    def test_expulsion_lru_por_entradas(self):
+        cache, _ = _cache(max_entradas=2)
+        cargar = Mock(side_effect=lambda: [dict(FILAS[0])])
+
+        cache.obtener("a", {}, cargar)
+        cache.obtener("b", {}, cargar)
+        cache.obtener("a", {}, cargar)  # "a" pasa a ser la más reciente
+        cache.obtener("c", {}, cargar)  # expulsa "b"
+        cache.obtener("a", {}, cargar)
+        cache.obtener("b", {}, cargar)
+
+        assert cargar.call_count == 4
+
+    def test_presupuesto_de_memoria(self):
+        """Un resultado mayor que el presupuesto se devuelve pero no se guarda"""
+        cache, _ = _cache(presupuesto_mb=0.001)
+        grande = [{"texto": "x" * 2000}]
+
+        assert cache.obtener("grande", {}, lambda: grande) is grande
+        assert cache.estadisticas()["entradas"] == 0
+
+    def test_resultado_vacio_no_se_guarda(self):
+        cache, _ = _cache()
+        cargar = Mock(return_value=[])
+
+        cache.obtener("vehiculos", {}, cargar)
+        cache.obtener("vehiculos", {}, cargar)
+
+        assert cargar.call_count == 2
+
+
+class TestVersionDatos:
+    """DatabaseManager incrementa la versión en cada commit"""
+
+    def test_execute_query_incrementa_version(self):
+        from src.database.manager import DatabaseManager
+        from src.database.version_datos import version_datos
+
+        db = object.__new__(DatabaseManager)
+        db.connection, db.cursor = Mock(), Mock(rowcount=1)
+        db.ensure_connection = Mock(return_value=True)
+        antes = version_datos.actual()
+
+        assert db.execute_query("UPDATE vehiculos SET activo = FALSE WHERE id = %s", (1,)) == (True, "")
+        assert version_datos.actual() == antes + 1
+
+
+class TestVigenciaCache:
+    """Edad máxima y contadores de versión por fuente"""
+
+    def test_entrada_vencida_se_recarga(self):
+        """Sin escrituras locales, un resultado más viejo que max_edad_s se vuelve a consultar"""
+        reloj = Mock(return_value=1000.0)
+        cache, _ = _cache(max_edad_s=60, reloj=reloj)
+        cargar = Mock(return_value=FILAS)
+
+        cache.obtener("vehiculos", {}, cargar)
+        reloj.return_value = 1059.0
+        cache.obtener("vehiculos", {}, cargar)
+        reloj.return_value = 1061.0
+        cache.obtener("vehiculos", {}, cargar)
+
+        assert cargar.call_count == 2
+        assert cache.estadisticas()["entradas"] == 1
+
+    def test_rollups_no_invalidan_reportes_operativos(self):
+        """Cada reporte se invalida solo con el contador del que depende"""
+        from src.database.version_datos import VersionDatos
+
+        cache, version = _cache()
+        rollups = VersionDatos()
+        operativo, historico = Mock(return_value=FILAS), Mock(return_value=FILAS)
+
+        cache.obtener("vehiculos", {}, operativo)
+        cache.obtener("historico", {}, historico, version=rollups)
+        rollups.incrementar()
+        cache.obtener("vehiculos", {}, operativo)
+        cache.obtener("historico", {}, historico, version=rollups)
+        version.incrementar()
+        cache.obtener("historico", {}, historico, version=rollups)
+
+        assert (operativo.call_count, historico.call_count) == (1, 2)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Carga diferida de dependencias opcionales"""
+
+import sys
+
+import pytest
+
+
+class TestDependencias:
+    """Tests de disponibilidad sin importar y carga con caché"""
+
+    def test_disponible_no_importa_el_paquete(self, monkeypatch):
+        """Consultar disponibilidad no agrega el módulo a sys.modules"""
+        from src.utils import dependencias
+
+        monkeypatch.setattr(dependencias, "_disponibles", {})
+        monkeypatch.delitem(sys.modules, "csv", raising=False)
+
+        assert dependencias.disponible("csv")
+        assert "csv" not in sys.modules
+
+    def test_cargar_guarda_el_modulo_en_cache(self, monkeypatch):
+        """La segunda carga devuelve el mismo módulo sin volver a importarlo"""
+        from src.utils import dependencias
+
+        monkeypatch.setattr(dependencias, "_modulos", {})
+        primero = dependencias.cargar("json.decoder")
+
+        monkeypatch.setattr(dependencias.importlib, "import_module", lambda nombre: pytest.fail("reimportado"))
+        assert dependencias.cargar("json.decoder") is primero
+
+    def test_dependencia_faltante(self):
+        """Un paquete no instalado se reporta con el comando de instalación"""
+        from src.utils.dependencias import DependenciaNoDisponible, cargar, disponible, faltantes
+
+        assert not disponible("paquete_inexistente_xyz")
+        assert faltantes("json", "paquete_inexistente_xyz") == ["paquete_inexistente_xyz"]
+        with pytest.raises(DependenciaNoDisponible, match="pip install paquete_inexistente_xyz"):
+            cargar("paquete_inexistente_xyz.sub")
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Instrumentación de consultas"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+class TestHuellaConsulta:
+    """Tests de normalización de consultas"""
+
+    @pytest.mark.parametrize(
+        "a, b",
+        [
+            ("SELECT * FROM vehiculos WHERE id = 5", "SELECT *   FROM vehiculos\n WHERE id = %s"),
+            ("SELECT * FROM f WHERE cedula IN ('1', '2', '3')", "SELECT * FROM f WHERE cedula IN (%s)"),
+            ("UPDATE p SET estado = 'Disponible' WHERE id = 1", "UPDATE p SET estado = %s WHERE id = %s"),
+        ],
+    )
+    def test_consultas_equivalentes_misma_huella(self, a, b):
+        """Literales, parámetros, espacios y listas IN no cambian la huella"""
+        from src.database.estadisticas_consultas import huella_consulta
+
+        assert huella_consulta(a) == huella_consulta(b)
+
+    def test_identificadores_con_numeros_se_conservan(self):
+        """Los números dentro de identificadores no se reemplazan"""
+        from src.database.estadisticas_consultas import huella_consulta
+
+        assert huella_consulta("SELECT t1.id FROM tabla2 t1 LIMIT 10") == "SELECT t1.id FROM tabla2 t1 LIMIT ?"
+
+
+class TestEstadisticasConsultas:
+    """Tests del histograma y del log de consultas lentas"""
+
+    def test_agrupa_por_huella(self):
+        """Las ejecuciones se agrupan y acumulan tiempo, filas y origen"""
+        from src.database.estadisticas_consultas import EstadisticasConsultas
+
+        stats = EstadisticasConsultas(umbral_lento_ms=1000)
+        stats.registrar("SELECT * FROM f WHERE id = 1", 0.002, filas=1)
+        stats.registrar("SELECT * FROM f WHERE id = 2", 0.004, filas=1)
+        stats.registrar("SELECT 1", 0.0005, filas=1)
+
+        primera = stats.resumen()[0]
+        assert primera["huella"] == "SELECT * FROM f WHERE id = ?"
+        assert primera["llamadas"] == 2
+        assert primera["total_ms"] == pytest.approx(6.0)
+        assert primera["max_ms"] == pytest.approx(4.0)
+        assert primera["origen_principal"].startswith("tests/unit/test_estadisticas_consultas.py:")
+        assert stats.totales()["huellas"] == 2
+
+    def test_consultas_lentas_van_al_log(self):
+        """Solo las consultas sobre el umbral se escriben en el log dedicado"""
+        from src.database.estadisticas_consultas import EstadisticasConsultas
+
+        stats = EstadisticasConsultas(umbral_lento_ms=100)
+        with patch.object(stats, "_registrar_lenta") as registrar_lenta:
+            stats.registrar("SELECT 1", 0.05)
+            stats.registrar("SELECT SLEEP(1)", 0.25, filas=1)
+
+        registrar_lenta.assert_called_once()
+        assert stats.totales()["lentas"] == 1
+
+    def test_deshabilitado_no_registra(self):
+        """Con QUERY_STATS_ENABLED=False no se acumula nada"""
+        from src.database.estadisticas_consultas import EstadisticasConsultas
+
+        stats = EstadisticasConsultas(habilitado=False)
+        stats.registrar("SELECT 1", 0.001)
+
+        assert stats.resumen() == []
+
+    def test_exportar_csv(self, tmp_path):
+        """El resumen se exporta a CSV con una fila por huella"""
+        from src.database.estadisticas_consultas import EstadisticasConsultas
+
+        stats = EstadisticasConsultas()
+        stats.registrar("SELECT 1", 0.001)
+        ruta = tmp_path / "consultas.csv"
+        stats.exportar_csv(str(ruta))
+
+        lineas = ruta.read_text(encoding="utf-8-sig").splitlines()
+        assert lineas[0].startswith("huella,llamadas,total_ms")
+        assert len(lineas) == 2
+
+    def test_database_manager_registra_origen_del_llamador(self):
+        """DatabaseManager atribuye la consulta al código que la pidió, no a sí mismo"""
+        from src.database.estadisticas_consultas import estadisticas
+        from src.database.manager import ConexionIndependiente
+
+        with patch.object(ConexionIndependiente, "connect", return_value=True):
+            db = ConexionIndependiente()
+        db.connection = type("Conexion", (), {"is_connected": lambda self: True})()
+        db.cursor = type("Cursor", (), {"execute": lambda *a: None, "fetchall": lambda self: [{"id": 1}]})()
+
+        estadisticas.reiniciar()
+        db.fetch_all("SELECT id FROM instrumentacion_prueba WHERE x = %s", (1,))
+
+        fila = next(f for f in estadisticas.resumen() if "instrumentacion_prueba" in f["huella"])
+        assert fila["filas"] == 1
+        assert "test_database_manager_registra_origen_del_llamador" in fila["origen_principal"]
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Historial diferido y paginado del detalle de parqueadero"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+
+def _registros(cantidad, desde_id):
+    base = datetime(2024, 1, 1)
+    return [
+        {
+            "id": desde_id - i,
+            "fecha_asignacion": base - timedelta(days=i),
+            "fecha_fin_asignacion": base,
+            "funcionario": "Ana Pérez",
+            "cedula": "123",
+            "tipo_vehiculo": "Carro",
+            "placa": "ABC123",
+            "tipo_circulacion": "PAR",
+            "estado": "Finalizado",
+            "observaciones": "",
+        }
+        for i in range(cantidad)
+    ]
+
+
+class TestObtenerHistorial:
+    """ParqueaderoModel.obtener_historial pagina por clave"""
+
+    def test_primera_pagina(self, mock_db_manager):
+        from src.models.parqueadero import ParqueaderoModel
+
+        ParqueaderoModel(mock_db_manager).obtener_historial(7, 20)
+
+        query, params = mock_db_manager.fetch_all.call_args[0]
+        assert "OFFSET" not in query.upper()
+        assert "ORDER BY a.fecha_asignacion DESC, a.id DESC" in query
+        assert params == (7, 20)
+
+    def test_pagina_siguiente_usa_cursor(self, mock_db_manager):
+        from src.models.parqueadero import ParqueaderoModel
+
+        fecha = datetime(2024, 1, 1)
+        ParqueaderoModel(mock_db_manager).obtener_historial(7, 20, (fecha, 90))
+
+        query, params = mock_db_manager.fetch_all.call_args[0]
+        assert "a.fecha_asignacion < %s" in query
+        assert params == (7, fecha, fecha, 90, 20)
+
+
+@pytest.fixture
+def modal(qapp, monkeypatch):
+    from src.models.parqueadero import ParqueaderoModel
+    from src.ui.modal_detalle_parqueadero import DetalleParqueaderoModal
+
+    db = MagicMock()
+    db.fetch_one.return_value = {
+        "numero_parqueadero": 5,
+        "estado": "Disponible",
+        "tipo_espacio": "Carro",
+        "sotano": "Sótano-1",
+        "carros_asignados": 0,
+        "motos_asignadas": 0,
+        "bicicletas_asignadas": 0,
+    }
+    db.fetch_all.return_value = []
+    paginas = MagicMock(side_effect=[_registros(50, 500), _registros(10, 450)])
+    monkeypatch.setattr(ParqueaderoModel, "obtener_historial", lambda self, *args: paginas(*args))
+
+    dialogo = DetalleParqueaderoModal(5, db_manager=db)
+    yield dialogo, paginas
+    dialogo.deleteLater()
+
+
+class TestModalHistorial:
+    """El historial no se consulta hasta abrir su tab"""
+
+    def test_abrir_modal_no_carga_historial(self, modal):
+        _, paginas = modal
+        paginas.assert_not_called()
+
+    def test_tab_historial_carga_paginas(self, modal):
+        dialogo, paginas = modal
+
+        dialogo.tabs.setCurrentWidget(dialogo.tab_historial)
+        assert dialogo.tabla_historial.rowCount() == 50
+
+        dialogo.cargar_mas_historial()
+        assert dialogo.tabla_historial.rowCount() == 60
+        assert paginas.call_args[0][2] == (datetime(2024, 1, 1) - timedelta(days=49), 451)
+
+        # Historial completo: el scroll ya no pide más páginas
+        dialogo.on_historial_scroll(dialogo.tabla_historial.verticalScrollBar().maximum())
+        assert paginas.call_count == 2
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Pipeline de importación masiva de funcionarios"""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+
+def _fila(cedula="12345678", nombre="Juan", apellidos="Pérez", celular="3001234567", cargo="Profesional", **extra):
+    fila = {
+        "Cedula": cedula,
+        "Nombre": nombre,
+        "Apellidos": apellidos,
+        "Direccion": "Vehículo Oficial",
+        "Cargo": cargo,
+        "Celular": celular,
+    }
+    fila.update(extra)
+    return fila
+
+
+class _LectorEnMemoria:
+    """Lector de prueba: entrega las filas en lotes como LectorImportacion"""
+
+    total_estimado = None
+
+    def __init__(self, filas, tamano_lote=500):
+        self.filas = filas
+        self.tamano_lote = tamano_lote
+
+    def __iter__(self):
+        from src.utils.lector_importacion import LoteImportacion
+
+        columnas = list(self.filas[0])
+        for inicio in range(0, len(self.filas), self.tamano_lote):
+            yield LoteImportacion(2 + inicio, columnas, self.filas[inicio:inicio + self.tamano_lote])
+
+
+class TestValidacionVectorizada:
+    """Tests de la etapa de validación por columnas"""
+
+    def test_filas_validas_sin_errores(self, mock_db_manager):
+        """Filas correctas pasan y se normalizan las cédulas numéricas"""
+        from src.utils.importacion_funcionarios import ImportadorFuncionarios
+
+        df = pd.DataFrame([_fila(cedula=12345678.0), _fila(cedula="87654321")])
+        validos, errores = ImportadorFuncionarios(mock_db_manager).validar(df)
+
+        assert errores == []
+        assert list(validos["cedula"]) == ["12345678", "87654321"]
+        assert list(validos["fila"]) == [2, 3]
+
+    def test_primer_error_por_fila(self, mock_db_manager):
+        """Cada fila inválida reporta un único motivo"""
+        from src.utils.importacion_funcionarios import ImportadorFuncionarios
+
+        df = pd.DataFrame([
+            _fila(cedula="123"),
+            _fila(cedula="1234567", celular="12"),
+            _fila(cedula="7654321", cargo="Inexistente"),
+            _fila(cedula="", celular="12"),
+        ])
+        validos, errores = ImportadorFuncionarios(mock_db_manager).validar(df)
+
+        assert validos.empty
+        motivos = {error.fila: error.motivo for error in errores}
+        assert motivos == {
+            2: "Cédula inválida",
+            3: "Celular inválido",
+            4: "Cargo inválido",
+            5: "Campos obligatorios vacíos",
+        }
+
+    def test_cedula_repetida_en_archivo_y_entre_lotes(self, mock_db_manager):
+        """Duplicados dentro del archivo se detectan aunque lleguen en lotes distintos"""
+        from src.utils.importacion_funcionarios import ImportadorFuncionarios
+
+        importador = ImportadorFuncionarios(mock_db_manager)
+        _, errores_lote1 = importador.validar(pd.DataFrame([_fila(), _fila()]))
+        _, errores_lote2 = importador.validar(pd.DataFrame([_fila()]), fila_inicial=4)
+
+        assert [e.fila for e in errores_lote1] == [3]
+        assert [e.fila for e in errores_lote2] == [4]
+
+    def test_cedulas_registradas_una_sola_consulta(self, mock_db_manager):
+        """Las cédulas existentes se consultan en bloque, no fila por fila"""
+        from src.utils.importacion_funcionarios import ImportadorFuncionarios
+
+        mock_db_manager.fetch_all.return_value = [
+            {"id": 1, "cedula": "12345678", "nombre": "Ana", "apellidos": "Gómez", "activo": False}
+        ]
+        df = pd.DataFrame([_fila(cedula="12345678"), _fila(cedula="87654321")])
+        validos, errores = ImportadorFuncionarios(mock_db_manager).validar(df)
+
+        assert mock_db_manager.fetch_all.call_count == 1
+        assert list(validos["cedula"]) == ["87654321"]
+        assert errores[0].motivo == "Cédula ya registrada"
+        assert "inactivo" in errores[0].detalle
+
+    def test_banderas_por_tipo_excepcion(self, mock_db_manager):
+        """Tipo_Excepcion se traduce a las banderas del funcionario"""
+        from src.utils.importacion_funcionarios import ImportadorFuncionarios
+
+        df = pd.DataFrame([
+            _fila(cedula="11111111", Tipo_Excepcion="carro_hibrido"),
+            _fila(cedula="22222222", Tipo_Excepcion="Discapacidad"),
+            _fila(cedula="33333333", Tipo_Excepcion=None),
+        ])
+        validos, _ = ImportadorFuncionarios(mock_db_manager).validar(df)
+        registros = validos.set_index("cedula")
+
+        assert registros.loc["11111111", "tiene_carro_hibrido"]
+        assert not registros.loc["11111111", "permite_compartir"]
+        assert registros.loc["22222222", "discapacidad"]
+        assert registros.loc["33333333", "permite_compartir"]
+
+
+class TestImportacion:
+    """Tests de dry run e inserción por lotes"""
+
+    def test_dry_run_no_inserta(self, mock_db_manager):
+        """En modo simulación no se escribe en la base de datos"""
+        from src.utils.importacion_funcionarios import ImportadorFuncionarios
+
+        resultado = ImportadorFuncionarios(mock_db_manager).importar_lotes(_LectorEnMemoria([_fila()]), dry_run=True)
+
+        assert resultado.validos == 1
+        assert resultado.importados == 0
+        mock_db_manager.execute_many.assert_not_called()
+
+    def test_insercion_por_lotes(self, mock_db_manager):
+        """Los registros válidos se insertan en lotes de tamano_lote"""
+        from src.utils.importacion_funcionarios import ImportadorFuncionarios
+
+        mock_db_manager.execute_many.return_value = (True, "")
+        lector = _LectorEnMemoria([_fila(cedula=str(10000000 + i)) for i in range(5)])
+        resultado = ImportadorFuncionarios(mock_db_manager, tamano_lote=2).importar_lotes(lector)
+
+        assert resultado.importados == 5
+        assert mock_db_manager.execute_many.call_count == 3
+
+    def test_lote_fallido_se_reintenta_por_fila(self, mock_db_manager):
+        """Un lote con error se reintenta fila por fila para aislar el registro"""
+        from src.utils.importacion_funcionarios import ImportadorFuncionarios
+
+        mock_db_manager.execute_many.side_effect = [
+            (False, "Duplicate entry"),
+            (True, ""),
+            (False, "Duplicate entry"),
+        ]
+        lector = _LectorEnMemoria([_fila(cedula="11111111"), _fila(cedula="22222222")])
+        resultado = ImportadorFuncionarios(mock_db_manager).importar_lotes(lector)
+
+        assert resultado.importados == 1
+        assert [(e.fila, e.motivo) for e in resultado.errores] == [(3, "Error al insertar")]
+        assert resultado.resumen_por_motivo() == {"Error al insertar": 1}
+
+
+class TestLectorImportacion:
+    """Tests de lectura por lotes (streaming) de Excel y CSV"""
+
+    def test_excel_por_lotes(self, tmp_path):
+        """El Excel se entrega en lotes con la numeración de filas original"""
+        openpyxl = pytest.importorskip("openpyxl")
+        from src.utils.lector_importacion import LectorImportacion
+
+        ruta = tmp_path / "funcionarios.xlsx"
+        libro = openpyxl.Workbook()
+        hoja = libro.active
+        hoja.append(["Cedula", "Nombre"])
+        for i in range(5):
+            hoja.append([10000000 + i, f"Persona {i}"])
+        hoja.append([None, None])  # fila vacía final: se descarta
+        libro.save(ruta)
+
+        with LectorImportacion(str(ruta), tamano_lote=2) as lector:
+            assert lector.columnas == ["Cedula", "Nombre"]
+            lotes = list(lector)
+
+        assert [(lote.fila_inicial, len(lote)) for lote in lotes] == [(2, 2), (4, 2), (6, 1)]
+        assert lotes[2].filas[0]["Cedula"] == 10000004
+
+    def test_csv_con_punto_y_coma(self, tmp_path):
+        """El delimitador del CSV se detecta automáticamente"""
+        from src.utils.lector_importacion import LectorImportacion
+
+        ruta = tmp_path / "funcionarios.csv"
+        ruta.write_text("Cedula;Nombre\n12345678;Juan\n\n87654321;Ana\n", encoding="utf-8")
+
+        with LectorImportacion(str(ruta)) as lector:
+            lotes = list(lector)
+
+        # La fila vacía intermedia se conserva para no alterar la numeración
+        assert [fila["Cedula"] for fila in lotes[0].filas] == ["12345678", None, "87654321"]
+
+    def test_filas_vacias_solo_se_cuentan(self, tmp_path):
+        """Un rango usado enorme de filas vacías no se acumula; las intermedias mantienen la numeración"""
+        from src.utils.lector_importacion import LectorImportacion
+
+        ruta = tmp_path / "funcionarios.csv"
+        ruta.write_text(
+            "Cedula;Nombre\n12345678;Juan\n" + ";\n" * 3 + "87654321;Ana\n" + ";\n" * 100_000, encoding="utf-8"
+        )
+
+        with LectorImportacion(str(ruta), tamano_lote=2) as lector:
+            lotes = list(lector)
+
+        assert [(lote.fila_inicial, len(lote)) for lote in lotes] == [(2, 2), (4, 2), (6, 1)]
+        assert lotes[2].filas[0] == {"Cedula": "87654321", "Nombre": "Ana"}
+        assert lotes[1].filas == [{"Cedula": None, "Nombre": None}] * 2
+
+    def test_formato_no_soportado(self, tmp_path):
+        """Extensiones desconocidas se rechazan"""
+        from src.utils.lector_importacion import LectorImportacion
+
+        with pytest.raises(ValueError):
+            LectorImportacion(str(tmp_path / "datos.txt"))
+
+    def test_importar_lotes_inserta_cada_lote(self, mock_db_manager, tmp_path):
+        """En streaming cada lote se inserta antes de leer el siguiente"""
+        from src.utils.importacion_funcionarios import ImportadorFuncionarios
+        from src.utils.lector_importacion import LectorImportacion
+
+        ruta = tmp_path / "funcionarios.csv"
+        filas = ["Cedula,Nombre,Apellidos,Direccion,Cargo,Celular"]
+        filas += [f"{10000000 + i},Juan,Pérez,Vehículo Oficial,Profesional,3001234567" for i in range(5)]
+        filas.append("10000000,Juan,Pérez,Vehículo Oficial,Profesional,3001234567")  # repetida
+        ruta.write_text("\n".join(filas), encoding="utf-8")
+        mock_db_manager.execute_many.return_value = (True, "")
+
+        progreso = []
+        with LectorImportacion(str(ruta), tamano_lote=2) as lector:
+            resultado = ImportadorFuncionarios(mock_db_manager).importar_lotes(
+                lector, progreso=lambda procesados, total, etapa: progreso.append(procesados)
+            )
+
+        assert resultado.importados == 5
+        assert [(e.fila, e.motivo) for e in resultado.errores] == [(7, "Cédula repetida en el archivo")]
+        assert mock_db_manager.execute_many.call_count == 3
+        assert progreso == [2, 4, 6]
+
+    def test_importar_lotes_dry_run_solo_cuenta(self, mock_db_manager, tmp_path):
+        """La simulación por lotes no conserva los registros y se puede repetir para importar"""
+        from src.utils.importacion_funcionarios import ImportadorFuncionarios
+        from src.utils.lector_importacion import LectorImportacion
+
+        ruta = tmp_path / "funcionarios.csv"
+        filas = ["Cedula,Nombre,Apellidos,Direccion,Cargo,Celular"]
+        filas += [f"{10000000 + i},Juan,Pérez,Vehículo Oficial,Profesional,3001234567" for i in range(3)]
+        ruta.write_text("\n".join(filas), encoding="utf-8")
+        mock_db_manager.execute_many.return_value = (True, "")
+        importador = ImportadorFuncionarios(mock_db_manager)
+
+        with LectorImportacion(str(ruta), tamano_lote=2) as lector:
+            simulacion = importador.importar_lotes(lector, dry_run=True)
+        with LectorImportacion(str(ruta), tamano_lote=2) as lector:
+            resultado = importador.importar_lotes(lector)
+
+        assert simulacion.validos == 3 and simulacion.importados == 0
+        assert resultado.importados == 3 and resultado.errores == []
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Importación masiva de vehículos"""
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+
+@pytest.fixture
+def db_importacion(mock_db_manager):
+    """DB simulada: un funcionario activo (id 1), la placa XYZ999 registrada y el parqueadero 10"""
+
+    def fetch_all(query, params=None):
+        if "FROM funcionarios" in query:
+            return [{"id": 1, "cedula": "12345678", "nombre": "Ana", "apellidos": "Gómez",
+                     "activo": True, "tiene_parqueadero_exclusivo": False}]
+        if "WHERE placa IN" in query:
+            # La colación no distingue mayúsculas: la fila puede venir como se guardó
+            return [{"id": 50, "placa": "xyz999", "tipo_vehiculo": "Carro"}]
+        if "FROM parqueaderos" in query:
+            return [{"id": 7, "numero_parqueadero": 10, "tipo_espacio": "Carro", "estado": "Disponible"}]
+        if "SELECT id, funcionario_id, tipo_vehiculo" in query:
+            return [{"id": 100, "funcionario_id": 1, "tipo_vehiculo": "Carro", "placa": "ABC123"}]
+        return []
+
+    mock_db_manager.fetch_all.side_effect = fetch_all
+    mock_db_manager.execute_many.return_value = (True, "")
+    return mock_db_manager
+
+
+def _df(*filas):
+    return pd.DataFrame([dict(zip(["Cedula", "Tipo_Vehiculo", "Placa", "Numero_Parqueadero"], f)) for f in filas])
+
+
+class TestImportacionVehiculos:
+    """Tests de búsquedas pre-resueltas e inserción masiva"""
+
+    def test_sin_consultas_por_fila(self, db_importacion):
+        """La validación no hace fetch_one: todo se resuelve con consultas por conjunto"""
+        from src.utils.importacion_vehiculos import ImportadorVehiculos
+
+        df = _df(
+            ("12345678", "Carro", "abc123", "10"),
+            ("12345678", "Moto", "ABC12", ""),
+            ("99999999", "Carro", "DEF456", ""),
+        )
+        resultado = ImportadorVehiculos(db_importacion).importar(df)
+
+        db_importacion.fetch_one.assert_not_called()
+        assert resultado.importados == 2
+        assert [(e.fila, e.motivo) for e in resultado.errores] == [(4, "Funcionario no existe")]
+
+    def test_insercion_y_asignacion_en_bloque(self, db_importacion):
+        """Vehículos y asignaciones se insertan con una llamada masiva cada uno"""
+        from src.utils.importacion_vehiculos import ImportadorVehiculos
+
+        ImportadorVehiculos(db_importacion).importar(_df(("12345678", "Carro", "ABC123", 10.0)))
+
+        llamadas = db_importacion.execute_many.call_args_list
+        assert len(llamadas) == 2
+        assert llamadas[0].args[1] == [(1, "Carro", "ABC123")]
+        assert llamadas[1].args[1] == [(7, 100)]
+
+    @pytest.mark.parametrize(
+        "fila, motivo",
+        [
+            (("12345678", "Camion", "ABC123", ""), "Tipo de vehículo inválido"),
+            (("12345678", "Bicicleta", "ABC123", ""), "Placa inválida"),
+            (("12345678", "Carro", "AB1234", ""), "Placa inválida"),
+            (("12345678", "Carro", "XYZ999", ""), "Placa ya registrada"),
+        ],
+    )
+    def test_filas_invalidas(self, db_importacion, fila, motivo):
+        """Cada fila inválida se reporta con su motivo y no se inserta"""
+        from src.utils.importacion_vehiculos import ImportadorVehiculos
+
+        resultado = ImportadorVehiculos(db_importacion).importar(_df(fila))
+
+        assert resultado.importados == 0
+        assert resultado.errores[0].motivo == motivo
+        db_importacion.execute_many.assert_not_called()
+
+    def test_reglas_de_negocio_con_vehiculos_del_mismo_archivo(self, db_importacion):
+        """Un segundo carro con la misma paridad en el archivo viola pico y placa"""
+        from src.utils.importacion_vehiculos import ImportadorVehiculos
+
+        df = _df(("12345678", "Carro", "ABC123", ""), ("12345678", "Carro", "DEF453", ""))
+        resultado = ImportadorVehiculos(db_importacion).importar(df)
+
+        assert resultado.importados == 1
+        assert resultado.errores[0].motivo == "Regla de negocio"
+
+    def test_importar_lotes_reutiliza_busquedas(self, db_importacion, tmp_path):
+        """Las claves ya resueltas en un lote no se vuelven a consultar"""
+        from src.utils.importacion_vehiculos import ImportadorVehiculos
+        from src.utils.lector_importacion import LectorImportacion
+
+        ruta = tmp_path / "vehiculos.csv"
+        ruta.write_text(
+            "Cedula,Tipo_Vehiculo,Placa,Numero_Parqueadero\n"
+            "12345678,Carro,ABC123,10\n"
+            "12345678,Moto,ABC12,\n",
+            encoding="utf-8",
+        )
+
+        with LectorImportacion(str(ruta), tamano_lote=1) as lector:
+            resultado = ImportadorVehiculos(db_importacion).importar_lotes(lector)
+
+        assert resultado.importados == 2
+        consultas_funcionario = [
+            c for c in db_importacion.fetch_all.call_args_list if "FROM funcionarios" in c.args[0]
+        ]
+        assert len(consultas_funcionario) == 1
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Ingesta de eventos de acceso"""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+PLACAS = [
+    {"id": 1, "placa": "ABC123", "parqueadero_id": 10},
+    {"id": 2, "placa": "XYZ98E", "parqueadero_id": None},
+]
+
+
+@pytest.fixture
+def ingesta(mock_db_manager, tmp_path):
+    from src.utils.ingesta_accesos import IndicePlacas, IngestaAccesos
+
+    mock_db_manager.fetch_all.return_value = PLACAS
+    indice = IndicePlacas()
+    indice.cargar(mock_db_manager)
+    return IngestaAccesos(
+        indice=indice, capacidad=2, tamano_lote=3, intervalo_ms=10, ruta_derrame=str(tmp_path / "pendientes.jsonl")
+    )
+
+
+class TestRegistrar:
+    """Validación contra el índice de placas y cola acotada"""
+
+    def test_placa_normalizada_y_parqueadero_asignado(self, ingesta):
+        assert ingesta.registrar("abc-123", "Entrada") == (True, "")
+
+        evento = ingesta._cola.get_nowait()
+        assert (evento.vehiculo_id, evento.parqueadero_id, evento.tipo_evento) == (1, 10, "Entrada")
+
+    def test_rechazos(self, ingesta):
+        assert not ingesta.registrar("ABC123", "Ingreso")[0]
+        assert not ingesta.registrar("NOEXISTE", "Entrada")[0]
+        # Sin asignación vigente hace falta indicar el espacio
+        assert not ingesta.registrar("XYZ98E", "Salida")[0]
+        assert ingesta.registrar("XYZ98E", "Salida", parqueadero_id=7)[0]
+
+        assert ingesta.estadisticas()["rechazados"] == 3
+        assert ingesta.pendientes() == 1
+
+    def test_cola_llena_derrama_a_disco_sin_bloquear(self, ingesta):
+        for _ in range(3):
+            assert ingesta.registrar("ABC123", "Entrada")[0]
+
+        assert ingesta.pendientes() == 2
+        assert ingesta.estadisticas()["derramados"] == 1
+        with open(ingesta.ruta_derrame, encoding="utf-8") as archivo:
+            assert len(archivo.readlines()) == 1
+
+
+class TestEscritor:
+    """Lotes multi-fila, derrame sin conexión y recuperación"""
+
+    def test_lote_en_un_solo_insert(self, ingesta, mock_db_manager):
+        from src.utils.ingesta_accesos import EventoAcceso
+
+        mock_db_manager.execute_many.return_value = (True, "")
+        lote = [EventoAcceso(1, 10, "Entrada", datetime(2024, 5, 6, 7, i)) for i in range(3)]
+
+        assert ingesta._escribir(mock_db_manager, lote)
+        mock_db_manager.execute_many.assert_called_once()
+        assert len(mock_db_manager.execute_many.call_args[0][1]) == 3
+        assert ingesta.estadisticas()["insertados"] == 3
+
+    def test_sin_conexion_derrama_y_luego_recupera(self, ingesta):
+        from src.utils.ingesta_accesos import EventoAcceso
+
+        caida = MagicMock()
+        caida.execute_many.return_value = (False, "No se pudo establecer conexión a la base de datos")
+        caida.ensure_connection.return_value = False
+        lote = [EventoAcceso(1, 10, "Salida", datetime(2024, 5, 6, 18, i)) for i in range(4)]
+
+        assert not ingesta._escribir(caida, lote)
+        assert ingesta._derrame_pendiente
+
+        db = MagicMock()
+        db.execute_many.return_value = (True, "")
+        ingesta._recuperar_derrame(db)
+
+        # 4 eventos con lotes de 3: dos INSERT
+        assert [len(c[0][1]) for c in db.execute_many.call_args_list] == [3, 1]
+        assert db.execute_many.call_args_list[0][0][1][0][3] == datetime(2024, 5, 6, 18, 0)
+        assert not ingesta._derrame_pendiente
+
+    def test_error_de_datos_aisla_la_fila(self, ingesta):
+        from src.utils.ingesta_accesos import EventoAcceso
+
+        db = MagicMock()
+        db.execute_many.return_value = (False, "foreign key constraint fails")
+        db.ensure_connection.return_value = True
+        db.execute_query.side_effect = [(True, ""), (False, "foreign key constraint fails")]
+        lote = [EventoAcceso(1, 10, "Entrada", datetime.now()), EventoAcceso(99, 10, "Entrada", datetime.now())]
+
+        assert ingesta._escribir(db, lote)
+        assert ingesta.estadisticas()["insertados"] == 1
+        assert ingesta.estadisticas()["descartados"] == 1
+
+    def test_hilo_escritor_vacia_la_cola_al_detener(self, ingesta, monkeypatch):
+        import src.utils.ingesta_accesos as modulo
+
+        db = MagicMock()
+        db.execute_many.return_value = (True, "")
+        conexion = MagicMock()
+        conexion.return_value.__enter__.return_value = db
+        monkeypatch.setattr(modulo, "ConexionIndependiente", conexion)
+
+        ingesta.iniciar()
+        ingesta.registrar("ABC123", "Entrada")
+        ingesta.registrar("ABC123", "Salida")
+        ingesta.detener()
+
+        filas = [fila for c in db.execute_many.call_args_list for fila in c[0][1]]
+        assert [f[2] for f in filas] == ["Entrada", "Salida"]
+        assert ingesta.pendientes() == 0
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Construcción diferida de pestañas en MainWindow"""
+
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import QWidget
+
+from tests.conftest import PROJECT_ROOT
+
+
+class PestanaFalsa(QWidget):
+    """Pestaña mínima con las señales que conecta MainWindow"""
+
+    funcionario_creado = pyqtSignal()
+    funcionario_eliminado = pyqtSignal()
+    vehiculo_creado = pyqtSignal()
+    asignacion_actualizada = pyqtSignal()
+    parqueaderos_actualizados = pyqtSignal()
+    construidas = []
+
+    def __init__(self, db):
+        super().__init__()
+        self.recargas = 0
+        PestanaFalsa.construidas.append(self)
+
+    def load_initial_data(self):
+        self.recargas += 1
+
+    def cargar_parqueaderos(self):
+        self.recargas += 1
+
+    cargar_filtros_iniciales = cargar_vehiculos_async = cargar_funcionarios = actualizar_reportes = load_initial_data
+
+
+@pytest.fixture
+def ventana(qapp, monkeypatch):
+    import scripts.main_modular as main_modular
+
+    PestanaFalsa.construidas = []
+    monkeypatch.setattr(
+        main_modular, "PESTANAS", [(atributo, PestanaFalsa, titulo) for atributo, _, titulo in main_modular.PESTANAS]
+    )
+    with patch.object(main_modular, "DatabaseManager", return_value=Mock()), patch.object(
+        main_modular, "ProgramadorRollups"
+    ):
+        window = main_modular.MainWindow()
+    yield window
+    window.deleteLater()
+
+
+class TestPestanasDiferidas:
+    """Tests de construcción en la primera activación"""
+
+    def test_solo_dashboard_al_iniciar(self, ventana):
+        """Al iniciar solo se construye el dashboard; el resto son marcadores"""
+        assert PestanaFalsa.construidas == [ventana.tab_dashboard]
+        assert ventana.tab_reportes is None
+        assert ventana.tabs.count() == 6
+
+    def test_pestana_se_construye_al_activarse(self, ventana):
+        """Abrir una pestaña la construye una sola vez y conserva su posición"""
+        ventana.tabs.setCurrentIndex(4)
+        ventana.tabs.setCurrentIndex(0)
+        ventana.tabs.setCurrentIndex(4)
+
+        assert len(PestanaFalsa.construidas) == 2
+        assert ventana.tabs.widget(4) is ventana.tab_parqueaderos
+        assert ventana.tabs.tabText(4) == "🅿️ Parqueaderos"
+
+    def test_senales_omiten_pestanas_no_construidas(self, ventana):
+        """Las señales solo recargan pestañas ya construidas"""
+        ventana.tabs.setCurrentIndex(3)
+        ventana.tab_asignaciones.asignacion_actualizada.emit()
+
+        assert list(ventana.programador._pendientes) == [ventana.tab_dashboard]
+        assert ventana.tab_reportes is None
+
+
+def test_importar_ventana_no_carga_modulos_de_pestanas():
+    """Importar la ventana principal no importa los módulos de las pestañas"""
+    codigo = (
+        "import sys, scripts.main_modular; "
+        "print(any(m.startswith('src.ui.') and m.endswith('_tab') for m in sys.modules))"
+    )
+    salida = subprocess.run(
+        [sys.executable, "-c", codigo], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    assert salida.stdout.strip().splitlines()[-1] == "False"
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Motor de elegibilidad de parqueaderos"""
+
+import pytest
+
+
+def _vehiculo(vehiculo_id, funcionario_id, circulacion="PAR", tipo="Carro", **flags):
+    fila = {
+        "vehiculo_id": vehiculo_id,
+        "funcionario_id": funcionario_id,
+        "tipo_vehiculo": tipo,
+        "tipo_circulacion": circulacion,
+    }
+    fila.update(flags)
+    return fila
+
+
+@pytest.fixture
+def ocupacion():
+    """
+    Sótano-1: 1 libre, 2 con un PAR regular, 3 con un IMPAR solidario,
+              4 con 2 carros del directivo 50, 5 completo PAR+IMPAR, 6 moto libre
+    Sótano-2: 7 libre, 8 con un IMPAR regular
+    """
+    from src.utils.motor_elegibilidad import InstantaneaOcupacion
+
+    parqueaderos = [
+        {"id": i, "numero_parqueadero": i, "tipo_espacio": "Carro", "sotano": "Sótano-1"} for i in range(1, 6)
+    ]
+    parqueaderos.append({"id": 6, "numero_parqueadero": 6, "tipo_espacio": "Moto", "sotano": "Sótano-1"})
+    parqueaderos += [
+        {"id": i, "numero_parqueadero": i, "tipo_espacio": "Carro", "sotano": "Sótano-2"} for i in (7, 8)
+    ]
+    ocupantes = [
+        dict(_vehiculo(102, 12), parqueadero_id=2),
+        dict(_vehiculo(103, 13, "IMPAR", pico_placa_solidario=True), parqueadero_id=3),
+        dict(_vehiculo(104, 50, tiene_parqueadero_exclusivo=True), parqueadero_id=4),
+        dict(_vehiculo(105, 50, "IMPAR", tiene_parqueadero_exclusivo=True), parqueadero_id=4),
+        dict(_vehiculo(106, 14), parqueadero_id=5),
+        dict(_vehiculo(107, 15, "IMPAR"), parqueadero_id=5),
+        dict(_vehiculo(108, 16, "IMPAR"), parqueadero_id=8),
+    ]
+    return InstantaneaOcupacion.desde_filas(parqueaderos, ocupantes)
+
+
+def _numeros(espacios):
+    return [e.numero_parqueadero for e in espacios]
+
+
+class TestMascaras:
+    """Tests de codificación de excepciones y circulación"""
+
+    def test_excepciones_como_bits(self):
+        """Cada condición del funcionario activa su bit; el híbrido se detecta por ambos campos"""
+        from src.utils import motor_elegibilidad as m
+
+        assert m.mascara_excepciones({}) == 0
+        assert m.mascara_excepciones({"pico_placa_solidario": 1, "discapacidad": 1}) == m.SOLIDARIO | m.DISCAPACIDAD
+        assert m.mascara_excepciones({"tipo_circulacion": "HÍBRIDO"}) == m.HIBRIDO
+        assert m.mascara_excepciones({"tiene_carro_hibrido": True}) == m.HIBRIDO
+
+    def test_motos_sin_excepciones(self):
+        """Las excepciones de pico y placa solo aplican a carros"""
+        from src.utils.motor_elegibilidad import PerfilVehiculo
+
+        perfil = PerfilVehiculo.desde_fila(_vehiculo(1, 1, "N/A", tipo="Moto", discapacidad=True))
+
+        assert perfil.excepciones == 0
+        assert perfil.circulacion == 0
+
+
+class TestCandidatos:
+    """Tests de espacios elegibles por perfil"""
+
+    def test_carro_regular_libres_y_complemento(self, ocupacion):
+        """Un IMPAR regular recibe espacios libres y el PAR regular, no el solidario ni el completo"""
+        from src.utils.motor_elegibilidad import PerfilVehiculo
+
+        perfil = PerfilVehiculo.desde_fila(_vehiculo(200, 20, "IMPAR"))
+
+        assert _numeros(ocupacion.candidatos(perfil, "Sótano-1")) == [1, 2]
+        assert _numeros(ocupacion.candidatos(perfil)) == [1, 2, 7]
+
+    def test_misma_circulacion_no_comparte(self, ocupacion):
+        """Un PAR no puede sumarse a otro PAR"""
+        from src.utils.motor_elegibilidad import PerfilVehiculo
+
+        perfil = PerfilVehiculo.desde_fila(_vehiculo(200, 20, "PAR"))
+
+        assert _numeros(ocupacion.candidatos(perfil)) == [1, 7, 8]
+
+    @pytest.mark.parametrize(
+        "flags", [{"discapacidad": True}, {"pico_placa_solidario": True}, {"tiene_carro_hibrido": True}]
+    )
+    def test_excepcion_solo_espacios_libres(self, ocupacion, flags):
+        """Carros con excepción solo reciben espacios sin asignaciones"""
+        from src.utils.motor_elegibilidad import PerfilVehiculo
+
+        perfil = PerfilVehiculo.desde_fila(_vehiculo(200, 20, "IMPAR", **flags))
+
+        assert _numeros(ocupacion.candidatos(perfil)) == [1, 7]
+
+    def test_directivo_exclusivo_suma_sus_espacios(self, ocupacion):
+        """El directivo ve sus propios espacios con cupo en el sótano pedido"""
+        from src.utils.motor_elegibilidad import PerfilVehiculo
+
+        perfil = PerfilVehiculo.desde_fila(_vehiculo(200, 50, tiene_parqueadero_exclusivo=True))
+        espacios = ocupacion.candidatos(perfil, "Sótano-1")
+
+        assert _numeros(espacios) == [1, 4]
+        assert espacios[1].estado_display == "Parcial (2/4)"
+        assert _numeros(ocupacion.candidatos(perfil, "Sótano-2")) == [7]
+
+    def test_moto_solo_espacios_de_moto(self, ocupacion):
+        """Motos solo reciben espacios de su tipo"""
+        from src.utils.motor_elegibilidad import PerfilVehiculo
+
+        perfil = PerfilVehiculo.desde_fila(_vehiculo(200, 20, "N/A", tipo="Moto"))
+
+        assert _numeros(ocupacion.candidatos(perfil)) == [6]
+
+
+class TestValidarYActualizar:
+    """Tests de validación puntual y actualización incremental del índice"""
+
+    def test_validar_explica_el_rechazo(self, ocupacion):
+        """Los rechazos devuelven el mensaje de la regla que aplica"""
+        from src.utils.motor_elegibilidad import PerfilVehiculo
+
+        regular_par = PerfilVehiculo.desde_fila(_vehiculo(200, 20, "PAR"))
+        discapacidad = PerfilVehiculo.desde_fila(_vehiculo(201, 21, "IMPAR", discapacidad=True))
+        otro_directivo = PerfilVehiculo.desde_fila(_vehiculo(202, 60, tiene_parqueadero_exclusivo=True))
+
+        assert ocupacion.validar(regular_par, 1) == (True, "")
+        assert "pico y placa" in ocupacion.validar(regular_par, 2)[1]
+        assert "excepción" in ocupacion.validar(regular_par, 3)[1]
+        assert "Discapacidad" in ocupacion.validar(discapacidad, 2)[1]
+        assert "otro directivo" in ocupacion.validar(otro_directivo, 4)[1]
+        assert ocupacion.validar(regular_par, 999)[0] is False
+
+    def test_asignar_y_liberar_reindexan(self, ocupacion):
+        """Registrar una asignación saca el espacio del índice; liberarla lo devuelve"""
+        from src.utils.motor_elegibilidad import PerfilVehiculo
+
+        impar = PerfilVehiculo.desde_fila(_vehiculo(200, 20, "IMPAR"))
+        otro_impar = PerfilVehiculo.desde_fila(_vehiculo(201, 21, "IMPAR"))
+
+        ocupacion.registrar_asignacion(impar, 2)
+        assert ocupacion.espacio(2).estado_display == "Completo"
+        assert 2 not in [e.id for e in ocupacion.candidatos(otro_impar)]
+        assert ocupacion.parqueadero_de(200) == 2
+
+        ocupacion.liberar(200)
+        assert 2 in [e.id for e in ocupacion.candidatos(otro_impar)]
+
+
+class TestAsignarVehiculoUsaMotor:
+    """ParqueaderoModel.asignar_vehiculo valida con el motor antes del procedimiento"""
+
+    def test_rechazo_sin_llamar_procedimiento(self, mock_db_manager, ocupacion):
+        """Una asignación inválida no llega a sp_asignar_vehiculo ni consulta conteos"""
+        from src.models.parqueadero import ParqueaderoModel
+
+        mock_db_manager.fetch_one.return_value = _vehiculo(200, 20, "IMPAR", discapacidad=True)
+        exito, mensaje = ParqueaderoModel(mock_db_manager).asignar_vehiculo(200, 2, instantanea=ocupacion)
+
+        assert exito is False
+        assert "Discapacidad" in mensaje
+        mock_db_manager.fetch_one.assert_called_once()
+        mock_db_manager.fetch_all.assert_not_called()
+        mock_db_manager.cursor.callproc.assert_not_called()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Ocupación en un momento dado y series temporales"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+T0 = datetime(2024, 3, 5, 8, 0)
+
+
+def _h(horas):
+    return T0 + timedelta(hours=horas)
+
+
+class TestIndiceIntervalos:
+    """Conteos por búsqueda binaria y barrido de eventos"""
+
+    def test_intervalo_semiabierto(self):
+        from src.utils.intervalos_ocupacion import IndiceIntervalos
+
+        indice = IndiceIntervalos([(_h(0), _h(2), 1, "Carro"), (_h(1), None, 2, "Moto")])
+
+        assert indice.activos_en(_h(-1)) == 0
+        assert indice.activos_en(_h(0)) == 1
+        assert indice.activos_en(_h(1)) == 2
+        # El fin no está incluido
+        assert indice.activos_en(_h(2)) == 1
+        assert indice.activos_en(_h(100)) == 1
+
+    def test_serie_cuenta_espacios_y_tipos(self):
+        from src.utils.intervalos_ocupacion import IndiceIntervalos, momentos
+
+        indice = IndiceIntervalos([
+            (_h(0), _h(3), 1, "Carro"),
+            (_h(1), _h(2), 1, "Carro"),  # Comparte el espacio 1
+            (_h(1), None, 2, "Bicicleta"),
+        ])
+
+        serie = indice.serie(momentos(_h(0), _h(3), timedelta(hours=1)))
+
+        assert [p["vehiculos"] for p in serie] == [1, 3, 2, 1]
+        assert [p["espacios_ocupados"] for p in serie] == [1, 2, 2, 1]
+        assert serie[1]["carros"] == 2 and serie[1]["bicicletas"] == 1
+        assert [p["vehiculos"] for p in serie] == [indice.activos_en(p["momento"]) for p in serie]
+
+    def test_paso_invalido(self):
+        from src.utils.intervalos_ocupacion import momentos
+
+        with pytest.raises(ValueError):
+            list(momentos(_h(0), _h(1), timedelta(0)))
+
+
+class TestConsultasTemporales:
+    """ParqueaderoModel: predicado de rango sobre asignaciones y archivo"""
+
+    def test_ocupantes_en_usa_predicado_de_intervalo(self, mock_db_manager):
+        from src.models.parqueadero import ParqueaderoModel
+
+        ParqueaderoModel(mock_db_manager).ocupantes_en(7, _h(1))
+
+        query, params = mock_db_manager.fetch_all.call_args[0]
+        assert "fecha_asignacion <= %s" in query
+        assert "fecha_fin_asignacion IS NULL OR fecha_fin_asignacion > %s" in query
+        assert params == (7, _h(1), _h(1))
+
+    def test_foto_incluye_archivo(self, mock_db_manager):
+        from src.models.parqueadero import ParqueaderoModel
+
+        mock_db_manager.fetch_one.return_value = {"Tables": "asignaciones_archivo"}
+        ParqueaderoModel(mock_db_manager).ocupacion_en(_h(1))
+
+        query, params = mock_db_manager.fetch_all.call_args[0]
+        assert "UNION ALL" in query and "FROM asignaciones_archivo" in query
+        assert params == (_h(1), _h(1)) * 2
+
+    def test_serie_lee_una_vez_los_intervalos_del_rango(self, mock_db_manager):
+        from src.models.parqueadero import ParqueaderoModel
+
+        mock_db_manager.fetch_all.return_value = [
+            {"parqueadero_id": 1, "fecha_asignacion": _h(-5), "fecha_fin_asignacion": _h(2),
+             "tipo_vehiculo": "Carro"},
+            {"parqueadero_id": 2, "fecha_asignacion": _h(1), "fecha_fin_asignacion": None,
+             "tipo_vehiculo": "Moto"},
+        ]
+
+        serie = ParqueaderoModel(mock_db_manager).serie_ocupacion(_h(0), _h(3), parqueadero_id=None)
+
+        mock_db_manager.fetch_all.assert_called_once()
+        # Intervalos que se cruzan con [desde, hasta]: inicio <= hasta y fin > desde
+        assert mock_db_manager.fetch_all.call_args[0][1] == (_h(3), _h(0))
+        assert [p["vehiculos"] for p in serie] == [1, 2, 1, 1]
+        assert [p["motos"] for p in serie] == [0, 1, 1, 1]
+
+    def test_liberar_conserva_el_intervalo_con_migracion(self, mock_db_manager):
+        from src.models.parqueadero import ParqueaderoModel
+
+        mock_db_manager.fetch_one.side_effect = [{"parqueadero_id": 4}, {"Field": "vehiculo_activo"}]
+        mock_db_manager.execute_query.return_value = (True, "")
+
+        assert ParqueaderoModel(mock_db_manager).liberar_asignacion(9) is True
+
+        query = mock_db_manager.execute_query.call_args_list[0][0][0]
+        assert "SET activo = FALSE, fecha_fin_asignacion = NOW()" in query
+        assert "DELETE" not in query
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Pool de modales y precarga de datos"""
+
+from unittest.mock import MagicMock
+
+
+class ModalFalso:
+    def __init__(self, registro):
+        self.registro = registro
+        self.visible = False
+
+    def isVisible(self):
+        return self.visible
+
+    def vincular(self, registro):
+        self.registro = registro
+
+
+class TestPoolModales:
+    """Reutilización de instancias"""
+
+    def test_reutiliza_y_revincula(self):
+        from src.ui.utils.pool_modales import PoolModales
+
+        pool, creados = PoolModales(), []
+
+        def obtener(registro):
+            return pool.obtener(
+                "detalle",
+                crear=lambda: creados.append(ModalFalso(registro)) or creados[-1],
+                vincular=lambda m: m.vincular(registro),
+            )
+
+        primero = obtener(1)
+        segundo = obtener(2)
+
+        assert primero is segundo
+        assert len(creados) == 1
+        assert segundo.registro == 2
+
+    def test_modal_visible_no_se_reutiliza(self):
+        """Una apertura anidada construye otra instancia sin reemplazar la del pool"""
+        from src.ui.utils.pool_modales import PoolModales
+
+        pool = PoolModales()
+        primero = pool.obtener("detalle", crear=lambda: ModalFalso(1), vincular=lambda m: None)
+        primero.visible = True
+
+        anidado = pool.obtener("detalle", crear=lambda: ModalFalso(2), vincular=lambda m: None)
+        primero.visible = False
+
+        assert anidado is not primero
+        assert pool.obtener("detalle", crear=lambda: ModalFalso(3), vincular=lambda m: None) is primero
+
+
+class TestPrecargaDatos:
+    """Caché de datos precargados (sin lanzar hilos)"""
+
+    def _precarga(self, qapp, **kwargs):
+        from src.ui.utils.pool_modales import PrecargaDatos
+
+        precarga = PrecargaDatos(None, lambda db, clave: {"clave": clave}, **kwargs)
+        precarga._iniciar = MagicMock()
+        return precarga
+
+    def test_tomar_consume_el_dato(self, qapp):
+        precarga = self._precarga(qapp)
+        precarga._al_terminar(5, {"clave": 5})
+
+        assert precarga.tomar(5) == {"clave": 5}
+        assert precarga.tomar(5) is None
+
+    def test_dato_vencido_no_se_usa(self, qapp):
+        precarga = self._precarga(qapp, vigencia_s=0)
+        precarga._al_terminar(5, {"clave": 5})
+
+        assert precarga.tomar(5) is None
+
+    def test_cache_acotada(self, qapp):
+        """Los espacios cruzados y nunca abiertos no se acumulan"""
+        precarga = self._precarga(qapp, max_entradas=3)
+        for clave in range(10):
+            precarga._al_terminar(clave, {"clave": clave})
+
+        assert list(precarga._cache) == [7, 8, 9]
+
+    def test_vencidos_se_liberan_al_guardar(self, qapp):
+        precarga = self._precarga(qapp)
+        precarga._al_terminar(1, {"clave": 1})
+        precarga._cache[1] = (precarga._cache[1][0] - 60, {"clave": 1})
+        precarga._al_terminar(2, {"clave": 2})
+
+        assert list(precarga._cache) == [2]
+
+    def test_solo_conserva_la_ultima_solicitud(self, qapp):
+        """Mientras hay un worker en curso, las solicitudes intermedias se descartan"""
+        precarga = self._precarga(qapp)
+        precarga._worker = MagicMock(clave=1, generacion=0)
+
+        for clave in (2, 3, 4):
+            precarga.precargar(clave)
+        precarga._al_terminar(1, {"clave": 1})
+
+        precarga._iniciar.assert_called_once_with(4)
+
+    def test_invalidar_descarta_resultado_en_curso(self, qapp):
+        precarga = self._precarga(qapp)
+        precarga._worker = MagicMock(clave=1, generacion=0)
+
+        precarga.invalidar()
+        precarga._al_terminar(1, {"clave": 1})
+
+        assert precarga.tomar(1) is None
+
+
+class TestDetalleParqueaderoReutilizable:
+    """DetalleParqueaderoModal se re-enlaza sin reconstruir la interfaz"""
+
+    def _datos(self, numero, placas):
+        info = {
+            "numero_parqueadero": numero,
+            "estado": "Disponible",
+            "tipo_espacio": "Carro",
+            "sotano": "Sótano-1",
+            "carros_asignados": len(placas),
+            "motos_asignadas": 0,
+            "bicicletas_asignadas": 0,
+        }
+        vehiculos = [
+            {
+                "nombre": "Ana",
+                "apellidos": "Pérez",
+                "cedula": "1",
+                "cargo": "",
+                "direccion_grupo": "",
+                "celular": "",
+                "tipo_vehiculo": "Carro",
+                "placa": placa,
+                "tipo_circulacion": "PAR",
+                "ultimo_digito": "2",
+                "fecha_asignacion": None,
+                "observaciones": "",
+            }
+            for placa in placas
+        ]
+        return {"numero_parqueadero": numero, "info": info, "vehiculos": vehiculos}
+
+    def test_vincular_con_datos_precargados_no_consulta(self, qapp):
+        from src.ui.modal_detalle_parqueadero import DetalleParqueaderoModal
+
+        db = MagicMock()
+        modal = DetalleParqueaderoModal(1, db_manager=db, datos=self._datos(1, ["AAA112"]))
+        tarjetas = modal.layout_vehiculos.count()
+
+        modal.vincular(2, self._datos(2, []))
+
+        db.fetch_one.assert_not_called()
+        db.fetch_all.assert_not_called()
+        assert modal.parqueadero_id == 2
+        assert "P-002" in modal.windowTitle()
+        # Mensaje de disponible + stretch: no se acumulan elementos entre usos
+        assert modal.layout_vehiculos.count() == 2 <= tarjetas
+        modal.deleteLater()
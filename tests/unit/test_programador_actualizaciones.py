@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Programador de actualizaciones entre pestañas"""
+
+from unittest.mock import Mock
+
+import pytest
+from PyQt5.QtWidgets import QTabWidget, QWidget
+
+
+class PestanaFalsa(QWidget):
+    """Pestaña que registra las recargas recibidas"""
+
+    def __init__(self):
+        super().__init__()
+        self.llamadas = []
+
+    def cargar_a(self):
+        self.llamadas.append("a")
+
+    def cargar_b(self):
+        self.llamadas.append("b")
+
+
+@pytest.fixture
+def entorno(qapp):
+    tabs = QTabWidget()
+    visible, oculta = PestanaFalsa(), PestanaFalsa()
+    tabs.addTab(visible, "Visible")
+    tabs.addTab(oculta, "Oculta")
+    tabs.setCurrentIndex(0)
+    db = Mock()
+
+    from src.ui.utils.programador_actualizaciones import ProgramadorActualizaciones
+
+    programador = ProgramadorActualizaciones(tabs, db)
+    yield programador, visible, oculta, db
+    tabs.deleteLater()
+
+
+class TestProgramadorActualizaciones:
+    """Tests de agrupación, deduplicación y recarga diferida"""
+
+    def test_rafaga_se_agrupa_y_deduplica(self, entorno):
+        """Varias señales seguidas producen una sola recarga por método y una reconexión"""
+        programador, visible, _, db = entorno
+
+        programador.solicitar(visible.cargar_a, visible.cargar_b)
+        programador.solicitar(visible.cargar_a)
+        assert visible.llamadas == []
+
+        programador.procesar()
+
+        assert visible.llamadas == ["a", "b"]
+        db.force_reconnect.assert_called_once()
+
+    def test_pestana_oculta_se_recarga_al_mostrarse(self, entorno):
+        """Las recargas de pestañas ocultas esperan a que el usuario las abra"""
+        programador, visible, oculta, db = entorno
+
+        programador.solicitar(oculta.cargar_a)
+        programador.solicitar(oculta.cargar_a)
+        programador.procesar()
+
+        assert oculta.llamadas == []
+        db.force_reconnect.assert_not_called()
+        assert programador.pendientes(oculta) == [oculta.cargar_a]
+
+        programador.tabs.setCurrentIndex(1)
+
+        assert oculta.llamadas == ["a"]
+        assert programador.pendientes(oculta) == []
+
+    def test_recarga_al_mostrar_descarta_pendientes(self, entorno):
+        """Si la pestaña recarga sola en showEvent, no se acumulan solicitudes"""
+        programador, _, oculta, _ = entorno
+        programador.recarga_al_mostrar(oculta)
+
+        programador.solicitar(oculta.cargar_a)
+        programador.procesar()
+        programador.tabs.setCurrentIndex(1)
+
+        assert oculta.llamadas == []
+
+    def test_error_en_una_recarga_no_detiene_las_demas(self, entorno):
+        """Una recarga que falla no impide ejecutar las siguientes"""
+        programador, visible, _, _ = entorno
+        visible.cargar_a = Mock(side_effect=RuntimeError("fallo"), __name__="cargar_a", __self__=visible)
+
+        programador.solicitar(visible.cargar_a, visible.cargar_b)
+        programador.procesar()
+
+        assert visible.llamadas == ["b"]
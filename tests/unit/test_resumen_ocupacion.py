@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Resumen de ocupación mantenido por triggers"""
+
+import pytest
+
+
+def _con_resumen(mock_db_manager, existe):
+    """fetch_one responde a SHOW TABLES/SHOW COLUMNS; la tabla de resumen existe o no"""
+
+    def fetch_one(query, params=None, preparada=False):
+        if "parqueaderos_ocupacion" in query:
+            return {"tabla": "parqueaderos_ocupacion"} if existe else None
+        if "SHOW COLUMNS" in query:
+            return {"Field": "sotano"}
+        return {"total_espacios": 0, "ocupados": 0, "vehiculos_estacionados": 0}
+
+    mock_db_manager.fetch_one.side_effect = fetch_one
+    return mock_db_manager
+
+
+class TestLecturas:
+    """Las lecturas usan el resumen si existe y las subconsultas si no"""
+
+    def test_listado_lee_el_resumen(self, mock_db_manager):
+        """Con la migración aplicada no hay subconsultas correlacionadas por parqueadero"""
+        from src.models.parqueadero import ParqueaderoModel
+
+        ParqueaderoModel(_con_resumen(mock_db_manager, True)).obtener_todos()
+
+        query = mock_db_manager.fetch_all.call_args[0][0]
+        assert "LEFT JOIN parqueaderos_ocupacion o" in query
+        assert "SELECT COUNT(*)" not in query
+
+    def test_listado_sin_migracion_usa_subconsultas(self, mock_db_manager):
+        """Sin la tabla de resumen se mantiene la consulta original"""
+        from src.models.parqueadero import ParqueaderoModel
+
+        ParqueaderoModel(_con_resumen(mock_db_manager, False)).obtener_todos()
+
+        query = mock_db_manager.fetch_all.call_args[0][0]
+        assert "parqueaderos_ocupacion" not in query
+        assert "SELECT COUNT(*)" in query
+
+    def test_existencia_de_tabla_se_consulta_una_vez(self, mock_db_manager):
+        """El modelo recuerda si la tabla existe"""
+        from src.models.parqueadero import ParqueaderoModel
+
+        model = ParqueaderoModel(_con_resumen(mock_db_manager, True))
+        model.obtener_estadisticas_generales()
+        model.obtener_ocupacion_por_sotano()
+
+        consultas = [c[0][0] for c in mock_db_manager.fetch_one.call_args_list]
+        assert sum("SHOW TABLES" in q for q in consultas) == 1
+        assert "parqueaderos_ocupacion" in mock_db_manager.fetch_all.call_args[0][0]
+
+
+class TestMantenimiento:
+    """Reconstrucción y verificación del resumen"""
+
+    def test_reconstruir_llama_procedimiento(self, mock_db_manager):
+        from src.models.parqueadero import ParqueaderoModel
+
+        mock_db_manager.execute_query.return_value = (True, "")
+        resultado = ParqueaderoModel(_con_resumen(mock_db_manager, True)).reconstruir_resumen_ocupacion()
+
+        assert resultado == (True, "")
+        mock_db_manager.execute_query.assert_called_once_with("CALL sp_reconstruir_ocupacion()")
+
+    def test_reconstruir_sin_migracion(self, mock_db_manager):
+        from src.models.parqueadero import ParqueaderoModel
+
+        exito, mensaje = ParqueaderoModel(_con_resumen(mock_db_manager, False)).reconstruir_resumen_ocupacion()
+
+        assert not exito and "002" in mensaje
+        mock_db_manager.execute_query.assert_not_called()
+
+    def test_verificar_reporta_columnas_distintas(self, mock_db_manager):
+        """Solo se reportan las columnas que difieren"""
+        from src.models.parqueadero import COLUMNAS_RESUMEN, ParqueaderoModel
+
+        fila = {"parqueadero_id": 7, "numero_parqueadero": 7}
+        for columna in COLUMNAS_RESUMEN:
+            fila[f"resumen_{columna}"] = fila[f"real_{columna}"] = 0
+        fila["resumen_total_asignaciones"], fila["real_total_asignaciones"] = 1, 2
+        fila["resumen_permite_compartir_min"], fila["real_permite_compartir_min"] = None, None
+        mock_db_manager.cursor.fetchall.return_value = [fila]
+
+        diferencias = ParqueaderoModel(_con_resumen(mock_db_manager, True)).verificar_resumen_ocupacion()
+
+        assert diferencias == [
+            {"parqueadero_id": 7, "numero_parqueadero": 7, "columna": "total_asignaciones", "resumen": 1, "real": 2}
+        ]
+        assert "<=>" in mock_db_manager.cursor.execute.call_args[0][0]
+
+    def test_verificar_sin_migracion_o_con_error_no_es_consistente(self, mock_db_manager):
+        """Sin la tabla o con la consulta fallida se lanza Error en lugar de retornar []"""
+        from mysql.connector import Error
+
+        from src.models.parqueadero import ParqueaderoModel
+
+        with pytest.raises(Error, match="002"):
+            ParqueaderoModel(_con_resumen(mock_db_manager, False)).verificar_resumen_ocupacion()
+        mock_db_manager.cursor.execute.assert_not_called()
+
+        mock_db_manager.cursor.execute.side_effect = Error(msg="Table doesn't exist")
+        with pytest.raises(Error):
+            ParqueaderoModel(_con_resumen(mock_db_manager, True)).verificar_resumen_ocupacion()
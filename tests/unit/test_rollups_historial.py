@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Rollups incrementales de accesos y ocupación"""
+
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+
+def _db(marca, ids):
+    """Conexión falsa: el cursor responde la marca de agua y los ids pendientes"""
+    db = MagicMock()
+    db.ensure_connection.return_value = True
+    db.cursor.fetchone.return_value = marca
+    db.cursor.fetchall.return_value = [{"id": i} for i in ids]
+    return db
+
+
+def _sentencias(db):
+    return [c[0][0] for c in db.cursor.execute.call_args_list]
+
+
+class TestAgregador:
+    """Marca de agua y transacción por lote"""
+
+    def test_procesa_solo_filas_nuevas_y_avanza_la_marca(self):
+        from src.database.version_datos import version_datos, version_rollups
+        from src.utils.rollups_historial import AgregadorRollups
+
+        db = _db({"ultimo_id": 100}, range(101, 141))
+        antes, global_antes = version_rollups.actual(), version_datos.actual()
+
+        assert AgregadorRollups(db, tamano_lote=1000).procesar_fuente("accesos") == 40
+
+        llamadas = db.cursor.execute.call_args_list
+        assert "FOR UPDATE" in llamadas[0][0][0]
+        assert llamadas[1][0][1] == (100, 1000)
+        # Rollup por hora y por día sobre (100, 140] y la nueva marca, en un solo commit
+        assert [c[0][1] for c in llamadas[2:4]] == [(100, 140), (100, 140)]
+        assert "rollup_accesos_hora" in llamadas[2][0][0]
+        assert "rollup_accesos_dia" in llamadas[3][0][0]
+        assert llamadas[4][0][1] == ("accesos", 140)
+        db.connection.commit.assert_called_once()
+        assert version_rollups.actual() == antes + 1
+        assert version_datos.actual() == global_antes
+
+    def test_sin_filas_nuevas_no_escribe(self):
+        from src.utils.rollups_historial import AgregadorRollups
+
+        db = _db({"ultimo_id": 140}, [])
+
+        assert AgregadorRollups(db).procesar_fuente("asignaciones") == 0
+        assert not any(s.lstrip().startswith("INSERT") for s in _sentencias(db))
+        db.connection.commit.assert_not_called()
+
+    def test_error_revierte_lote_y_marca(self):
+        from mysql.connector import Error
+
+        from src.utils.rollups_historial import AgregadorRollups
+
+        db = _db({"ultimo_id": 0}, range(1, 11))
+        db.cursor.execute.side_effect = [None, None, Error("deadlock")]
+
+        assert AgregadorRollups(db).procesar_fuente("asignaciones") == 0
+        db.connection.rollback.assert_called_once()
+        db.connection.commit.assert_not_called()
+
+    def test_commit_fuera_de_orden_no_se_salta(self):
+        """La marca se detiene en un id aún sin confirmar y lo agrega cuando aparece"""
+        from unittest.mock import Mock
+
+        from src.utils.rollups_historial import AgregadorRollups
+
+        reloj = Mock(return_value=1000.0)
+        db = _db({"ultimo_id": 100}, [101, 102, 104, 105])  # 103 todavía en una transacción abierta
+        agregador = AgregadorRollups(db, espera_hueco_s=300, reloj=reloj)
+
+        assert agregador.procesar_fuente("accesos") == 2
+        assert db.cursor.execute.call_args_list[-1][0][1] == ("accesos", 102)
+
+        # 103 confirma después de 104 y 105: el siguiente lote lo incluye
+        db.cursor.fetchone.return_value = {"ultimo_id": 102}
+        db.cursor.fetchall.return_value = [{"id": i} for i in (103, 104, 105)]
+        assert agregador.procesar_fuente("accesos") == 3
+        llamadas = db.cursor.execute.call_args_list
+        assert llamadas[-2][0][1] == (102, 105)
+        assert llamadas[-1][0][1] == ("accesos", 105)
+
+    def test_hueco_vencido_se_cruza(self):
+        """Un id que nunca confirma (rollback) solo retiene la marca durante la espera"""
+        from unittest.mock import Mock
+
+        from src.utils.rollups_historial import AgregadorRollups
+
+        reloj = Mock(return_value=1000.0)
+        db = _db({"ultimo_id": 102}, [104, 105])
+        agregador = AgregadorRollups(db, espera_hueco_s=300, reloj=reloj)
+
+        assert agregador.procesar_fuente("accesos") == 0
+        reloj.return_value = 1299.0
+        assert agregador.procesar_fuente("accesos") == 0
+        reloj.return_value = 1300.0
+        assert agregador.procesar_fuente("accesos") == 2
+        assert db.cursor.execute.call_args_list[-1][0][1] == ("accesos", 105)
+        assert agregador._huecos["accesos"] == {}
+
+    def test_procesar_recorre_lotes_hasta_ponerse_al_dia(self):
+        from src.utils.rollups_historial import AgregadorRollups
+
+        agregador = AgregadorRollups(MagicMock(), tamano_lote=10)
+        agregador.procesar_fuente = MagicMock(side_effect=[10, 10, 3, 0])
+        agregador.registrar_ocupacion = MagicMock(return_value=200)
+
+        assert agregador.procesar() == {"accesos": 23, "asignaciones": 0, "ocupacion": 200}
+
+    def test_muestra_de_ocupacion_truncada_a_la_hora(self):
+        from src.utils.rollups_historial import AgregadorRollups
+
+        db = MagicMock()
+        db.ensure_connection.return_value = True
+        db.cursor.rowcount = 200
+
+        assert AgregadorRollups(db).registrar_ocupacion(datetime(2024, 3, 5, 9, 41, 7)) == 200
+
+        llamadas = db.cursor.execute.call_args_list
+        assert llamadas[0][0][1] == (datetime(2024, 3, 5, 9, 0),)
+        assert llamadas[1][0][1] == (datetime(2024, 3, 5), datetime(2024, 3, 6))
+
+
+class TestConsultasRollups:
+    """Lecturas para reportes"""
+
+    def test_ocupacion_mensual_combina_fuentes(self, mock_db_manager):
+        from src.utils.rollups_historial import ConsultasRollups
+
+        mock_db_manager.fetch_all.side_effect = [
+            [{"mes": "2024-02", "espacios": 200, "ocupacion_pct": 81.5, "vehiculos_promedio": 240.0,
+              "carros": 200.0, "motos": 30.0, "bicicletas": 10.0}],
+            [{"mes": "2024-01", "entradas": 900, "salidas": 880}],
+            [{"mes": "2024-02", "asignaciones": 12}],
+        ]
+
+        meses = ConsultasRollups(mock_db_manager).ocupacion_mensual(date(2024, 1, 1), date(2024, 2, 29))
+
+        assert [m["mes"] for m in meses] == ["2024-01", "2024-02"]
+        assert meses[0]["entradas"] == 900 and meses[0]["ocupacion_pct"] is None
+        assert meses[1]["ocupacion_pct"] == 81.5 and meses[1]["asignaciones"] == 12
+        for query in (c[0][0] for c in mock_db_manager.fetch_all.call_args_list):
+            assert "historial_accesos" not in query and "FROM asignaciones" not in query
+
+    def test_accesos_por_sotano(self, mock_db_manager):
+        from src.utils.rollups_historial import ConsultasRollups
+
+        mock_db_manager.fetch_one.return_value = {"Field": "sotano"}
+        ConsultasRollups(mock_db_manager).accesos(datetime(2024, 1, 1), datetime(2024, 1, 2), "hora", por="sotano")
+
+        query = mock_db_manager.fetch_all.call_args[0][0]
+        assert "FROM rollup_accesos_hora r" in query
+        assert "COALESCE(p.sotano, 'Sótano-1') AS grupo" in query
+        assert "JOIN parqueaderos p" in query
+
+    def test_sotano_nulo_es_sotano_1(self, mock_db_manager):
+        """Los espacios sin sótano cuentan como Sótano-1, igual que en el resto de consultas"""
+        from src.utils.rollups_historial import ConsultasRollups
+
+        mock_db_manager.fetch_one.return_value = {"Field": "sotano"}
+        consultas = ConsultasRollups(mock_db_manager)
+        consultas.tendencia_ocupacion(datetime(2024, 1, 1), 3600, por="sotano")
+        consultas.ocupacion_diaria(date(2024, 1, 1), date(2024, 1, 31), sotano="Sótano-1")
+
+        tendencia, diaria = (c[0][0] for c in mock_db_manager.fetch_all.call_args_list)
+        assert "COALESCE(p.sotano, 'Sótano-1') AS grupo" in tendencia
+        assert "COALESCE(p.sotano, 'Sótano-1') = %s" in diaria
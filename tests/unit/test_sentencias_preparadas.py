@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Caché de sentencias preparadas en DatabaseManager"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def db():
+    """ConexionIndependiente con una conexión simulada que crea cursores preparados"""
+    from src.database.manager import ConexionIndependiente
+
+    with patch.object(ConexionIndependiente, "connect", return_value=True):
+        conexion = ConexionIndependiente()
+
+    conexion.connection = MagicMock()
+    conexion.connection.is_connected.return_value = True
+    conexion.cursor = MagicMock()
+
+    def nuevo_cursor(prepared=False):
+        cursor = MagicMock()
+        cursor.column_names = ("id", "placa")
+        cursor.fetchall.return_value = [(7, bytearray(b"ABC123"))]
+        return cursor
+
+    conexion.connection.cursor.side_effect = nuevo_cursor
+    return conexion
+
+
+class TestSentenciasPreparadas:
+    """Tests de reutilización por texto SQL y conversión a diccionarios"""
+
+    def test_resultado_binario_como_diccionario(self, db):
+        """Las tuplas del protocolo binario se entregan con la forma del cursor dictionary"""
+        fila = db.fetch_one("SELECT id, placa FROM vehiculos WHERE id = %s", (7,), preparada=True)
+
+        assert fila == {"id": 7, "placa": "ABC123"}
+        db.connection.cursor.assert_called_once_with(prepared=True)
+
+    def test_cursor_reutilizado_por_texto_sql(self, db):
+        """El mismo SQL reutiliza su cursor preparado; otro SQL prepara uno nuevo"""
+        sql = "SELECT id, placa FROM vehiculos WHERE id = %s"
+        db.fetch_all(sql, (1,), preparada=True)
+        db.fetch_all(sql, (2,), preparada=True)
+        db.fetch_all("SELECT id, placa FROM vehiculos WHERE placa = %s", ("X",), preparada=True)
+
+        assert db.connection.cursor.call_count == 2
+        db.cursor.execute.assert_not_called()
+
+    def test_lru_limita_sentencias_por_conexion(self, db):
+        """Al superar el límite se cierra la sentencia menos usada"""
+        from src.database import manager
+
+        with patch.object(manager, "MAX_SENTENCIAS_PREPARADAS", 2):
+            for i in range(3):
+                db.fetch_all(f"SELECT id, placa FROM vehiculos WHERE id = {i} AND x = %s", (1,), preparada=True)
+
+        assert len(db._sentencias) == 2
+        assert "WHERE id = 0" not in " ".join(db._sentencias)
+
+    def test_reconexion_descarta_sentencias(self, db):
+        """Las sentencias pertenecen a la conexión: se cierran al desconectar"""
+        db.fetch_one("SELECT id, placa FROM vehiculos WHERE id = %s", (1,), preparada=True)
+        cursor = next(iter(db._sentencias.values()))
+
+        db.disconnect()
+
+        cursor.close.assert_called_once()
+        assert not db._sentencias
+
+    def test_error_cierra_el_cursor_descartado(self, db):
+        """Si la consulta falla, el cursor se saca de la caché y se libera en el servidor"""
+        from mysql.connector import Error
+
+        sql = "SELECT id, placa FROM vehiculos WHERE id = %s"
+        db.fetch_one(sql, (1,), preparada=True)
+        cursor = db._sentencias[sql]
+        cursor.execute.side_effect = Error("Lost connection")
+        cursor.close.side_effect = Error("Lost connection")
+
+        assert db.fetch_one(sql, (1,), preparada=True) is None
+        cursor.close.assert_called_once()
+        assert sql not in db._sentencias
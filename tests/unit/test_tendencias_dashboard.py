@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Tendencias de ocupación del dashboard"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+AHORA = datetime(2024, 3, 8, 10, 30)
+
+
+def _fila(horas_atras, grupo, valor):
+    momento = AHORA.replace(minute=0) - timedelta(hours=horas_atras)
+    return {"momento": momento, "grupo": grupo, "valor": valor}
+
+
+class TestSerieTendencia:
+    """Caché de series entre refrescos"""
+
+    def test_refresco_solo_consulta_desde_el_ultimo_punto(self):
+        from src.utils.rollups_historial import SerieTendencia
+
+        consultas = MagicMock()
+        consultas.tendencia_ocupacion.side_effect = [
+            [_fila(2, "Carros", 10), _fila(1, "Carros", 12)],
+            [_fila(1, "Carros", 13), _fila(0, "Carros", 14)],
+        ]
+        serie = SerieTendencia(consultas, por="tipo", dias=7, puntos_max=168)
+
+        serie.actualizar(AHORA)
+        series = serie.actualizar(AHORA + timedelta(seconds=30))
+
+        primera, segunda = consultas.tendencia_ocupacion.call_args_list
+        assert primera[0] == (AHORA - timedelta(days=7), 3600, "tipo")
+        assert segunda[0][0] == _fila(1, "Carros", 0)["momento"]
+        # El último punto en caché se reemplaza por su valor recalculado
+        assert [v for _, v in series["Carros"]] == [10, 13, 14]
+
+    def test_puntos_agrupados_segun_maximo(self):
+        from src.utils.rollups_historial import SerieTendencia
+
+        serie = SerieTendencia(MagicMock(), dias=30, puntos_max=100)
+        assert serie.segundos_por_punto == 8 * 3600
+
+    def test_tendencia_por_tipo_agrupa_en_la_base(self, mock_db_manager):
+        from src.utils.rollups_historial import ConsultasRollups
+
+        mock_db_manager.fetch_all.return_value = [
+            {"momento": AHORA, "carros": 120.5, "motos": 30.0, "bicicletas": 4.0}
+        ]
+
+        filas = ConsultasRollups(mock_db_manager).tendencia_ocupacion(AHORA, 7200, "tipo")
+
+        query, params = mock_db_manager.fetch_all.call_args[0]
+        assert "FLOOR(UNIX_TIMESTAMP(r.hora) / %s)" in query and "GROUP BY momento" in query
+        assert params == (7200, 7200, AHORA)
+        assert [(f["grupo"], f["valor"]) for f in filas] == [("Carros", 120.5), ("Motos", 30.0), ("Bicicletas", 4.0)]
+
+
+class TestGraficaTendencia:
+    """Redibujo completo solo cuando cambian los límites o las series"""
+
+    def test_blitting_para_puntos_dentro_de_los_limites(self, qapp):
+        pytest.importorskip("matplotlib")
+        from src.ui.widgets.grafica_tendencia import GraficaTendencia
+
+        grafica = GraficaTendencia("Por tipo de vehículo", "vehículos")
+        puntos = [(AHORA - timedelta(hours=h), 10.0) for h in range(48, 0, -1)]
+
+        grafica.mostrar({"Carros": puntos})
+        grafica.mostrar({"Carros": puntos + [(AHORA, 11.0)]})
+        assert (grafica.redibujos_completos, grafica.redibujos_parciales) == (1, 1)
+
+        # Un punto fuera del eje X obliga a recalcular los límites
+        grafica.mostrar({"Carros": puntos + [(AHORA + timedelta(days=2), 11.0)]})
+        assert grafica.redibujos_completos == 2
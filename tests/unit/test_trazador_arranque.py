@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Tests Unitarios: Trazador de arranque"""
+
+import json
+
+import pytest
+
+
+@pytest.fixture
+def trazador(monkeypatch):
+    monkeypatch.delenv("PARKING_STARTUP_TRACE", raising=False)
+    monkeypatch.delenv("PARKING_STARTUP_TRACE_FORMAT", raising=False)
+    from src.core.trazador_arranque import TrazadorArranque
+
+    trazador = TrazadorArranque()
+    trazador.iniciar()
+    return trazador
+
+
+class TestTrazadorArranque:
+    """Tests de registro de fases y volcado"""
+
+    def test_fases_anidadas(self, trazador):
+        """Cada fase registra pared, CPU y nivel de anidamiento"""
+        with trazador.fase("ventana_principal"):
+            with trazador.fase("pestana.tab_dashboard", categoria="pestana"):
+                sum(range(10000))
+
+        pestana, ventana = trazador.eventos
+        assert (ventana["nombre"], ventana["nivel"]) == ("ventana_principal", 0)
+        assert (pestana["categoria"], pestana["nivel"]) == ("pestana", 1)
+        assert ventana["duracion_ms"] >= pestana["duracion_ms"]
+        assert pestana["cpu_ms"] >= 0
+
+    def test_consultas_solo_hasta_finalizar(self, trazador):
+        """Tras la primera pantalla interactiva se dejan de registrar consultas"""
+        import time
+
+        trazador.consulta("SELECT  *\n FROM funcionarios", time.perf_counter(), 0.002, filas=3)
+        assert trazador.finalizar() is None  # sin destino configurado no vuelca
+        trazador.consulta("SELECT 1", time.perf_counter(), 0.001)
+
+        consultas = [e for e in trazador.eventos if e["categoria"] == "consulta"]
+        assert [c["nombre"] for c in consultas] == ["SELECT * FROM funcionarios"]
+        assert consultas[0]["datos"] == {"filas": 3}
+
+    def test_inactivo_hasta_iniciar(self):
+        """Los procesos que no son la aplicación (scripts, pruebas) no acumulan eventos"""
+        import time
+
+        from src.core.trazador_arranque import TrazadorArranque
+
+        trazador = TrazadorArranque()
+        with trazador.fase("db.conexion", categoria="db"):
+            trazador.consulta("SELECT 1", time.perf_counter(), 0.001)
+        assert trazador.eventos == [] and trazador.finalizar() is None
+
+    def test_eventos_acotados(self, trazador, monkeypatch):
+        """Pasado MAX_EVENTOS solo se cuentan los descartados"""
+        import time
+
+        monkeypatch.setattr("src.core.trazador_arranque.MAX_EVENTOS", 3)
+        for _ in range(5):
+            trazador.consulta("SELECT 1", time.perf_counter(), 0.001)
+
+        assert len(trazador.eventos) == 3
+        assert trazador.resumen()["descartados"] == 2
+
+    def test_volcado_json(self, trazador, tmp_path):
+        """El resumen JSON agrupa por categoría sin contar dos veces las fases anidadas"""
+        trazador.configurar(str(tmp_path / "arranque.json"))
+        with trazador.fase("ventana_principal"):
+            with trazador.fase("pestana.tab_dashboard", categoria="pestana"):
+                pass
+
+        ruta = trazador.finalizar()
+        resumen = json.loads(ruta.read_text(encoding="utf-8"))
+
+        assert resumen["por_categoria"]["fase"]["cantidad"] == 1
+        assert "pestana" not in resumen["por_categoria"]
+        assert resumen["eventos"][-1]["nombre"] == "arranque.interactivo"
+
+    def test_volcado_chrome(self, trazador, tmp_path):
+        """El formato chrome usa eventos completos (ph=X) en microsegundos"""
+        trazador.configurar(str(tmp_path / "arranque.trace.json"), "chrome")
+        with trazador.fase("qapplication"):
+            pass
+
+        traza = json.loads(trazador.finalizar().read_text(encoding="utf-8"))
+        fase = next(e for e in traza["traceEvents"] if e["name"] == "qapplication")
+
+        assert fase["ph"] == "X"
+        assert isinstance(fase["ts"], int)
+        assert any(e["ph"] == "M" for e in traza["traceEvents"])
+
+    def test_formato_invalido(self, trazador):
+        """Un formato desconocido se rechaza"""
+        with pytest.raises(ValueError):
+            trazador.configurar("traza.json", "xml")
+
+
+def test_flags_de_traza_se_quitan_de_argv():
+    """main.py extrae los flags del trazador antes de crear QApplication"""
+    from main import extract_trace_options
+
+    argv = ["main.py", "--trace-startup", "t.json", "-style", "fusion", "--trace-format=chrome"]
+
+    assert extract_trace_options(argv) == ("t.json", "chrome")
+    assert argv == ["main.py", "-style", "fusion"]